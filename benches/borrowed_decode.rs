@@ -0,0 +1,103 @@
+use criterion::{black_box, criterion_group, criterion_main, Criterion};
+use rust_system::dto::binance::borrowed::{BookTickerRef, KlineRef, PartialDepthRef, TradeRef};
+use rust_system::dto::binance::websocket::{BinancePartialDepth, BinanceTradeData, BookTickerData, KlineData};
+use rust_system::models::{CommonDepth, OrderTick, TradeTick, TradingSymbol};
+use std::alloc::{GlobalAlloc, Layout, System};
+use std::sync::atomic::{AtomicUsize, Ordering};
+
+/// 统计分配次数的全局分配器
+struct CountingAllocator;
+
+static ALLOCATIONS: AtomicUsize = AtomicUsize::new(0);
+
+unsafe impl GlobalAlloc for CountingAllocator {
+    unsafe fn alloc(&self, layout: Layout) -> *mut u8 {
+        ALLOCATIONS.fetch_add(1, Ordering::Relaxed);
+        unsafe { System.alloc(layout) }
+    }
+
+    unsafe fn dealloc(&self, ptr: *mut u8, layout: Layout) {
+        unsafe { System.dealloc(ptr, layout) }
+    }
+
+    unsafe fn realloc(&self, ptr: *mut u8, layout: Layout, new_size: usize) -> *mut u8 {
+        ALLOCATIONS.fetch_add(1, Ordering::Relaxed);
+        unsafe { System.realloc(ptr, layout, new_size) }
+    }
+}
+
+#[global_allocator]
+static GLOBAL: CountingAllocator = CountingAllocator;
+
+/// fstream 实盘抓取的推送（futures USDT-M）
+const BOOK_TICKER: &str = r#"{"e":"bookTicker","u":8822354685703,"s":"BTCUSDT","b":"118234.50","B":"7.312","a":"118234.60","A":"2.045","T":1754379530514,"E":1754379530514}"#;
+const TRADE: &str = r#"{"e":"trade","E":1754379530617,"T":1754379530617,"s":"BTCUSDT","t":6541587912,"p":"118234.60","q":"0.004","X":"MARKET","m":false}"#;
+const KLINE: &str = r#"{"e":"kline","E":1754379531003,"s":"BTCUSDT","k":{"t":1754379480000,"T":1754379539999,"s":"BTCUSDT","i":"1m","f":6541586201,"L":6541587925,"o":"118201.10","c":"118234.60","h":"118240.00","l":"118198.70","v":"96.118","n":1725,"x":false,"q":"11363221.90480","V":"58.402","Q":"6904448.78110","B":"0"}}"#;
+const PARTIAL_DEPTH: &str = r#"{"e":"depthUpdate","E":1754379530622,"T":1754379530614,"s":"BTCUSDT","U":8822354685120,"u":8822354685790,"pu":8822354685101,"b":[["118234.50","7.312"],["118234.40","0.102"],["118234.30","0.004"],["118234.10","0.015"],["118234.00","0.450"],["118233.90","0.002"],["118233.80","0.210"],["118233.70","0.019"],["118233.50","1.034"],["118233.40","0.002"]],"a":[["118234.60","2.045"],["118234.70","0.041"],["118234.80","0.300"],["118235.00","0.923"],["118235.10","0.004"],["118235.20","0.050"],["118235.40","0.128"],["118235.50","2.001"],["118235.60","0.017"],["118235.80","0.310"]]}"#;
+
+fn owned_book_ticker() -> OrderTick {
+    OrderTick::new_from_binance(serde_json::from_str::<BookTickerData>(BOOK_TICKER).unwrap())
+}
+
+fn borrowed_book_ticker() -> OrderTick {
+    OrderTick::new_from_binance_ref(&serde_json::from_str::<BookTickerRef>(BOOK_TICKER).unwrap())
+}
+
+fn owned_trade() -> TradeTick {
+    TradeTick::new_from_binance(serde_json::from_str::<BinanceTradeData>(TRADE).unwrap())
+}
+
+fn borrowed_trade() -> TradeTick {
+    TradeTick::new_from_binance_ref(&serde_json::from_str::<TradeRef>(TRADE).unwrap())
+}
+
+fn owned_kline() -> f64 {
+    serde_json::from_str::<KlineData>(KLINE).unwrap().kline.close_price
+}
+
+fn borrowed_kline() -> f64 {
+    serde_json::from_str::<KlineRef>(KLINE).unwrap().kline.close_price
+}
+
+fn owned_depth() -> CommonDepth {
+    let data = serde_json::from_str::<BinancePartialDepth>(PARTIAL_DEPTH).unwrap();
+    CommonDepth::new_from_binance(data, TradingSymbol::BTCUSDT)
+}
+
+fn borrowed_depth() -> CommonDepth {
+    let data = serde_json::from_str::<PartialDepthRef>(PARTIAL_DEPTH).unwrap();
+    CommonDepth::new_from_binance_ref(data, TradingSymbol::BTCUSDT)
+}
+
+/// 单条消息（解析 + 转换为模型）的分配次数
+fn allocations_per_message<T>(f: fn() -> T) -> usize {
+    // 预热一次，排除惰性初始化
+    black_box(f());
+    let before = ALLOCATIONS.load(Ordering::Relaxed);
+    black_box(f());
+    ALLOCATIONS.load(Ordering::Relaxed) - before
+}
+
+fn report_allocations() {
+    println!("allocations per message (owned -> borrowed):");
+    println!("  book_ticker:   {} -> {}", allocations_per_message(owned_book_ticker), allocations_per_message(borrowed_book_ticker));
+    println!("  trade:         {} -> {}", allocations_per_message(owned_trade), allocations_per_message(borrowed_trade));
+    println!("  kline:         {} -> {}", allocations_per_message(owned_kline), allocations_per_message(borrowed_kline));
+    println!("  partial_depth: {} -> {}", allocations_per_message(owned_depth), allocations_per_message(borrowed_depth));
+}
+
+fn bench_decode(c: &mut Criterion) {
+    report_allocations();
+
+    c.bench_function("book_ticker_owned", |b| b.iter(|| black_box(owned_book_ticker())));
+    c.bench_function("book_ticker_borrowed", |b| b.iter(|| black_box(borrowed_book_ticker())));
+    c.bench_function("trade_owned", |b| b.iter(|| black_box(owned_trade())));
+    c.bench_function("trade_borrowed", |b| b.iter(|| black_box(borrowed_trade())));
+    c.bench_function("kline_owned", |b| b.iter(|| black_box(owned_kline())));
+    c.bench_function("kline_borrowed", |b| b.iter(|| black_box(borrowed_kline())));
+    c.bench_function("partial_depth_owned", |b| b.iter(|| black_box(owned_depth())));
+    c.bench_function("partial_depth_borrowed", |b| b.iter(|| black_box(borrowed_depth())));
+}
+
+criterion_group!(benches, bench_decode);
+criterion_main!(benches);
@@ -0,0 +1,141 @@
+use criterion::{black_box, criterion_group, criterion_main, Criterion};
+use rust_decimal::Decimal;
+use rust_system::common::decimal::{parse_f64, parse_fixed_u64, FastDecimal, FIXED_SCALE};
+use rust_system::dto::binance::websocket::{BinancePartialDepth, BinanceTradeData, BookTickerData, KlineData};
+use serde::Deserialize;
+use serde_with::{serde_as, DisplayFromStr};
+use std::str::FromStr;
+
+/// fstream 实盘抓取的推送（futures USDT-M）
+const BOOK_TICKER: &str = r#"{"e":"bookTicker","u":8822354685703,"s":"BTCUSDT","b":"118234.50","B":"7.312","a":"118234.60","A":"2.045","T":1754379530514,"E":1754379530514}"#;
+const TRADE: &str = r#"{"e":"trade","E":1754379530617,"T":1754379530617,"s":"BTCUSDT","t":6541587912,"p":"118234.60","q":"0.004","X":"MARKET","m":false}"#;
+const KLINE: &str = r#"{"e":"kline","E":1754379531003,"s":"BTCUSDT","k":{"t":1754379480000,"T":1754379539999,"s":"BTCUSDT","i":"1m","f":6541586201,"L":6541587925,"o":"118201.10","c":"118234.60","h":"118240.00","l":"118198.70","v":"96.118","n":1725,"x":false,"q":"11363221.90480","V":"58.402","Q":"6904448.78110","B":"0"}}"#;
+const PARTIAL_DEPTH: &str = r#"{"e":"depthUpdate","E":1754379530622,"T":1754379530614,"s":"BTCUSDT","U":8822354685120,"u":8822354685790,"pu":8822354685101,"b":[["118234.50","7.312"],["118234.40","0.102"],["118234.30","0.004"],["118234.10","0.015"],["118234.00","0.450"],["118233.90","0.002"],["118233.80","0.210"],["118233.70","0.019"],["118233.50","1.034"],["118233.40","0.002"]],"a":[["118234.60","2.045"],["118234.70","0.041"],["118234.80","0.300"],["118235.00","0.923"],["118235.10","0.004"],["118235.20","0.050"],["118235.40","0.128"],["118235.50","2.001"],["118235.60","0.017"],["118235.80","0.310"]]}"#;
+
+/// 与 BookTickerData 相同结构，使用 DisplayFromStr 作为对照组
+#[serde_as]
+#[derive(Deserialize)]
+#[allow(dead_code)]
+struct BookTickerDisplayFromStr {
+    #[serde(rename = "u")]
+    order_book_update_id: u64,
+    #[serde(rename = "s")]
+    symbol: String,
+    #[serde_as(as = "DisplayFromStr")]
+    #[serde(rename = "b")]
+    best_bid_price: f64,
+    #[serde_as(as = "DisplayFromStr")]
+    #[serde(rename = "B")]
+    best_bid_qty: f64,
+    #[serde_as(as = "DisplayFromStr")]
+    #[serde(rename = "a")]
+    best_ask_price: f64,
+    #[serde_as(as = "DisplayFromStr")]
+    #[serde(rename = "A")]
+    best_ask_qty: f64,
+}
+
+/// 同上，使用 FastDecimal
+#[serde_as]
+#[derive(Deserialize)]
+#[allow(dead_code)]
+struct BookTickerFastDecimal {
+    #[serde(rename = "u")]
+    order_book_update_id: u64,
+    #[serde(rename = "s")]
+    symbol: String,
+    #[serde_as(as = "FastDecimal")]
+    #[serde(rename = "b")]
+    best_bid_price: f64,
+    #[serde_as(as = "FastDecimal")]
+    #[serde(rename = "B")]
+    best_bid_qty: f64,
+    #[serde_as(as = "FastDecimal")]
+    #[serde(rename = "a")]
+    best_ask_price: f64,
+    #[serde_as(as = "FastDecimal")]
+    #[serde(rename = "A")]
+    best_ask_qty: f64,
+}
+
+/// 从抓取的推送中取出所有价格/数量字符串
+fn captured_fields() -> Vec<String> {
+    let depth: serde_json::Value = serde_json::from_str(PARTIAL_DEPTH).unwrap();
+    let mut fields: Vec<String> = ["b", "a"]
+        .iter()
+        .flat_map(|side| depth[side].as_array().unwrap().clone())
+        .flat_map(|level| level.as_array().unwrap().clone())
+        .map(|v| v.as_str().unwrap().to_string())
+        .collect();
+
+    let kline: serde_json::Value = serde_json::from_str(KLINE).unwrap();
+    for key in ["o", "c", "h", "l", "v", "q", "V", "Q"] {
+        fields.push(kline["k"][key].as_str().unwrap().to_string());
+    }
+    fields
+}
+
+fn bench_field_parsers(c: &mut Criterion) {
+    let fields = captured_fields();
+
+    c.bench_function("std_parse_f64", |b| {
+        b.iter(|| {
+            for s in &fields {
+                black_box(s.parse::<f64>().unwrap());
+            }
+        })
+    });
+
+    c.bench_function("fast_parse_f64", |b| {
+        b.iter(|| {
+            for s in &fields {
+                black_box(parse_f64(s).unwrap());
+            }
+        })
+    });
+
+    c.bench_function("fast_parse_fixed_u64", |b| {
+        b.iter(|| {
+            for s in &fields {
+                black_box(parse_fixed_u64(s, FIXED_SCALE).unwrap());
+            }
+        })
+    });
+
+    c.bench_function("rust_decimal_from_str", |b| {
+        b.iter(|| {
+            for s in &fields {
+                black_box(Decimal::from_str(s).unwrap());
+            }
+        })
+    });
+}
+
+fn bench_payload_decode(c: &mut Criterion) {
+    c.bench_function("book_ticker_display_from_str", |b| {
+        b.iter(|| black_box(serde_json::from_str::<BookTickerDisplayFromStr>(black_box(BOOK_TICKER)).unwrap()))
+    });
+
+    c.bench_function("book_ticker_fast_decimal", |b| {
+        b.iter(|| black_box(serde_json::from_str::<BookTickerFastDecimal>(black_box(BOOK_TICKER)).unwrap()))
+    });
+
+    c.bench_function("decode_book_ticker", |b| {
+        b.iter(|| black_box(serde_json::from_str::<BookTickerData>(black_box(BOOK_TICKER)).unwrap()))
+    });
+
+    c.bench_function("decode_trade", |b| {
+        b.iter(|| black_box(serde_json::from_str::<BinanceTradeData>(black_box(TRADE)).unwrap()))
+    });
+
+    c.bench_function("decode_kline", |b| {
+        b.iter(|| black_box(serde_json::from_str::<KlineData>(black_box(KLINE)).unwrap()))
+    });
+
+    c.bench_function("decode_partial_depth_10_levels", |b| {
+        b.iter(|| black_box(serde_json::from_str::<BinancePartialDepth>(black_box(PARTIAL_DEPTH)).unwrap()))
+    });
+}
+
+criterion_group!(benches, bench_field_parsers, bench_payload_decode);
+criterion_main!(benches);
@@ -0,0 +1,80 @@
+use criterion::{black_box, criterion_group, criterion_main, Criterion, Throughput};
+use rust_system::common::json::JsonDecoder;
+use rust_system::dto::binance::websocket::{BinancePartialDepth, BinanceTradeData, BookTickerData, KlineData};
+
+/// fstream 实盘抓取的推送（futures USDT-M）
+const BOOK_TICKER: &str = r#"{"e":"bookTicker","u":8822354685703,"s":"BTCUSDT","b":"118234.50","B":"7.312","a":"118234.60","A":"2.045","T":1754379530514,"E":1754379530514}"#;
+const TRADE: &str = r#"{"e":"trade","E":1754379530617,"T":1754379530617,"s":"BTCUSDT","t":6541587912,"p":"118234.60","q":"0.004","X":"MARKET","m":false}"#;
+const KLINE: &str = r#"{"e":"kline","E":1754379531003,"s":"BTCUSDT","k":{"t":1754379480000,"T":1754379539999,"s":"BTCUSDT","i":"1m","f":6541586201,"L":6541587925,"o":"118201.10","c":"118234.60","h":"118240.00","l":"118198.70","v":"96.118","n":1725,"x":false,"q":"11363221.90480","V":"58.402","Q":"6904448.78110","B":"0"}}"#;
+const PARTIAL_DEPTH: &str = r#"{"e":"depthUpdate","E":1754379530622,"T":1754379530614,"s":"BTCUSDT","U":8822354685120,"u":8822354685790,"pu":8822354685101,"b":[["118234.50","7.312"],["118234.40","0.102"],["118234.30","0.004"],["118234.10","0.015"],["118234.00","0.450"],["118233.90","0.002"],["118233.80","0.210"],["118233.70","0.019"],["118233.50","1.034"],["118233.40","0.002"]],"a":[["118234.60","2.045"],["118234.70","0.041"],["118234.80","0.300"],["118235.00","0.923"],["118235.10","0.004"],["118235.20","0.050"],["118235.40","0.128"],["118235.50","2.001"],["118235.60","0.017"],["118235.80","0.310"]]}"#;
+
+#[derive(Clone, Copy)]
+enum Frame {
+    BookTicker,
+    Trade,
+    Kline,
+    PartialDepth,
+}
+
+/// 回放序列，按实盘单交易对的大致比例混合：bookTicker 为主，其次深度和成交，K线最少
+fn replay_frames() -> Vec<(Frame, &'static str)> {
+    let mut frames = Vec::with_capacity(100);
+    for i in 0..100 {
+        let frame = match i % 20 {
+            0..=11 => (Frame::BookTicker, BOOK_TICKER),
+            12..=15 => (Frame::PartialDepth, PARTIAL_DEPTH),
+            16..=18 => (Frame::Trade, TRADE),
+            _ => (Frame::Kline, KLINE),
+        };
+        frames.push(frame);
+    }
+    frames
+}
+
+fn replay(decoder: JsonDecoder, frames: &[(Frame, &str)]) {
+    for &(frame, text) in frames {
+        match frame {
+            Frame::BookTicker => {
+                black_box(decoder.decode::<BookTickerData>(black_box(text)).unwrap());
+            }
+            Frame::Trade => {
+                black_box(decoder.decode::<BinanceTradeData>(black_box(text)).unwrap());
+            }
+            Frame::Kline => {
+                black_box(decoder.decode::<KlineData>(black_box(text)).unwrap());
+            }
+            Frame::PartialDepth => {
+                black_box(decoder.decode::<BinancePartialDepth>(black_box(text)).unwrap());
+            }
+        }
+    }
+}
+
+/// 单线程回放，吞吐即每核每秒可解码的消息数
+fn bench_replay(c: &mut Criterion) {
+    let frames = replay_frames();
+    let mut decoders = vec![JsonDecoder::SerdeJson];
+    if JsonDecoder::simd_available() {
+        decoders.push(JsonDecoder::SimdJson);
+    } else {
+        println!("simd-json feature disabled, run with `--features simd-json` to compare");
+    }
+
+    let mut group = c.benchmark_group("json_replay_messages");
+    group.throughput(Throughput::Elements(frames.len() as u64));
+    for &decoder in &decoders {
+        group.bench_function(format!("{:?}", decoder), |b| b.iter(|| replay(decoder, &frames)));
+    }
+    group.finish();
+
+    let bytes: usize = frames.iter().map(|(_, text)| text.len()).sum();
+    let mut group = c.benchmark_group("json_replay_bytes");
+    group.throughput(Throughput::Bytes(bytes as u64));
+    for &decoder in &decoders {
+        group.bench_function(format!("{:?}", decoder), |b| b.iter(|| replay(decoder, &frames)));
+    }
+    group.finish();
+}
+
+criterion_group!(benches, bench_replay);
+criterion_main!(benches);
@@ -0,0 +1,143 @@
+use criterion::{black_box, criterion_group, criterion_main, Criterion};
+use futures::{SinkExt, StreamExt};
+use rust_system::dto::binance::rest_api::{OrderRequest, OrderSide, OrderType};
+use rust_system::exchange_api::binance::api::BinanceFuturesApi;
+use rust_system::exchange_api::binance::ws_api::BinanceWsApi;
+use std::sync::Arc;
+use tokio::io::{AsyncReadExt, AsyncWriteExt};
+use tokio::net::{TcpListener, TcpStream};
+use tokio::runtime::Runtime;
+use tokio_tungstenite::tungstenite::protocol::Message;
+
+/// mock 服务器返回的下单结果（REST 响应体和 ws-fapi 的 result 相同）
+const ORDER_RESULT: &str = r#"{"orderId":1,"symbol":"ETHUSDT","status":"FILLED","clientOrderId":"bench","price":"0","avgPrice":"3000.10","origQty":"0.010","executedQty":"0.010","cumQty":"0.010","cumQuote":"30.001","timeInForce":"GTC","type":"MARKET","reduceOnly":false,"closePosition":false,"side":"BUY","positionSide":"BOTH","stopPrice":"0","workingType":"CONTRACT_PRICE","priceProtect":false,"origType":"MARKET","priceMatch":"NONE","selfTradePreventionMode":"NONE","goodTillDate":0,"updateTime":0}"#;
+
+fn market_order() -> OrderRequest {
+    OrderRequest {
+        symbol: "ETHUSDT".to_string(),
+        side: OrderSide::Buy,
+        order_type: OrderType::Market,
+        quantity: Some("0.010".to_string()),
+        ..Default::default()
+    }
+}
+
+/// 最小 HTTP/1.1 mock：keep-alive，读完请求头（和 Content-Length 指定的正文）后返回固定结果
+async fn serve_http(mut stream: TcpStream) {
+    let mut buffer = Vec::with_capacity(4096);
+    let mut chunk = [0u8; 4096];
+    loop {
+        let header_end = loop {
+            if let Some(pos) = buffer.windows(4).position(|w| w == b"\r\n\r\n") {
+                break pos + 4;
+            }
+            match stream.read(&mut chunk).await {
+                Ok(0) | Err(_) => return,
+                Ok(n) => buffer.extend_from_slice(&chunk[..n]),
+            }
+        };
+        let headers = String::from_utf8_lossy(&buffer[..header_end]).to_ascii_lowercase();
+        let body_len = headers
+            .lines()
+            .find_map(|line| line.strip_prefix("content-length:"))
+            .and_then(|value| value.trim().parse::<usize>().ok())
+            .unwrap_or(0);
+        while buffer.len() < header_end + body_len {
+            match stream.read(&mut chunk).await {
+                Ok(0) | Err(_) => return,
+                Ok(n) => buffer.extend_from_slice(&chunk[..n]),
+            }
+        }
+        buffer.drain(..header_end + body_len);
+
+        let response = format!(
+            "HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: {}\r\n\r\n{}",
+            ORDER_RESULT.len(),
+            ORDER_RESULT
+        );
+        if stream.write_all(response.as_bytes()).await.is_err() {
+            return;
+        }
+    }
+}
+
+/// ws-fapi mock：按请求 id 返回固定结果
+async fn serve_ws(stream: TcpStream) {
+    let mut ws = tokio_tungstenite::accept_async(stream).await.unwrap();
+    while let Some(Ok(Message::Text(text))) = ws.next().await {
+        let request: serde_json::Value = serde_json::from_str(&text).unwrap();
+        let response = format!(r#"{{"id":{},"status":200,"result":{}}}"#, request["id"], ORDER_RESULT);
+        if ws.send(Message::Text(response)).await.is_err() {
+            return;
+        }
+    }
+}
+
+/// 启动本地 mock 服务器，返回 (REST base_url, ws url)
+fn spawn_mock_servers(rt: &Runtime) -> (String, String) {
+    rt.block_on(async {
+        let http = TcpListener::bind("127.0.0.1:0").await.unwrap();
+        let ws = TcpListener::bind("127.0.0.1:0").await.unwrap();
+        let urls = (
+            format!("http://{}/fapi/v1", http.local_addr().unwrap()),
+            format!("ws://{}", ws.local_addr().unwrap()),
+        );
+        tokio::spawn(async move {
+            while let Ok((stream, _)) = http.accept().await {
+                stream.set_nodelay(true).ok();
+                tokio::spawn(serve_http(stream));
+            }
+        });
+        tokio::spawn(async move {
+            while let Ok((stream, _)) = ws.accept().await {
+                stream.set_nodelay(true).ok();
+                tokio::spawn(serve_ws(stream));
+            }
+        });
+        urls
+    })
+}
+
+/// 单笔下单往返延迟：REST（签名 + HTTP 请求 + 解析）对比 ws-fapi（签名 + 帧 + id 匹配 + 解析）
+fn bench_order_round_trip(c: &mut Criterion) {
+    let rt = Runtime::new().unwrap();
+    let (rest_url, ws_url) = spawn_mock_servers(&rt);
+
+    let mut rest = BinanceFuturesApi::new("key".to_string(), "secret".to_string());
+    rest.base_url = rest_url;
+    let ws_api = rt
+        .block_on(BinanceWsApi::connect_url(&ws_url, "key".to_string(), "secret".to_string()))
+        .unwrap();
+    let ws = BinanceFuturesApi::new("key".to_string(), "secret".to_string()).with_ws_api(Arc::new(ws_api));
+
+    let mut group = c.benchmark_group("order_round_trip");
+    group.bench_function("rest", |b| {
+        b.iter(|| black_box(rt.block_on(rest.new_order(market_order())).unwrap()))
+    });
+    group.bench_function("ws_fapi", |b| {
+        b.iter(|| black_box(rt.block_on(ws.new_order(market_order())).unwrap()))
+    });
+    group.finish();
+
+    // 3 个订单（主单 + 止损 + 止盈）：REST 逐个串行发送，ws-fapi 同一连接上同时在途
+    let mut group = c.benchmark_group("three_orders");
+    group.bench_function("rest_sequential", |b| {
+        b.iter(|| {
+            rt.block_on(async {
+                for _ in 0..3 {
+                    black_box(rest.new_order(market_order()).await.unwrap());
+                }
+            })
+        })
+    });
+    group.bench_function("ws_fapi_in_flight", |b| {
+        b.iter(|| {
+            let orders = vec![market_order(), market_order(), market_order()];
+            black_box(rt.block_on(ws.batch_orders(orders, None)).unwrap())
+        })
+    });
+    group.finish();
+}
+
+criterion_group!(benches, bench_order_round_trip);
+criterion_main!(benches);
@@ -0,0 +1,126 @@
+use criterion::{black_box, criterion_group, criterion_main, Criterion};
+use ordered_float::OrderedFloat;
+use rust_system::models::{BookSide, DepthLevels};
+use std::collections::BTreeMap;
+
+type Price = OrderedFloat<f64>;
+
+/// 20 档 partial depth 风格的数据：买盘从 mid 向下，卖盘从 mid 向上
+fn create_levels(mid: f64, tick: f64, count: usize) -> (Vec<[f64; 2]>, Vec<[f64; 2]>) {
+    let bids = (0..count)
+        .map(|i| [mid - tick * (i as f64 + 1.0), 1.0 + i as f64 * 0.1])
+        .collect();
+    let asks = (0..count)
+        .map(|i| [mid + tick * (i as f64 + 1.0), 1.5 + i as f64 * 0.1])
+        .collect();
+    (bids, asks)
+}
+
+/// 模拟增量更新：集中在盘口附近，约 1/4 为删除
+fn create_updates(mid: f64, tick: f64, count: usize) -> Vec<(f64, f64)> {
+    (0..count)
+        .map(|i| {
+            let offset = (i % 40) as f64 - 20.0;
+            let qty = if i % 4 == 0 { 0.0 } else { 0.5 + (i % 7) as f64 };
+            (mid + offset * tick, qty)
+        })
+        .collect()
+}
+
+fn btree_imbalance(bids: &BTreeMap<Price, f64>, asks: &BTreeMap<Price, f64>, levels: usize) -> f64 {
+    let bid: f64 = bids.iter().rev().take(levels).map(|(_, q)| *q).sum();
+    let ask: f64 = asks.iter().take(levels).map(|(_, q)| *q).sum();
+    (bid - ask) / (bid + ask)
+}
+
+fn levels_imbalance(bids: &DepthLevels<Price, f64>, asks: &DepthLevels<Price, f64>, levels: usize) -> f64 {
+    let bid = bids.quantity_sum(levels);
+    let ask = asks.quantity_sum(levels);
+    (bid - ask) / (bid + ask)
+}
+
+fn bench_build_from_partial_depth(c: &mut Criterion) {
+    let (bids, asks) = create_levels(50000.0, 0.1, 20);
+
+    c.bench_function("btreemap_build_20_levels", |b| {
+        b.iter(|| {
+            let bid_map: BTreeMap<Price, f64> = bids.iter().map(|l| (OrderedFloat(l[0]), l[1])).collect();
+            let ask_map: BTreeMap<Price, f64> = asks.iter().map(|l| (OrderedFloat(l[0]), l[1])).collect();
+            black_box((bid_map, ask_map))
+        })
+    });
+
+    c.bench_function("depth_levels_build_20_levels", |b| {
+        b.iter(|| {
+            let bid_levels = DepthLevels::from_levels(BookSide::Bid, bids.iter().map(|l| (OrderedFloat(l[0]), l[1])));
+            let ask_levels = DepthLevels::from_levels(BookSide::Ask, asks.iter().map(|l| (OrderedFloat(l[0]), l[1])));
+            black_box((bid_levels, ask_levels))
+        })
+    });
+}
+
+fn bench_incremental_updates(c: &mut Criterion) {
+    let mid = 50000.0;
+    let (bids, _) = create_levels(mid, 0.1, 1000);
+    let updates = create_updates(mid - 2.0, 0.1, 1000);
+
+    c.bench_function("btreemap_apply_1000_updates", |b| {
+        b.iter(|| {
+            let mut book: BTreeMap<Price, f64> = bids.iter().map(|l| (OrderedFloat(l[0]), l[1])).collect();
+            for (price, qty) in updates.iter() {
+                if *qty == 0.0 {
+                    book.remove(&OrderedFloat(*price));
+                } else {
+                    book.insert(OrderedFloat(*price), *qty);
+                }
+            }
+            black_box(book.iter().next_back().map(|(p, q)| (*p, *q)))
+        })
+    });
+
+    c.bench_function("depth_levels_apply_1000_updates", |b| {
+        b.iter(|| {
+            let mut book = DepthLevels::from_levels(BookSide::Bid, bids.iter().map(|l| (OrderedFloat(l[0]), l[1])));
+            for (price, qty) in updates.iter() {
+                if *qty == 0.0 {
+                    book.remove(OrderedFloat(*price));
+                } else {
+                    book.upsert(OrderedFloat(*price), *qty);
+                }
+            }
+            black_box(book.best())
+        })
+    });
+}
+
+fn bench_top_of_book_and_imbalance(c: &mut Criterion) {
+    let (bids, asks) = create_levels(50000.0, 0.1, 20);
+    let bid_map: BTreeMap<Price, f64> = bids.iter().map(|l| (OrderedFloat(l[0]), l[1])).collect();
+    let ask_map: BTreeMap<Price, f64> = asks.iter().map(|l| (OrderedFloat(l[0]), l[1])).collect();
+    let bid_levels = DepthLevels::from_levels(BookSide::Bid, bids.iter().map(|l| (OrderedFloat(l[0]), l[1])));
+    let ask_levels = DepthLevels::from_levels(BookSide::Ask, asks.iter().map(|l| (OrderedFloat(l[0]), l[1])));
+
+    c.bench_function("btreemap_best_bid_ask", |b| {
+        b.iter(|| black_box((bid_map.iter().next_back(), ask_map.iter().next())))
+    });
+
+    c.bench_function("depth_levels_best_bid_ask", |b| {
+        b.iter(|| black_box((bid_levels.best(), ask_levels.best())))
+    });
+
+    c.bench_function("btreemap_imbalance_10_levels", |b| {
+        b.iter(|| black_box(btree_imbalance(&bid_map, &ask_map, black_box(10))))
+    });
+
+    c.bench_function("depth_levels_imbalance_10_levels", |b| {
+        b.iter(|| black_box(levels_imbalance(&bid_levels, &ask_levels, black_box(10))))
+    });
+}
+
+criterion_group!(
+    benches,
+    bench_build_from_partial_depth,
+    bench_incremental_updates,
+    bench_top_of_book_and_imbalance
+);
+criterion_main!(benches);
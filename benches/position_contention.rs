@@ -0,0 +1,95 @@
+use criterion::{black_box, criterion_group, criterion_main, Criterion, Throughput};
+use rust_system::common::enums::{Exchange, PositionSide, StrategyName};
+use rust_system::models::{HftPositionKey, HftPositionManager, TradingSymbol};
+use std::sync::atomic::{AtomicBool, Ordering};
+use std::sync::Arc;
+use std::thread::JoinHandle;
+
+/// 后台竞争线程数
+const BACKGROUND_THREADS: [usize; 3] = [0, 1, 3];
+
+fn position_key() -> HftPositionKey {
+    HftPositionKey::new(Exchange::Binance, TradingSymbol::BTCUSDT, StrategyName::MACD, PositionSide::Long)
+}
+
+/// 后台线程：持续运行 `work` 直到 stop 被置位
+fn spawn_background(
+    threads: usize,
+    stop: &Arc<AtomicBool>,
+    manager: &Arc<HftPositionManager>,
+    work: fn(&HftPositionManager, &HftPositionKey),
+) -> Vec<JoinHandle<()>> {
+    (0..threads)
+        .map(|_| {
+            let stop = stop.clone();
+            let manager = manager.clone();
+            std::thread::spawn(move || {
+                let key = position_key();
+                while !stop.load(Ordering::Relaxed) {
+                    work(&manager, &key);
+                }
+            })
+        })
+        .collect()
+}
+
+/// 一次成交：加仓后立即减回，仓位始终保持非零
+fn fill(manager: &HftPositionManager, key: &HftPositionKey) {
+    manager.open_position(*key, 0.01, 50000.0).unwrap();
+    manager.close_position(key, 0.01, 50001.0).unwrap();
+}
+
+fn read_snapshot(manager: &HftPositionManager, key: &HftPositionKey) {
+    black_box(manager.get_position_snapshot(key));
+}
+
+/// 写者持续成交时的快照读取吞吐（reads/sec）
+fn bench_snapshot_under_contention(c: &mut Criterion) {
+    let mut group = c.benchmark_group("snapshot_under_contention");
+    group.throughput(Throughput::Elements(1));
+
+    for writers in BACKGROUND_THREADS {
+        let manager = Arc::new(HftPositionManager::new());
+        let key = position_key();
+        manager.open_position(key, 1.0, 50000.0).unwrap();
+
+        let stop = Arc::new(AtomicBool::new(false));
+        let handles = spawn_background(writers, &stop, &manager, fill);
+
+        group.bench_function(format!("{}_writers", writers), |b| {
+            b.iter(|| black_box(manager.get_position_snapshot(&key)))
+        });
+
+        stop.store(true, Ordering::Relaxed);
+        for handle in handles {
+            handle.join().unwrap();
+        }
+    }
+    group.finish();
+}
+
+/// 读者持续读取快照时的成交更新吞吐（fill updates/sec，每次迭代开仓 + 平仓两次更新）
+fn bench_fill_under_contention(c: &mut Criterion) {
+    let mut group = c.benchmark_group("fill_under_contention");
+    group.throughput(Throughput::Elements(2));
+
+    for readers in BACKGROUND_THREADS {
+        let manager = Arc::new(HftPositionManager::new());
+        let key = position_key();
+        manager.open_position(key, 1.0, 50000.0).unwrap();
+
+        let stop = Arc::new(AtomicBool::new(false));
+        let handles = spawn_background(readers, &stop, &manager, read_snapshot);
+
+        group.bench_function(format!("{}_readers", readers), |b| b.iter(|| fill(&manager, &key)));
+
+        stop.store(true, Ordering::Relaxed);
+        for handle in handles {
+            handle.join().unwrap();
+        }
+    }
+    group.finish();
+}
+
+criterion_group!(benches, bench_snapshot_under_contention, bench_fill_under_contention);
+criterion_main!(benches);
@@ -0,0 +1,131 @@
+use criterion::{black_box, criterion_group, criterion_main, Criterion};
+use rust_system::common::signer::{canonical_query, RequestSigner, SignedQuery};
+use rust_system::common::utils::generate_hmac_signature;
+use rust_system::dto::aster::rest_api as aster;
+use rust_system::dto::binance::rest_api::{OrderRequest, OrderSide, OrderType, TimeInForce};
+use rust_system::exchange_api::aster::{BatchOrderTemplate, OrderTemplate, PriceSlot};
+use std::collections::HashMap;
+
+const SECRET: &str = "NhqPtmdSJYdKjVHjA7PZj4Mge3R5YNiP1e3UZjInClVN65XAbvqqM6A7H5fATj0j";
+const BASE_URL: &str = "https://fapi.binance.com/fapi/v1";
+const TIMESTAMP: u64 = 1_700_000_000_000;
+
+/// 带止损参数的限价单，参数个数接近实盘下单
+fn limit_order() -> OrderRequest {
+    OrderRequest {
+        symbol: "ETHUSDT".to_string(),
+        side: OrderSide::Buy,
+        order_type: OrderType::Limit,
+        time_in_force: Some(TimeInForce::Gtc),
+        quantity: Some("0.010".to_string()),
+        price: Some("3000.10".to_string()),
+        new_client_order_id: Some("ml_v1-1700000000000".to_string()),
+        new_order_resp_type: Some("RESULT".to_string()),
+        ..Default::default()
+    }
+}
+
+/// 单次签名：每次派生密钥 对比 克隆预计算的 HMAC 状态
+fn bench_sign(c: &mut Criterion) {
+    let payload = "newClientOrderId=ml_v1-1700000000000&newOrderRespType=RESULT&price=3000.10&quantity=0.010&recvWindow=60000&side=BUY&symbol=ETHUSDT&timeInForce=GTC&timestamp=1700000000000&type=LIMIT";
+    let signer = RequestSigner::new(SECRET);
+
+    let mut group = c.benchmark_group("hmac_sign");
+    group.bench_function("one_shot", |b| {
+        b.iter(|| black_box(generate_hmac_signature(black_box(payload), SECRET)))
+    });
+    group.bench_function("precomputed", |b| {
+        b.iter(|| black_box(signer.sign(black_box(payload).as_bytes())))
+    });
+    group.finish();
+}
+
+/// 每笔订单的参数拼装 + 签名 + URL：HashMap 排序拼接 对比 规范顺序写入复用缓冲区
+fn bench_sign_and_build(c: &mut Criterion) {
+    let order = limit_order();
+    let signer = RequestSigner::new(SECRET);
+
+    let mut group = c.benchmark_group("sign_and_build_order");
+    group.bench_function("hashmap", |b| {
+        b.iter(|| {
+            let mut params = order.to_params().unwrap();
+            params.insert("timestamp".to_string(), TIMESTAMP.to_string());
+            params.insert("recvWindow".to_string(), "60000".to_string());
+            let query_string = canonical_query(&params);
+            let signature = generate_hmac_signature(&query_string, SECRET);
+            black_box(format!("{}/order?{}&signature={}", BASE_URL, query_string, signature))
+        })
+    });
+    group.bench_function("signed_query", |b| {
+        b.iter(|| {
+            let mut query = SignedQuery::url(BASE_URL, "/order?");
+            order.write_params(&mut query, TIMESTAMP, 60000);
+            black_box(query.sign(&signer).len())
+        })
+    });
+    group.bench_function("signed_query_reused", |b| {
+        let mut query = SignedQuery::new("");
+        b.iter(|| {
+            query.reset("https://fapi.binance.com/fapi/v1/order?");
+            order.write_params(&mut query, TIMESTAMP, 60000);
+            black_box(query.sign(&signer).len())
+        })
+    });
+    group.finish();
+}
+
+/// Lead-Lag 开仓（市价单 + 止损单）的批量下单 URL：每次拼 JSON 对比 预编码模板只填止损价
+fn bench_batch_template(c: &mut Criterion) {
+    let signer = RequestSigner::new(SECRET);
+    let aster_order = |side: aster::OrderSide, order_type: aster::OrderType, reduce_only: bool| aster::OrderRequest {
+        symbol: "ASTERUSDT".to_string(),
+        side,
+        order_type,
+        quantity: Some("10".to_string()),
+        reduce_only: reduce_only.then(|| "true".to_string()),
+        ..Default::default()
+    };
+    let mut template = BatchOrderTemplate::new(
+        "https://fapi.asterdex.com",
+        &[
+            OrderTemplate::new(aster_order(aster::OrderSide::Buy, aster::OrderType::Market, false)),
+            OrderTemplate::new(aster_order(aster::OrderSide::Sell, aster::OrderType::StopMarket, true))
+                .with_slot(PriceSlot::StopPrice),
+        ],
+        5,
+    )
+    .unwrap();
+
+    let mut group = c.benchmark_group("lead_lag_open_batch");
+    group.bench_function("build_json", |b| {
+        b.iter(|| {
+            let stop_price = format!("{:.5}", black_box(1.2345));
+            let mut entry = HashMap::new();
+            entry.insert("symbol", "ASTERUSDT".to_string());
+            entry.insert("side", "BUY".to_string());
+            entry.insert("type", "MARKET".to_string());
+            entry.insert("quantity", "10".to_string());
+            let mut stop = HashMap::new();
+            stop.insert("symbol", "ASTERUSDT".to_string());
+            stop.insert("side", "SELL".to_string());
+            stop.insert("type", "STOP_MARKET".to_string());
+            stop.insert("quantity", "10".to_string());
+            stop.insert("reduceOnly", "true".to_string());
+            stop.insert("stopPrice", stop_price);
+            let json = serde_json::to_string(&vec![entry, stop]).unwrap();
+            let mut query = SignedQuery::url("https://fapi.asterdex.com", "/fapi/v1/batchOrders?");
+            query
+                .push("batchOrders", urlencoding::encode(&json))
+                .push("recvWindow", 60000)
+                .push("timestamp", TIMESTAMP);
+            black_box(query.sign(&signer).len())
+        })
+    });
+    group.bench_function("template", |b| {
+        b.iter(|| black_box(template.sign(&[black_box(123_450)], TIMESTAMP, 60000, &signer).unwrap().len()))
+    });
+    group.finish();
+}
+
+criterion_group!(benches, bench_sign, bench_sign_and_build, bench_batch_template);
+criterion_main!(benches);
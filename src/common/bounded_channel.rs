@@ -0,0 +1,459 @@
+use serde::{Deserialize, Serialize};
+use std::collections::VecDeque;
+use std::fmt;
+use std::future::Future;
+use std::sync::atomic::{AtomicBool, AtomicU64, AtomicUsize, Ordering};
+use std::sync::{Arc, Mutex};
+use tokio::sync::Notify;
+use tokio::sync::mpsc;
+use tokio::sync::mpsc::error::SendError;
+
+/// 队列满时的处理策略
+#[derive(Debug, Clone, Copy, PartialEq, Eq, Serialize, Deserialize)]
+#[serde(rename_all = "snake_case")]
+pub enum OverflowPolicy {
+    /// 等待消费者腾出空间（不丢数据，反压到上游）
+    Block,
+    /// 丢弃队列中最旧的一条可丢弃数据（`DropOldest` / `Conflate`），没有可丢弃数据时等待
+    DropOldest,
+    /// 丢弃新到的这一条
+    DropNewest,
+    /// 用新数据覆盖队列中同一合并键的旧数据；没有同键数据时按 `DropOldest` 处理
+    Conflate,
+}
+
+/// 通道统计
+#[derive(Debug, Default)]
+pub struct ChannelStats {
+    sent: AtomicU64,
+    dropped: AtomicU64,
+    conflated: AtomicU64,
+    blocked: AtomicU64,
+    depth: AtomicUsize,
+    max_depth: AtomicUsize,
+}
+
+impl ChannelStats {
+    /// 成功入队的消息数（不含合并覆盖）
+    pub fn sent(&self) -> u64 {
+        self.sent.load(Ordering::Relaxed)
+    }
+
+    /// 因队列满而丢弃的消息数
+    pub fn dropped(&self) -> u64 {
+        self.dropped.load(Ordering::Relaxed)
+    }
+
+    /// 被同键新数据覆盖的消息数
+    pub fn conflated(&self) -> u64 {
+        self.conflated.load(Ordering::Relaxed)
+    }
+
+    /// 发送方因队列满而等待的次数
+    pub fn blocked(&self) -> u64 {
+        self.blocked.load(Ordering::Relaxed)
+    }
+
+    /// 当前队列长度
+    pub fn depth(&self) -> usize {
+        self.depth.load(Ordering::Relaxed)
+    }
+
+    /// 历史最大队列长度
+    pub fn max_depth(&self) -> usize {
+        self.max_depth.load(Ordering::Relaxed)
+    }
+}
+
+type Classifier<T, K> = Arc<dyn Fn(&T) -> (OverflowPolicy, Option<K>) + Send + Sync>;
+
+struct Shared<T> {
+    queue: Mutex<VecDeque<T>>,
+    capacity: usize,
+    not_empty: Notify,
+    not_full: Notify,
+    senders: AtomicUsize,
+    receiver_closed: AtomicBool,
+    stats: Arc<ChannelStats>,
+}
+
+impl<T> Shared<T> {
+    fn update_depth(&self, len: usize) {
+        self.stats.depth.store(len, Ordering::Relaxed);
+        self.stats.max_depth.fetch_max(len, Ordering::Relaxed);
+    }
+
+    fn pop(&self) -> Option<T> {
+        let value = {
+            let mut queue = self.queue.lock().unwrap_or_else(|e| e.into_inner());
+            let value = queue.pop_front();
+            self.update_depth(queue.len());
+            value
+        };
+        if value.is_some() {
+            self.not_full.notify_one();
+        }
+        value
+    }
+}
+
+/// 创建有界通道
+///
+/// `classify` 为每条消息给出溢出策略和可选的合并键，同一个通道内不同类型的消息
+/// 可以使用不同的策略（例如深度合并、K线阻塞、成交丢弃最旧）。
+pub fn bounded_channel<T, K, F>(capacity: usize, classify: F) -> (PolicySender<T, K>, PolicyReceiver<T>)
+where
+    K: PartialEq,
+    F: Fn(&T) -> (OverflowPolicy, Option<K>) + Send + Sync + 'static,
+{
+    let capacity = capacity.max(1);
+    let shared = Arc::new(Shared {
+        queue: Mutex::new(VecDeque::with_capacity(capacity)),
+        capacity,
+        not_empty: Notify::new(),
+        not_full: Notify::new(),
+        senders: AtomicUsize::new(1),
+        receiver_closed: AtomicBool::new(false),
+        stats: Arc::new(ChannelStats::default()),
+    });
+    (
+        PolicySender {
+            shared: shared.clone(),
+            classify: Arc::new(classify),
+        },
+        PolicyReceiver { shared },
+    )
+}
+
+/// 有界通道发送端
+pub struct PolicySender<T, K> {
+    shared: Arc<Shared<T>>,
+    classify: Classifier<T, K>,
+}
+
+impl<T, K: PartialEq> PolicySender<T, K> {
+    /// 发送消息；`Block` 策略在队列满时等待，`DropOldest` / `Conflate` 只在队列里全是
+    /// 不可丢弃的数据时等待，接收端关闭时返回错误
+    pub async fn send(&self, value: T) -> Result<(), SendError<T>> {
+        let (policy, key) = (self.classify)(&value);
+        let mut value = Some(value);
+        let mut waited = false;
+
+        loop {
+            let notified = self.shared.not_full.notified();
+            tokio::pin!(notified);
+            notified.as_mut().enable();
+
+            if self.shared.receiver_closed.load(Ordering::Acquire) {
+                return Err(SendError(value.take().expect("value is present until sent")));
+            }
+
+            match self.try_push(&mut value, policy, key.as_ref()) {
+                true => {
+                    self.shared.not_empty.notify_one();
+                    return Ok(());
+                }
+                false => {
+                    if !waited {
+                        waited = true;
+                        self.shared.stats.blocked.fetch_add(1, Ordering::Relaxed);
+                    }
+                    notified.await;
+                }
+            }
+        }
+    }
+
+    /// 按策略入队，返回 false 表示需要等待
+    fn try_push(&self, value: &mut Option<T>, policy: OverflowPolicy, key: Option<&K>) -> bool {
+        let stats = &self.shared.stats;
+        let mut queue = self.shared.queue.lock().unwrap_or_else(|e| e.into_inner());
+
+        if queue.len() < self.shared.capacity {
+            queue.push_back(value.take().expect("value is present until sent"));
+            stats.sent.fetch_add(1, Ordering::Relaxed);
+            self.shared.update_depth(queue.len());
+            return true;
+        }
+
+        match policy {
+            OverflowPolicy::Block => return false,
+            OverflowPolicy::DropNewest => {
+                value.take();
+                stats.dropped.fetch_add(1, Ordering::Relaxed);
+                return true;
+            }
+            OverflowPolicy::Conflate => {
+                // 只在队列满时才扫描同键数据，正常负载下没有额外开销
+                if let Some(key) = key {
+                    let classify = &self.classify;
+                    if let Some(index) = queue
+                        .iter()
+                        .rposition(|queued| classify(queued).1.as_ref() == Some(key))
+                    {
+                        queue[index] = value.take().expect("value is present until sent");
+                        stats.conflated.fetch_add(1, Ordering::Relaxed);
+                        return true;
+                    }
+                }
+            }
+            OverflowPolicy::DropOldest => {}
+        }
+
+        // 只淘汰自身策略允许丢弃的数据，K线等 `Block` 数据不会被行情突发挤掉
+        let classify = &self.classify;
+        let Some(index) = queue
+            .iter()
+            .position(|queued| matches!(classify(queued).0, OverflowPolicy::DropOldest | OverflowPolicy::Conflate))
+        else {
+            return false;
+        };
+        queue.remove(index);
+        queue.push_back(value.take().expect("value is present until sent"));
+        stats.dropped.fetch_add(1, Ordering::Relaxed);
+        stats.sent.fetch_add(1, Ordering::Relaxed);
+        true
+    }
+
+    pub fn is_closed(&self) -> bool {
+        self.shared.receiver_closed.load(Ordering::Acquire)
+    }
+
+    pub fn stats(&self) -> Arc<ChannelStats> {
+        self.shared.stats.clone()
+    }
+
+    pub fn capacity(&self) -> usize {
+        self.shared.capacity
+    }
+}
+
+impl<T, K> Clone for PolicySender<T, K> {
+    fn clone(&self) -> Self {
+        self.shared.senders.fetch_add(1, Ordering::Relaxed);
+        Self {
+            shared: self.shared.clone(),
+            classify: self.classify.clone(),
+        }
+    }
+}
+
+impl<T, K> Drop for PolicySender<T, K> {
+    fn drop(&mut self) {
+        if self.shared.senders.fetch_sub(1, Ordering::AcqRel) == 1 {
+            // 最后一个发送端关闭，唤醒接收端返回 None
+            self.shared.not_empty.notify_one();
+        }
+    }
+}
+
+impl<T, K> fmt::Debug for PolicySender<T, K> {
+    fn fmt(&self, f: &mut fmt::Formatter<'_>) -> fmt::Result {
+        f.debug_struct("PolicySender")
+            .field("capacity", &self.shared.capacity)
+            .field("stats", &self.shared.stats)
+            .finish()
+    }
+}
+
+/// 行情推送的去向
+///
+/// WebSocket 读循环解析出一条数据后直接 `deliver`，在下游的容量或溢出策略上等待，
+/// socket 和下游通道之间不再经过无界队列转发。只为有界的发送端实现。
+pub trait MessageSink<T>: Send + Sync {
+    /// 投递一条数据，接收端已关闭时返回 false
+    fn deliver(&self, value: T) -> impl Future<Output = bool> + Send;
+
+    /// 接收端是否已关闭（用于停止重连）
+    fn is_closed(&self) -> bool;
+}
+
+impl<T: Send, K: PartialEq + Send + Sync> MessageSink<T> for PolicySender<T, K> {
+    async fn deliver(&self, value: T) -> bool {
+        self.send(value).await.is_ok()
+    }
+
+    fn is_closed(&self) -> bool {
+        PolicySender::is_closed(self)
+    }
+}
+
+impl<T: Send> MessageSink<T> for mpsc::Sender<T> {
+    async fn deliver(&self, value: T) -> bool {
+        self.send(value).await.is_ok()
+    }
+
+    fn is_closed(&self) -> bool {
+        mpsc::Sender::is_closed(self)
+    }
+}
+
+impl<T, S: MessageSink<T>> MessageSink<T> for &S {
+    fn deliver(&self, value: T) -> impl Future<Output = bool> + Send {
+        (**self).deliver(value)
+    }
+
+    fn is_closed(&self) -> bool {
+        (**self).is_closed()
+    }
+}
+
+/// 有界通道接收端
+pub struct PolicyReceiver<T> {
+    shared: Arc<Shared<T>>,
+}
+
+impl<T> PolicyReceiver<T> {
+    /// 接收一条消息，所有发送端关闭且队列为空时返回 None
+    pub async fn recv(&mut self) -> Option<T> {
+        loop {
+            let notified = self.shared.not_empty.notified();
+            tokio::pin!(notified);
+            notified.as_mut().enable();
+
+            if let Some(value) = self.shared.pop() {
+                return Some(value);
+            }
+            if self.shared.senders.load(Ordering::Acquire) == 0 {
+                return None;
+            }
+            notified.await;
+        }
+    }
+
+    /// 非阻塞接收
+    pub fn try_recv(&mut self) -> Option<T> {
+        self.shared.pop()
+    }
+
+    pub fn len(&self) -> usize {
+        self.shared.stats.depth()
+    }
+
+    pub fn is_empty(&self) -> bool {
+        self.len() == 0
+    }
+
+    pub fn stats(&self) -> Arc<ChannelStats> {
+        self.shared.stats.clone()
+    }
+}
+
+impl<T> Drop for PolicyReceiver<T> {
+    fn drop(&mut self) {
+        self.shared.receiver_closed.store(true, Ordering::Release);
+        self.shared.not_full.notify_waiters();
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn classify(item: &(u8, u32)) -> (OverflowPolicy, Option<u8>) {
+        match item.0 {
+            0 => (OverflowPolicy::Conflate, Some(0)),
+            1 => (OverflowPolicy::DropOldest, None),
+            2 => (OverflowPolicy::DropNewest, None),
+            _ => (OverflowPolicy::Block, None),
+        }
+    }
+
+    #[tokio::test]
+    async fn test_overflow_policies() {
+        let (tx, mut rx) = bounded_channel(2, classify);
+        tx.send((0, 1)).await.unwrap();
+        tx.send((1, 1)).await.unwrap();
+
+        // 队列已满：合并覆盖同键数据
+        tx.send((0, 2)).await.unwrap();
+        // 丢弃最旧
+        tx.send((1, 2)).await.unwrap();
+        // 丢弃最新
+        tx.send((2, 1)).await.unwrap();
+
+        let stats = tx.stats();
+        assert_eq!(stats.conflated(), 1);
+        assert_eq!(stats.dropped(), 2);
+        assert_eq!(stats.depth(), 2);
+
+        assert_eq!(rx.recv().await, Some((1, 1)));
+        assert_eq!(rx.recv().await, Some((1, 2)));
+        assert!(rx.try_recv().is_none());
+    }
+
+    #[tokio::test]
+    async fn test_block_waits_for_capacity() {
+        let (tx, mut rx) = bounded_channel(1, classify);
+        tx.send((3, 1)).await.unwrap();
+
+        let sender = tx.clone();
+        let pending = tokio::spawn(async move { sender.send((3, 2)).await });
+        tokio::task::yield_now().await;
+        assert!(!pending.is_finished());
+
+        assert_eq!(rx.recv().await, Some((3, 1)));
+        pending.await.unwrap().unwrap();
+        assert_eq!(rx.recv().await, Some((3, 2)));
+        assert_eq!(tx.stats().blocked(), 1);
+        assert_eq!(tx.stats().dropped(), 0);
+
+        drop(tx);
+        assert_eq!(rx.recv().await, None);
+    }
+
+    #[tokio::test]
+    async fn test_burst_does_not_evict_blocking_entries() {
+        let (tx, mut rx) = bounded_channel(2, classify);
+        // K线（Block）在队首，随后成交突发
+        tx.send((3, 1)).await.unwrap();
+        for trade in 1..=10 {
+            tx.send((1, trade)).await.unwrap();
+        }
+        assert_eq!(tx.stats().dropped(), 9);
+        assert_eq!(rx.recv().await, Some((3, 1)));
+        assert_eq!(rx.recv().await, Some((1, 10)));
+
+        // 队列里只剩 K线时，成交也要等待而不是挤掉 K线
+        tx.send((3, 2)).await.unwrap();
+        tx.send((3, 3)).await.unwrap();
+        let sender = tx.clone();
+        let pending = tokio::spawn(async move { sender.send((1, 11)).await });
+        tokio::task::yield_now().await;
+        assert!(!pending.is_finished());
+
+        assert_eq!(rx.recv().await, Some((3, 2)));
+        pending.await.unwrap().unwrap();
+        assert_eq!(rx.recv().await, Some((3, 3)));
+        assert_eq!(rx.recv().await, Some((1, 11)));
+    }
+
+    #[tokio::test]
+    async fn test_sink_applies_policy_at_delivery() {
+        async fn deliver_all(sink: impl MessageSink<(u8, u32)>, items: &[(u8, u32)]) -> bool {
+            for &item in items {
+                if !sink.deliver(item).await {
+                    return false;
+                }
+            }
+            true
+        }
+
+        let (tx, mut rx) = bounded_channel(2, classify);
+        // 读循环直接投递到有界通道，突发时按策略丢弃最旧，不会积压
+        assert!(deliver_all(&tx, &[(1, 1), (1, 2), (1, 3), (1, 4)]).await);
+        assert_eq!(tx.stats().dropped(), 2);
+        assert_eq!(rx.recv().await, Some((1, 3)));
+
+        drop(rx);
+        assert!(MessageSink::is_closed(&tx));
+        assert!(!deliver_all(&tx, &[(1, 5)]).await);
+    }
+
+    #[tokio::test]
+    async fn test_send_fails_after_receiver_dropped() {
+        let (tx, rx) = bounded_channel(1, classify);
+        drop(rx);
+        assert!(tx.send((1, 1)).await.is_err());
+    }
+}
@@ -2,11 +2,46 @@ use serde::{Deserialize,Serialize};
 use std::env;
 use anyhow::{Result, Context};
 use dotenv::dotenv;
+use crate::common::consts::DEFAULT_MAX_CONCURRENT_SIGNALS;
 
 #[derive(Debug, Clone, Serialize, Deserialize)]
 pub struct BinanceUserConfig{
     pub api_key:String,
     pub secret_key:String,
+    /// 下单通道
+    #[serde(default)]
+    pub order_transport: OrderTransport,
+    /// 最多同时执行的信号通道数（按交易所/交易对/策略划分）
+    #[serde(default = "default_max_concurrent_signals")]
+    pub max_concurrent_signals: usize,
+}
+
+fn default_max_concurrent_signals() -> usize {
+    DEFAULT_MAX_CONCURRENT_SIGNALS
+}
+
+/// 币安期货下单通道
+#[derive(Debug, Clone, Copy, PartialEq, Eq, Default, Serialize, Deserialize)]
+#[serde(rename_all = "snake_case")]
+pub enum OrderTransport {
+    /// REST（HTTP/1.1，每个请求独立签名和解析）
+    #[default]
+    Rest,
+    /// ws-fapi 长连接，请求按 id 匹配响应
+    #[serde(rename = "websocket", alias = "ws")]
+    WebSocket,
+}
+
+impl std::str::FromStr for OrderTransport {
+    type Err = anyhow::Error;
+
+    fn from_str(s: &str) -> Result<Self> {
+        match s.trim().to_ascii_lowercase().as_str() {
+            "rest" => Ok(OrderTransport::Rest),
+            "websocket" | "ws" => Ok(OrderTransport::WebSocket),
+            other => Err(anyhow::anyhow!("未知的下单通道: {}（可选 rest / websocket）", other)),
+        }
+    }
 }
 #[derive(Debug, Clone, Serialize, Deserialize)]
 pub struct OKXUserConfig{
@@ -18,11 +53,17 @@ pub struct MexcUserConfig{
     pub api_key:String,
     pub secret_key:String,
 }
+#[derive(Debug, Clone, Serialize, Deserialize)]
+pub struct AsterUserConfig{
+    pub api_key:String,
+    pub secret_key:String,
+}
 #[derive(Debug, Clone, Serialize, Deserialize, Default)]
 pub struct UserConfig{
     pub binance_user:Option<BinanceUserConfig>,
     pub okx_user:Option<OKXUserConfig>,
     pub mexc_user:Option<MexcUserConfig>,
+    pub aster_user:Option<AsterUserConfig>,
 }
 
 /// 从环境变量或.env文件加载用户配置 (API Keys).
@@ -34,10 +75,14 @@ pub struct UserConfig{
 /// 支持的变量名:
 /// - `BINANCE_USER__API_KEY`
 /// - `BINANCE_USER__SECRET_KEY`
+/// - `BINANCE_USER__ORDER_TRANSPORT`（可选，`rest` / `websocket`，默认 `rest`）
+/// - `BINANCE_USER__MAX_CONCURRENT_SIGNALS`（可选，同时执行的信号通道数，默认 8）
 /// - `OKX_USER__API_KEY`
 /// - `OKX_USER__SECRET_KEY`
 /// - `MEXC_USER_API_KEY`
 /// - `MEXC_USER_SECRET_KEY`
+/// - `ASTER_USER__API_KEY`
+/// - `ASTER_USER__SECRET_KEY`
 pub fn load_user_config_from_env() -> Result<UserConfig> {
     let mut user_config = UserConfig::default();
 
@@ -49,9 +94,28 @@ pub fn load_user_config_from_env() -> Result<UserConfig> {
     // 尝试加载Binance配置
     match (env::var("BINANCE_USER__API_KEY"), env::var("BINANCE_USER__SECRET_KEY")) {
         (Ok(api_key), Ok(secret_key)) if !api_key.is_empty() && !secret_key.is_empty() => {
+            // 下单通道，未配置或无法识别时使用 REST
+            let order_transport = match env::var("BINANCE_USER__ORDER_TRANSPORT") {
+                Ok(value) => value.parse().unwrap_or_else(|e| {
+                    println!("⚠️  {}，使用 REST 下单", e);
+                    OrderTransport::Rest
+                }),
+                Err(_) => OrderTransport::Rest,
+            };
+            // 信号并发通道数，未配置或无法解析时使用默认值
+            let max_concurrent_signals = match env::var("BINANCE_USER__MAX_CONCURRENT_SIGNALS") {
+                Ok(value) => value.trim().parse().unwrap_or_else(|_| {
+                    println!("⚠️  无法解析 BINANCE_USER__MAX_CONCURRENT_SIGNALS={}，使用默认值 {}",
+                        value, DEFAULT_MAX_CONCURRENT_SIGNALS);
+                    DEFAULT_MAX_CONCURRENT_SIGNALS
+                }),
+                Err(_) => DEFAULT_MAX_CONCURRENT_SIGNALS,
+            };
             user_config.binance_user = Some(BinanceUserConfig {
                 api_key,
                 secret_key,
+                order_transport,
+                max_concurrent_signals,
             });
         },
         _ => {
@@ -90,6 +154,21 @@ pub fn load_user_config_from_env() -> Result<UserConfig> {
             println!("   MEXC_USER_SECRET_KEY");
         }
     }
+
+    // 尝试加载ASTER配置
+    match (env::var("ASTER_USER__API_KEY"), env::var("ASTER_USER__SECRET_KEY")) {
+        (Ok(api_key), Ok(secret_key)) if !api_key.is_empty() && !secret_key.is_empty() => {
+            user_config.aster_user = Some(AsterUserConfig {
+                api_key,
+                secret_key,
+            });
+        },
+        _ => {
+            println!("⚠️  未找到ASTER配置，请检查环境变量或.env文件是否包含:");
+            println!("   ASTER_USER__API_KEY");
+            println!("   ASTER_USER__SECRET_KEY");
+        }
+    }
     
     Ok(user_config)
 }
@@ -132,3 +211,16 @@ pub fn load_mexc_user_config() -> Result<MexcUserConfig> {
          2. Or .env file exists with these variables"
     ))
 }
+
+/// Loads ASTER user configuration specifically from environment variables or .env file.
+/// Returns an error if the required configuration is not found.
+pub fn load_aster_user_config() -> Result<AsterUserConfig> {
+    let user_config = load_user_config_from_env().context("Failed to load user config")?;
+    user_config.aster_user.ok_or_else(|| anyhow::anyhow!(
+        "ASTER user config not found. Please ensure either:\n\
+         1. Environment variables are set:\n\
+            - ASTER_USER__API_KEY\n\
+            - ASTER_USER__SECRET_KEY\n\
+         2. Or .env file exists with these variables"
+    ))
+}
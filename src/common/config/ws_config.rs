@@ -1,3 +1,6 @@
+use crate::common::bounded_channel::OverflowPolicy;
+use crate::common::json::JsonDecoder;
+use crate::system_log;
 use serde::{Deserialize, Serialize};
 use std::time::Duration;
 
@@ -134,6 +137,63 @@ pub struct WebSocketConfigsRaw {
     pub diff_depth: Vec<DiffDepthConfigRaw>,
     #[serde(default)]
     pub book_ticker: Vec<BookTickerConfigRaw>,
+    #[serde(default)]
+    pub channel: ChannelConfig,
+    #[serde(default)]
+    pub json_decoder: JsonDecoder,
+}
+
+/// 行情汇总通道配置
+///
+/// 队列满时按数据类型选择处理策略：深度和 Book Ticker 只关心最新值，合并覆盖；
+/// 逐笔成交丢弃最旧的数据并计数；K线不能丢，阻塞等待消费者。
+#[derive(Debug, Clone, Serialize, Deserialize)]
+pub struct ChannelConfig {
+    /// 通道容量（消息条数）
+    #[serde(default = "default_channel_capacity")]
+    pub capacity: usize,
+    #[serde(default = "default_conflate")]
+    pub mark_price: OverflowPolicy,
+    #[serde(default = "default_block")]
+    pub kline: OverflowPolicy,
+    #[serde(default = "default_conflate")]
+    pub partial_depth: OverflowPolicy,
+    #[serde(default = "default_conflate")]
+    pub diff_depth: OverflowPolicy,
+    #[serde(default = "default_conflate")]
+    pub book_ticker: OverflowPolicy,
+    #[serde(default = "default_drop_oldest")]
+    pub trade: OverflowPolicy,
+}
+
+fn default_channel_capacity() -> usize {
+    4096
+}
+
+fn default_conflate() -> OverflowPolicy {
+    OverflowPolicy::Conflate
+}
+
+fn default_block() -> OverflowPolicy {
+    OverflowPolicy::Block
+}
+
+fn default_drop_oldest() -> OverflowPolicy {
+    OverflowPolicy::DropOldest
+}
+
+impl Default for ChannelConfig {
+    fn default() -> Self {
+        Self {
+            capacity: default_channel_capacity(),
+            mark_price: default_conflate(),
+            kline: default_block(),
+            partial_depth: default_conflate(),
+            diff_depth: default_conflate(),
+            book_ticker: default_conflate(),
+            trade: default_drop_oldest(),
+        }
+    }
 }
 
 /// 标记价格配置
@@ -294,6 +354,14 @@ pub struct WebSocketConfigs {
     /// Book Ticker 配置列表
     pub book_ticker: Vec<BookTickerConfig>,
 
+    /// 行情汇总通道配置
+    #[serde(default)]
+    pub channel: ChannelConfig,
+
+    /// 行情推送的 JSON 解码后端
+    #[serde(default)]
+    pub json_decoder: JsonDecoder,
+
     pub base: WebSocketBaseConfig,
 }
 
@@ -305,6 +373,8 @@ impl Default for WebSocketConfigs {
             partial_depth: vec![],
             diff_depth: vec![],
             book_ticker: vec![],
+            channel: ChannelConfig::default(),
+            json_decoder: JsonDecoder::default(),
             base: WebSocketBaseConfig {
                 auto_reconnect: true,
                 max_retries: 5,
@@ -360,10 +430,32 @@ impl ConfigLoader {
             partial_depth,
             diff_depth,
             book_ticker,
+            channel: raw.channel,
+            json_decoder: raw.json_decoder,
             base,
         })
     }
     
+    /// 只读取配置文件中的 `[channel]` 段；文件不存在或无法解析时使用默认通道配置
+    pub fn load_channel_config(path: &str) -> ChannelConfig {
+        #[derive(Deserialize)]
+        struct ChannelSection {
+            #[serde(default)]
+            channel: ChannelConfig,
+        }
+
+        let parsed = std::fs::read_to_string(path)
+            .map_err(|e| e.to_string())
+            .and_then(|content| toml::from_str::<ChannelSection>(&content).map_err(|e| e.to_string()));
+        match parsed {
+            Ok(section) => section.channel,
+            Err(e) => {
+                system_log!(warn, "⚠️  读取 {} 的 [channel] 配置失败: {}，使用默认通道配置", path, e);
+                ChannelConfig::default()
+            }
+        }
+    }
+
     /// 保存配置到文件
     pub fn save_to_file(configs: &WebSocketConfigs, path: &str) -> Result<(), Box<dyn std::error::Error>> {
         let content = toml::to_string_pretty(configs)?;
@@ -404,6 +496,8 @@ impl ConfigLoader {
                 BookTickerConfig::new("btcusdt", default_base.clone()),
                 BookTickerConfig::new("ethusdt", default_base.clone()),
             ],
+            channel: ChannelConfig::default(),
+            json_decoder: JsonDecoder::default(),
             base: default_base,
         }
     }
@@ -2,9 +2,14 @@ pub const BINANCE_BASE_URL: &str = "https://api.binance.com/api";
 pub const BINANCE_FUTURES_URL: &str = "https://fapi.binance.com/fapi/v1";
 pub const MEXC_SPOT_URL: &str = "https://api.exc.com";
 pub const BINANCE_WS: &str = "wss://fstream.binance.com/ws";
+pub const BINANCE_WS_STREAM: &str = "wss://fstream.binance.com/stream";
+pub const BINANCE_WS_FAPI: &str = "wss://ws-fapi.binance.com/ws-fapi/v1"; // 期货 WebSocket API（下单）
 pub const BINANCE_WS_SPOT: &str = "wss://stream.binance.com:9443/ws";
 pub const ASTER_WS: &str = "wss://fstream.asterdex.com";
 pub const ASTER_FUTURES_URL: &str = "https://fapi.asterdex.com";
+pub const WS_CONFIG_FILE: &str = "config.toml"; // 行情连接与汇总通道配置
+pub const EXCHANGE_INFO_FILE: &str = "exchange_info.json"; // exchangeInfo 本地副本，REST 不可用时加载
+pub const DEFAULT_MAX_CONCURRENT_SIGNALS: usize = 8; // 默认最多同时执行的信号通道数
 pub const BTC_USDT_SYMBOL: &str = "BTCUSDT";
 pub const ETH_USDT_SYMBOL: &str = "ETHUSDT";
 pub const SOL_USDT_SYMBOL: &str = "SOLUSDT";
@@ -0,0 +1,386 @@
+use serde::de::{self, Visitor};
+use serde::{Deserializer, Serializer};
+use serde_with::{DeserializeAs, SerializeAs};
+use std::fmt;
+use thiserror::Error;
+
+/// 定点数默认精度（10^8，与 `PARSE_DECIMAL` 一致）
+pub const FIXED_SCALE: u32 = 8;
+
+/// f64 可以精确表示的 10 的幂（10^0 ~ 10^22）
+const F64_POW10: [f64; 23] = [
+    1e0, 1e1, 1e2, 1e3, 1e4, 1e5, 1e6, 1e7, 1e8, 1e9, 1e10, 1e11, 1e12, 1e13, 1e14, 1e15, 1e16,
+    1e17, 1e18, 1e19, 1e20, 1e21, 1e22,
+];
+
+/// 尾数不超过 2^53 时可以精确转换为 f64
+const MAX_EXACT_MANTISSA: u64 = 1 << 53;
+
+#[derive(Error, Debug, Clone, Copy, PartialEq, Eq)]
+pub enum ParseDecimalError {
+    #[error("Empty decimal string")]
+    Empty,
+
+    #[error("Invalid character in decimal string")]
+    InvalidDigit,
+
+    #[error("Negative value for unsigned decimal")]
+    Negative,
+
+    #[error("Decimal value out of range")]
+    Overflow,
+}
+
+/// 拆出符号位，其余部分至少包含一个字符
+#[inline]
+fn split_sign(input: &[u8]) -> Result<(bool, &[u8]), ParseDecimalError> {
+    let (negative, rest) = match input.first() {
+        None => return Err(ParseDecimalError::Empty),
+        Some(b'-') => (true, &input[1..]),
+        Some(b'+') => (false, &input[1..]),
+        Some(_) => (false, input),
+    };
+    if rest.is_empty() {
+        return Err(ParseDecimalError::InvalidDigit);
+    }
+    Ok((negative, rest))
+}
+
+/// 解析无符号十进制数为 `value * 10^scale`，多余的小数位四舍五入（0.5 进位）
+#[inline]
+fn parse_unsigned_fixed(digits: &[u8], scale: u32) -> Result<u64, ParseDecimalError> {
+    let mut value: u64 = 0;
+    let mut frac_digits: u32 = 0;
+    let mut round_up = false;
+    let mut seen_dot = false;
+    let mut seen_digit = false;
+
+    for (i, &b) in digits.iter().enumerate() {
+        match b {
+            b'0'..=b'9' => {
+                seen_digit = true;
+                let digit = (b - b'0') as u64;
+                if !seen_dot {
+                    value = value
+                        .checked_mul(10)
+                        .and_then(|v| v.checked_add(digit))
+                        .ok_or(ParseDecimalError::Overflow)?;
+                } else if frac_digits < scale {
+                    value = value
+                        .checked_mul(10)
+                        .and_then(|v| v.checked_add(digit))
+                        .ok_or(ParseDecimalError::Overflow)?;
+                    frac_digits += 1;
+                } else {
+                    // 只看第一位被舍弃的数字，后面的数字只校验格式
+                    round_up = digit >= 5;
+                    if !digits[i + 1..].iter().all(u8::is_ascii_digit) {
+                        return Err(ParseDecimalError::InvalidDigit);
+                    }
+                    break;
+                }
+            }
+            b'.' if !seen_dot => seen_dot = true,
+            _ => return Err(ParseDecimalError::InvalidDigit),
+        }
+    }
+    if !seen_digit {
+        return Err(ParseDecimalError::InvalidDigit);
+    }
+
+    let pad = 10u64
+        .checked_pow(scale - frac_digits)
+        .ok_or(ParseDecimalError::Overflow)?;
+    let value = value.checked_mul(pad).ok_or(ParseDecimalError::Overflow)?;
+    if round_up {
+        value.checked_add(1).ok_or(ParseDecimalError::Overflow)
+    } else {
+        Ok(value)
+    }
+}
+
+/// 解析为无符号定点数 `value * 10^scale`
+///
+/// 只接受普通十进制写法（不支持指数），超出精度的部分四舍五入，
+/// 与 `f2u` 的 `round()` 语义一致但不经过 f64，没有二进制误差。
+///
+/// ```
+/// use rust_system::common::decimal::parse_fixed_u64;
+///
+/// assert_eq!(parse_fixed_u64("95000.12", 8), Ok(9_500_012_000_000));
+/// assert_eq!(parse_fixed_u64("0.123456785", 8), Ok(12_345_679));
+/// ```
+pub fn parse_fixed_u64(input: &str, scale: u32) -> Result<u64, ParseDecimalError> {
+    let (negative, digits) = split_sign(input.as_bytes())?;
+    let value = parse_unsigned_fixed(digits, scale)?;
+    if negative && value != 0 {
+        return Err(ParseDecimalError::Negative);
+    }
+    Ok(value)
+}
+
+/// 解析为有符号定点数 `value * 10^scale`，舍入规则同 `parse_fixed_u64`（远离零）
+pub fn parse_fixed_i64(input: &str, scale: u32) -> Result<i64, ParseDecimalError> {
+    let (negative, digits) = split_sign(input.as_bytes())?;
+    let value = parse_unsigned_fixed(digits, scale)?;
+    if negative {
+        if value > i64::MAX as u64 + 1 {
+            return Err(ParseDecimalError::Overflow);
+        }
+        Ok((value as i64).wrapping_neg())
+    } else {
+        i64::try_from(value).map_err(|_| ParseDecimalError::Overflow)
+    }
+}
+
+/// 快速路径：不超过 19 位有效数字且没有指数时，返回 (尾数, 小数位数)
+#[inline]
+fn parse_mantissa(digits: &[u8]) -> Option<(u64, u32)> {
+    let mut mantissa: u64 = 0;
+    let mut total_digits = 0u32;
+    let mut frac_digits = 0u32;
+    let mut seen_dot = false;
+
+    for &b in digits {
+        match b {
+            b'0'..=b'9' => {
+                // 跳过前导零，不计入有效数字
+                if mantissa != 0 || b != b'0' {
+                    total_digits += 1;
+                    if total_digits > 19 {
+                        return None;
+                    }
+                }
+                mantissa = mantissa * 10 + (b - b'0') as u64;
+                if seen_dot {
+                    frac_digits += 1;
+                }
+            }
+            b'.' if !seen_dot => seen_dot = true,
+            _ => return None,
+        }
+    }
+    if digits.len() == seen_dot as usize {
+        return None;
+    }
+    Some((mantissa, frac_digits))
+}
+
+/// 解析十进制字符串为 f64，结果与 `str::parse::<f64>` 完全一致
+///
+/// 交易所推送的价格/数量都是不超过 19 位有效数字的普通小数，
+/// 这类输入走 Clinger 快速路径：尾数 ≤ 2^53 且小数位数 ≤ 22 时，
+/// 一次精确除法即可得到正确舍入的结果；其余输入（指数、超长小数等）退回标准库。
+#[inline]
+pub fn parse_f64(input: &str) -> Result<f64, ParseDecimalError> {
+    let (negative, digits) = split_sign(input.as_bytes())?;
+    if let Some((mantissa, frac_digits)) = parse_mantissa(digits) {
+        if mantissa <= MAX_EXACT_MANTISSA && frac_digits <= 22 {
+            let value = mantissa as f64 / F64_POW10[frac_digits as usize];
+            return Ok(if negative { -value } else { value });
+        }
+    }
+    input.parse::<f64>().map_err(|_| ParseDecimalError::InvalidDigit)
+}
+
+/// 把定点数 `value * 10^scale` 写成十进制字符串，固定保留 `scale` 位小数
+///
+/// `parse_fixed_u64` 的逆运算。下单时直接由整数 tick 生成价格/数量字符串，
+/// 不经过 f64 和 `format!("{:.N}")`。
+///
+/// ```
+/// use rust_system::common::decimal::format_fixed;
+///
+/// assert_eq!(format_fixed(9_500_012, 2), "95000.12");
+/// assert_eq!(format_fixed(5, 4), "0.0005");
+/// ```
+pub fn write_fixed<W: fmt::Write>(out: &mut W, value: u64, scale: u32) -> fmt::Result {
+    debug_assert!(scale <= 19);
+    // u64 最多 20 位数字，加上小数点和补齐的前导零
+    let mut buf = [0u8; 41];
+    let mut pos = buf.len();
+    let mut rest = value;
+    let mut written = 0u32;
+    while rest > 0 || written <= scale {
+        if written == scale && scale > 0 {
+            pos -= 1;
+            buf[pos] = b'.';
+        }
+        pos -= 1;
+        buf[pos] = b'0' + (rest % 10) as u8;
+        rest /= 10;
+        written += 1;
+    }
+    out.write_str(std::str::from_utf8(&buf[pos..]).map_err(|_| fmt::Error)?)
+}
+
+/// `write_fixed` 的 String 版本
+pub fn format_fixed(value: u64, scale: u32) -> String {
+    let mut out = String::with_capacity(24);
+    write_fixed(&mut out, value, scale).expect("writing to a String cannot fail");
+    out
+}
+
+/// serde_with 适配器：字符串形式的十进制数 <-> f64
+///
+/// 用法与 `DisplayFromStr` 相同，解析走 `parse_f64`，序列化保持 `Display` 格式：
+/// `#[serde_as(as = "FastDecimal")]`、`#[serde_as(as = "Vec<[FastDecimal; 2]>")]`
+pub struct FastDecimal;
+
+struct FastDecimalVisitor;
+
+impl<'de> Visitor<'de> for FastDecimalVisitor {
+    type Value = f64;
+
+    fn expecting(&self, formatter: &mut fmt::Formatter) -> fmt::Result {
+        formatter.write_str("a decimal number string")
+    }
+
+    fn visit_str<E: de::Error>(self, value: &str) -> Result<f64, E> {
+        parse_f64(value).map_err(E::custom)
+    }
+}
+
+impl<'de> DeserializeAs<'de, f64> for FastDecimal {
+    fn deserialize_as<D>(deserializer: D) -> Result<f64, D::Error>
+    where
+        D: Deserializer<'de>,
+    {
+        deserializer.deserialize_str(FastDecimalVisitor)
+    }
+}
+
+impl SerializeAs<f64> for FastDecimal {
+    fn serialize_as<S>(source: &f64, serializer: S) -> Result<S::Ok, S::Error>
+    where
+        S: Serializer,
+    {
+        serializer.collect_str(source)
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use rust_decimal::prelude::ToPrimitive;
+    use rust_decimal::{Decimal, RoundingStrategy};
+    use serde::{Deserialize, Serialize};
+    use serde_with::serde_as;
+    use std::str::FromStr;
+
+    /// 固定种子的 xorshift，生成可复现的随机输入
+    struct XorShift(u64);
+
+    impl XorShift {
+        fn next(&mut self) -> u64 {
+            self.0 ^= self.0 << 13;
+            self.0 ^= self.0 >> 7;
+            self.0 ^= self.0 << 17;
+            self.0
+        }
+
+        /// 随机十进制字符串：最多 10 位整数、12 位小数，带随机前导/尾随零
+        fn decimal_string(&mut self) -> String {
+            let int_len = (self.next() % 11) as usize;
+            let frac_len = (self.next() % 13) as usize;
+            let mut s = String::new();
+            if self.next() % 8 == 0 {
+                s.push('-');
+            }
+            for i in 0..int_len.max(1) {
+                let digit = if i == 0 && int_len > 1 && self.next() % 4 != 0 { 1 + self.next() % 9 } else { self.next() % 10 };
+                s.push((b'0' + digit as u8) as char);
+            }
+            if frac_len > 0 {
+                s.push('.');
+                for _ in 0..frac_len {
+                    s.push((b'0' + (self.next() % 10) as u8) as char);
+                }
+            }
+            s
+        }
+    }
+
+    #[test]
+    fn test_parse_f64_matches_std() {
+        let mut rng = XorShift(0x9E37_79B9_7F4A_7C15);
+        for _ in 0..200_000 {
+            let s = rng.decimal_string();
+            assert_eq!(parse_f64(&s).unwrap().to_bits(), s.parse::<f64>().unwrap().to_bits(), "input: {}", s);
+        }
+        for s in ["0", "0.0", "-0.0", "1e-8", "1.5E3", "12345678901234567890.5", "0.00000000000000000000000123", ".5", "5."] {
+            assert_eq!(parse_f64(s).unwrap().to_bits(), s.parse::<f64>().unwrap().to_bits(), "input: {}", s);
+        }
+        assert_eq!(parse_f64(""), Err(ParseDecimalError::Empty));
+        assert_eq!(parse_f64("-"), Err(ParseDecimalError::InvalidDigit));
+        assert_eq!(parse_f64("1.2.3"), Err(ParseDecimalError::InvalidDigit));
+        assert_eq!(parse_f64("abc"), Err(ParseDecimalError::InvalidDigit));
+    }
+
+    #[test]
+    fn test_parse_fixed_matches_rust_decimal() {
+        let mut rng = XorShift(0xD1B5_4A32_D192_ED03);
+        for _ in 0..200_000 {
+            let s = rng.decimal_string();
+            let expected = Decimal::from_str(&s)
+                .unwrap()
+                .round_dp_with_strategy(FIXED_SCALE, RoundingStrategy::MidpointAwayFromZero);
+            let expected = (expected * Decimal::from(100_000_000u64)).trunc();
+            let expected = expected.to_i64().unwrap();
+            assert_eq!(parse_fixed_i64(&s, FIXED_SCALE), Ok(expected), "input: {}", s);
+            if expected >= 0 {
+                assert_eq!(parse_fixed_u64(&s, FIXED_SCALE), Ok(expected as u64), "input: {}", s);
+            }
+        }
+    }
+
+    #[test]
+    fn test_parse_fixed_edge_cases() {
+        assert_eq!(parse_fixed_u64("0.000000005", 8), Ok(1));
+        assert_eq!(parse_fixed_u64("0.000000004999", 8), Ok(0));
+        assert_eq!(parse_fixed_u64("-0.0", 8), Ok(0));
+        assert_eq!(parse_fixed_u64("-0.1", 8), Err(ParseDecimalError::Negative));
+        assert_eq!(parse_fixed_u64("184467440737.09551615", 8), Ok(u64::MAX));
+        assert_eq!(parse_fixed_u64("184467440737.09551616", 8), Err(ParseDecimalError::Overflow));
+        assert_eq!(parse_fixed_i64("-92233720368.54775808", 8), Ok(i64::MIN));
+        assert_eq!(parse_fixed_u64("1.00000000x", 8), Err(ParseDecimalError::InvalidDigit));
+        assert_eq!(parse_fixed_u64("1e5", 8), Err(ParseDecimalError::InvalidDigit));
+        assert_eq!(parse_fixed_u64(".", 8), Err(ParseDecimalError::InvalidDigit));
+        assert_eq!(parse_fixed_u64("42", 0), Ok(42));
+    }
+
+    #[serde_as]
+    #[derive(Debug, Serialize, Deserialize, PartialEq)]
+    struct Level {
+        #[serde_as(as = "FastDecimal")]
+        price: f64,
+        #[serde_as(as = "Vec<[FastDecimal; 2]>")]
+        bids: Vec<[f64; 2]>,
+    }
+
+    #[test]
+    fn test_format_fixed_round_trip() {
+        assert_eq!(format_fixed(0, 0), "0");
+        assert_eq!(format_fixed(0, 3), "0.000");
+        assert_eq!(format_fixed(123, 0), "123");
+        assert_eq!(format_fixed(12_345, 2), "123.45");
+        assert_eq!(format_fixed(7, 8), "0.00000007");
+        assert_eq!(format_fixed(u64::MAX, 19), "1.8446744073709551615");
+
+        let mut rng = XorShift(0x5eed_f0f0_1234_5678);
+        for _ in 0..10_000 {
+            let value = rng.next() >> (rng.next() % 64);
+            let scale = (rng.next() % 10) as u32;
+            assert_eq!(parse_fixed_u64(&format_fixed(value, scale), scale), Ok(value));
+        }
+    }
+
+    #[test]
+    fn test_serde_adapter() {
+        let json = r#"{"price":"95000.12","bids":[["95000.10","1.500"]]}"#;
+        let level: Level = serde_json::from_str(json).unwrap();
+        assert_eq!(level, Level { price: 95000.12, bids: vec![[95000.10, 1.5]] });
+        assert_eq!(serde_json::to_string(&level).unwrap(), r#"{"price":"95000.12","bids":[["95000.1","1.5"]]}"#);
+        assert!(serde_json::from_str::<Level>(r#"{"price":95000.12,"bids":[]}"#).is_err());
+    }
+}
@@ -0,0 +1,120 @@
+use serde::de::DeserializeOwned;
+use serde::{Deserialize, Serialize};
+use std::sync::atomic::{AtomicU64, AtomicU8, Ordering};
+
+/// 行情推送的 JSON 解码后端
+///
+/// `SimdJson` 需要编译时开启 `simd-json` feature；未开启时自动退回 `SerdeJson`。
+#[derive(Debug, Clone, Copy, PartialEq, Eq, Default, Serialize, Deserialize)]
+#[serde(rename_all = "snake_case")]
+pub enum JsonDecoder {
+    #[default]
+    SerdeJson,
+    SimdJson,
+}
+
+static DECODER: AtomicU8 = AtomicU8::new(JsonDecoder::SerdeJson as u8);
+static SIMD_FALLBACKS: AtomicU64 = AtomicU64::new(0);
+
+impl JsonDecoder {
+    /// 当前构建是否包含 simd-json
+    pub const fn simd_available() -> bool {
+        cfg!(feature = "simd-json")
+    }
+
+    /// 实际生效的后端（未编译 simd-json 时为 `SerdeJson`）
+    pub fn effective(self) -> Self {
+        if self == JsonDecoder::SimdJson && Self::simd_available() {
+            JsonDecoder::SimdJson
+        } else {
+            JsonDecoder::SerdeJson
+        }
+    }
+
+    /// 使用指定后端解码；SIMD 解析失败时退回 serde_json，错误以 serde_json 为准
+    pub fn decode<T: DeserializeOwned>(self, text: &str) -> serde_json::Result<T> {
+        #[cfg(feature = "simd-json")]
+        if self == JsonDecoder::SimdJson {
+            if let Some(value) = simd::decode(text) {
+                return Ok(value);
+            }
+            SIMD_FALLBACKS.fetch_add(1, Ordering::Relaxed);
+        }
+        serde_json::from_str(text)
+    }
+}
+
+/// 设置全局解码后端，对之后解析的所有行情推送生效
+pub fn set_json_decoder(decoder: JsonDecoder) {
+    DECODER.store(decoder.effective() as u8, Ordering::Relaxed);
+}
+
+/// 当前全局解码后端
+pub fn json_decoder() -> JsonDecoder {
+    match DECODER.load(Ordering::Relaxed) {
+        1 => JsonDecoder::SimdJson,
+        _ => JsonDecoder::SerdeJson,
+    }
+}
+
+/// SIMD 解析失败后退回 serde_json 的次数
+pub fn simd_fallback_count() -> u64 {
+    SIMD_FALLBACKS.load(Ordering::Relaxed)
+}
+
+/// 使用全局后端解码行情推送
+#[inline]
+pub fn decode_json<T: DeserializeOwned>(text: &str) -> serde_json::Result<T> {
+    json_decoder().decode(text)
+}
+
+#[cfg(feature = "simd-json")]
+mod simd {
+    use serde::de::DeserializeOwned;
+    use std::cell::RefCell;
+
+    thread_local! {
+        // simd-json 会原地改写输入，复制到线程内复用的缓冲区，原始文本留给 serde_json 兜底
+        static SCRATCH: RefCell<Vec<u8>> = RefCell::new(Vec::with_capacity(16 * 1024));
+    }
+
+    pub(super) fn decode<T: DeserializeOwned>(text: &str) -> Option<T> {
+        SCRATCH.with(|scratch| {
+            let mut buf = scratch.borrow_mut();
+            buf.clear();
+            buf.extend_from_slice(text.as_bytes());
+            simd_json::serde::from_slice::<T>(&mut buf).ok()
+        })
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use crate::dto::binance::websocket::{BinancePartialDepth, BookTickerData};
+
+    const BOOK_TICKER: &str = r#"{"e":"bookTicker","u":400900217,"E":1568014460893,"T":1568014460891,"s":"BNBUSDT","b":"25.35190000","B":"31.21000000","a":"25.36520000","A":"40.66000000"}"#;
+
+    #[test]
+    fn test_decoders_agree() {
+        for decoder in [JsonDecoder::SerdeJson, JsonDecoder::SimdJson] {
+            let data: BookTickerData = decoder.decode(BOOK_TICKER).unwrap();
+            assert_eq!(data.best_bid_price, 25.3519);
+            assert_eq!(data.best_ask_qty, 40.66);
+
+            let depth: BinancePartialDepth = decoder
+                .decode(r#"{"lastUpdateId":160,"bids":[["0.0024","10"]],"asks":[["0.0026","100"]]}"#)
+                .unwrap();
+            assert_eq!(depth.bids, vec![[0.0024, 10.0]]);
+
+            assert!(decoder.decode::<BookTickerData>(r#"{"e":"bookTicker"}"#).is_err());
+        }
+    }
+
+    #[test]
+    fn test_effective_decoder() {
+        assert_eq!(JsonDecoder::SerdeJson.effective(), JsonDecoder::SerdeJson);
+        let expected = if JsonDecoder::simd_available() { JsonDecoder::SimdJson } else { JsonDecoder::SerdeJson };
+        assert_eq!(JsonDecoder::SimdJson.effective(), expected);
+    }
+}
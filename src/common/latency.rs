@@ -0,0 +1,66 @@
+use std::sync::atomic::{AtomicU64, Ordering};
+use std::time::Duration;
+
+/// 延迟统计
+///
+/// 只做原子累加，记录路径上没有锁和分配；多个持有者共享同一个 `Arc<LatencyStats>`。
+#[derive(Debug, Default)]
+pub struct LatencyStats {
+    count: AtomicU64,
+    total_nanos: AtomicU64,
+    last_nanos: AtomicU64,
+    max_nanos: AtomicU64,
+}
+
+impl LatencyStats {
+    /// 记录一次耗时
+    pub fn record(&self, elapsed: Duration) {
+        let nanos = u64::try_from(elapsed.as_nanos()).unwrap_or(u64::MAX);
+        self.count.fetch_add(1, Ordering::Relaxed);
+        self.total_nanos.fetch_add(nanos, Ordering::Relaxed);
+        self.last_nanos.store(nanos, Ordering::Relaxed);
+        self.max_nanos.fetch_max(nanos, Ordering::Relaxed);
+    }
+
+    /// 已记录的次数
+    pub fn count(&self) -> u64 {
+        self.count.load(Ordering::Relaxed)
+    }
+
+    /// 最近一次耗时
+    pub fn last(&self) -> Duration {
+        Duration::from_nanos(self.last_nanos.load(Ordering::Relaxed))
+    }
+
+    /// 历史最大耗时
+    pub fn max(&self) -> Duration {
+        Duration::from_nanos(self.max_nanos.load(Ordering::Relaxed))
+    }
+
+    /// 平均耗时，没有记录时为 0
+    pub fn mean(&self) -> Duration {
+        let count = self.count();
+        if count == 0 {
+            return Duration::ZERO;
+        }
+        Duration::from_nanos(self.total_nanos.load(Ordering::Relaxed) / count)
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_latency_stats() {
+        let stats = LatencyStats::default();
+        assert_eq!(stats.mean(), Duration::ZERO);
+
+        stats.record(Duration::from_millis(30));
+        stats.record(Duration::from_millis(10));
+        assert_eq!(stats.count(), 2);
+        assert_eq!(stats.last(), Duration::from_millis(10));
+        assert_eq!(stats.max(), Duration::from_millis(30));
+        assert_eq!(stats.mean(), Duration::from_millis(20));
+    }
+}
@@ -1,7 +1,12 @@
+pub mod bounded_channel;
 pub mod config;
 pub mod consts;
+pub mod decimal;
 pub mod enums;
 pub mod error;
+pub mod json;
+pub mod latency;
+pub mod signer;
 pub mod simple_logging;
 pub mod ts;
 pub mod utils;
@@ -0,0 +1,232 @@
+use hmac::{Hmac, Mac};
+use sha2::Sha256;
+use std::collections::HashMap;
+use std::fmt::{self, Write};
+
+type HmacSha256 = Hmac<Sha256>;
+
+/// HMAC-SHA256 签名的十六进制长度
+pub const SIGNATURE_HEX_LEN: usize = 64;
+
+/// 请求签名器
+///
+/// 构造时用 secret 派生一次 HMAC 的 inner/outer pad，每次签名只克隆已初始化的状态，
+/// 不再对每个请求重新处理密钥。每个 API 客户端持有一个。
+#[derive(Clone)]
+pub struct RequestSigner {
+    mac: HmacSha256,
+}
+
+impl RequestSigner {
+    pub fn new(secret_key: &str) -> Self {
+        Self {
+            mac: HmacSha256::new_from_slice(secret_key.as_bytes()).expect("HMAC can take a key of any size"),
+        }
+    }
+
+    /// 对载荷签名，结果十六进制编码在栈上
+    #[inline]
+    pub fn sign(&self, payload: &[u8]) -> Signature {
+        let mut mac = self.mac.clone();
+        mac.update(payload);
+        let digest = mac.finalize().into_bytes();
+        let mut hex = [0u8; SIGNATURE_HEX_LEN];
+        hex::encode_to_slice(digest, &mut hex).expect("32 字节摘要正好编码为 64 个字符");
+        Signature { hex }
+    }
+}
+
+impl fmt::Debug for RequestSigner {
+    /// 不输出密钥状态
+    fn fmt(&self, f: &mut fmt::Formatter<'_>) -> fmt::Result {
+        f.write_str("RequestSigner { .. }")
+    }
+}
+
+/// 十六进制签名（定长栈缓冲区）
+#[derive(Clone, Copy, PartialEq, Eq)]
+pub struct Signature {
+    hex: [u8; SIGNATURE_HEX_LEN],
+}
+
+impl Signature {
+    #[inline]
+    pub fn as_str(&self) -> &str {
+        std::str::from_utf8(&self.hex).expect("十六进制编码只包含 ASCII")
+    }
+}
+
+impl fmt::Display for Signature {
+    fn fmt(&self, f: &mut fmt::Formatter<'_>) -> fmt::Result {
+        f.write_str(self.as_str())
+    }
+}
+
+impl fmt::Debug for Signature {
+    fn fmt(&self, f: &mut fmt::Formatter<'_>) -> fmt::Result {
+        f.debug_tuple("Signature").field(&self.as_str()).finish()
+    }
+}
+
+/// 签名查询串构建器
+///
+/// URL 前缀、参数和签名写在同一个缓冲区里：`reset` 保留容量，热路径上复用同一个实例时不再分配。
+/// 参数按键名升序写入（交易所的规范顺序），不经过 HashMap 和排序；debug 构建下检查顺序。
+#[derive(Debug, Clone, Default)]
+pub struct SignedQuery {
+    buf: String,
+    query_start: usize,
+    #[cfg(debug_assertions)]
+    last_key: Option<(usize, usize)>,
+}
+
+impl SignedQuery {
+    /// 以 URL 前缀（如 `https://fapi.binance.com/fapi/v1/order?`）开始，前缀可以为空
+    pub fn new(prefix: &str) -> Self {
+        let mut query = Self {
+            buf: String::with_capacity(prefix.len() + 256),
+            ..Self::default()
+        };
+        query.reset(prefix);
+        query
+    }
+
+    /// 以 `base_url + path` 为前缀，`path` 需带上 `?`
+    pub fn url(base_url: &str, path: &str) -> Self {
+        let mut query = Self::new("");
+        query.buf.reserve(base_url.len() + path.len());
+        query.buf.push_str(base_url);
+        query.buf.push_str(path);
+        query.query_start = query.buf.len();
+        query
+    }
+
+    /// 清空参数并换成新的前缀，保留已分配的容量
+    pub fn reset(&mut self, prefix: &str) -> &mut Self {
+        self.buf.clear();
+        self.buf.push_str(prefix);
+        self.query_start = self.buf.len();
+        #[cfg(debug_assertions)]
+        {
+            self.last_key = None;
+        }
+        self
+    }
+
+    /// 预留容量，避免首次触发时扩容
+    pub fn reserve(&mut self, additional: usize) {
+        self.buf.reserve(additional);
+    }
+
+    /// 追加一个参数，键名必须大于上一个键名
+    pub fn push(&mut self, key: &str, value: impl fmt::Display) -> &mut Self {
+        #[cfg(debug_assertions)]
+        {
+            if let Some((start, end)) = self.last_key {
+                debug_assert!(&self.buf[start..end] < key, "参数未按键名升序写入: {}", key);
+            }
+        }
+        if self.buf.len() > self.query_start {
+            self.buf.push('&');
+        }
+        #[cfg(debug_assertions)]
+        {
+            self.last_key = Some((self.buf.len(), self.buf.len() + key.len()));
+        }
+        self.buf.push_str(key);
+        self.buf.push('=');
+        write!(self.buf, "{}", value).expect("写入 String 不会失败");
+        self
+    }
+
+    /// 值为 `Some` 时追加参数
+    pub fn push_opt(&mut self, key: &str, value: Option<impl fmt::Display>) -> &mut Self {
+        if let Some(value) = value {
+            self.push(key, value);
+        }
+        self
+    }
+
+    /// 已写入的查询串（不含前缀）
+    pub fn query(&self) -> &str {
+        &self.buf[self.query_start..]
+    }
+
+    /// 对已写入的参数签名并追加 `&signature=...`，返回完整 URL
+    pub fn sign(&mut self, signer: &RequestSigner) -> &str {
+        let signature = signer.sign(self.query().as_bytes());
+        self.buf.push_str("&signature=");
+        self.buf.push_str(signature.as_str());
+        &self.buf
+    }
+
+    pub fn as_str(&self) -> &str {
+        &self.buf
+    }
+
+    pub fn into_string(self) -> String {
+        self.buf
+    }
+}
+
+/// 把参数字典按键名排序后拼成查询串，用于非热路径上仍以 HashMap 组装参数的接口
+pub fn canonical_query(params: &HashMap<String, String>) -> String {
+    let mut pairs: Vec<(&str, &str)> = params.iter().map(|(k, v)| (k.as_str(), v.as_str())).collect();
+    pairs.sort_unstable_by_key(|&(key, _)| key);
+    let mut query = SignedQuery::new("");
+    for (key, value) in pairs {
+        query.push(key, value);
+    }
+    query.into_string()
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use crate::common::utils::generate_hmac_signature;
+
+    const SECRET: &str = "NhqPtmdSJYdKjVHjA7PZj4Mge3R5YNiP1e3UZjInClVN65XAbvqqM6A7H5fATj0j";
+
+    #[test]
+    fn test_signer_matches_one_shot_hmac() {
+        let signer = RequestSigner::new(SECRET);
+        let payload = "symbol=LTCBTC&side=BUY&type=LIMIT&timeInForce=GTC&quantity=1&price=0.1&recvWindow=5000&timestamp=1499827319559";
+        assert_eq!(
+            signer.sign(payload.as_bytes()).as_str(),
+            "c8db56825ae71d6d79447849e617115f4a920fa2acdcab2b053c4b2838bd6b71"
+        );
+        // 克隆状态签名，多次调用互不影响
+        assert_eq!(signer.sign(b"a=1").as_str(), generate_hmac_signature("a=1", SECRET));
+        assert_eq!(signer.sign(b"a=1"), signer.sign(b"a=1"));
+    }
+
+    #[test]
+    fn test_signed_query_reuses_buffer() {
+        let signer = RequestSigner::new(SECRET);
+        let mut query = SignedQuery::new("https://example.com/order?");
+        query.push("quantity", "0.010").push("side", "BUY").push("timestamp", 1499827319559u64);
+        assert_eq!(query.query(), "quantity=0.010&side=BUY&timestamp=1499827319559");
+
+        let expected = generate_hmac_signature(query.query(), SECRET);
+        let url = query.sign(&signer).to_string();
+        assert_eq!(
+            url,
+            format!("https://example.com/order?quantity=0.010&side=BUY&timestamp=1499827319559&signature={}", expected)
+        );
+
+        let capacity = query.as_str().len();
+        query.reset("https://example.com/order?").push("symbol", "ETHUSDT");
+        assert_eq!(query.as_str(), "https://example.com/order?symbol=ETHUSDT");
+        assert!(query.buf.capacity() >= capacity);
+    }
+
+    #[test]
+    fn test_canonical_query_sorts_by_key() {
+        let mut params = HashMap::new();
+        params.insert("timestamp".to_string(), "1".to_string());
+        params.insert("timeInForce".to_string(), "GTC".to_string());
+        params.insert("price".to_string(), "0.1".to_string());
+        params.insert("priceMatch".to_string(), "NONE".to_string());
+        assert_eq!(canonical_query(&params), "price=0.1&priceMatch=NONE&timeInForce=GTC&timestamp=1");
+    }
+}
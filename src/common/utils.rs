@@ -1,12 +1,9 @@
 use crate::common::consts::PARSE_DECIMAL;
+use crate::common::decimal::{parse_fixed_u64, ParseDecimalError, FIXED_SCALE};
 use hmac::{Hmac, Mac};
 use std::num::ParseIntError;
 use sha2::Sha256;
 use std::time::{SystemTime, UNIX_EPOCH};
-use std::num::ParseFloatError;
-use rust_decimal::Decimal;
-use rust_decimal::prelude::ToPrimitive;
-use std::str::FromStr;
 /// # HMAC-SHA256 签名生成器
 ///
 /// 使用 HMAC-SHA256 算法为给定的查询字符串生成一个签名。
@@ -19,6 +16,7 @@ use std::str::FromStr;
 ///
 /// 返回一个十六进制编码的签名字符串。
 ///
+/// 每次调用都会重新处理密钥，下单等热路径使用 `common::signer::RequestSigner`。
 pub fn generate_hmac_signature(query_string: &str, secret_key: &str) -> String {
     type HmacSha256 = Hmac<Sha256>;
 
@@ -59,31 +57,17 @@ pub fn get_timestamp_ms() -> u64 {
 /// // 结果: 94500.12 (与市场价格保持相同的2位小数精度)
 /// ```
 pub fn align_price_precision(reference_price: f64, target_price: f64) -> f64 {
-    // 使用更可靠的方法：通过分析参考价格的字符串表示来确定精度
-    // 使用固定格式来确保小数位数的一致性
-    let reference_str = format!("{:.10}", reference_price);
-
-    // 找到小数点的位置
-    if let Some(dot_pos) = reference_str.find('.') {
-        // 找到有效数字的结束位置（去除尾随的0）
-        let mut end_pos = reference_str.len();
-        for (i, ch) in reference_str.chars().rev().enumerate() {
-            if ch != '0' {
-                end_pos = reference_str.len() - i;
-                break;
-            }
+    // 逐位放大参考价格，找到能表示它的最少小数位数（最多 10 位），不再格式化字符串扫描字符。
+    // 下单价格应使用 `SymbolFilters`（按 exchangeInfo 的 tickSize 取整），这里只用于没有交易对信息的场景。
+    let mut multiplier = 1.0;
+    for _ in 0..10 {
+        let scaled = reference_price * multiplier;
+        if (scaled - scaled.round()).abs() < multiplier * 5e-11 {
+            break;
         }
-
-        // 计算小数位数
-        let decimal_places = end_pos - dot_pos - 1;
-
-        // 根据小数位数调整目标价格
-        let multiplier = 10_f64.powi(decimal_places as i32);
-        (target_price * multiplier).round() / multiplier
-    } else {
-        // 如果没有小数点，说明是整数，返回整数
-        target_price.round()
+        multiplier *= 10.0;
     }
+    (target_price * multiplier).round() / multiplier
 }
 
 #[inline]
@@ -91,57 +75,12 @@ pub fn f2u(data: f64) -> u64 {
     // 使用 round() 确保四舍五入，然后转换为 u64
     (data * PARSE_DECIMAL).round() as u64
 }
+/// 字符串解析为 10^8 定点数，不经过 f64，超出 8 位的小数四舍五入
 #[inline]
-pub fn s2u_custom(input: &str) -> Result<u64, ParseFloatError> {
-    // 高性能版本：避免 Vec 分配，直接解析
-    if let Some(dot_pos) = input.find('.') {
-        // 有小数点的情况
-        let integer_part = &input[..dot_pos];
-        let decimal_part = &input[dot_pos + 1..];
-        
-        let integer = integer_part.parse::<u64>().unwrap_or(0);
-        let decimal_len = decimal_part.len();
-        
-        if decimal_len == 0 {
-            Ok(integer * PARSE_DECIMAL as u64)
-        } else if decimal_len <= 8 {
-            // 直接解析小数部分
-            let decimal = decimal_part.parse::<u64>().unwrap_or(0);
-            let multiplier = 10_u64.pow(8 - decimal_len as u32);
-            Ok(integer * PARSE_DECIMAL as u64 + decimal * multiplier)
-        } else {
-            // 超过8位小数，截断
-            let truncated = &decimal_part[..8];
-            let decimal = truncated.parse::<u64>().unwrap_or(0);
-            Ok(integer * PARSE_DECIMAL as u64 + decimal)
-        }
-    } else {
-        // 没有小数点，直接解析整数
-        Ok(input.parse::<u64>().unwrap_or(0) * PARSE_DECIMAL as u64)
-    }
-}
-
-#[inline]
-pub fn s2u(input: &str) -> Result<u64, ParseFloatError> {
-    input.parse::<f64>().map(|item|f2u(item))
+pub fn s2u(input: &str) -> Result<u64, ParseDecimalError> {
+    parse_fixed_u64(input, FIXED_SCALE)
 }
 
-#[inline]
-pub fn s2u_decimal_fast(input: &str) -> Result<u64, ParseFloatError> {
-    // 使用 Decimal 快速解析，避免精度损失
-    let decimal = Decimal::from_str(input).unwrap_or(Decimal::ZERO);
-    let mantissa = decimal.mantissa();
-    let scale = decimal.scale();
-    
-    if scale <= 8 {
-        let multiplier = 10_u64.pow(8 - scale as u32);
-        Ok(mantissa as u64 * multiplier)
-    } else {
-        // 超过8位小数，截断到8位
-        let truncated_multiplier = 10_u64.pow(8);
-        Ok((mantissa as u64) / 10_u64.pow((scale - 8) as u32) * truncated_multiplier)
-    }
-}
 #[cfg(test)]
 mod tests {
     use super::*;
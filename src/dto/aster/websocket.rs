@@ -2,7 +2,8 @@ use crate::common::Exchange;
 use crate::models::TradingSymbol;
 use crate::common::ts::{BookTickerData as BookTickerDataTrait, TransactionTime, PushTime};
 use serde::{Deserialize, Serialize};
-use serde_with::{DisplayFromStr, serde_as};
+use serde_with::serde_as;
+use crate::common::decimal::FastDecimal;
 
 /// ASTER Book Ticker 数据结构
 /// 格式与 Binance 相同
@@ -24,19 +25,19 @@ pub struct AsterBookTickerData {
     #[serde(rename = "s")]
     pub symbol: TradingSymbol, // symbol
     
-    #[serde_as(as = "DisplayFromStr")]
+    #[serde_as(as = "FastDecimal")]
     #[serde(rename = "b")]
     pub best_bid_price: f64, // best bid price (auto-converted from string)
     
-    #[serde_as(as = "DisplayFromStr")]
+    #[serde_as(as = "FastDecimal")]
     #[serde(rename = "B")]
     pub best_bid_qty: f64, // best bid qty (auto-converted from string)
     
-    #[serde_as(as = "DisplayFromStr")]
+    #[serde_as(as = "FastDecimal")]
     #[serde(rename = "a")]
     pub best_ask_price: f64, // best ask price (auto-converted from string)
     
-    #[serde_as(as = "DisplayFromStr")]
+    #[serde_as(as = "FastDecimal")]
     #[serde(rename = "A")]
     pub best_ask_qty: f64, // best ask qty (auto-converted from string)
 }
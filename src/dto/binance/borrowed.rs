@@ -0,0 +1,438 @@
+//! 热路径 DTO 的借用版本
+//!
+//! 直接从 WebSocket 帧缓冲区反序列化：字符串字段借用 `&str`，价格/数量走 `FastDecimal`，
+//! 交易对解析为栈上的 `TradingSymbol`。转换为 `TradeTick` / `OrderTick` / `CommonDepth`
+//! 时不产生中间 `String`；Partial Depth 的档位直接解析进最终的存储 Vec。
+//!
+//! 整数 tick 路径使用 `*StrRef` 版本：价格/数量保留原始字符串，按交易对精度直接解析为 tick / lot。
+//!
+//! 借用字段要求 JSON 字符串不含转义，币安推送的字段都满足这一点。
+
+use crate::common::decimal::FastDecimal;
+use crate::common::ts::TransactionTime;
+use crate::dto::binance::websocket::{KlineData, KlineInfo};
+use crate::models::TradingSymbol;
+use ordered_float::OrderedFloat;
+use serde::de::{SeqAccess, Visitor};
+use serde::{Deserialize, Deserializer};
+use serde_with::serde_as;
+use std::fmt;
+
+/// Book Ticker 推送（借用）
+#[serde_as]
+#[derive(Debug, Clone, Deserialize)]
+pub struct BookTickerRef<'a> {
+    #[serde(rename = "e", borrow, default)]
+    pub event_type: Option<&'a str>,
+
+    #[serde(rename = "u")]
+    pub order_book_update_id: u64,
+
+    #[serde(rename = "E", default)]
+    pub event_time: Option<i64>,
+
+    #[serde(rename = "T", default)]
+    pub transaction_time: Option<i64>,
+
+    #[serde(rename = "s")]
+    pub symbol: TradingSymbol,
+
+    #[serde_as(as = "FastDecimal")]
+    #[serde(rename = "b")]
+    pub best_bid_price: f64,
+
+    #[serde_as(as = "FastDecimal")]
+    #[serde(rename = "B")]
+    pub best_bid_qty: f64,
+
+    #[serde_as(as = "FastDecimal")]
+    #[serde(rename = "a")]
+    pub best_ask_price: f64,
+
+    #[serde_as(as = "FastDecimal")]
+    #[serde(rename = "A")]
+    pub best_ask_qty: f64,
+}
+
+impl TransactionTime for BookTickerRef<'_> {
+    fn transaction_time(&self) -> i64 {
+        self.transaction_time.unwrap_or_else(|| self.event_time.unwrap_or(0))
+    }
+}
+
+/// 逐笔成交推送（借用）
+#[serde_as]
+#[derive(Debug, Clone, Deserialize)]
+pub struct TradeRef<'a> {
+    #[serde(rename = "e")]
+    pub event_type: &'a str,
+
+    #[serde(rename = "E")]
+    pub event_time: i64,
+
+    #[serde(rename = "T")]
+    pub trade_time: i64,
+
+    #[serde(rename = "s")]
+    pub symbol: TradingSymbol,
+
+    #[serde(rename = "t")]
+    pub trade_id: u64,
+
+    #[serde_as(as = "FastDecimal")]
+    #[serde(rename = "p")]
+    pub price: f64,
+
+    #[serde_as(as = "FastDecimal")]
+    #[serde(rename = "q")]
+    pub quantity: f64,
+
+    #[serde(rename = "X", borrow, default)]
+    pub order_type: Option<&'a str>,
+
+    #[serde(rename = "m")]
+    pub is_buyer_maker: bool,
+}
+
+impl TradeRef<'_> {
+    /// 判断是否为买入交易（买方是吃单方）
+    pub fn is_buy(&self) -> bool {
+        !self.is_buyer_maker
+    }
+}
+
+/// Book Ticker 推送（借用，价格/数量保留原始字符串）
+///
+/// 供整数 tick 路径按交易对精度直接解析为 tick / lot，不经过 f64。
+#[derive(Debug, Clone, Deserialize)]
+pub struct BookTickerStrRef<'a> {
+    #[serde(rename = "e", borrow, default)]
+    pub event_type: Option<&'a str>,
+
+    #[serde(rename = "u")]
+    pub order_book_update_id: u64,
+
+    #[serde(rename = "E", default)]
+    pub event_time: Option<i64>,
+
+    #[serde(rename = "T", default)]
+    pub transaction_time: Option<i64>,
+
+    #[serde(rename = "s")]
+    pub symbol: TradingSymbol,
+
+    #[serde(rename = "b")]
+    pub best_bid_price: &'a str,
+
+    #[serde(rename = "B")]
+    pub best_bid_qty: &'a str,
+
+    #[serde(rename = "a")]
+    pub best_ask_price: &'a str,
+
+    #[serde(rename = "A")]
+    pub best_ask_qty: &'a str,
+}
+
+impl TransactionTime for BookTickerStrRef<'_> {
+    fn transaction_time(&self) -> i64 {
+        self.transaction_time.unwrap_or_else(|| self.event_time.unwrap_or(0))
+    }
+}
+
+/// 逐笔成交推送（借用，价格/数量保留原始字符串）
+#[derive(Debug, Clone, Deserialize)]
+pub struct TradeStrRef<'a> {
+    #[serde(rename = "e")]
+    pub event_type: &'a str,
+
+    #[serde(rename = "E")]
+    pub event_time: i64,
+
+    #[serde(rename = "T")]
+    pub trade_time: i64,
+
+    #[serde(rename = "s")]
+    pub symbol: TradingSymbol,
+
+    #[serde(rename = "t")]
+    pub trade_id: u64,
+
+    #[serde(rename = "p")]
+    pub price: &'a str,
+
+    #[serde(rename = "q")]
+    pub quantity: &'a str,
+
+    #[serde(rename = "X", borrow, default)]
+    pub order_type: Option<&'a str>,
+
+    #[serde(rename = "m")]
+    pub is_buyer_maker: bool,
+}
+
+impl TradeStrRef<'_> {
+    /// 判断是否为买入交易（买方是吃单方）
+    pub fn is_buy(&self) -> bool {
+        !self.is_buyer_maker
+    }
+}
+
+/// K线推送（借用）
+#[derive(Debug, Clone, Deserialize)]
+pub struct KlineRef<'a> {
+    #[serde(rename = "e")]
+    pub event_type: &'a str,
+
+    #[serde(rename = "E")]
+    pub event_time: i64,
+
+    #[serde(rename = "s")]
+    pub symbol: TradingSymbol,
+
+    #[serde(rename = "k", borrow)]
+    pub kline: KlineInfoRef<'a>,
+}
+
+/// K线详细信息（借用）
+#[serde_as]
+#[derive(Debug, Clone, Deserialize)]
+pub struct KlineInfoRef<'a> {
+    #[serde(rename = "t")]
+    pub start_time: i64,
+
+    #[serde(rename = "T")]
+    pub close_time: i64,
+
+    #[serde(rename = "s")]
+    pub symbol: TradingSymbol,
+
+    #[serde(rename = "i")]
+    pub interval: &'a str,
+
+    #[serde(rename = "f")]
+    pub first_trade_id: i64,
+
+    #[serde(rename = "L")]
+    pub last_trade_id: i64,
+
+    #[serde(rename = "o")]
+    #[serde_as(as = "FastDecimal")]
+    pub open_price: f64,
+
+    #[serde(rename = "c")]
+    #[serde_as(as = "FastDecimal")]
+    pub close_price: f64,
+
+    #[serde(rename = "h")]
+    #[serde_as(as = "FastDecimal")]
+    pub high_price: f64,
+
+    #[serde(rename = "l")]
+    #[serde_as(as = "FastDecimal")]
+    pub low_price: f64,
+
+    #[serde(rename = "v")]
+    #[serde_as(as = "FastDecimal")]
+    pub base_volume: f64,
+
+    #[serde(rename = "n")]
+    pub trade_count: u64,
+
+    #[serde(rename = "x")]
+    pub is_closed: bool,
+
+    #[serde(rename = "q")]
+    #[serde_as(as = "FastDecimal")]
+    pub quote_volume: f64,
+
+    #[serde(rename = "V")]
+    #[serde_as(as = "FastDecimal")]
+    pub taker_buy_base_volume: f64,
+
+    #[serde(rename = "Q")]
+    #[serde_as(as = "FastDecimal")]
+    pub taker_buy_quote_volume: f64,
+
+    #[serde(rename = "B")]
+    pub ignore: &'a str,
+}
+
+impl KlineRef<'_> {
+    /// 转换为拥有所有权的 `KlineData`
+    ///
+    /// 未收盘的 K线推送通常只需要读取几个价格字段，先判断 `kline.is_closed`
+    /// 再按需转换，可以避免为每条推送分配字符串。
+    pub fn to_owned_data(&self) -> KlineData {
+        let k = &self.kline;
+        KlineData {
+            event_type: self.event_type.to_string(),
+            event_time: self.event_time,
+            symbol: self.symbol,
+            kline: KlineInfo {
+                start_time: k.start_time,
+                close_time: k.close_time,
+                symbol: k.symbol,
+                interval: k.interval.to_string(),
+                first_trade_id: k.first_trade_id,
+                last_trade_id: k.last_trade_id,
+                open_price: k.open_price,
+                close_price: k.close_price,
+                high_price: k.high_price,
+                low_price: k.low_price,
+                base_volume: k.base_volume,
+                trade_count: k.trade_count,
+                is_closed: k.is_closed,
+                quote_volume: k.quote_volume,
+                taker_buy_base_volume: k.taker_buy_base_volume,
+                taker_buy_quote_volume: k.taker_buy_quote_volume,
+                ignore: k.ignore.to_string(),
+            },
+        }
+    }
+}
+
+/// 单边深度档位，直接解析为 `(价格, 数量)`
+///
+/// 过滤掉价格或数量为 0 的档位；解析结果即 `DepthLevels` 的最终存储，不经过 `Vec<[f64; 2]>`。
+#[derive(Debug, Clone, Default)]
+pub struct PriceLevels(pub Vec<(OrderedFloat<f64>, f64)>);
+
+#[serde_as]
+#[derive(Deserialize)]
+struct Level(
+    #[serde_as(as = "FastDecimal")] f64,
+    #[serde_as(as = "FastDecimal")] f64,
+);
+
+struct PriceLevelsVisitor;
+
+impl<'de> Visitor<'de> for PriceLevelsVisitor {
+    type Value = PriceLevels;
+
+    fn expecting(&self, formatter: &mut fmt::Formatter) -> fmt::Result {
+        formatter.write_str("an array of [price, quantity] pairs")
+    }
+
+    fn visit_seq<A: SeqAccess<'de>>(self, mut seq: A) -> Result<PriceLevels, A::Error> {
+        // Partial Depth 最多 20 档
+        let mut levels = Vec::with_capacity(seq.size_hint().unwrap_or(20));
+        while let Some(Level(price, quantity)) = seq.next_element()? {
+            if price > 0.0 && quantity > 0.0 {
+                levels.push((OrderedFloat(price), quantity));
+            }
+        }
+        Ok(PriceLevels(levels))
+    }
+}
+
+impl<'de> Deserialize<'de> for PriceLevels {
+    fn deserialize<D: Deserializer<'de>>(deserializer: D) -> Result<Self, D::Error> {
+        deserializer.deserialize_seq(PriceLevelsVisitor)
+    }
+}
+
+/// Partial Depth 推送（直接解析为档位）
+/// 兼容现货格式 {"lastUpdateId","bids","asks"} 和期货格式 {"u","b","a"}
+#[derive(Debug, Clone, Deserialize)]
+pub struct PartialDepthRef {
+    #[serde(rename = "lastUpdateId", alias = "u")]
+    pub last_update_id: i64,
+
+    #[serde(rename = "E", default)]
+    pub event_time: Option<i64>,
+
+    #[serde(rename = "bids", alias = "b")]
+    pub bids: PriceLevels,
+
+    #[serde(rename = "asks", alias = "a")]
+    pub asks: PriceLevels,
+}
+
+/// Partial Depth 推送（借用，档位保留原始字符串）
+///
+/// 档位按推送顺序原样保留，由整数 tick 路径按交易对精度解析并过滤。
+#[derive(Debug, Clone, Deserialize)]
+pub struct PartialDepthStrRef<'a> {
+    #[serde(rename = "lastUpdateId", alias = "u")]
+    pub last_update_id: i64,
+
+    #[serde(rename = "E", default)]
+    pub event_time: Option<i64>,
+
+    #[serde(rename = "bids", alias = "b", borrow)]
+    pub bids: Vec<(&'a str, &'a str)>,
+
+    #[serde(rename = "asks", alias = "a", borrow)]
+    pub asks: Vec<(&'a str, &'a str)>,
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use crate::dto::binance::websocket::{BinanceTradeData, BookTickerData};
+
+    #[test]
+    fn test_borrowed_matches_owned() {
+        let text = r#"{"e":"bookTicker","u":400900217,"E":1568014460893,"T":1568014460891,"s":"BNBUSDT","b":"25.35190000","B":"31.21000000","a":"25.36520000","A":"40.66000000"}"#;
+        let borrowed: BookTickerRef = serde_json::from_str(text).unwrap();
+        let owned: BookTickerData = serde_json::from_str(text).unwrap();
+        assert_eq!(borrowed.event_type, Some("bookTicker"));
+        assert_eq!(borrowed.symbol, owned.symbol);
+        assert_eq!(borrowed.best_bid_price, owned.best_bid_price);
+        assert_eq!(borrowed.best_ask_qty, owned.best_ask_qty);
+        assert_eq!(borrowed.transaction_time(), 1568014460891);
+
+        let text = r#"{"e":"trade","E":123456789,"T":123456785,"s":"BTCUSDT","t":12345,"p":"0.001","q":"100","X":"MARKET","m":true}"#;
+        let borrowed: TradeRef = serde_json::from_str(text).unwrap();
+        let owned: BinanceTradeData = serde_json::from_str(text).unwrap();
+        assert_eq!(borrowed.order_type, Some("MARKET"));
+        assert_eq!(borrowed.price, owned.price);
+        assert_eq!(borrowed.is_buy(), owned.is_buy());
+    }
+
+    #[test]
+    fn test_kline_to_owned() {
+        let text = r#"{"e":"kline","E":1,"s":"BTCUSDT","k":{"t":0,"T":59999,"s":"BTCUSDT","i":"1m","f":1,"L":2,"o":"1.0","c":"2.0","h":"3.0","l":"0.5","v":"10","n":2,"x":true,"q":"20","V":"5","Q":"10","B":"0"}}"#;
+        let borrowed: KlineRef = serde_json::from_str(text).unwrap();
+        assert_eq!(borrowed.kline.interval, "1m");
+        let owned = borrowed.to_owned_data();
+        assert_eq!(owned.kline.interval, "1m");
+        assert_eq!(owned.kline.high_price, 3.0);
+        assert!(owned.kline.is_closed);
+    }
+
+    #[test]
+    fn test_partial_depth_levels() {
+        let text = r#"{"lastUpdateId":160,"bids":[["0.0024","10"],["0.0023","0"]],"asks":[["0.0026","100"]]}"#;
+        let depth: PartialDepthRef = serde_json::from_str(text).unwrap();
+        assert_eq!(depth.last_update_id, 160);
+        assert_eq!(depth.bids.0, vec![(OrderedFloat(0.0024), 10.0)]);
+        assert_eq!(depth.asks.0, vec![(OrderedFloat(0.0026), 100.0)]);
+
+        let text = r#"{"e":"depthUpdate","E":5,"T":4,"s":"BTCUSDT","U":1,"u":2,"pu":0,"b":[["100.0","1.0"]],"a":[]}"#;
+        let depth: PartialDepthRef = serde_json::from_str(text).unwrap();
+        assert_eq!(depth.last_update_id, 2);
+        assert_eq!(depth.event_time, Some(5));
+        assert!(depth.asks.0.is_empty());
+    }
+
+    #[test]
+    fn test_str_refs_keep_raw_decimals() {
+        let text = r#"{"e":"bookTicker","u":1,"E":2,"T":3,"s":"ETHUSDT","b":"3512.34","B":"1.500","a":"3512.35","A":"2"}"#;
+        let ticker: BookTickerStrRef = serde_json::from_str(text).unwrap();
+        assert_eq!((ticker.best_bid_price, ticker.best_bid_qty), ("3512.34", "1.500"));
+        assert_eq!(ticker.transaction_time(), 3);
+
+        let text = r#"{"e":"trade","E":1,"T":2,"s":"ETHUSDT","t":7,"p":"0.1","q":"0.3","m":false}"#;
+        let trade: TradeStrRef = serde_json::from_str(text).unwrap();
+        assert_eq!((trade.price, trade.quantity), ("0.1", "0.3"));
+        assert!(trade.is_buy());
+
+        let text = r#"{"e":"depthUpdate","E":5,"T":4,"s":"ETHUSDT","U":1,"u":2,"pu":0,"b":[["3512.34","1.5"]],"a":[["3512.35","0"]]}"#;
+        let depth: PartialDepthStrRef = serde_json::from_str(text).unwrap();
+        assert_eq!(depth.last_update_id, 2);
+        assert_eq!(depth.bids, vec![("3512.34", "1.5")]);
+        assert_eq!(depth.asks, vec![("3512.35", "0")]);
+    }
+}
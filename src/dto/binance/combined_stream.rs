@@ -0,0 +1,136 @@
+use serde::{Deserialize, Serialize};
+use std::borrow::Cow;
+
+/// 组合流帧
+/// 格式: {"stream":"<streamName>","data":<rawPayload>}
+#[derive(Debug, Clone, Serialize, Deserialize)]
+pub struct CombinedStreamFrame<T> {
+    pub stream: String,
+    pub data: T,
+}
+
+/// 只解析 data 字段，不为 stream 名称分配 String
+#[derive(Deserialize)]
+struct DataOnly<T> {
+    data: T,
+}
+
+/// 订阅控制帧
+/// 格式: {"method":"SUBSCRIBE","params":["btcusdt@aggTrade"],"id":1}
+#[derive(Debug, Clone, Serialize)]
+pub struct StreamControlRequest<'a> {
+    pub method: &'a str,
+    pub params: &'a [String],
+    pub id: u64,
+}
+
+/// 订阅控制帧的响应
+/// 格式: {"result":null,"id":1}
+#[derive(Debug, Clone, Deserialize)]
+pub struct StreamControlResponse {
+    #[serde(default)]
+    pub result: Option<serde_json::Value>,
+    pub id: u64,
+}
+
+const STREAM_PREFIX: &str = "{\"stream\":\"";
+const DATA_PREFIX: &str = "\",\"data\":";
+const EVENT_PREFIX: &str = "{\"e\":\"";
+
+/// 前缀扫描拆分组合流帧，返回 stream 名称和 data 部分的原始 JSON
+///
+/// 只识别币安实际使用的 `{"stream":"...","data":...}` 紧凑布局，
+/// 字段顺序不同或带空白时返回 None，由调用方退回 serde 解析整个帧。
+pub fn split_frame(text: &str) -> Option<(&str, &str)> {
+    let rest = text.strip_prefix(STREAM_PREFIX)?;
+    let end = rest.find('"')?;
+    let (stream, rest) = rest.split_at(end);
+    let data = rest.strip_prefix(DATA_PREFIX)?.trim_end().strip_suffix('}')?;
+    Some((stream, data))
+}
+
+/// 前缀扫描取出推送中的事件类型（`e` 字段）
+///
+/// 单一 stream 连接推送的是不带外层包装的 data，币安把 `e` 放在第一个字段。
+pub fn extract_event_type(text: &str) -> Option<&str> {
+    let rest = text.strip_prefix(EVENT_PREFIX)?;
+    let end = rest.find('"')?;
+    Some(&rest[..end])
+}
+
+/// 取出组合流帧中的 stream 名称
+///
+/// 币安总是把 stream 放在第一个字段，优先走前缀扫描（零分配）；
+/// 格式不符时退回 serde 解析。控制帧响应等不带 stream 的消息返回 None。
+pub fn extract_stream_name(text: &str) -> Option<Cow<'_, str>> {
+    if let Some(rest) = text.strip_prefix(STREAM_PREFIX) {
+        let end = rest.find('"')?;
+        return Some(Cow::Borrowed(&rest[..end]));
+    }
+
+    #[derive(Deserialize)]
+    struct StreamOnly {
+        stream: String,
+    }
+    serde_json::from_str::<StreamOnly>(text)
+        .ok()
+        .map(|frame| Cow::Owned(frame.stream))
+}
+
+/// 解析组合流帧中的 data 部分
+///
+/// `T` 可以是借用 `text` 的类型（如 `borrowed::TradeRef<'a>`），此时不会分配字符串。
+/// 紧凑布局下直接解析 data 部分，不再扫描外层包装。
+pub fn decode_data<'a, T: Deserialize<'a>>(text: &'a str) -> serde_json::Result<T> {
+    match split_frame(text) {
+        Some((_, data)) => serde_json::from_str(data),
+        None => serde_json::from_str::<DataOnly<T>>(text).map(|frame| frame.data),
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_extract_stream_name() {
+        let text = r#"{"stream":"btcusdt@bookTicker","data":{"u":1}}"#;
+        assert!(matches!(extract_stream_name(text), Some(Cow::Borrowed("btcusdt@bookTicker"))));
+
+        // 字段顺序不同时退回 serde
+        let text = r#"{"data":{"u":1},"stream":"btcusdt@trade"}"#;
+        assert_eq!(extract_stream_name(text).as_deref(), Some("btcusdt@trade"));
+
+        // 控制帧响应
+        assert!(extract_stream_name(r#"{"result":null,"id":1}"#).is_none());
+    }
+
+    #[test]
+    fn test_split_frame() {
+        let text = r#"{"stream":"btcusdt@trade","data":{"e":"trade","t":1}}"#;
+        assert_eq!(split_frame(text), Some(("btcusdt@trade", r#"{"e":"trade","t":1}"#)));
+        assert_eq!(extract_event_type(split_frame(text).unwrap().1), Some("trade"));
+
+        // 非紧凑布局由 serde 兜底
+        let text = r#"{"data":{"u":7},"stream":"btcusdt@trade"}"#;
+        assert!(split_frame(text).is_none());
+
+        #[derive(Deserialize)]
+        struct Update {
+            u: u64,
+        }
+        assert_eq!(decode_data::<Update>(text).unwrap().u, 7);
+        assert_eq!(decode_data::<Update>(r#"{"stream":"x@trade","data":{"u":8}}"#).unwrap().u, 8);
+        assert!(decode_data::<Update>(r#"{"stream":"x@trade","data":{"u":8}"#).is_err());
+    }
+
+    #[test]
+    fn test_control_request_format() {
+        let params = vec!["btcusdt@depth5".to_string()];
+        let request = StreamControlRequest { method: "SUBSCRIBE", params: &params, id: 7 };
+        assert_eq!(
+            serde_json::to_string(&request).unwrap(),
+            r#"{"method":"SUBSCRIBE","params":["btcusdt@depth5"],"id":7}"#
+        );
+    }
+}
@@ -1,2 +1,5 @@
+pub mod borrowed;
+pub mod combined_stream;
 pub mod websocket;
-pub mod rest_api; 
\ No newline at end of file
+pub mod rest_api;
+pub mod ws_api;
\ No newline at end of file
@@ -1,4 +1,7 @@
 use serde::{Deserialize, Serialize};
+use serde_with::serde_as;
+use crate::common::decimal::FastDecimal;
+use crate::common::signer::SignedQuery;
 use std::collections::HashMap;
 use anyhow::Result;
 use ta::{Close, High, Low, Not, Open, Qav, Tbbav, Tbqav, Volume};
@@ -37,6 +40,42 @@ pub enum TimeInForce {
     Gtd, // Good Till Date
 }
 
+impl OrderType {
+    /// 下单参数中的取值，与 serde 序列化结果相同
+    pub fn as_str(&self) -> &'static str {
+        match self {
+            OrderType::Limit => "LIMIT",
+            OrderType::Market => "MARKET",
+            OrderType::Stop => "STOP",
+            OrderType::StopMarket => "STOP_MARKET",
+            OrderType::TakeProfit => "TAKE_PROFIT",
+            OrderType::TakeProfitMarket => "TAKE_PROFIT_MARKET",
+            OrderType::TrailingStopMarket => "TRAILING_STOP_MARKET",
+        }
+    }
+}
+
+impl OrderSide {
+    pub fn as_str(&self) -> &'static str {
+        match self {
+            OrderSide::Buy => "BUY",
+            OrderSide::Sell => "SELL",
+        }
+    }
+}
+
+impl TimeInForce {
+    pub fn as_str(&self) -> &'static str {
+        match self {
+            TimeInForce::Gtc => "GTC",
+            TimeInForce::Ioc => "IOC",
+            TimeInForce::Fok => "FOK",
+            TimeInForce::Gtx => "GTX",
+            TimeInForce::Gtd => "GTD",
+        }
+    }
+}
+
 /// K线数据请求
 #[derive(Debug, Clone, Serialize, Deserialize)]
 pub struct KlineRequest {
@@ -195,6 +234,76 @@ impl SymbolEnum for KlineData {
 /// K线数据响应类型别名
 pub type KlineResponse = Vec<KlineData>;
 
+/// 订单簿快照 (GET /fapi/v1/depth)
+/// 格式: {"lastUpdateId":...,"E":...,"T":...,"bids":[...],"asks":[...]}
+#[serde_as]
+#[derive(Debug, Clone, Serialize, Deserialize)]
+pub struct DepthSnapshot {
+    #[serde(rename = "lastUpdateId")]
+    pub last_update_id: i64, // 快照对应的最后一个 updateId
+
+    #[serde(rename = "E", default)]
+    pub event_time: Option<i64>, // 消息输出时间
+
+    #[serde(rename = "T", default)]
+    pub transaction_time: Option<i64>, // 撮合引擎时间
+
+    #[serde_as(as = "Vec<[FastDecimal; 2]>")]
+    pub bids: Vec<[f64; 2]>, // [price, quantity]
+
+    #[serde_as(as = "Vec<[FastDecimal; 2]>")]
+    pub asks: Vec<[f64; 2]>, // [price, quantity]
+}
+
+/// 交易规则 (GET /fapi/v1/exchangeInfo)，只保留下单需要的交易对过滤器
+#[derive(Debug, Clone, Serialize, Deserialize)]
+pub struct ExchangeInfo {
+    pub symbols: Vec<ExchangeSymbolInfo>,
+}
+
+/// 单个交易对的交易规则
+#[derive(Debug, Clone, Serialize, Deserialize)]
+#[serde(rename_all = "camelCase")]
+pub struct ExchangeSymbolInfo {
+    /// 交易所列出的原始符号，可能超出 `TradingSymbol` 能表示的长度，由调用方转换
+    pub symbol: String,
+    #[serde(default)]
+    pub status: String, // TRADING / SETTLING 等
+    pub price_precision: u8,    // 展示用价格精度，下单以 tickSize 为准
+    pub quantity_precision: u8, // 展示用数量精度，下单以 stepSize 为准
+    #[serde(default)]
+    pub filters: Vec<ExchangeSymbolFilter>,
+}
+
+/// 交易对过滤器，按 filterType 区分；不关心的类型解析为 Other
+#[derive(Debug, Clone, Serialize, Deserialize)]
+#[serde(tag = "filterType", rename_all = "SCREAMING_SNAKE_CASE")]
+pub enum ExchangeSymbolFilter {
+    #[serde(rename_all = "camelCase")]
+    PriceFilter {
+        tick_size: String,
+        min_price: String,
+        max_price: String,
+    },
+    #[serde(rename_all = "camelCase")]
+    LotSize {
+        step_size: String,
+        min_qty: String,
+        max_qty: String,
+    },
+    #[serde(rename_all = "camelCase")]
+    MarketLotSize {
+        step_size: String,
+        min_qty: String,
+        max_qty: String,
+    },
+    MinNotional {
+        notional: String,
+    },
+    #[serde(other)]
+    Other,
+}
+
 /// 下单请求参数
 #[derive(Debug, Clone, Serialize, Deserialize)]
 pub struct OrderRequest {
@@ -304,6 +413,92 @@ impl Default for OrderRequest {
     }
 }
 
+impl OrderRequest {
+    /// 转换为下单参数（不含 timestamp / recvWindow / signature，由调用方按传输方式补充）
+    pub fn to_params(&self) -> Result<HashMap<String, String>> {
+        let mut params = HashMap::new();
+        params.insert("symbol".to_string(), self.symbol.clone());
+        params.insert("side".to_string(), serde_json::to_string(&self.side)?.trim_matches('"').to_string());
+        params.insert("type".to_string(), serde_json::to_string(&self.order_type)?.trim_matches('"').to_string());
+
+        if let Some(ref position_side) = self.position_side {
+            params.insert("positionSide".to_string(), position_side.clone());
+        }
+        if let Some(ref time_in_force) = self.time_in_force {
+            params.insert("timeInForce".to_string(), serde_json::to_string(time_in_force)?.trim_matches('"').to_string());
+        }
+        if let Some(ref quantity) = self.quantity {
+            params.insert("quantity".to_string(), quantity.clone());
+        }
+        if let Some(ref reduce_only) = self.reduce_only {
+            params.insert("reduceOnly".to_string(), reduce_only.clone());
+        }
+        if let Some(ref price) = self.price {
+            params.insert("price".to_string(), price.clone());
+        }
+        if let Some(ref new_client_order_id) = self.new_client_order_id {
+            params.insert("newClientOrderId".to_string(), new_client_order_id.clone());
+        }
+        if let Some(ref stop_price) = self.stop_price {
+            params.insert("stopPrice".to_string(), stop_price.clone());
+        }
+        if let Some(ref close_position) = self.close_position {
+            params.insert("closePosition".to_string(), close_position.clone());
+        }
+        if let Some(ref activation_price) = self.activation_price {
+            params.insert("activationPrice".to_string(), activation_price.clone());
+        }
+        if let Some(ref callback_rate) = self.callback_rate {
+            params.insert("callbackRate".to_string(), callback_rate.clone());
+        }
+        if let Some(ref working_type) = self.working_type {
+            params.insert("workingType".to_string(), working_type.clone());
+        }
+        if let Some(ref price_protect) = self.price_protect {
+            params.insert("priceProtect".to_string(), price_protect.clone());
+        }
+        if let Some(ref new_order_resp_type) = self.new_order_resp_type {
+            params.insert("newOrderRespType".to_string(), new_order_resp_type.clone());
+        }
+        if let Some(ref price_match) = self.price_match {
+            params.insert("priceMatch".to_string(), price_match.clone());
+        }
+        if let Some(ref self_trade_prevention_mode) = self.self_trade_prevention_mode {
+            params.insert("selfTradePreventionMode".to_string(), self_trade_prevention_mode.clone());
+        }
+        if let Some(ref good_till_date) = self.good_till_date {
+            params.insert("goodTillDate".to_string(), good_till_date.to_string());
+        }
+        Ok(params)
+    }
+
+    /// 按键名升序把下单参数（含 recvWindow / timestamp）写入签名查询串，不经过 HashMap
+    pub fn write_params(&self, query: &mut SignedQuery, timestamp: u64, recv_window: u64) {
+        query
+            .push_opt("activationPrice", self.activation_price.as_deref())
+            .push_opt("callbackRate", self.callback_rate.as_deref())
+            .push_opt("closePosition", self.close_position.as_deref())
+            .push_opt("goodTillDate", self.good_till_date)
+            .push_opt("newClientOrderId", self.new_client_order_id.as_deref())
+            .push_opt("newOrderRespType", self.new_order_resp_type.as_deref())
+            .push_opt("positionSide", self.position_side.as_deref())
+            .push_opt("price", self.price.as_deref())
+            .push_opt("priceMatch", self.price_match.as_deref())
+            .push_opt("priceProtect", self.price_protect.as_deref())
+            .push_opt("quantity", self.quantity.as_deref())
+            .push("recvWindow", recv_window)
+            .push_opt("reduceOnly", self.reduce_only.as_deref())
+            .push_opt("selfTradePreventionMode", self.self_trade_prevention_mode.as_deref())
+            .push("side", self.side.as_str())
+            .push_opt("stopPrice", self.stop_price.as_deref())
+            .push("symbol", &self.symbol)
+            .push_opt("timeInForce", self.time_in_force.as_ref().map(TimeInForce::as_str))
+            .push("timestamp", timestamp)
+            .push("type", self.order_type.as_str())
+            .push_opt("workingType", self.working_type.as_deref());
+    }
+}
+
 impl KlineRequest {
     pub fn to_params(&self) -> Result<HashMap<String, String>> {
         let mut params = HashMap::new();
@@ -429,6 +624,32 @@ mod tests {
         assert_eq!(params.get("endTime"), None);
     }
 
+    #[test]
+    fn test_order_request_write_params_matches_sorted_params() {
+        let request = OrderRequest {
+            symbol: "ETHUSDT".to_string(),
+            side: OrderSide::Sell,
+            order_type: OrderType::StopMarket,
+            time_in_force: Some(TimeInForce::Gtc),
+            quantity: Some("0.010".to_string()),
+            reduce_only: Some("true".to_string()),
+            stop_price: Some("2950.10".to_string()),
+            new_client_order_id: Some("sl-1".to_string()),
+            working_type: Some("MARK_PRICE".to_string()),
+            price_protect: Some("TRUE".to_string()),
+            good_till_date: Some(1_700_000_000_000),
+            ..Default::default()
+        };
+
+        let mut params = request.to_params().unwrap();
+        params.insert("timestamp".to_string(), "1499827319559".to_string());
+        params.insert("recvWindow".to_string(), "5000".to_string());
+
+        let mut query = SignedQuery::new("");
+        request.write_params(&mut query, 1499827319559, 5000);
+        assert_eq!(query.query(), crate::common::signer::canonical_query(&params));
+    }
+
     #[test]
     fn test_order_request_default() {
         let request = OrderRequest::default();
@@ -438,6 +659,23 @@ mod tests {
         assert_eq!(request.quantity, None);
     }
 
+    #[test]
+    fn test_depth_snapshot_parsing() {
+        let json_str = r#"{
+            "lastUpdateId": 1027024,
+            "E": 1589436922972,
+            "T": 1589436922959,
+            "bids": [["4.00000000", "431.00000000"]],
+            "asks": [["4.00000200", "12.00000000"]]
+        }"#;
+
+        let snapshot: DepthSnapshot = serde_json::from_str(json_str).unwrap();
+        assert_eq!(snapshot.last_update_id, 1027024);
+        assert_eq!(snapshot.transaction_time, Some(1589436922959));
+        assert_eq!(snapshot.bids[0], [4.0, 431.0]);
+        assert_eq!(snapshot.asks[0], [4.000002, 12.0]);
+    }
+
     #[test]
     fn test_kline_data_string_parsing() {
         let json_str = r#"[
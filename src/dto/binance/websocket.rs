@@ -2,7 +2,8 @@ use crate::common::Exchange;
 use crate::common::ts::MarketData;
 use crate::models::TradingSymbol;
 use serde::{Deserialize, Serialize};
-use serde_with::{DisplayFromStr, serde_as};
+use serde_with::serde_as;
+use crate::common::decimal::FastDecimal;
 use ta::{Close, High, Low, Not, Open, Qav, Tbbav, Tbqav, Volume};
 use crate::common::ts::IsClosed;
 use crate::common::ts::BookTickerData as BookTickerDataTrait;
@@ -15,21 +16,21 @@ use crate::common::ts::{Symbol,SymbolEnum};
 pub struct MarkPriceData {
     pub symbol: TradingSymbol,
 
-    #[serde_as(as = "DisplayFromStr")]
+    #[serde_as(as = "FastDecimal")]
     pub mark_price: f64, // 标记价格 (auto-converted from string)
 
-    #[serde_as(as = "DisplayFromStr")]
+    #[serde_as(as = "FastDecimal")]
     pub index_price: f64, // 指数价格 (auto-converted from string)
 
-    #[serde_as(as = "DisplayFromStr")]
+    #[serde_as(as = "FastDecimal")]
     pub estimated_settle_price: f64, // 预估结算价 (auto-converted from string)
 
-    #[serde_as(as = "DisplayFromStr")]
+    #[serde_as(as = "FastDecimal")]
     pub last_funding_rate: f64, // 最新资金费率 (auto-converted from string)
 
     pub next_funding_time: i64, // 下次资金费时间
 
-    #[serde_as(as = "DisplayFromStr")]
+    #[serde_as(as = "FastDecimal")]
     pub interest_rate: f64, // 利率 (auto-converted from string)
 
     pub time: i64, // 时间戳
@@ -62,28 +63,29 @@ pub struct BinanceDepthUpdate {
     pub prev_final_update_id: Option<i64>, // Final update Id in last stream (可选)
 
     #[serde(rename = "b")]
-    #[serde_as(as = "Vec<[DisplayFromStr; 2]>")]
+    #[serde_as(as = "Vec<[FastDecimal; 2]>")]
     pub bids: Vec<[f64; 2]>, // Bids to be updated [price, quantity] (auto-converted from strings)
 
     #[serde(rename = "a")]
-    #[serde_as(as = "Vec<[DisplayFromStr; 2]>")]
+    #[serde_as(as = "Vec<[FastDecimal; 2]>")]
     pub asks: Vec<[f64; 2]>, // Asks to be updated [price, quantity] (auto-converted from strings)
 }
 
 /// Partial Depth Stream 深度数据 (@depth20@100ms)
 /// 格式: {"lastUpdateId":...,"bids":[...],"asks":[...]}
+/// 期货格式: {"e":"depthUpdate",...,"u":...,"b":[...],"a":[...]}（通过 alias 兼容）
 #[serde_as]
 #[derive(Debug, Clone, Serialize, Deserialize)]
 pub struct BinancePartialDepth {
-    #[serde(rename = "lastUpdateId")]
+    #[serde(rename = "lastUpdateId", alias = "u")]
     pub last_update_id: i64, // Last update ID
 
-    #[serde(rename = "bids")]
-    #[serde_as(as = "Vec<[DisplayFromStr; 2]>")]
+    #[serde(rename = "bids", alias = "b")]
+    #[serde_as(as = "Vec<[FastDecimal; 2]>")]
     pub bids: Vec<[f64; 2]>, // Bids [price, quantity] (auto-converted from strings)
 
-    #[serde(rename = "asks")]
-    #[serde_as(as = "Vec<[DisplayFromStr; 2]>")]
+    #[serde(rename = "asks", alias = "a")]
+    #[serde_as(as = "Vec<[FastDecimal; 2]>")]
     pub asks: Vec<[f64; 2]>, // Asks [price, quantity] (auto-converted from strings)
 }
 
@@ -127,23 +129,23 @@ pub struct KlineInfo {
     pub last_trade_id: i64, // Last trade ID
 
     #[serde(rename = "o")]
-    #[serde_as(as = "DisplayFromStr")]
+    #[serde_as(as = "FastDecimal")]
     pub open_price: f64, // Open price (auto-converted from string)
 
     #[serde(rename = "c")]
-    #[serde_as(as = "DisplayFromStr")]
+    #[serde_as(as = "FastDecimal")]
     pub close_price: f64, // Close price (auto-converted from string)
 
     #[serde(rename = "h")]
-    #[serde_as(as = "DisplayFromStr")]
+    #[serde_as(as = "FastDecimal")]
     pub high_price: f64, // High price (auto-converted from string)
 
     #[serde(rename = "l")]
-    #[serde_as(as = "DisplayFromStr")]
+    #[serde_as(as = "FastDecimal")]
     pub low_price: f64, // Low price (auto-converted from string)
 
     #[serde(rename = "v")]
-    #[serde_as(as = "DisplayFromStr")]
+    #[serde_as(as = "FastDecimal")]
     pub base_volume: f64, // Base asset volume (auto-converted from string)
 
     #[serde(rename = "n")]
@@ -153,15 +155,15 @@ pub struct KlineInfo {
     pub is_closed: bool, // Is this kline closed?
 
     #[serde(rename = "q")]
-    #[serde_as(as = "DisplayFromStr")]
+    #[serde_as(as = "FastDecimal")]
     pub quote_volume: f64, // Quote asset volume (auto-converted from string)
 
     #[serde(rename = "V")]
-    #[serde_as(as = "DisplayFromStr")]
+    #[serde_as(as = "FastDecimal")]
     pub taker_buy_base_volume: f64, // Taker buy base asset volume (auto-converted from string)
 
     #[serde(rename = "Q")]
-    #[serde_as(as = "DisplayFromStr")]
+    #[serde_as(as = "FastDecimal")]
     pub taker_buy_quote_volume: f64, // Taker buy quote asset volume (auto-converted from string)
 
     #[serde(rename = "B")]
@@ -299,19 +301,19 @@ pub struct BookTickerData {
     #[serde(rename = "s")]
     pub symbol: TradingSymbol, // symbol
     
-    #[serde_as(as = "DisplayFromStr")]
+    #[serde_as(as = "FastDecimal")]
     #[serde(rename = "b")]
     pub best_bid_price: f64, // best bid price (auto-converted from string)
     
-    #[serde_as(as = "DisplayFromStr")]
+    #[serde_as(as = "FastDecimal")]
     #[serde(rename = "B")]
     pub best_bid_qty: f64, // best bid qty (auto-converted from string)
     
-    #[serde_as(as = "DisplayFromStr")]
+    #[serde_as(as = "FastDecimal")]
     #[serde(rename = "a")]
     pub best_ask_price: f64, // best ask price (auto-converted from string)
     
-    #[serde_as(as = "DisplayFromStr")]
+    #[serde_as(as = "FastDecimal")]
     #[serde(rename = "A")]
     pub best_ask_qty: f64, // best ask qty (auto-converted from string)
 }
@@ -335,11 +337,11 @@ pub struct BinanceTradeData {
     #[serde(rename = "t")]
     pub trade_id: u64, // 交易ID
     
-    #[serde_as(as = "DisplayFromStr")]
+    #[serde_as(as = "FastDecimal")]
     #[serde(rename = "p")]
     pub price: f64, // 成交价格 (auto-converted from string)
     
-    #[serde_as(as = "DisplayFromStr")]
+    #[serde_as(as = "FastDecimal")]
     #[serde(rename = "q")]
     pub quantity: f64, // 成交数量 (auto-converted from string)
     
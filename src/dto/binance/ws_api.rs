@@ -0,0 +1,43 @@
+use crate::dto::binance::rest_api::BinanceErrorResponse;
+use serde::{Deserialize, Serialize};
+use std::collections::BTreeMap;
+
+/// 币安 WebSocket API（ws-fapi）请求
+///
+/// `id` 由客户端分配，响应原样带回，用于在同一连接上匹配并发请求。
+/// `params` 使用 BTreeMap，序列化和签名时参数已按字母顺序排列。
+#[derive(Debug, Clone, Serialize)]
+pub struct WsApiRequest<'a> {
+    pub id: u64,
+    pub method: &'a str,
+    pub params: &'a BTreeMap<String, String>,
+}
+
+/// 币安 WebSocket API 响应
+///
+/// 成功时 `status` 为 200 且带 `result`，失败时带 `error`（与 REST 的错误结构相同）。
+/// 请求格式错误时交易所可能返回 `id: null`。
+#[derive(Debug, Clone, Deserialize)]
+pub struct WsApiResponse {
+    #[serde(default)]
+    pub id: Option<u64>,
+    pub status: u16,
+    #[serde(default)]
+    pub result: Option<serde_json::Value>,
+    #[serde(default)]
+    pub error: Option<BinanceErrorResponse>,
+}
+
+impl WsApiResponse {
+    /// 取出结果：失败响应返回交易所错误
+    pub fn into_result(self) -> Result<serde_json::Value, BinanceErrorResponse> {
+        match (self.status, self.result, self.error) {
+            (200, Some(result), _) => Ok(result),
+            (_, _, Some(error)) => Err(error),
+            (status, _, None) => Err(BinanceErrorResponse {
+                code: -(status as i32),
+                msg: format!("ws-fapi 响应缺少结果: status={}", status),
+            }),
+        }
+    }
+}
@@ -1,3 +1,4 @@
+use crate::common::signer::SignedQuery;
 use serde::{Deserialize, Serialize};
 
 /// MEXC 订单类型枚举
@@ -16,6 +17,25 @@ pub enum MexcOrderSide {
     Sell,
 }
 
+impl MexcOrderType {
+    /// 下单参数中的取值，与 serde 序列化结果相同
+    pub fn as_str(&self) -> &'static str {
+        match self {
+            MexcOrderType::Limit => "LIMIT",
+            MexcOrderType::Market => "MARKET",
+        }
+    }
+}
+
+impl MexcOrderSide {
+    pub fn as_str(&self) -> &'static str {
+        match self {
+            MexcOrderSide::Buy => "BUY",
+            MexcOrderSide::Sell => "SELL",
+        }
+    }
+}
+
 /// MEXC 下单请求
 #[derive(Debug, Clone)]
 pub struct MexcOrderRequest {
@@ -118,6 +138,26 @@ impl MexcOrderRequest {
         
         params
     }
+
+    /// 按键名升序把下单参数写入签名查询串，不经过 HashMap
+    pub fn write_params(&self, query: &mut SignedQuery) {
+        let timestamp = self.timestamp.unwrap_or_else(|| {
+            std::time::SystemTime::now()
+                .duration_since(std::time::UNIX_EPOCH)
+                .unwrap()
+                .as_millis() as u64
+        });
+        query
+            .push_opt("newClientOrderId", self.new_client_order_id.as_deref())
+            .push_opt("price", self.price.as_deref())
+            .push_opt("quantity", self.quantity.as_deref())
+            .push_opt("quoteOrderQty", self.quote_order_qty.as_deref())
+            .push("recvWindow", self.recv_window.unwrap_or(60000))
+            .push("side", self.side.as_str())
+            .push("symbol", &self.symbol)
+            .push("timestamp", timestamp)
+            .push("type", self.order_type.as_str());
+    }
 }
 
 /// MEXC User Data Stream - 创建 listenKey 响应
@@ -1,9 +1,12 @@
 use crate::common::consts::ASTER_FUTURES_URL;
-use crate::common::utils::generate_hmac_signature;
+use crate::common::signer::{canonical_query, RequestSigner, SignedQuery};
+use crate::exchange_api::aster::order_template::{batch_order_fields, BatchOrderTemplate, OrderTemplate, MAX_BATCH_ORDERS};
 use crate::dto::aster::rest_api::{
     OrderType, OrderSide,
     OrderRequest, OrderResponse, BatchOrderResponseItem, BatchOrderResult
 };
+use crate::dto::binance::rest_api::ExchangeInfo;
+use crate::models::SymbolFilterCache;
 use anyhow::Result;
 use reqwest::Client;
 use serde_json;
@@ -19,7 +22,7 @@ pub struct AsterFuturesApi {
     pub base_url: String,
     client: Client,
     api_key: String,
-    secret_key: String,
+    signer: RequestSigner,
 }
 
 impl AsterFuturesApi {
@@ -29,7 +32,7 @@ impl AsterFuturesApi {
             base_url: ASTER_FUTURES_URL.to_string(),
             client: Client::new(),
             api_key,
-            secret_key,
+            signer: RequestSigner::new(&secret_key),
         }
     }
 
@@ -41,16 +44,35 @@ impl AsterFuturesApi {
             .as_millis() as u64
     }
 
-    /// 构建查询字符串
+    /// 构建查询字符串（ASTER 要求参数按字母顺序排序）
     pub fn build_query_string(&self, params: &HashMap<String, String>) -> String {
-        let mut pairs: Vec<String> = params.iter().map(|(k, v)| format!("{}={}", k, v)).collect();
-        pairs.sort(); // ASTER 要求参数按字母顺序排序
-        pairs.join("&")
+        canonical_query(params)
     }
 
     /// 生成签名
     pub fn generate_signature(&self, query_string: &str) -> String {
-        generate_hmac_signature(query_string, &self.secret_key)
+        self.signer.sign(query_string.as_bytes()).to_string()
+    }
+
+    /// 获取交易规则（公开接口，无需签名），格式与币安 exchangeInfo 相同
+    pub async fn get_exchange_info(&self) -> Result<ExchangeInfo> {
+        let url = format!("{}/fapi/v1/exchangeInfo", self.base_url);
+        let response = self.client.get(&url).send().await?;
+        if !response.status().is_success() {
+            let error_text = response.text().await?;
+            return Err(anyhow::anyhow!("Exchange info request failed: {}", error_text));
+        }
+
+        let info: ExchangeInfo = response.json().await?;
+        Ok(info)
+    }
+
+    /// 加载 ASTER 交易对过滤器缓存
+    ///
+    /// 本地 `exchange_info.json` 是币安的交易规则，不能代替 ASTER 的，请求失败时直接返回错误。
+    pub async fn load_symbol_filters(&self) -> Result<SymbolFilterCache> {
+        let info = self.get_exchange_info().await?;
+        Ok(SymbolFilterCache::from_exchange_info(&info))
     }
 
     /// 批量下单
@@ -85,106 +107,60 @@ impl AsterFuturesApi {
         if orders.is_empty() {
             return Err(anyhow::anyhow!("订单列表不能为空"));
         }
-        if orders.len() > 5 {
-            return Err(anyhow::anyhow!("批量订单最多支持5个订单，当前: {}", orders.len()));
+        if orders.len() > MAX_BATCH_ORDERS {
+            return Err(anyhow::anyhow!("批量订单最多支持{}个订单，当前: {}", MAX_BATCH_ORDERS, orders.len()));
         }
 
-        // 构建批量订单参数
-        let mut params = HashMap::new();
-        
         // 将订单列表转换为 ASTER API 期望的格式
-        let mut aster_orders = Vec::new();
+        let mut aster_orders = Vec::with_capacity(orders.len());
         for order in &orders {
-            let mut aster_order = HashMap::new();
-            
-            // 必需参数
-            aster_order.insert("symbol".to_string(), order.symbol.clone());
-            aster_order.insert("side".to_string(), serde_json::to_string(&order.side)?.trim_matches('"').to_string());
-            aster_order.insert("type".to_string(), serde_json::to_string(&order.order_type)?.trim_matches('"').to_string());
-            
-            // 可选参数
-            if let Some(ref position_side) = order.position_side {
-                aster_order.insert("positionSide".to_string(), position_side.clone());
-            }
-            
-            if let Some(ref time_in_force) = order.time_in_force {
-                aster_order.insert("timeInForce".to_string(), serde_json::to_string(time_in_force)?.trim_matches('"').to_string());
-            }
-            
-            if let Some(ref quantity) = order.quantity {
-                aster_order.insert("quantity".to_string(), quantity.clone());
-            }
-            
-            if let Some(ref reduce_only) = order.reduce_only {
-                aster_order.insert("reduceOnly".to_string(), reduce_only.clone());
-            }
-            
-            if let Some(ref price) = order.price {
-                aster_order.insert("price".to_string(), price.clone());
-            }
-            
-            if let Some(ref new_client_order_id) = order.new_client_order_id {
-                aster_order.insert("newClientOrderId".to_string(), new_client_order_id.clone());
-            }
-            
-            if let Some(ref stop_price) = order.stop_price {
-                aster_order.insert("stopPrice".to_string(), stop_price.clone());
-            }
-            
-            if let Some(ref activation_price) = order.activation_price {
-                aster_order.insert("activationPrice".to_string(), activation_price.clone());
-            }
-            
-            if let Some(ref callback_rate) = order.callback_rate {
-                aster_order.insert("callbackRate".to_string(), callback_rate.clone());
-            }
-            
-            if let Some(ref working_type) = order.working_type {
-                aster_order.insert("workingType".to_string(), working_type.clone());
-            }
-            
-            if let Some(ref price_protect) = order.price_protect {
-                aster_order.insert("priceProtect".to_string(), price_protect.clone());
-            }
-            
-            if let Some(ref new_order_resp_type) = order.new_order_resp_type {
-                aster_order.insert("newOrderRespType".to_string(), new_order_resp_type.clone());
-            }
-            
+            let aster_order: HashMap<&str, String> = batch_order_fields(order)?.into_iter().collect();
             aster_orders.push(aster_order);
         }
         
         // 将 ASTER 格式的订单转换为JSON字符串
         let batch_orders_json = serde_json::to_string(&aster_orders)?;
         
-        // 对JSON字符串进行URL编码
+        // 对JSON字符串进行URL编码，按 batchOrders / recvWindow / timestamp 顺序签名
         let encoded_batch_orders = urlencoding::encode(&batch_orders_json);
-        params.insert("batchOrders".to_string(), encoded_batch_orders.to_string());
-        
-        // 添加时间戳和接收窗口
-        let timestamp = Self::get_timestamp();
-        params.insert("timestamp".to_string(), timestamp.to_string());
-        params.insert(
-            "recvWindow".to_string(),
-            recv_window.unwrap_or(60000).to_string(),
-        );
-
-        // 构建查询字符串
-        let query_string = self.build_query_string(&params);
-
-        // 生成签名
-        let signature = self.generate_signature(&query_string);
-
-        // 构建完整 URL
-        let url = format!(
-            "{}/fapi/v1/batchOrders?{}&signature={}",
-            self.base_url, query_string, signature
-        );
+        let mut query = SignedQuery::url(&self.base_url, "/fapi/v1/batchOrders?");
+        query
+            .push("batchOrders", &encoded_batch_orders)
+            .push("recvWindow", recv_window.unwrap_or(60000))
+            .push("timestamp", Self::get_timestamp());
+        let url = query.sign(&self.signer);
+
+        self.send_batch_orders(url, orders.len()).await
+    }
+
+    /// 创建预编码的批量下单模板（启动时调用一次）
+    pub fn batch_order_template(&self, orders: &[OrderTemplate], price_scale: u32) -> Result<BatchOrderTemplate> {
+        BatchOrderTemplate::new(&self.base_url, orders, price_scale)
+    }
+
+    /// 按模板批量下单：只填入价格 tick 和时间戳后签名发送
+    ///
+    /// # Arguments
+    /// * `template` - `batch_order_template` 创建的模板，URL 缓冲区在多次下单间复用
+    /// * `price_ticks` - 各价格槽的整数 tick，按订单顺序
+    /// * `recv_window` - 接收窗口时间（可选，默认60000ms）
+    pub async fn batch_orders_from_template(
+        &self,
+        template: &mut BatchOrderTemplate,
+        price_ticks: &[u64],
+        recv_window: Option<u64>,
+    ) -> Result<BatchOrderResult> {
+        let total = template.len();
+        let url = template.sign(price_ticks, Self::get_timestamp(), recv_window.unwrap_or(60000), &self.signer)?;
+        self.send_batch_orders(url, total).await
+    }
 
+    /// 发送已签名的批量下单请求并解析混合响应
+    async fn send_batch_orders(&self, url: &str, total: usize) -> Result<BatchOrderResult> {
         // 发送请求
         let response = self
             .client
-            .post(&url)
+            .post(url)
             .header("X-MBX-APIKEY", &self.api_key)
             .send()
             .await?;
@@ -208,7 +184,7 @@ impl AsterFuturesApi {
         let response_items: Vec<BatchOrderResponseItem> = serde_json::from_str(&response_text)?;
         
         // 处理混合响应
-        let mut result = BatchOrderResult::new(orders.len());
+        let mut result = BatchOrderResult::new(total);
         
         for (index, item) in response_items.iter().enumerate() {
             match item {
@@ -288,36 +264,18 @@ impl AsterFuturesApi {
         symbol: &str,
         recv_window: Option<u64>,
     ) -> Result<()> {
-        // 构建请求参数
-        let mut params = HashMap::new();
-        
-        // 必需参数
-        params.insert("symbol".to_string(), symbol.to_string());
-        params.insert("timestamp".to_string(), Self::get_timestamp().to_string());
-        
-        // 可选参数
-        if let Some(window) = recv_window {
-            params.insert("recvWindow".to_string(), window.to_string());
-        } else {
-            params.insert("recvWindow".to_string(), "60000".to_string());
-        }
-
-        // 构建查询字符串
-        let query_string = self.build_query_string(&params);
-
-        // 生成签名
-        let signature = self.generate_signature(&query_string);
-
-        // 构建完整 URL
-        let url = format!(
-            "{}/fapi/v1/allOpenOrders?{}&signature={}",
-            self.base_url, query_string, signature
-        );
+        // 参数按规范顺序直接写入 URL 缓冲区并签名
+        let mut query = SignedQuery::url(&self.base_url, "/fapi/v1/allOpenOrders?");
+        query
+            .push("recvWindow", recv_window.unwrap_or(60000))
+            .push("symbol", symbol)
+            .push("timestamp", Self::get_timestamp());
+        let url = query.sign(&self.signer);
 
         // 发送DELETE请求
         let response = self
             .client
-            .delete(&url)
+            .delete(url)
             .header("X-MBX-APIKEY", &self.api_key)
             .send()
             .await?;
@@ -431,50 +389,32 @@ impl AsterFuturesApi {
         let total_orders = order_id_list.as_ref().map(|v| v.len()).unwrap_or(0) +
             orig_client_order_id_list.as_ref().map(|v| v.len()).unwrap_or(0);
 
-        // 构建请求参数
-        let mut params = HashMap::new();
-        
-        // 必需参数
-        params.insert("symbol".to_string(), symbol.to_string());
-        params.insert("timestamp".to_string(), Self::get_timestamp().to_string());
-        
-        // 可选参数
-        if let Some(ref order_ids) = order_id_list {
-            // 将订单ID列表转换为JSON数组字符串，然后URL编码
-            let order_ids_json = serde_json::to_string(order_ids)?;
-            let encoded_order_ids = urlencoding::encode(&order_ids_json);
-            params.insert("orderIdList".to_string(), encoded_order_ids.to_string());
-        }
-
-        if let Some(ref client_order_ids) = orig_client_order_id_list {
-            // 将客户端订单ID列表转换为JSON数组字符串，然后URL编码
-            let client_order_ids_json = serde_json::to_string(client_order_ids)?;
-            let encoded_client_order_ids = urlencoding::encode(&client_order_ids_json);
-            params.insert("origClientOrderIdList".to_string(), encoded_client_order_ids.to_string());
-        }
-
-        if let Some(window) = recv_window {
-            params.insert("recvWindow".to_string(), window.to_string());
-        } else {
-            params.insert("recvWindow".to_string(), "60000".to_string());
-        }
-
-        // 构建查询字符串
-        let query_string = self.build_query_string(&params);
-
-        // 生成签名
-        let signature = self.generate_signature(&query_string);
-
-        // 构建完整 URL
-        let url = format!(
-            "{}/fapi/v1/batchOrders?{}&signature={}",
-            self.base_url, query_string, signature
-        );
+        // 订单ID列表转换为JSON数组字符串后URL编码
+        let encoded_order_ids = match order_id_list {
+            Some(ref order_ids) => Some(urlencoding::encode(&serde_json::to_string(order_ids)?).into_owned()),
+            None => None,
+        };
+        let encoded_client_order_ids = match orig_client_order_id_list {
+            Some(ref client_order_ids) => {
+                Some(urlencoding::encode(&serde_json::to_string(client_order_ids)?).into_owned())
+            }
+            None => None,
+        };
+
+        // 参数按规范顺序直接写入 URL 缓冲区并签名
+        let mut query = SignedQuery::url(&self.base_url, "/fapi/v1/batchOrders?");
+        query
+            .push_opt("orderIdList", encoded_order_ids.as_deref())
+            .push_opt("origClientOrderIdList", encoded_client_order_ids.as_deref())
+            .push("recvWindow", recv_window.unwrap_or(60000))
+            .push("symbol", symbol)
+            .push("timestamp", Self::get_timestamp());
+        let url = query.sign(&self.signer);
 
         // 发送DELETE请求
         let response = self
             .client
-            .delete(&url)
+            .delete(url)
             .header("X-MBX-APIKEY", &self.api_key)
             .send()
             .await?;
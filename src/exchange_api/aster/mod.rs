@@ -1,7 +1,9 @@
 pub mod ws;
 pub mod client;
 pub mod api;
+pub mod order_template;
 
 pub use ws::client::AsterWebSocket;
 pub use api::AsterFuturesApi;
+pub use order_template::{BatchOrderTemplate, OrderTemplate, PriceSlot};
 
@@ -0,0 +1,263 @@
+use crate::common::decimal::write_fixed;
+use crate::common::signer::{RequestSigner, SignedQuery};
+use crate::dto::aster::rest_api::OrderRequest;
+use anyhow::Result;
+use std::fmt;
+
+/// 批量下单接口单次最多订单数
+pub const MAX_BATCH_ORDERS: usize = 5;
+
+/// 触发时才填入的价格字段
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub enum PriceSlot {
+    Price,
+    StopPrice,
+}
+
+impl PriceSlot {
+    fn key(self) -> &'static str {
+        match self {
+            PriceSlot::Price => "price",
+            PriceSlot::StopPrice => "stopPrice",
+        }
+    }
+}
+
+/// 单个订单模板：symbol / side / type / quantity / reduceOnly 等在启动时固定，
+/// 可选一个价格字段留到触发时填入
+#[derive(Debug, Clone)]
+pub struct OrderTemplate {
+    order: OrderRequest,
+    slot: Option<PriceSlot>,
+}
+
+impl OrderTemplate {
+    /// 以 `order` 的全部字段为固定部分
+    pub fn new(order: OrderRequest) -> Self {
+        Self { order, slot: None }
+    }
+
+    /// 触发时填入 `slot` 对应的价格，`order` 中该字段的取值被忽略
+    pub fn with_slot(mut self, slot: PriceSlot) -> Self {
+        self.slot = Some(slot);
+        self
+    }
+}
+
+/// 批量订单 JSON 的字段（启动时和非模板下单共用，保证两条路径发送的字段相同）
+pub(crate) fn batch_order_fields(order: &OrderRequest) -> Result<Vec<(&'static str, String)>> {
+    let mut fields = vec![
+        ("symbol", order.symbol.clone()),
+        ("side", serde_json::to_string(&order.side)?.trim_matches('"').to_string()),
+        ("type", serde_json::to_string(&order.order_type)?.trim_matches('"').to_string()),
+    ];
+    if let Some(ref position_side) = order.position_side {
+        fields.push(("positionSide", position_side.clone()));
+    }
+    if let Some(ref time_in_force) = order.time_in_force {
+        fields.push(("timeInForce", serde_json::to_string(time_in_force)?.trim_matches('"').to_string()));
+    }
+    let optional = [
+        ("quantity", &order.quantity),
+        ("reduceOnly", &order.reduce_only),
+        ("price", &order.price),
+        ("newClientOrderId", &order.new_client_order_id),
+        ("stopPrice", &order.stop_price),
+        ("activationPrice", &order.activation_price),
+        ("callbackRate", &order.callback_rate),
+        ("workingType", &order.working_type),
+        ("priceProtect", &order.price_protect),
+        ("newOrderRespType", &order.new_order_resp_type),
+    ];
+    for (key, value) in optional {
+        if let Some(value) = value {
+            fields.push((key, value.clone()));
+        }
+    }
+    Ok(fields)
+}
+
+/// 预编码的批量下单模板
+///
+/// 启动时把 `batchOrders` 的 JSON 按价格字段切成若干段并提前 URL 编码，
+/// 触发时只把整数 tick 按固定小数位写进段与段之间，再追加 recvWindow / timestamp 签名。
+/// 价格只含数字和小数点，URL 编码后不变，所以拼接结果与先拼 JSON 再整体编码相同。
+/// URL 缓冲区由模板持有并复用，热路径上没有 HashMap、JSON 序列化和额外的字符串分配。
+#[derive(Debug, Clone)]
+pub struct BatchOrderTemplate {
+    url_prefix: String,
+    /// 已 URL 编码的固定片段，比价格槽多一段
+    segments: Vec<String>,
+    orders: usize,
+    price_scale: u32,
+    query: SignedQuery,
+}
+
+impl BatchOrderTemplate {
+    /// `price_scale` 为价格的小数位数（交易对的 price_precision）
+    pub fn new(base_url: &str, orders: &[OrderTemplate], price_scale: u32) -> Result<Self> {
+        if orders.is_empty() {
+            return Err(anyhow::anyhow!("订单列表不能为空"));
+        }
+        if orders.len() > MAX_BATCH_ORDERS {
+            return Err(anyhow::anyhow!("批量订单最多支持{}个订单，当前: {}", MAX_BATCH_ORDERS, orders.len()));
+        }
+
+        let mut segments = Vec::new();
+        let mut json = String::from("[");
+        for (index, template) in orders.iter().enumerate() {
+            if index > 0 {
+                json.push(',');
+            }
+            json.push('{');
+            let slot_key = template.slot.map(PriceSlot::key);
+            let mut first = true;
+            for (key, value) in batch_order_fields(&template.order)? {
+                if Some(key) == slot_key {
+                    continue;
+                }
+                if !first {
+                    json.push(',');
+                }
+                first = false;
+                json.push_str(&serde_json::to_string(key)?);
+                json.push(':');
+                json.push_str(&serde_json::to_string(&value)?);
+            }
+            if let Some(key) = slot_key {
+                if !first {
+                    json.push(',');
+                }
+                json.push_str(&serde_json::to_string(key)?);
+                json.push_str(":\"");
+                segments.push(urlencoding::encode(&json).into_owned());
+                json.clear();
+                json.push('"');
+            }
+            json.push('}');
+        }
+        json.push(']');
+        segments.push(urlencoding::encode(&json).into_owned());
+
+        let url_prefix = format!("{}/fapi/v1/batchOrders?", base_url);
+        let capacity = url_prefix.len() + segments.iter().map(String::len).sum::<usize>() + 256;
+        let mut query = SignedQuery::new("");
+        query.reserve(capacity);
+        Ok(Self {
+            url_prefix,
+            segments,
+            orders: orders.len(),
+            price_scale,
+            query,
+        })
+    }
+
+    /// 模板中的订单数
+    pub fn len(&self) -> usize {
+        self.orders
+    }
+
+    pub fn is_empty(&self) -> bool {
+        self.orders == 0
+    }
+
+    /// 需要填入的价格个数（按订单顺序）
+    pub fn slots(&self) -> usize {
+        self.segments.len() - 1
+    }
+
+    /// 填入价格 tick 和时间戳并签名，返回完整 URL
+    pub fn sign(&mut self, price_ticks: &[u64], timestamp: u64, recv_window: u64, signer: &RequestSigner) -> Result<&str> {
+        if price_ticks.len() != self.slots() {
+            return Err(anyhow::anyhow!("模板需要{}个价格，实际: {}", self.slots(), price_ticks.len()));
+        }
+        let batch = RenderedBatch {
+            segments: &self.segments,
+            price_ticks,
+            price_scale: self.price_scale,
+        };
+        self.query
+            .reset(&self.url_prefix)
+            .push("batchOrders", batch)
+            .push("recvWindow", recv_window)
+            .push("timestamp", timestamp);
+        Ok(self.query.sign(signer))
+    }
+}
+
+/// 固定片段与价格交替写出，直接进入 `SignedQuery` 的缓冲区
+struct RenderedBatch<'a> {
+    segments: &'a [String],
+    price_ticks: &'a [u64],
+    price_scale: u32,
+}
+
+impl fmt::Display for RenderedBatch<'_> {
+    fn fmt(&self, f: &mut fmt::Formatter<'_>) -> fmt::Result {
+        for (segment, &ticks) in self.segments.iter().zip(self.price_ticks) {
+            f.write_str(segment)?;
+            write_fixed(f, ticks, self.price_scale)?;
+        }
+        f.write_str(&self.segments[self.segments.len() - 1])
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use crate::dto::aster::rest_api::{OrderSide, OrderType};
+    use std::collections::HashMap;
+
+    fn decoded_batch(url: &str) -> Vec<HashMap<String, String>> {
+        let query = url.split_once('?').unwrap().1;
+        let encoded = query.strip_prefix("batchOrders=").unwrap().split('&').next().unwrap();
+        serde_json::from_str(&urlencoding::decode(encoded).unwrap()).unwrap()
+    }
+
+    #[test]
+    fn test_template_patches_stop_price() {
+        let signer = RequestSigner::new("secret");
+        let entry = OrderTemplate::new(OrderRequest {
+            symbol: "ASTERUSDT".to_string(),
+            side: OrderSide::Buy,
+            order_type: OrderType::Market,
+            quantity: Some("10".to_string()),
+            ..Default::default()
+        });
+        let stop = OrderTemplate::new(OrderRequest {
+            symbol: "ASTERUSDT".to_string(),
+            side: OrderSide::Sell,
+            order_type: OrderType::StopMarket,
+            quantity: Some("10".to_string()),
+            reduce_only: Some("true".to_string()),
+            ..Default::default()
+        })
+        .with_slot(PriceSlot::StopPrice);
+
+        let mut template = BatchOrderTemplate::new("https://fapi.asterdex.com", &[entry, stop], 5).unwrap();
+        assert_eq!(template.len(), 2);
+        assert_eq!(template.slots(), 1);
+
+        let url = template.sign(&[123_450], 1_700_000_000_000, 60000, &signer).unwrap().to_string();
+        assert!(url.starts_with("https://fapi.asterdex.com/fapi/v1/batchOrders?batchOrders="));
+
+        let orders = decoded_batch(&url);
+        assert_eq!(orders[0]["side"], "BUY");
+        assert_eq!(orders[0]["type"], "MARKET");
+        assert_eq!(orders[0]["quantity"], "10");
+        assert!(!orders[0].contains_key("stopPrice"));
+        assert_eq!(orders[1]["type"], "STOP_MARKET");
+        assert_eq!(orders[1]["reduceOnly"], "true");
+        assert_eq!(orders[1]["stopPrice"], "1.23450");
+
+        // 签名覆盖 URL 中 ? 之后、signature 之前的全部参数
+        let (query, signature) = url.split_once('?').unwrap().1.rsplit_once("&signature=").unwrap();
+        assert!(query.ends_with("&recvWindow=60000&timestamp=1700000000000"));
+        assert_eq!(signature, signer.sign(query.as_bytes()).as_str());
+
+        // 复用缓冲区再次触发，只有价格和时间戳变化
+        let url = template.sign(&[120_000], 1_700_000_000_001, 60000, &signer).unwrap().to_string();
+        assert_eq!(decoded_batch(&url)[1]["stopPrice"], "1.20000");
+        assert!(template.sign(&[], 0, 60000, &signer).is_err());
+    }
+}
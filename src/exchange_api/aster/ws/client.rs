@@ -3,8 +3,8 @@ use crate::dto::aster::websocket::AsterBookTickerData;
 use crate::websocket_log;
 use anyhow::Result;
 use futures::{StreamExt, SinkExt};
-use serde::Deserialize;
-use serde_json;
+use crate::common::json::decode_json;
+use crate::dto::binance::combined_stream::{decode_data, split_frame};
 use tokio::sync::mpsc;
 use tokio::time::{Duration, interval};
 use tokio_tungstenite::{connect_async, tungstenite::protocol::Message};
@@ -83,7 +83,7 @@ impl AsterWebSocket {
         while let Some(msg) = read.next().await {
             match msg? {
                 Message::Text(text) => {
-                    if let Ok(data) = serde_json::from_str::<AsterBookTickerData>(&text) {
+                    if let Ok(data) = decode_json::<AsterBookTickerData>(&text) {
                         if let Err(e) = tx.send(data) {
                             websocket_log!(warn, "Failed to send book ticker message: {}", e);
                             break;
@@ -162,38 +162,16 @@ impl AsterWebSocket {
             }
         });
 
-        // 处理组合stream的格式: {"stream":"<streamName>","data":<rawPayload>}
-        #[derive(Deserialize)]
-        struct StreamWrapper {
-            #[serde(rename = "stream")]
-            _stream: String, // stream名称，解析时使用但不实际使用
-            data: serde_json::Value,
-        }
-
         while let Some(msg) = read.next().await {
             match msg? {
                 Message::Text(text) => {
-                    // 尝试解析为组合stream格式
-                    if let Ok(wrapper) = serde_json::from_str::<StreamWrapper>(&text) {
-                        // 提取实际的payload数据
-                        if let Ok(data) = serde_json::from_value::<AsterBookTickerData>(wrapper.data) {
-                            if let Err(e) = tx.send(data) {
-                                websocket_log!(warn, "Failed to send book ticker message: {}", e);
-                                break;
-                            }
-                        } else {
-                            websocket_log!(warn, "Failed to parse book ticker data from wrapper: {}", text);
+                    if let Ok(data) = decode_book_ticker_frame(&text) {
+                        if let Err(e) = tx.send(data) {
+                            websocket_log!(warn, "Failed to send book ticker message: {}", e);
+                            break;
                         }
                     } else {
-                        // 如果不是组合stream格式，尝试直接解析
-                        if let Ok(data) = serde_json::from_str::<AsterBookTickerData>(&text) {
-                            if let Err(e) = tx.send(data) {
-                                websocket_log!(warn, "Failed to send book ticker message: {}", e);
-                                break;
-                            }
-                        } else {
-                            websocket_log!(warn, "Failed to parse book ticker message: {}", text);
-                        }
+                        websocket_log!(warn, "Failed to parse book ticker message: {}", text);
                     }
                 }
                 Message::Close(_) => {
@@ -217,3 +195,34 @@ impl AsterWebSocket {
     }
 }
 
+/// 解析组合 stream 推送的 bookTicker
+///
+/// 格式: {"stream":"<streamName>","data":<rawPayload>}。紧凑布局下前缀扫描取出 data 的原始 JSON，
+/// 直接交给全局解码后端解析为 DTO；其他布局按类型化的 data 字段解析，不经过中间的 `serde_json::Value`。
+/// 不带外层包装的裸推送也能解析。
+fn decode_book_ticker_frame(text: &str) -> serde_json::Result<AsterBookTickerData> {
+    match split_frame(text) {
+        Some((_, data)) => decode_json(data),
+        None => decode_data(text).or_else(|_| decode_json(text)),
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    const PAYLOAD: &str = r#"{"e":"bookTicker","u":400900217,"E":1568014460893,"T":1568014460891,"s":"BTCUSDT","b":"25.35190000","B":"31.21000000","a":"25.36520000","A":"40.66000000"}"#;
+
+    #[test]
+    fn test_decode_book_ticker_frame() {
+        let compact = format!(r#"{{"stream":"btcusdt@bookTicker","data":{}}}"#, PAYLOAD);
+        let reordered = format!(r#"{{"data":{}, "stream":"btcusdt@bookTicker"}}"#, PAYLOAD);
+        for text in [compact.as_str(), reordered.as_str(), PAYLOAD] {
+            let data = decode_book_ticker_frame(text).unwrap();
+            assert_eq!(data.order_book_update_id, 400900217);
+            assert_eq!(data.best_bid_price, 25.3519);
+        }
+
+        assert!(decode_book_ticker_frame(r#"{"result":null,"id":1}"#).is_err());
+    }
+}
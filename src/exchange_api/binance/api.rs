@@ -1,26 +1,37 @@
+use crate::common::config::user_config::OrderTransport;
 use crate::common::consts::BINANCE_FUTURES_URL;
-use crate::common::utils::generate_hmac_signature;
-use crate::models::{TradingSignal, Signal, MarketSignal, Side};
+use crate::common::latency::LatencyStats;
+use crate::common::signer::{canonical_query, RequestSigner, SignedQuery};
+use crate::exchange_api::binance::ws_api::BinanceWsApi;
+use crate::models::{symbol_filters, SymbolFilterCache, TradingSignal, Signal, MarketSignal, Side};
 use crate::dto::binance::rest_api::{
     OrderType, OrderSide, TimeInForce, KlineRequest, KlineResponse,
-    OrderRequest, OrderResponse, BatchOrderResponseItem, BatchOrderResult
+    OrderRequest, OrderResponse, BatchOrderResponseItem, BatchOrderResult, DepthSnapshot, ExchangeInfo
 };
 use anyhow::Result;
 use reqwest::Client;
 use serde_json;
 use std::collections::HashMap;
-use std::time::{SystemTime, UNIX_EPOCH};
+use std::sync::Arc;
+use std::time::{Instant, SystemTime, UNIX_EPOCH};
 
 // 导入日志宏
 use crate::{order_log, error_log};
 
 /// 币安期货 API 客户端
+///
+/// 下单默认走 REST；挂上 `BinanceWsApi` 后 `new_order` 和批量下单改走 ws-fapi 长连接，
+/// 连接断开期间自动退回 REST，后台重连成功后恢复 ws-fapi。行情、撤单等其余接口始终走 REST。
+/// 克隆出的客户端共享同一份平仓延迟统计。
 #[derive(Debug, Clone)]
 pub struct BinanceFuturesApi {
     pub base_url: String,
     client: Client,
     api_key: String,
     secret_key: String,
+    signer: RequestSigner,
+    ws_api: Option<Arc<BinanceWsApi>>,
+    exit_latency: Arc<LatencyStats>,
 }
 
 impl BinanceFuturesApi {
@@ -30,7 +41,52 @@ impl BinanceFuturesApi {
             base_url: BINANCE_FUTURES_URL.to_string(),
             client: Client::new(),
             api_key,
+            signer: RequestSigner::new(&secret_key),
             secret_key,
+            ws_api: None,
+            exit_latency: Arc::new(LatencyStats::default()),
+        }
+    }
+
+    /// 下单改走已连接的 ws-fapi 客户端
+    pub fn with_ws_api(mut self, ws_api: Arc<BinanceWsApi>) -> Self {
+        self.ws_api = Some(ws_api);
+        self
+    }
+
+    /// 按配置选择下单通道，`WebSocket` 时使用本客户端的密钥建立 ws-fapi 连接
+    pub async fn with_order_transport(self, transport: OrderTransport) -> Result<Self> {
+        match transport {
+            OrderTransport::Rest => Ok(self),
+            OrderTransport::WebSocket => {
+                let ws_api = BinanceWsApi::connect(self.api_key.clone(), self.secret_key.clone()).await?;
+                order_log!(info, "🔌 下单通道: ws-fapi");
+                Ok(self.with_ws_api(Arc::new(ws_api)))
+            }
+        }
+    }
+
+    /// 平仓延迟统计：从发出平仓单到收到回报的耗时
+    pub fn exit_latency(&self) -> Arc<LatencyStats> {
+        Arc::clone(&self.exit_latency)
+    }
+
+    /// 当前实际使用的下单通道（ws-fapi 断开时为 REST）
+    pub fn order_transport(&self) -> OrderTransport {
+        match &self.ws_api {
+            Some(ws_api) if ws_api.is_connected() => OrderTransport::WebSocket,
+            _ => OrderTransport::Rest,
+        }
+    }
+
+    /// 可用的 ws-fapi 客户端；挂了客户端但连接已断开时记录一次退回 REST
+    fn live_ws_api(&self) -> Option<&BinanceWsApi> {
+        let ws_api = self.ws_api.as_deref()?;
+        if ws_api.is_connected() {
+            Some(ws_api)
+        } else {
+            error_log!(warn, "⚠️ ws-fapi 连接已断开，下单退回 REST");
+            None
         }
     }
 
@@ -42,16 +98,14 @@ impl BinanceFuturesApi {
             .as_millis() as u64
     }
 
-    /// 构建查询字符串
+    /// 构建查询字符串（币安要求参数按字母顺序排序）
     pub fn build_query_string(&self, params: &HashMap<String, String>) -> String {
-        let mut pairs: Vec<String> = params.iter().map(|(k, v)| format!("{}={}", k, v)).collect();
-        pairs.sort(); // 币安要求参数按字母顺序排序
-        pairs.join("&")
+        canonical_query(params)
     }
 
     /// 生成签名
     pub fn generate_signature(&self, query_string: &str) -> String {
-        generate_hmac_signature(query_string, &self.secret_key)
+        self.signer.sign(query_string.as_bytes()).to_string()
     }
 
     /// 获取K线数据
@@ -76,108 +130,68 @@ impl BinanceFuturesApi {
         Ok(klines)
     }
 
-    /// 发送下单请求
-    pub async fn new_order(&self, request: OrderRequest) -> Result<OrderResponse> {
-        // 构建请求参数
-        let mut params = HashMap::new();
-
-        // 必需参数 - 使用 serde 序列化
-        params.insert("symbol".to_string(), request.symbol.clone());
-        params.insert(
-            "side".to_string(),
-            serde_json::to_string(&request.side)?
-                .trim_matches('"')
-                .to_string(),
-        );
-        params.insert(
-            "type".to_string(),
-            serde_json::to_string(&request.order_type)?
-                .trim_matches('"')
-                .to_string(),
+    /// 获取订单簿快照（公开接口，无需签名）
+    ///
+    /// # Arguments
+    /// * `symbol` - 交易对符号，如 "BTCUSDT"
+    /// * `limit` - 档位数量，可选 5, 10, 20, 50, 100, 500, 1000
+    pub async fn get_depth_snapshot(&self, symbol: &str, limit: u32) -> Result<DepthSnapshot> {
+        let url = format!(
+            "{}/depth?symbol={}&limit={}",
+            self.base_url,
+            symbol.to_uppercase(),
+            limit
         );
-
-        // 可选参数
-        if let Some(ref position_side) = request.position_side {
-            params.insert("positionSide".to_string(), position_side.clone());
-        }
-        if let Some(ref time_in_force) = request.time_in_force {
-            params.insert(
-                "timeInForce".to_string(),
-                serde_json::to_string(time_in_force)?
-                    .trim_matches('"')
-                    .to_string(),
-            );
-        }
-        if let Some(ref quantity) = request.quantity {
-            params.insert("quantity".to_string(), quantity.clone());
-        }
-        if let Some(ref reduce_only) = request.reduce_only {
-            params.insert("reduceOnly".to_string(), reduce_only.clone());
-        }
-        if let Some(ref price) = request.price {
-            params.insert("price".to_string(), price.clone());
-        }
-        if let Some(ref new_client_order_id) = request.new_client_order_id {
-            params.insert("newClientOrderId".to_string(), new_client_order_id.clone());
-        }
-        if let Some(ref stop_price) = request.stop_price {
-            params.insert("stopPrice".to_string(), stop_price.clone());
-        }
-        if let Some(ref close_position) = request.close_position {
-            params.insert("closePosition".to_string(), close_position.clone());
-        }
-        if let Some(ref activation_price) = request.activation_price {
-            params.insert("activationPrice".to_string(), activation_price.clone());
-        }
-        if let Some(ref callback_rate) = request.callback_rate {
-            params.insert("callbackRate".to_string(), callback_rate.clone());
-        }
-        if let Some(ref working_type) = request.working_type {
-            params.insert("workingType".to_string(), working_type.clone());
-        }
-        if let Some(ref price_protect) = request.price_protect {
-            params.insert("priceProtect".to_string(), price_protect.clone());
-        }
-        if let Some(ref new_order_resp_type) = request.new_order_resp_type {
-            params.insert("newOrderRespType".to_string(), new_order_resp_type.clone());
-        }
-        if let Some(ref price_match) = request.price_match {
-            params.insert("priceMatch".to_string(), price_match.clone());
-        }
-        if let Some(ref self_trade_prevention_mode) = request.self_trade_prevention_mode {
-            params.insert(
-                "selfTradePreventionMode".to_string(),
-                self_trade_prevention_mode.clone(),
-            );
+        let response = self.client.get(&url).send().await?;
+        if !response.status().is_success() {
+            let error_text = response.text().await?;
+            return Err(anyhow::anyhow!("Depth snapshot request failed: {}", error_text));
         }
-        if let Some(ref good_till_date) = request.good_till_date {
-            params.insert("goodTillDate".to_string(), good_till_date.to_string());
+
+        let snapshot: DepthSnapshot = response.json().await?;
+        Ok(snapshot)
+    }
+
+    /// 获取交易规则（公开接口，无需签名），用于构建 `SymbolFilterCache`
+    pub async fn get_exchange_info(&self) -> Result<ExchangeInfo> {
+        let url = format!("{}/exchangeInfo", self.base_url);
+        let response = self.client.get(&url).send().await?;
+        if !response.status().is_success() {
+            let error_text = response.text().await?;
+            return Err(anyhow::anyhow!("Exchange info request failed: {}", error_text));
         }
 
-        // 添加时间戳和接收窗口
-        let timestamp = request.timestamp.unwrap_or_else(Self::get_timestamp);
-        params.insert("timestamp".to_string(), timestamp.to_string());
-        params.insert(
-            "recvWindow".to_string(),
-            request.recv_window.unwrap_or(60000).to_string(),
-        );
+        let info: ExchangeInfo = response.json().await?;
+        Ok(info)
+    }
 
-        // 构建查询字符串
-        let query_string = self.build_query_string(&params);
+    /// 加载交易对过滤器缓存：优先请求 exchangeInfo，失败时读取本地 exchangeInfo 文件
+    pub async fn load_symbol_filters(&self, fallback_path: &str) -> Result<SymbolFilterCache> {
+        match self.get_exchange_info().await {
+            Ok(info) => Ok(SymbolFilterCache::from_exchange_info(&info)),
+            Err(e) => {
+                error_log!(warn, "⚠️ 获取 exchangeInfo 失败: {}，使用本地文件 {}", e, fallback_path);
+                SymbolFilterCache::load_from_file(fallback_path)
+            }
+        }
+    }
 
-        // 生成签名
-        let signature = self.generate_signature(&query_string);
+    /// 发送下单请求
+    pub async fn new_order(&self, request: OrderRequest) -> Result<OrderResponse> {
+        if let Some(ws_api) = self.live_ws_api() {
+            return ws_api.new_order(request).await;
+        }
 
-        // 构建完整 URL
-        let url = format!(
-            "{}/order?{}&signature={}",
-            self.base_url, query_string, signature
-        );
+        // 参数按规范顺序直接写入 URL 缓冲区并签名
+        let timestamp = request.timestamp.unwrap_or_else(Self::get_timestamp);
+        let mut query = SignedQuery::url(&self.base_url, "/order?");
+        request.write_params(&mut query, timestamp, request.recv_window.unwrap_or(60000));
+        let url = query.sign(&self.signer);
 
         // 发送请求 - 只使用 URL 参数，不发送 JSON body
         let response = self
             .client
-            .post(&url)
+            .post(url)
             .header("X-MBX-APIKEY", &self.api_key)
             .send()
             .await?;
@@ -275,6 +289,15 @@ impl BinanceFuturesApi {
     /// # Returns
     /// * `Result<Vec<String>>` - 订单ID列表
     pub async fn signal_to_order(&self, signal: &TradingSignal) -> Result<Vec<String>> {
+        let responses = self.signal_to_order_responses(signal).await?;
+        Ok(responses.iter().map(|order| order.order_id.to_string()).collect())
+    }
+
+    /// 将交易信号转换为订单并执行，返回成功订单的完整回报
+    ///
+    /// 主市价单使用 `newOrderRespType=RESULT`，回报中的 executedQty / avgPrice 即为成交数量和均价，
+    /// 调用方据此更新仓位。
+    pub async fn signal_to_order_responses(&self, signal: &TradingSignal) -> Result<Vec<OrderResponse>> {
         match &signal.signal {
             Signal::Market(market_signal) => {
                 // 处理市价信号
@@ -294,51 +317,55 @@ impl BinanceFuturesApi {
     /// * `market_signal` - 市价信号详情
     /// 
     /// # Returns
-    /// * `Result<Vec<String>>` - 订单ID列表
-    async fn mkt_sig2order(&self, signal: &TradingSignal, market_signal: &MarketSignal) -> Result<Vec<String>> {
-        let mut all_orders = Vec::new();
+    /// * `Result<Vec<OrderResponse>>` - 成功订单的回报
+    async fn mkt_sig2order(&self, signal: &TradingSignal, market_signal: &MarketSignal) -> Result<Vec<OrderResponse>> {
+        // 数量向下取整到 stepSize，触发价取整到 tickSize，都是整数运算
+        let filters = symbol_filters(signal.symbol.symbol());
+        let lots = filters.quantity_lots(signal.quantity);
+        if lots == 0 || !filters.meets_min_qty(lots) {
+            return Err(anyhow::anyhow!("下单数量 {} 小于 {} 的最小下单量", signal.quantity, signal.symbol));
+        }
+        let quantity = filters.format_quantity(lots);
         
         // 检查是否为平仓操作
-        if market_signal.is_closed {
-            // 平仓操作：先取消该交易对的所有开放订单
-            order_log!(info, "🔄 平仓操作：先取消 {} 的所有开放订单", signal.symbol);
-            let cancel_result = self.cancel_all_open_orders(&signal.symbol, None).await;
-            if cancel_result.is_ok() {
-                order_log!(info, "✅ 成功取消 {} 的所有开放订单", signal.symbol);
-            } else {
-                // 如果取消订单失败，记录警告但继续执行平仓
-                let error = cancel_result.unwrap_err();
-                error_log!(warn, "⚠️ 取消开放订单失败: {}，继续执行平仓", error);
-            }
-            
+        let batch_result = if market_signal.is_closed {
             // 平仓操作：使用信号携带的数量，并设置 reduce_only
             let close_order_request = OrderRequest {
-                symbol: signal.symbol.clone(),
+                symbol: signal.symbol.as_str().to_string(),
                 side: match signal.side {
                     Side::Buy => OrderSide::Buy,   // 平仓买入（平空仓）
                     Side::Sell => OrderSide::Sell, // 平仓卖出（平多仓）
                 },
                 order_type: OrderType::Market,
-                quantity: Some(signal.quantity.to_string()),
+                quantity: Some(quantity.clone()),
                 reduce_only: Some("true".to_string()),   // 必须是减仓单
+                new_order_resp_type: Some("RESULT".to_string()), // 回报中带成交数量和均价
                 timestamp: Some(Self::get_timestamp()),
                 recv_window: Some(60000),
                 ..Default::default()
             };
-            
-            all_orders.push(close_order_request);
-            
+
+            // 平仓单和撤销止损止盈单并发发出
+            self.close_and_cancel(signal.symbol.as_str(), close_order_request).await?
         } else {
+            let mut all_orders = Vec::new();
+            // 开仓单受 MIN_NOTIONAL 限制（减仓单不受限），本地拒绝可以省掉一次必然失败的请求
+            if !filters.meets_min_notional(filters.price_ticks(signal.latest_price), lots) {
+                return Err(anyhow::anyhow!("{} 下单名义价值低于最小名义价值: 数量={}, 价格={}",
+                    signal.symbol, quantity, signal.latest_price));
+            }
+
             // 开仓操作：原有的逻辑
             // 1. 构建主市价单
             let main_order_request = OrderRequest {
-                symbol: signal.symbol.clone(),
+                symbol: signal.symbol.as_str().to_string(),
                 side: match signal.side {
                     Side::Buy => OrderSide::Buy,
                     Side::Sell => OrderSide::Sell,
                 },
                 order_type: OrderType::Market,
-                quantity: Some(signal.quantity.to_string()),
+                quantity: Some(quantity.clone()),
+                new_order_resp_type: Some("RESULT".to_string()), // 回报中带成交数量和均价
                 timestamp: Some(Self::get_timestamp()),
                 recv_window: Some(60000),
                 ..Default::default()
@@ -352,14 +379,14 @@ impl BinanceFuturesApi {
                 
                 // 构建止损单
                 let stop_order_request = OrderRequest {
-                    symbol: signal.symbol.clone(),
+                    symbol: signal.symbol.as_str().to_string(),
                     side: match signal.side {
                         Side::Buy => OrderSide::Sell,  // 买入后，止损是卖出
                         Side::Sell => OrderSide::Buy,  // 卖出后，止损是买入
                     },
                     order_type: OrderType::StopMarket,
-                    quantity: Some(signal.quantity.to_string()),
-                    stop_price: Some(stop_price.to_string()),
+                    quantity: Some(quantity.clone()),
+                    stop_price: Some(filters.format_price_f64(stop_price)),
                     reduce_only: Some("true".to_string()),  // 止损单必须是减仓单
                     timestamp: Some(Self::get_timestamp()),
                     recv_window: Some(60000),
@@ -368,14 +395,14 @@ impl BinanceFuturesApi {
                 
                 // 构建止盈单
                 let profit_order_request = OrderRequest {
-                    symbol: signal.symbol.clone(),
+                    symbol: signal.symbol.as_str().to_string(),
                     side: match signal.side {
                         Side::Buy => OrderSide::Sell,  // 买入后，止盈是卖出
                         Side::Sell => OrderSide::Buy,  // 卖出后，止盈是买入
                     },
                     order_type: OrderType::TakeProfitMarket,
-                    quantity: Some(signal.quantity.to_string()),
-                    stop_price: Some(profit_price.to_string()),
+                    quantity: Some(quantity.clone()),
+                    stop_price: Some(filters.format_price_f64(profit_price)),
                     reduce_only: Some("true".to_string()),  // 止盈单必须是减仓单
                     timestamp: Some(Self::get_timestamp()),
                     recv_window: Some(60000),
@@ -388,14 +415,14 @@ impl BinanceFuturesApi {
             } else if let Some(stop_price) = market_signal.stop_price {
                 // 只有止损单
                 let stop_order_request = OrderRequest {
-                    symbol: signal.symbol.clone(),
+                    symbol: signal.symbol.as_str().to_string(),
                     side: match signal.side {
                         Side::Buy => OrderSide::Sell,
                         Side::Sell => OrderSide::Buy,
                     },
                     order_type: OrderType::StopMarket,
-                    quantity: Some(signal.quantity.to_string()),
-                    stop_price: Some(stop_price.to_string()),
+                    quantity: Some(quantity.clone()),
+                    stop_price: Some(filters.format_price_f64(stop_price)),
                     reduce_only: Some("true".to_string()),
                     timestamp: Some(Self::get_timestamp()),
                     recv_window: Some(60000),
@@ -407,14 +434,14 @@ impl BinanceFuturesApi {
             } else if let Some(profit_price) = market_signal.profit_price {
                 // 只有止盈单
                 let profit_order_request = OrderRequest {
-                    symbol: signal.symbol.clone(),
+                    symbol: signal.symbol.as_str().to_string(),
                     side: match signal.side {
                         Side::Buy => OrderSide::Sell,
                         Side::Sell => OrderSide::Buy,
                     },
                     order_type: OrderType::TakeProfitMarket,
-                    quantity: Some(signal.quantity.to_string()),
-                    stop_price: Some(profit_price.to_string()),
+                    quantity: Some(quantity.clone()),
+                    stop_price: Some(filters.format_price_f64(profit_price)),
                     reduce_only: Some("true".to_string()),
                     timestamp: Some(Self::get_timestamp()),
                     recv_window: Some(60000),
@@ -425,11 +452,11 @@ impl BinanceFuturesApi {
                 
             } else {
             }
-        }
 
-        // 3. 一次性下所有订单（带重试机制）
-        let batch_result = self.batch_orders_with_retry(all_orders, None).await?;
-        
+            // 3. 一次性下所有订单（带重试机制）
+            self.batch_orders_with_retry(all_orders, None).await?
+        };
+
         // 4. 处理批量订单结果
         if batch_result.is_all_failed() {
             // 所有订单都失败了
@@ -437,13 +464,7 @@ impl BinanceFuturesApi {
             return Err(anyhow::anyhow!("所有订单都失败了: {}", first_error.msg));
         }
         
-        // 5. 收集成功的订单ID
-        let mut order_ids = Vec::new();
-        for order in &batch_result.successful_orders {
-            order_ids.push(order.order_id.to_string());
-        }
-        
-        // 6. 如果有部分失败的订单，记录警告
+        // 5. 如果有部分失败的订单，记录警告
         if batch_result.is_partial_success() {
             order_log!(warn, "⚠️ 部分订单失败: 成功{}/{}，失败{}/{}", 
                 batch_result.success_count(), batch_result.total_requested,
@@ -455,7 +476,45 @@ impl BinanceFuturesApi {
             }
         }
         
-        Ok(order_ids)
+        Ok(batch_result.successful_orders)
+    }
+
+    /// 平仓：reduceOnly 市价单和撤销全部开放订单（止损/止盈单）并发发出
+    ///
+    /// 退出路径只等一次往返。市价平仓单到达即成交，不会被同时到达的撤单请求撤掉；
+    /// 两个请求都返回后再对账：平仓成功但撤单失败时补撤一次，避免残留的止损/止盈单；
+    /// 撤单成功但平仓失败时仓位已失去保护，记录错误交由上层处理。
+    async fn close_and_cancel(&self, symbol: &str, close_order: OrderRequest) -> Result<BatchOrderResult> {
+        order_log!(info, "🔄 平仓操作：发出 {} 平仓单，同时取消所有开放订单", symbol);
+        let started = Instant::now();
+        let close = async {
+            let result = self.batch_orders_with_retry(vec![close_order], None).await;
+            let elapsed = started.elapsed();
+            self.exit_latency.record(elapsed);
+            (result, elapsed)
+        };
+        let ((close_result, elapsed), cancel_result) = tokio::join!(close, self.cancel_all_open_orders(symbol, None));
+        order_log!(info, "⏱️ {} 平仓回报耗时 {:?}（平均 {:?}）", symbol, elapsed, self.exit_latency.mean());
+
+        let closed = matches!(&close_result, Ok(result) if result.success_count() > 0);
+        match cancel_result {
+            Ok(()) => {
+                order_log!(info, "✅ 成功取消 {} 的所有开放订单", symbol);
+                if !closed {
+                    error_log!(error, "❌ {} 平仓未成功但开放订单已取消，仓位当前没有止损/止盈单", symbol);
+                }
+            }
+            Err(e) if closed => {
+                error_log!(warn, "⚠️ 取消开放订单失败: {}，平仓已成交，重试取消", e);
+                if let Err(e) = self.cancel_all_open_orders(symbol, None).await {
+                    error_log!(error, "❌ 重试取消 {} 的开放订单失败: {}", symbol, e);
+                }
+            }
+            Err(e) => {
+                error_log!(warn, "⚠️ 取消开放订单失败: {}，平仓也未成功，保留现有止损/止盈单", e);
+            }
+        }
+        close_result
     }
 
     /// 带重试机制的批量下单（简化版）
@@ -574,6 +633,8 @@ impl BinanceFuturesApi {
 
     /// 批量下单 - 一次性下多个订单
     /// 
+    /// 挂了 ws-fapi 客户端时改为在同一连接上并发发送多个 `order.place`，结果格式相同。
+    /// 
     /// # Arguments
     /// * `orders` - 订单列表，最多5个订单
     /// * `recv_window` - 接收窗口时间（可选）
@@ -618,10 +679,10 @@ impl BinanceFuturesApi {
         if orders.len() > 5 {
             return Err(anyhow::anyhow!("批量订单最多支持5个订单，当前: {}", orders.len()));
         }
+        if let Some(ws_api) = self.live_ws_api() {
+            return ws_api.batch_orders(orders, recv_window).await;
+        }
 
-        // 构建批量订单参数
-        let mut params = HashMap::new();
-        
         // 将订单列表转换为币安API期望的格式
         let mut binance_orders = Vec::new();
         for order in &orders {
@@ -700,34 +761,19 @@ impl BinanceFuturesApi {
         // 将币安格式的订单转换为JSON字符串
         let batch_orders_json = serde_json::to_string(&binance_orders)?;
         
-        // 对JSON字符串进行URL编码
+        // 对JSON字符串进行URL编码，按 batchOrders / recvWindow / timestamp 顺序签名
         let encoded_batch_orders = urlencoding::encode(&batch_orders_json);
-        params.insert("batchOrders".to_string(), encoded_batch_orders.to_string());
-        
-        // 添加时间戳和接收窗口
-        let timestamp = Self::get_timestamp();
-        params.insert("timestamp".to_string(), timestamp.to_string());
-        params.insert(
-            "recvWindow".to_string(),
-            recv_window.unwrap_or(60000).to_string(),
-        );
-
-        // 构建查询字符串
-        let query_string = self.build_query_string(&params);
-
-        // 生成签名
-        let signature = self.generate_signature(&query_string);
-
-        // 构建完整 URL
-        let url = format!(
-            "{}/batchOrders?{}&signature={}",
-            self.base_url, query_string, signature
-        );
+        let mut query = SignedQuery::url(&self.base_url, "/batchOrders?");
+        query
+            .push("batchOrders", &encoded_batch_orders)
+            .push("recvWindow", recv_window.unwrap_or(60000))
+            .push("timestamp", Self::get_timestamp());
+        let url = query.sign(&self.signer);
 
         // 发送请求
         let response = self
             .client
-            .post(&url)
+            .post(url)
             .header("X-MBX-APIKEY", &self.api_key)
             .send()
             .await?;
@@ -895,36 +941,18 @@ impl BinanceFuturesApi {
         symbol: &str,
         recv_window: Option<u64>,
     ) -> Result<()> {
-        // 构建请求参数
-        let mut params = HashMap::new();
-        
-        // 必需参数
-        params.insert("symbol".to_string(), symbol.to_string());
-        params.insert("timestamp".to_string(), Self::get_timestamp().to_string());
-        
-        // 可选参数
-        if let Some(window) = recv_window {
-            params.insert("recvWindow".to_string(), window.to_string());
-        } else {
-            params.insert("recvWindow".to_string(), "60000".to_string());
-        }
-
-        // 构建查询字符串
-        let query_string = self.build_query_string(&params);
-
-        // 生成签名
-        let signature = self.generate_signature(&query_string);
-
-        // 构建完整 URL
-        let url = format!(
-            "{}/allOpenOrders?{}&signature={}",
-            self.base_url, query_string, signature
-        );
+        // 参数按规范顺序直接写入 URL 缓冲区并签名
+        let mut query = SignedQuery::url(&self.base_url, "/allOpenOrders?");
+        query
+            .push("recvWindow", recv_window.unwrap_or(60000))
+            .push("symbol", symbol)
+            .push("timestamp", Self::get_timestamp());
+        let url = query.sign(&self.signer);
 
         // 发送DELETE请求
         let response = self
             .client
-            .delete(&url)
+            .delete(url)
             .header("X-MBX-APIKEY", &self.api_key)
             .send()
             .await?;
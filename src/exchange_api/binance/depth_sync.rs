@@ -0,0 +1,122 @@
+use super::api::BinanceFuturesApi;
+use crate::common::bounded_channel::MessageSink;
+use crate::dto::binance::rest_api::DepthSnapshot;
+use crate::dto::binance::websocket::BinanceDepthUpdate;
+use crate::models::{CommonDepth, DepthUpdateResult, LocalOrderBook, TradingSymbol};
+use crate::websocket_log;
+use anyhow::Result;
+use std::sync::Arc;
+use std::time::Duration;
+use tokio::sync::mpsc;
+
+/// 快照默认档位（币安期货最大 1000）
+pub const DEFAULT_SNAPSHOT_LIMIT: u32 = 1000;
+
+/// 增量深度同步器
+///
+/// 消费 depthUpdate 增量流，按需拉取 REST 快照，维护本地订单簿，
+/// 每次成功应用增量后输出截取 `emit_levels` 档的 CommonDepth。
+/// 出现 updateId 断档时自动重新拉取快照。
+#[derive(Debug, Clone)]
+pub struct DepthSynchronizer {
+    rest_client: BinanceFuturesApi,
+    snapshot_limit: u32,
+    emit_levels: usize,
+    retry_delay: Duration,
+}
+
+impl DepthSynchronizer {
+    pub fn new(rest_client: BinanceFuturesApi, emit_levels: usize) -> Self {
+        Self {
+            rest_client,
+            snapshot_limit: DEFAULT_SNAPSHOT_LIMIT,
+            emit_levels,
+            retry_delay: Duration::from_millis(500),
+        }
+    }
+
+    pub fn with_snapshot_limit(mut self, limit: u32) -> Self {
+        self.snapshot_limit = limit;
+        self
+    }
+
+    pub fn with_retry_delay(mut self, retry_delay: Duration) -> Self {
+        self.retry_delay = retry_delay;
+        self
+    }
+
+    /// 运行同步主循环，直到增量流或下游通道关闭
+    pub async fn run(
+        &self,
+        symbol: TradingSymbol,
+        mut update_rx: mpsc::Receiver<BinanceDepthUpdate>,
+        depth_tx: impl MessageSink<Arc<CommonDepth>>,
+    ) -> Result<()> {
+        let mut book = LocalOrderBook::new(symbol);
+        // 同一时刻最多只有一个快照请求在途
+        let (snapshot_tx, mut snapshot_rx) = mpsc::channel::<Result<DepthSnapshot>>(1);
+        let mut snapshot_in_flight = false;
+        let mut resync_count: u64 = 0;
+
+        loop {
+            if book.needs_snapshot() && !snapshot_in_flight {
+                snapshot_in_flight = true;
+                let client = self.rest_client.clone();
+                let snapshot_tx = snapshot_tx.clone();
+                let limit = self.snapshot_limit;
+                // 首次同步立即拉取，重新同步时稍作等待，让增量事件先进入缓存
+                let delay = if resync_count == 0 { Duration::ZERO } else { self.retry_delay };
+                tokio::spawn(async move {
+                    tokio::time::sleep(delay).await;
+                    let result = client.get_depth_snapshot(symbol.as_str(), limit).await;
+                    let _ = snapshot_tx.send(result).await;
+                });
+            }
+
+            let result = tokio::select! {
+                update = update_rx.recv() => {
+                    match update {
+                        Some(update) => book.push_update(update),
+                        None => {
+                            websocket_log!(info, "Depth update stream closed: {}", symbol);
+                            break;
+                        }
+                    }
+                }
+                snapshot = snapshot_rx.recv() => {
+                    snapshot_in_flight = false;
+                    match snapshot {
+                        Some(Ok(snapshot)) => {
+                            websocket_log!(info, "Depth snapshot loaded: {} lastUpdateId={}, pending={}",
+                                symbol, snapshot.last_update_id, book.pending_len());
+                            book.apply_snapshot(snapshot)
+                        }
+                        Some(Err(e)) => {
+                            websocket_log!(warn, "Failed to fetch depth snapshot for {}: {}", symbol, e);
+                            resync_count += 1;
+                            continue;
+                        }
+                        None => continue,
+                    }
+                }
+            };
+
+            match result {
+                DepthUpdateResult::Applied => {
+                    if !depth_tx.deliver(Arc::new(book.to_common_depth(self.emit_levels))).await {
+                        websocket_log!(info, "Depth consumer closed, stopping synchronizer: {}", symbol);
+                        break;
+                    }
+                }
+                DepthUpdateResult::Gap { expected, received } => {
+                    resync_count += 1;
+                    websocket_log!(warn, "Depth sequence gap for {}: expected {}, received {} (resync #{})",
+                        symbol, expected, received, resync_count);
+                }
+                DepthUpdateResult::Buffered | DepthUpdateResult::Stale => {}
+            }
+        }
+
+        Ok(())
+    }
+}
@@ -1,4 +1,7 @@
 pub mod ws;
 pub mod ws_manager;
+pub mod depth_sync;
+pub mod stream_mux;
 pub mod api; 
-pub mod api_manager;
\ No newline at end of file
+pub mod api_manager;
+pub mod ws_api;
\ No newline at end of file
@@ -0,0 +1,548 @@
+use super::ws_manager::{WebSocketDataType, WebSocketMessage, WebSocketMessageSender};
+use crate::common::consts::BINANCE_WS_STREAM;
+use crate::common::json::decode_json;
+use crate::dto::binance::combined_stream::{
+    StreamControlRequest, decode_data, extract_event_type, extract_stream_name, split_frame,
+};
+use crate::dto::binance::websocket::{BinancePartialDepth, BinanceTradeData, BookTickerData, KlineData, MarkPriceData};
+use crate::websocket_log;
+use anyhow::Result;
+use futures::{SinkExt, StreamExt};
+use serde::de::DeserializeOwned;
+use std::collections::{HashMap, HashSet};
+use std::sync::Arc;
+use std::time::Duration;
+use tokio::sync::mpsc;
+use tokio::task::JoinHandle;
+use tokio_tungstenite::{connect_async, tungstenite::protocol::Message};
+use url::Url;
+
+/// 币安单个连接最多订阅的 stream 数量
+pub const MAX_STREAMS_PER_CONNECTION: usize = 200;
+
+/// 根据 stream 名称的后缀判断数据类型
+///
+/// - `<symbol>@markPrice[@1s]` -> MarkPrice
+/// - `<symbol>@kline_<interval>` -> Kline
+/// - `<symbol>@depth<levels>[@<interval>]` -> PartialDepth
+/// - `<symbol>@depth[@<interval>]` -> DiffDepth
+/// - `<symbol>@bookTicker` -> BookTicker
+/// - `<symbol>@trade` -> Trade
+pub fn classify_stream(stream: &str) -> Option<WebSocketDataType> {
+    let (_, rest) = stream.split_once('@')?;
+    let channel = rest.split('@').next().unwrap_or(rest);
+    match channel {
+        "markPrice" => Some(WebSocketDataType::MarkPrice),
+        "bookTicker" => Some(WebSocketDataType::BookTicker),
+        "trade" => Some(WebSocketDataType::Trade),
+        "depth" => Some(WebSocketDataType::DiffDepth),
+        c if c.starts_with("kline_") => Some(WebSocketDataType::Kline),
+        c if c.len() > 5 && c.starts_with("depth") && c[5..].bytes().all(|b| b.is_ascii_digit()) => {
+            Some(WebSocketDataType::PartialDepth)
+        }
+        _ => None,
+    }
+}
+
+/// 根据推送的事件类型（`e` 字段）判断数据类型，用于不带外层包装的单一 stream 推送
+///
+/// 期货的 Partial Depth 和增量深度都是 `depthUpdate`，无法区分，统一视为 DiffDepth。
+pub fn classify_event(event: &str) -> Option<WebSocketDataType> {
+    match event {
+        "markPriceUpdate" => Some(WebSocketDataType::MarkPrice),
+        "kline" => Some(WebSocketDataType::Kline),
+        "bookTicker" => Some(WebSocketDataType::BookTicker),
+        "trade" => Some(WebSocketDataType::Trade),
+        "depthUpdate" => Some(WebSocketDataType::DiffDepth),
+        _ => None,
+    }
+}
+
+/// 行情推送的 DTO，编译期绑定数据类型和对应的 `WebSocketMessage` 变体
+pub trait StreamPayload: DeserializeOwned {
+    const DATA_TYPE: WebSocketDataType;
+
+    fn into_message(self) -> WebSocketMessage;
+}
+
+impl StreamPayload for MarkPriceData {
+    const DATA_TYPE: WebSocketDataType = WebSocketDataType::MarkPrice;
+
+    fn into_message(self) -> WebSocketMessage {
+        WebSocketMessage::MarkPrice(Arc::new(self))
+    }
+}
+
+impl StreamPayload for KlineData {
+    const DATA_TYPE: WebSocketDataType = WebSocketDataType::Kline;
+
+    fn into_message(self) -> WebSocketMessage {
+        WebSocketMessage::Kline(Arc::new(self))
+    }
+}
+
+impl StreamPayload for BinancePartialDepth {
+    const DATA_TYPE: WebSocketDataType = WebSocketDataType::PartialDepth;
+
+    fn into_message(self) -> WebSocketMessage {
+        WebSocketMessage::PartialDepth(Arc::new(self))
+    }
+}
+
+impl StreamPayload for BookTickerData {
+    const DATA_TYPE: WebSocketDataType = WebSocketDataType::BookTicker;
+
+    fn into_message(self) -> WebSocketMessage {
+        WebSocketMessage::BookTicker(Arc::new(self))
+    }
+}
+
+impl StreamPayload for BinanceTradeData {
+    const DATA_TYPE: WebSocketDataType = WebSocketDataType::Trade;
+
+    fn into_message(self) -> WebSocketMessage {
+        WebSocketMessage::Trade(Arc::new(self))
+    }
+}
+
+/// 待解析的推送正文
+#[derive(Clone, Copy)]
+enum Payload<'a> {
+    /// 前缀扫描定位到的 data 原始 JSON
+    Data(&'a str),
+    /// 布局不符合前缀扫描的完整组合流帧
+    Frame(&'a str),
+}
+
+fn decode_payload<P: StreamPayload>(payload: Payload<'_>) -> Result<WebSocketMessage> {
+    let data: P = match payload {
+        Payload::Data(data) => decode_json(data)?,
+        Payload::Frame(text) => decode_data(text)?,
+    };
+    Ok(data.into_message())
+}
+
+/// 按数据类型直接解析为具体 DTO，不经过 `serde_json::Value`
+fn dispatch(data_type: Option<WebSocketDataType>, payload: Payload<'_>) -> Result<Option<WebSocketMessage>> {
+    let decode: fn(Payload<'_>) -> Result<WebSocketMessage> = match data_type {
+        Some(WebSocketDataType::MarkPrice) => decode_payload::<MarkPriceData>,
+        Some(WebSocketDataType::Kline) => decode_payload::<KlineData>,
+        Some(WebSocketDataType::PartialDepth) => decode_payload::<BinancePartialDepth>,
+        Some(WebSocketDataType::BookTicker) => decode_payload::<BookTickerData>,
+        Some(WebSocketDataType::Trade) => decode_payload::<BinanceTradeData>,
+        // 增量深度需要经过 DepthSynchronizer，不在这里直接分发
+        Some(WebSocketDataType::DiffDepth) | None => return Ok(None),
+    };
+    decode(payload).map(Some)
+}
+
+/// 把一条组合流帧解析为 WebSocketMessage
+///
+/// 前缀扫描取出 stream 名称和 data 的位置后，data 直接解析为对应的 DTO，整个帧只解析一次。
+/// 控制帧响应、未知 stream 以及需要本地订单簿同步的增量深度返回 Ok(None)
+pub fn decode_combined_message(text: &str) -> Result<Option<WebSocketMessage>> {
+    if let Some((stream, data)) = split_frame(text) {
+        return dispatch(classify_stream(stream), Payload::Data(data));
+    }
+    let Some(stream) = extract_stream_name(text) else {
+        return Ok(None);
+    };
+    dispatch(classify_stream(&stream), Payload::Frame(text))
+}
+
+/// 解析一条推送，兼容组合流帧和单一 stream 的裸推送（按 `e` 字段分发）
+pub fn decode_stream_message(text: &str) -> Result<Option<WebSocketMessage>> {
+    match extract_event_type(text) {
+        Some(event) => dispatch(classify_event(event), Payload::Data(text)),
+        None => decode_combined_message(text),
+    }
+}
+
+/// 组合流帧的路由回调，返回 Ok(false) 表示帧被忽略
+pub type FrameRouter = Arc<dyn Fn(&str) -> Result<bool> + Send + Sync>;
+
+/// 分片读循环收到的组合流帧的去向
+#[derive(Clone)]
+enum FrameSink {
+    /// 按 stream 后缀解析为 WebSocketMessage，发送到行情汇总通道
+    Messages(WebSocketMessageSender),
+    /// 原始帧直接交给路由回调，由下游（如按交易对分片的快照创建器）解析
+    Frames(FrameRouter),
+}
+
+enum ShardCommand {
+    Subscribe(Vec<String>),
+    Unsubscribe(Vec<String>),
+}
+
+struct MuxShard {
+    streams: HashSet<String>,
+    cmd_tx: mpsc::UnboundedSender<ShardCommand>,
+    handle: JoinHandle<()>,
+}
+
+/// 组合流多路复用器
+///
+/// 多个交易对、多种数据类型共用少量 WebSocket 连接（`/stream?streams=` 组合流），
+/// 运行期通过 SUBSCRIBE / UNSUBSCRIBE 控制帧增减订阅，按 stream 后缀解析后
+/// 统一发送为 `WebSocketMessage`（或通过 `with_frame_router` 把原始帧交给路由回调）。
+/// 单个连接超过 200 个 stream 时自动新建连接分片。连接断开后按当前订阅列表自动重连。
+pub struct StreamMultiplexer {
+    base_url: String,
+    sink: FrameSink,
+    max_streams_per_connection: usize,
+    retry_delay: Duration,
+    shards: Vec<MuxShard>,
+    stream_shard: HashMap<String, usize>,
+}
+
+impl StreamMultiplexer {
+    pub fn new(message_tx: WebSocketMessageSender) -> Self {
+        Self::with_sink(FrameSink::Messages(message_tx))
+    }
+
+    /// 不解析帧，读循环收到的每一帧原样交给 `router`
+    ///
+    /// 路由回调在分片的读循环中同步执行，只应做解析和非阻塞投递。
+    pub fn with_frame_router<F>(router: F) -> Self
+    where
+        F: Fn(&str) -> Result<bool> + Send + Sync + 'static,
+    {
+        Self::with_sink(FrameSink::Frames(Arc::new(router)))
+    }
+
+    fn with_sink(sink: FrameSink) -> Self {
+        Self {
+            base_url: BINANCE_WS_STREAM.to_string(),
+            sink,
+            max_streams_per_connection: MAX_STREAMS_PER_CONNECTION,
+            retry_delay: Duration::from_secs(1),
+            shards: Vec::new(),
+            stream_shard: HashMap::new(),
+        }
+    }
+
+    pub fn with_base_url(mut self, url: &str) -> Self {
+        self.base_url = url.to_string();
+        self
+    }
+
+    pub fn with_max_streams_per_connection(mut self, max_streams: usize) -> Self {
+        self.max_streams_per_connection = max_streams.clamp(1, MAX_STREAMS_PER_CONNECTION);
+        self
+    }
+
+    pub fn with_retry_delay(mut self, retry_delay: Duration) -> Self {
+        self.retry_delay = retry_delay;
+        self
+    }
+
+    /// 订阅一组 stream（如 "btcusdt@bookTicker"），已订阅的会被忽略
+    pub fn subscribe<I, S>(&mut self, streams: I) -> Result<()>
+    where
+        I: IntoIterator<Item = S>,
+        S: Into<String>,
+    {
+        let mut batches: HashMap<usize, Vec<String>> = HashMap::new();
+        for stream in streams {
+            let stream = stream.into();
+            if self.stream_shard.contains_key(&stream) {
+                continue;
+            }
+            let index = self.shard_with_room();
+            self.shards[index].streams.insert(stream.clone());
+            self.stream_shard.insert(stream.clone(), index);
+            batches.entry(index).or_default().push(stream);
+        }
+
+        for (index, streams) in batches {
+            self.shards[index]
+                .cmd_tx
+                .send(ShardCommand::Subscribe(streams))
+                .map_err(|_| anyhow::anyhow!("Stream shard #{} has exited", index))?;
+        }
+        Ok(())
+    }
+
+    /// 取消订阅一组 stream，未订阅的会被忽略
+    pub fn unsubscribe<I, S>(&mut self, streams: I) -> Result<()>
+    where
+        I: IntoIterator<Item = S>,
+        S: AsRef<str>,
+    {
+        let mut batches: HashMap<usize, Vec<String>> = HashMap::new();
+        for stream in streams {
+            if let Some((stream, index)) = self.stream_shard.remove_entry(stream.as_ref()) {
+                self.shards[index].streams.remove(&stream);
+                batches.entry(index).or_default().push(stream);
+            }
+        }
+
+        for (index, streams) in batches {
+            self.shards[index]
+                .cmd_tx
+                .send(ShardCommand::Unsubscribe(streams))
+                .map_err(|_| anyhow::anyhow!("Stream shard #{} has exited", index))?;
+        }
+        Ok(())
+    }
+
+    /// 找到一个还有余量的分片，没有则新建
+    fn shard_with_room(&mut self) -> usize {
+        if let Some(index) = self
+            .shards
+            .iter()
+            .position(|shard| shard.streams.len() < self.max_streams_per_connection)
+        {
+            return index;
+        }
+
+        let index = self.shards.len();
+        let (cmd_tx, cmd_rx) = mpsc::unbounded_channel();
+        let handle = tokio::spawn(run_shard(
+            index,
+            self.base_url.clone(),
+            cmd_rx,
+            self.sink.clone(),
+            self.retry_delay,
+        ));
+        self.shards.push(MuxShard {
+            streams: HashSet::new(),
+            cmd_tx,
+            handle,
+        });
+        index
+    }
+
+    pub fn is_subscribed(&self, stream: &str) -> bool {
+        self.stream_shard.contains_key(stream)
+    }
+
+    /// 已订阅的 stream 数量
+    pub fn stream_count(&self) -> usize {
+        self.stream_shard.len()
+    }
+
+    /// 连接分片数量
+    pub fn connection_count(&self) -> usize {
+        self.shards.len()
+    }
+
+    /// 关闭所有连接
+    pub fn shutdown(&mut self) {
+        for shard in self.shards.drain(..) {
+            shard.handle.abort();
+        }
+        self.stream_shard.clear();
+    }
+}
+
+impl Drop for StreamMultiplexer {
+    fn drop(&mut self) {
+        for shard in &self.shards {
+            shard.handle.abort();
+        }
+    }
+}
+
+fn apply_command(streams: &mut Vec<String>, command: &ShardCommand) {
+    match command {
+        ShardCommand::Subscribe(new_streams) => {
+            for stream in new_streams {
+                if !streams.contains(stream) {
+                    streams.push(stream.clone());
+                }
+            }
+        }
+        ShardCommand::Unsubscribe(removed) => streams.retain(|stream| !removed.contains(stream)),
+    }
+}
+
+/// 单个连接分片的主循环
+async fn run_shard(
+    index: usize,
+    base_url: String,
+    mut cmd_rx: mpsc::UnboundedReceiver<ShardCommand>,
+    sink: FrameSink,
+    retry_delay: Duration,
+) {
+    let mut streams: Vec<String> = Vec::new();
+    let mut request_id: u64 = 0;
+
+    'reconnect: loop {
+        // 没有订阅时不建立连接，等待新的订阅命令
+        if streams.is_empty() {
+            match cmd_rx.recv().await {
+                Some(command) => {
+                    apply_command(&mut streams, &command);
+                    continue;
+                }
+                None => break,
+            }
+        }
+
+        let ws_url = format!("{}?streams={}", base_url, streams.join("/"));
+        let url = match Url::parse(&ws_url) {
+            Ok(url) => url,
+            Err(e) => {
+                websocket_log!(error, "Invalid combined stream url for shard #{}: {}", index, e);
+                break;
+            }
+        };
+
+        websocket_log!(info, "Connecting combined stream shard #{} with {} streams", index, streams.len());
+        let ws_stream = match connect_async(url).await {
+            Ok((ws_stream, _)) => ws_stream,
+            Err(e) => {
+                websocket_log!(warn, "Combined stream shard #{} connect failed: {}", index, e);
+                tokio::time::sleep(retry_delay).await;
+                continue;
+            }
+        };
+        websocket_log!(info, "Combined stream shard #{} connected", index);
+
+        let (mut write, mut read) = ws_stream.split();
+
+        loop {
+            tokio::select! {
+                command = cmd_rx.recv() => {
+                    let Some(command) = command else {
+                        let _ = write.send(Message::Close(None)).await;
+                        break 'reconnect;
+                    };
+                    let (method, params) = match &command {
+                        ShardCommand::Subscribe(params) => ("SUBSCRIBE", params),
+                        ShardCommand::Unsubscribe(params) => ("UNSUBSCRIBE", params),
+                    };
+                    request_id += 1;
+                    let frame = serde_json::to_string(&StreamControlRequest { method, params, id: request_id })
+                        .expect("control frame is always serializable");
+                    apply_command(&mut streams, &command);
+                    if let Err(e) = write.send(Message::Text(frame)).await {
+                        // 订阅列表已更新，重连时会按新的列表建立连接
+                        websocket_log!(warn, "Failed to send {} on shard #{}: {}", method, index, e);
+                        break;
+                    }
+                }
+                msg = read.next() => {
+                    match msg {
+                        Some(Ok(Message::Text(text))) => match &sink {
+                            FrameSink::Messages(message_tx) => match decode_combined_message(&text) {
+                                Ok(Some(message)) => {
+                                    if message_tx.send(message).await.is_err() {
+                                        websocket_log!(info, "Message receiver closed, stopping shard #{}", index);
+                                        break 'reconnect;
+                                    }
+                                }
+                                Ok(None) => {}
+                                Err(e) => {
+                                    websocket_log!(warn, "Failed to decode combined stream message: {}", e);
+                                    websocket_log!(debug, "Failed message content: {}", text);
+                                }
+                            },
+                            FrameSink::Frames(router) => {
+                                if let Err(e) = router(&text) {
+                                    websocket_log!(warn, "Failed to route combined stream frame: {}", e);
+                                    websocket_log!(debug, "Failed message content: {}", text);
+                                }
+                            }
+                        },
+                        Some(Ok(Message::Ping(data))) => {
+                            if let Err(e) = write.send(Message::Pong(data)).await {
+                                websocket_log!(warn, "Failed to send pong on shard #{}: {}", index, e);
+                                break;
+                            }
+                        }
+                        Some(Ok(Message::Close(_))) | None => {
+                            websocket_log!(warn, "Combined stream shard #{} closed", index);
+                            break;
+                        }
+                        Some(Err(e)) => {
+                            websocket_log!(warn, "Combined stream shard #{} error: {}", index, e);
+                            break;
+                        }
+                        Some(Ok(_)) => {}
+                    }
+                }
+            }
+        }
+
+        tokio::time::sleep(retry_delay).await;
+    }
+
+    websocket_log!(info, "Combined stream shard #{} exited", index);
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use crate::common::config::ws_config::ChannelConfig;
+    use crate::exchange_api::binance::ws_manager::websocket_message_channel;
+
+    #[test]
+    fn test_classify_stream() {
+        assert_eq!(classify_stream("btcusdt@markPrice@1s"), Some(WebSocketDataType::MarkPrice));
+        assert_eq!(classify_stream("btcusdt@kline_1m"), Some(WebSocketDataType::Kline));
+        assert_eq!(classify_stream("btcusdt@depth20@100ms"), Some(WebSocketDataType::PartialDepth));
+        assert_eq!(classify_stream("btcusdt@depth@100ms"), Some(WebSocketDataType::DiffDepth));
+        assert_eq!(classify_stream("btcusdt@bookTicker"), Some(WebSocketDataType::BookTicker));
+        assert_eq!(classify_stream("btcusdt@trade"), Some(WebSocketDataType::Trade));
+        assert_eq!(classify_stream("btcusdt@aggTrade"), None);
+    }
+
+    #[test]
+    fn test_decode_combined_message() {
+        let text = r#"{"stream":"btcusdt@depth5","data":{"lastUpdateId":1,"bids":[["100.0","1.0"]],"asks":[["101.0","2.0"]]}}"#;
+        match decode_combined_message(text).unwrap() {
+            Some(WebSocketMessage::PartialDepth(depth)) => assert_eq!(depth.bids[0], [100.0, 1.0]),
+            other => panic!("unexpected message: {:?}", other),
+        }
+
+        // 字段顺序不同时退回整帧解析
+        let text = r#"{"data":{"e":"trade","E":1,"T":1,"s":"BTCUSDT","t":5,"p":"100.5","q":"2","m":true},"stream":"btcusdt@trade"}"#;
+        match decode_combined_message(text).unwrap() {
+            Some(WebSocketMessage::Trade(trade)) => assert_eq!(trade.price, 100.5),
+            other => panic!("unexpected message: {:?}", other),
+        }
+
+        // 控制帧响应
+        assert!(decode_combined_message(r#"{"result":null,"id":1}"#).unwrap().is_none());
+    }
+
+    #[test]
+    fn test_decode_stream_message() {
+        let text = r#"{"e":"bookTicker","u":1,"E":2,"T":3,"s":"BTCUSDT","b":"100.0","B":"1","a":"100.1","A":"2"}"#;
+        match decode_stream_message(text).unwrap() {
+            Some(WebSocketMessage::BookTicker(ticker)) => assert_eq!(ticker.best_ask_price, 100.1),
+            other => panic!("unexpected message: {:?}", other),
+        }
+
+        let text = r#"{"stream":"btcusdt@bookTicker","data":{"e":"bookTicker","u":1,"E":2,"T":3,"s":"BTCUSDT","b":"100.0","B":"1","a":"100.1","A":"2"}}"#;
+        assert!(matches!(decode_stream_message(text).unwrap(), Some(WebSocketMessage::BookTicker(_))));
+
+        assert!(decode_stream_message(r#"{"e":"depthUpdate","E":1}"#).unwrap().is_none());
+        assert!(decode_stream_message(r#"{"stream":"btcusdt@bookTicker","data":{"u":1}}"#).is_err());
+    }
+
+    #[tokio::test]
+    async fn test_shards_at_stream_limit() {
+        let (tx, _rx) = websocket_message_channel(&ChannelConfig::default());
+        // 指向不可达地址，只验证分片分配
+        let mut mux = StreamMultiplexer::new(tx)
+            .with_base_url("ws://127.0.0.1:9/stream")
+            .with_max_streams_per_connection(2);
+
+        mux.subscribe(["a@trade", "b@trade", "c@trade"]).unwrap();
+        assert_eq!(mux.connection_count(), 2);
+        assert_eq!(mux.stream_count(), 3);
+
+        // 重复订阅被忽略，释放的名额会被复用
+        mux.subscribe(["a@trade"]).unwrap();
+        mux.unsubscribe(["b@trade"]).unwrap();
+        mux.subscribe(["d@trade"]).unwrap();
+        assert_eq!(mux.connection_count(), 2);
+        assert!(mux.is_subscribed("d@trade"));
+        assert!(!mux.is_subscribed("b@trade"));
+        mux.shutdown();
+    }
+}
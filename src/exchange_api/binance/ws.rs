@@ -2,10 +2,10 @@ use crate::common::consts::BINANCE_WS;
 use crate::dto::binance::websocket::{MarkPriceData, BinancePartialDepth, BinanceDepthUpdate, KlineData, BookTickerData, BinanceTradeData};
 use anyhow::Result;
 use futures::{StreamExt, SinkExt};
-use serde_json;
+use crate::common::bounded_channel::MessageSink;
+use crate::common::json::decode_json;
 use crate::websocket_log;
 use std::time::{Duration, Instant};
-use tokio::sync::mpsc;
 use tokio_tungstenite::{connect_async, tungstenite::protocol::Message};
 use url::Url;
 
@@ -36,7 +36,7 @@ impl BinanceWebSocket {
         &self,
         symbol: &str,
         interval: &str,
-        tx: mpsc::UnboundedSender<MarkPriceData>,
+        tx: impl MessageSink<MarkPriceData>,
     ) -> Result<()> {
         let stream_name = format!("{}@markPrice@{}", symbol, interval);
         let ws_url = format!("{}/{}", self.base_url, stream_name);
@@ -54,9 +54,9 @@ impl BinanceWebSocket {
         while let Some(msg) = read.next().await {
             match msg? {
                 Message::Text(text) => {
-                    if let Ok(data) = serde_json::from_str::<MarkPriceData>(&text) {
-                        if let Err(e) = tx.send(data) {
-                            websocket_log!(warn, "Failed to send message: {}", e);
+                    if let Ok(data) = decode_json::<MarkPriceData>(&text) {
+                        if !tx.deliver(data).await {
+                            websocket_log!(warn, "Failed to send message (channel closed)");
                             break;
                         }
                     }
@@ -89,7 +89,7 @@ impl BinanceWebSocket {
         Ok(())
     }
 
-    /// 订阅订单簿深度数据
+    /// 订阅订单簿增量深度数据 (depthUpdate)
     ///
     /// # Arguments
     /// * `symbol` - 交易对符号，如 "btcusdt"
@@ -99,7 +99,7 @@ impl BinanceWebSocket {
         &self,
         symbol: &str,
         interval: &str,
-        tx: mpsc::UnboundedSender<BinancePartialDepth>,
+        tx: impl MessageSink<BinanceDepthUpdate>,
     ) -> Result<()> {
         let stream_name = if interval == "250ms" {
             format!("{}@depth", symbol)
@@ -121,13 +121,30 @@ impl BinanceWebSocket {
         while let Some(msg) = read.next().await {
             match msg? {
                 Message::Text(text) => {
-                    websocket_log!(debug, "Received Depth message, length: {}", text.len());
-                    // subscribe_depth 暂时不使用，只支持 partial depth
-                    websocket_log!(warn, "subscribe_depth is deprecated, use subscribe_partial_depth instead");
+                    match decode_json::<BinanceDepthUpdate>(&text) {
+                        Ok(data) => {
+                            if !tx.deliver(data).await {
+                                websocket_log!(warn, "Failed to send depth update (channel closed)");
+                                return Err(anyhow::anyhow!("Channel closed while sending depth update"));
+                            }
+                        }
+                        Err(e) => {
+                            websocket_log!(warn, "Failed to parse depth update: {}", e);
+                            websocket_log!(debug, "Failed message content: {}", text);
+                        }
+                    }
                 }
-                Message::Close(_) => {
-                    websocket_log!(info, "Depth WebSocket connection closed");
-                    break;
+                Message::Close(close_frame) => {
+                    if let Some(frame) = close_frame {
+                        websocket_log!(warn, "Depth WebSocket closed with code: {:?}, reason: {}",
+                            frame.code, frame.reason);
+                        // 返回错误以便触发重连，本地订单簿会通过 pu 断档检测重新同步
+                        return Err(anyhow::anyhow!("WebSocket closed with code: {:?}, reason: {}",
+                            frame.code, frame.reason));
+                    } else {
+                        websocket_log!(warn, "Depth WebSocket connection closed without close frame (likely network issue)");
+                        return Err(anyhow::anyhow!("WebSocket connection closed without close frame (likely network issue)"));
+                    }
                 }
                 Message::Ping(data) => {
                     websocket_log!(debug, "Received ping from depth stream, sending pong");
@@ -146,12 +163,54 @@ impl BinanceWebSocket {
         Ok(())
     }
 
+    /// 带重试机制的增量深度订阅
+    pub async fn subscribe_depth_with_reconnect(
+        &self,
+        symbol: &str,
+        interval: &str,
+        tx: impl MessageSink<BinanceDepthUpdate>,
+        max_retries: usize,
+        retry_delay: Duration,
+    ) -> Result<()> {
+        let mut retry_count = 0;
+
+        loop {
+            let result = self.subscribe_depth(symbol, interval, &tx).await;
+            if tx.is_closed() {
+                // 下游已经退出，不再重连
+                return result;
+            }
+
+            retry_count += 1;
+            match result {
+                Ok(_) => {
+                    websocket_log!(warn, "Depth WebSocket connection completed unexpectedly, will retry");
+                }
+                Err(e) => {
+                    websocket_log!(warn, "Depth WebSocket connection failed (attempt {}/{}): {}",
+                        retry_count, max_retries, e);
+                    if retry_count >= max_retries {
+                        websocket_log!(error, "Depth WebSocket connection failed after {} attempts, giving up", max_retries);
+                        return Err(e);
+                    }
+                }
+            }
+
+            if retry_count >= max_retries {
+                return Err(anyhow::anyhow!("Max retries reached for depth connection"));
+            }
+
+            websocket_log!(info, "Retrying Depth connection in {:?}...", retry_delay);
+            tokio::time::sleep(retry_delay).await;
+        }
+    }
+
     /// 创建多个标记价格 WebSocket 连接
     pub async fn subscribe_multiple_mark_prices(
         &self,
         symbols: Vec<String>,
         interval: &str,
-        tx: mpsc::UnboundedSender<MarkPriceData>,
+        tx: impl MessageSink<MarkPriceData>,
     ) -> Result<()> {
         let stream_names: Vec<String> = symbols
             .iter()
@@ -173,9 +232,9 @@ impl BinanceWebSocket {
         while let Some(msg) = read.next().await {
             match msg? {
                 Message::Text(text) => {
-                    if let Ok(data) = serde_json::from_str::<MarkPriceData>(&text) {
-                        if let Err(e) = tx.send(data) {
-                            websocket_log!(warn, "Failed to send message: {}", e);
+                    if let Ok(data) = decode_json::<MarkPriceData>(&text) {
+                        if !tx.deliver(data).await {
+                            websocket_log!(warn, "Failed to send message (channel closed)");
                             break;
                         }
                     }
@@ -206,12 +265,12 @@ impl BinanceWebSocket {
         Ok(())
     }
 
-    /// 订阅多个交易对的深度数据
+    /// 订阅多个交易对的增量深度数据
     pub async fn subscribe_multiple_depths(
         &self,
         symbols: &[String],
         interval: &str,
-        tx: mpsc::UnboundedSender<BinancePartialDepth>,
+        tx: impl MessageSink<BinanceDepthUpdate>,
     ) -> Result<()> {
         let stream_names: Vec<String> = symbols
             .iter()
@@ -239,12 +298,22 @@ impl BinanceWebSocket {
         while let Some(msg) = read.next().await {
             match msg? {
                 Message::Text(text) => {
-                    // subscribe_multiple_depths 暂时不使用，只支持 partial depth
-                    websocket_log!(warn, "subscribe_multiple_depths is deprecated, use subscribe_multiple_partial_depths instead");
+                    match decode_json::<BinanceDepthUpdate>(&text) {
+                        Ok(data) => {
+                            if !tx.deliver(data).await {
+                                websocket_log!(warn, "Failed to send depth update (channel closed)");
+                                return Err(anyhow::anyhow!("Channel closed while sending depth update"));
+                            }
+                        }
+                        Err(e) => {
+                            websocket_log!(warn, "Failed to parse depth update: {}", e);
+                            websocket_log!(debug, "Failed message content: {}", text);
+                        }
+                    }
                 }
                 Message::Close(_) => {
-                    websocket_log!(info, "Multiple depth streams connection closed");
-                    break;
+                    websocket_log!(warn, "Multiple depth streams connection closed");
+                    return Err(anyhow::anyhow!("Multiple depth streams connection closed"));
                 }
                 Message::Ping(data) => {
                     websocket_log!(debug, "Received ping from multiple depth streams, sending pong");
@@ -275,7 +344,7 @@ impl BinanceWebSocket {
         symbol: &str,
         levels: u8,
         interval: Option<&str>,
-        tx: mpsc::UnboundedSender<BinancePartialDepth>,
+        tx: impl MessageSink<BinancePartialDepth>,
     ) -> Result<()> {
         // 验证 levels 参数
         if !matches!(levels, 5 | 10 | 20) {
@@ -307,10 +376,10 @@ impl BinanceWebSocket {
             match msg? {
                 Message::Text(text) => {
                     websocket_log!(debug, "Received Partial Depth message, length: {}", text.len());
-                    match serde_json::from_str::<BinancePartialDepth>(&text) {
+                    match decode_json::<BinancePartialDepth>(&text) {
                         Ok(data) => {
-                            if let Err(e) = tx.send(data) {
-                                websocket_log!(warn, "Failed to send partial depth message: {}", e);
+                            if !tx.deliver(data).await {
+                                websocket_log!(warn, "Failed to send partial depth message (channel closed)");
                                 break;
                             } else {
                                 websocket_log!(debug, "Partial Depth message sent successfully");
@@ -355,7 +424,7 @@ impl BinanceWebSocket {
         symbols: &[String],
         levels: u8,
         interval: Option<&str>,
-        tx: mpsc::UnboundedSender<BinancePartialDepth>,
+        tx: impl MessageSink<BinancePartialDepth>,
     ) -> Result<()> {
         // 验证 levels 参数
         if !matches!(levels, 5 | 10 | 20) {
@@ -392,10 +461,10 @@ impl BinanceWebSocket {
         while let Some(msg) = read.next().await {
             match msg? {
                 Message::Text(text) => {
-                    match serde_json::from_str::<BinancePartialDepth>(&text) {
+                    match decode_json::<BinancePartialDepth>(&text) {
                         Ok(data) => {
-                            if let Err(e) = tx.send(data) {
-                                websocket_log!(warn, "Failed to send partial depth message: {}", e);
+                            if !tx.deliver(data).await {
+                                websocket_log!(warn, "Failed to send partial depth message (channel closed)");
                                 break;
                             }
                         }
@@ -434,7 +503,7 @@ impl BinanceWebSocket {
     pub async fn subscribe_trades(
         &self,
         symbol: &str,
-        tx: mpsc::UnboundedSender<BinanceTradeData>,
+        tx: impl MessageSink<BinanceTradeData>,
     ) -> Result<()> {
         let stream_name = format!("{}@trade", symbol);
         let ws_url = format!("{}/{}", self.base_url, stream_name);
@@ -451,9 +520,9 @@ impl BinanceWebSocket {
         while let Some(msg) = read.next().await {
             match msg? {
                 Message::Text(text) => {
-                    if let Ok(data) = serde_json::from_str::<BinanceTradeData>(&text) {
-                        if let Err(e) = tx.send(data) {
-                            websocket_log!(warn, "Failed to send trade message: {}", e);
+                    if let Ok(data) = decode_json::<BinanceTradeData>(&text) {
+                        if !tx.deliver(data).await {
+                            websocket_log!(warn, "Failed to send trade message (channel closed)");
                             break;
                         }
                     } else {
@@ -489,7 +558,7 @@ impl BinanceWebSocket {
     pub async fn subscribe_multiple_trades(
         &self,
         symbols: &[String],
-        tx: mpsc::UnboundedSender<BinanceTradeData>,
+        tx: impl MessageSink<BinanceTradeData>,
     ) -> Result<()> {
         let stream_names: Vec<String> = symbols
             .iter()
@@ -511,9 +580,9 @@ impl BinanceWebSocket {
         while let Some(msg) = read.next().await {
             match msg? {
                 Message::Text(text) => {
-                    if let Ok(data) = serde_json::from_str::<BinanceTradeData>(&text) {
-                        if let Err(e) = tx.send(data) {
-                            websocket_log!(warn, "Failed to send trade message: {}", e);
+                    if let Ok(data) = decode_json::<BinanceTradeData>(&text) {
+                        if !tx.deliver(data).await {
+                            websocket_log!(warn, "Failed to send trade message (channel closed)");
                             break;
                         }
                     } else {
@@ -546,7 +615,7 @@ impl BinanceWebSocket {
         &self,
         symbol: &str,
         interval: &str,
-        tx: mpsc::UnboundedSender<MarkPriceData>,
+        tx: impl MessageSink<MarkPriceData>,
         max_retries: usize,
         retry_delay: Duration,
     ) -> Result<()> {
@@ -554,7 +623,7 @@ impl BinanceWebSocket {
 
         loop {
             match self
-                .subscribe_mark_price(symbol, interval, tx.clone())
+                .subscribe_mark_price(symbol, interval, &tx)
                 .await
             {
                 Ok(_) => {
@@ -588,7 +657,7 @@ impl BinanceWebSocket {
         &self,
         symbol: &str,
         interval: &str,
-        tx: mpsc::UnboundedSender<KlineData>,
+        tx: impl MessageSink<KlineData>,
     ) -> Result<()> {
         let stream_name = format!("{}@kline_{}", symbol, interval);
         let ws_url = format!("{}/{}", self.base_url, stream_name);
@@ -605,11 +674,11 @@ impl BinanceWebSocket {
         while let Some(msg) = read.next().await {
             match msg? {
                 Message::Text(text) => {
-                    if let Ok(data) = serde_json::from_str::<KlineData>(&text) {
-                        if let Err(e) = tx.send(data) {
-                            websocket_log!(warn, "Failed to send kline message: {} (channel closed)", e);
+                    if let Ok(data) = decode_json::<KlineData>(&text) {
+                        if !tx.deliver(data).await {
+                            websocket_log!(warn, "Failed to send kline message (channel closed)");
                             // 通道关闭，返回错误以便触发重连
-                            return Err(anyhow::anyhow!("Channel closed while sending kline message: {}", e));
+                            return Err(anyhow::anyhow!("Channel closed while sending kline message"));
                         }
                     }
                 }
@@ -648,7 +717,7 @@ impl BinanceWebSocket {
         &self,
         symbols: &[String],
         interval: &str,
-        tx: mpsc::UnboundedSender<KlineData>,
+        tx: impl MessageSink<KlineData>,
     ) -> Result<()> {
         let stream_names: Vec<String> = symbols
             .iter()
@@ -670,11 +739,11 @@ impl BinanceWebSocket {
         while let Some(msg) = read.next().await {
             match msg? {
                 Message::Text(text) => {
-                    if let Ok(data) = serde_json::from_str::<KlineData>(&text) {
-                        if let Err(e) = tx.send(data) {
-                            websocket_log!(warn, "Failed to send kline message: {} (channel closed)", e);
+                    if let Ok(data) = decode_json::<KlineData>(&text) {
+                        if !tx.deliver(data).await {
+                            websocket_log!(warn, "Failed to send kline message (channel closed)");
                             // 通道关闭，返回错误以便触发重连
-                            return Err(anyhow::anyhow!("Channel closed while sending kline message: {}", e));
+                            return Err(anyhow::anyhow!("Channel closed while sending kline message"));
                         }
                     }
                 }
@@ -713,14 +782,14 @@ impl BinanceWebSocket {
         &self,
         symbol: &str,
         interval: &str,
-        tx: mpsc::UnboundedSender<KlineData>,
+        tx: impl MessageSink<KlineData>,
         max_retries: usize,
         retry_delay: Duration,
     ) -> Result<()> {
         let mut retry_count = 0;
 
         loop {
-            match self.subscribe_kline(symbol, interval, tx.clone()).await {
+            match self.subscribe_kline(symbol, interval, &tx).await {
                 Ok(_) => {
                     // 正常情况下不应该到达这里，因为连接断开会返回错误
                     websocket_log!(warn, "Kline WebSocket connection completed unexpectedly, will retry");
@@ -754,14 +823,14 @@ impl BinanceWebSocket {
         &self,
         symbols: &[String],
         interval: &str,
-        tx: mpsc::UnboundedSender<KlineData>,
+        tx: impl MessageSink<KlineData>,
         max_retries: usize,
         retry_delay: Duration,
     ) -> Result<()> {
         let mut retry_count = 0;
 
         loop {
-            match self.subscribe_multiple_klines(symbols, interval, tx.clone()).await {
+            match self.subscribe_multiple_klines(symbols, interval, &tx).await {
                 Ok(_) => {
                     // 正常情况下不应该到达这里，因为连接断开会返回错误
                     websocket_log!(warn, "Multiple Kline WebSocket connection completed unexpectedly, will retry");
@@ -797,7 +866,7 @@ impl BinanceWebSocket {
     pub async fn subscribe_book_ticker(
         &self,
         symbol: &str,
-        tx: mpsc::UnboundedSender<BookTickerData>,
+        tx: impl MessageSink<BookTickerData>,
     ) -> Result<()> {
         let stream_name = format!("{}@bookTicker", symbol);
         let ws_url = format!("{}/{}", self.base_url, stream_name);
@@ -814,9 +883,9 @@ impl BinanceWebSocket {
         while let Some(msg) = read.next().await {
             match msg? {
                 Message::Text(text) => {
-                    if let Ok(data) = serde_json::from_str::<BookTickerData>(&text) {
-                        if let Err(e) = tx.send(data) {
-                            websocket_log!(warn, "Failed to send book ticker message: {}", e);
+                    if let Ok(data) = decode_json::<BookTickerData>(&text) {
+                        if !tx.deliver(data).await {
+                            websocket_log!(warn, "Failed to send book ticker message (channel closed)");
                             break;
                         }
                     } else {
@@ -848,7 +917,7 @@ impl BinanceWebSocket {
     pub async fn subscribe_multiple_book_tickers(
         &self,
         symbols: &[String],
-        tx: mpsc::UnboundedSender<BookTickerData>,
+        tx: impl MessageSink<BookTickerData>,
     ) -> Result<()> {
         let stream_names: Vec<String> = symbols
             .iter()
@@ -870,9 +939,9 @@ impl BinanceWebSocket {
         while let Some(msg) = read.next().await {
             match msg? {
                 Message::Text(text) => {
-                    if let Ok(data) = serde_json::from_str::<BookTickerData>(&text) {
-                        if let Err(e) = tx.send(data) {
-                            websocket_log!(warn, "Failed to send book ticker message: {}", e);
+                    if let Ok(data) = decode_json::<BookTickerData>(&text) {
+                        if !tx.deliver(data).await {
+                            websocket_log!(warn, "Failed to send book ticker message (channel closed)");
                             break;
                         }
                     }
@@ -897,6 +966,51 @@ impl BinanceWebSocket {
 
         Ok(())
     }
+
+    /// 订阅一组 stream，把每条文本帧原样转发，由调用方按 stream / 事件类型分发
+    ///
+    /// 多个 stream 共用一个连接（`<base>/<stream1>/<stream2>`），推送不带外层包装，
+    /// 接收方按 `e` 字段区分数据类型。
+    pub async fn subscribe_frames(
+        &self,
+        streams: &[String],
+        tx: impl MessageSink<String>,
+    ) -> Result<()> {
+        let ws_url = format!("{}/{}", self.base_url, streams.join("/"));
+
+        websocket_log!(info, "Connecting to raw frame streams: {}", ws_url);
+
+        let url = Url::parse(&ws_url)?;
+        let (ws_stream, _) = connect_async(url).await?;
+
+        websocket_log!(info, "Raw frame streams connected successfully");
+
+        let (mut write, mut read) = ws_stream.split();
+
+        while let Some(msg) = read.next().await {
+            match msg? {
+                Message::Text(text) => {
+                    if !tx.deliver(text).await {
+                        websocket_log!(warn, "Frame receiver closed, stopping raw frame streams");
+                        break;
+                    }
+                }
+                Message::Close(_) => {
+                    websocket_log!(info, "Raw frame streams connection closed");
+                    break;
+                }
+                Message::Ping(data) => {
+                    if let Err(e) = write.send(Message::Pong(data)).await {
+                        websocket_log!(warn, "Failed to send pong: {}", e);
+                        return Err(anyhow::anyhow!("Failed to send pong: {}", e));
+                    }
+                }
+                _ => {}
+            }
+        }
+
+        Ok(())
+    }
 }
 
 // 使用示例和测试
@@ -909,7 +1023,7 @@ mod tests {
     #[tokio::test]
     async fn test_websocket_connection() {
         let ws = BinanceWebSocket::new();
-        let (tx, mut rx) = mpsc::unbounded_channel();
+        let (tx, mut rx) = mpsc::channel(100);
 
         // 启动 WebSocket 连接
         let symbol = "bnbusdt";
@@ -992,7 +1106,7 @@ mod tests {
     #[tokio::test]
     async fn test_depth_websocket_connection() {
         let ws = BinanceWebSocket::new();
-        let (tx, mut rx) = mpsc::unbounded_channel();
+        let (tx, mut rx) = mpsc::channel(100);
 
         // 启动深度数据 WebSocket 连接
         let symbol = "btcusdt";
@@ -1020,7 +1134,7 @@ mod tests {
     #[tokio::test]
     async fn test_kline_websocket_connection() {
         let ws = BinanceWebSocket::new();
-        let (tx, mut rx) = mpsc::unbounded_channel();
+        let (tx, mut rx) = mpsc::channel(100);
 
         // 启动 Kline WebSocket 连接
         let symbol = "btcusdt";
@@ -1048,7 +1162,7 @@ mod tests {
     #[tokio::test]
     async fn test_multiple_klines_websocket_connection() {
         let ws = BinanceWebSocket::new();
-        let (tx, mut rx) = mpsc::unbounded_channel();
+        let (tx, mut rx) = mpsc::channel(100);
 
         // 启动多个 Kline WebSocket 连接
         let symbols = vec!["btcusdt".to_string(), "ethusdt".to_string()];
@@ -1077,7 +1191,7 @@ mod tests {
     #[tokio::test]
     async fn test_book_ticker_websocket_connection() {
         let ws = BinanceWebSocket::new();
-        let (tx, mut rx) = mpsc::unbounded_channel();
+        let (tx, mut rx) = mpsc::channel(100);
 
         // 启动 Book Ticker WebSocket 连接
         let symbol = "btcusdt";
@@ -1105,7 +1219,7 @@ mod tests {
     #[tokio::test]
     async fn test_multiple_book_tickers_websocket_connection() {
         let ws = BinanceWebSocket::new();
-        let (tx, mut rx) = mpsc::unbounded_channel();
+        let (tx, mut rx) = mpsc::channel(100);
 
         // 启动多个 Book Ticker WebSocket 连接
         let symbols = vec!["btcusdt".to_string(), "ethusdt".to_string()];
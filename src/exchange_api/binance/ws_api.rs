@@ -0,0 +1,450 @@
+use crate::common::consts::BINANCE_WS_FAPI;
+use crate::common::signer::{RequestSigner, SignedQuery};
+use crate::dto::binance::rest_api::{BatchOrderResult, BinanceErrorResponse, OrderRequest, OrderResponse};
+use crate::dto::binance::ws_api::{WsApiRequest, WsApiResponse};
+use crate::{error_log, order_log};
+use anyhow::Result;
+use dashmap::DashMap;
+use futures::future::join_all;
+use futures::{SinkExt, StreamExt};
+use std::collections::BTreeMap;
+use std::fmt;
+use std::sync::atomic::{AtomicBool, AtomicU64, Ordering};
+use std::sync::Arc;
+use std::time::{Duration, SystemTime, UNIX_EPOCH};
+use tokio::net::TcpStream;
+use tokio::sync::{mpsc, oneshot};
+use tokio_tungstenite::{connect_async, tungstenite::protocol::Message, MaybeTlsStream, WebSocketStream};
+
+/// 单个请求等待响应的默认超时
+const DEFAULT_REQUEST_TIMEOUT: Duration = Duration::from_secs(10);
+
+/// 连接层失败时写入 `BatchOrderResult` 的错误码（币安 -1001 DISCONNECTED）
+const DISCONNECTED: i32 = -1001;
+
+/// 断线后第一次重连前的等待时间，之后每次失败翻倍
+const RECONNECT_INITIAL_DELAY: Duration = Duration::from_millis(200);
+
+/// 重连等待时间上限
+const RECONNECT_MAX_DELAY: Duration = Duration::from_secs(30);
+
+/// 在途请求：id -> 等待响应的调用方
+type PendingRequests = DashMap<u64, oneshot::Sender<WsApiResponse>>;
+
+type WsStream = WebSocketStream<MaybeTlsStream<TcpStream>>;
+
+/// 币安期货 WebSocket API（ws-fapi）下单客户端
+///
+/// 与 REST 客户端使用相同的 `OrderRequest` / `OrderResponse` / `BatchOrderResult`：
+/// - 一条持久连接，省掉每个请求的 HTTP 头、连接复用检查和 TLS 开销
+/// - 写任务串行发送请求帧，读任务按响应中的 `id` 唤醒对应的调用方，多个请求可以同时在途
+/// - 每个请求按 ws-fapi 要求携带 apiKey / timestamp / signature（参数按字母排序后 HMAC-SHA256）
+///
+/// 连接断开后所有在途请求立即失败；后台按指数退避重连，重连成功前的请求直接返回错误，
+/// 由调用方决定重试或退回 REST。
+pub struct BinanceWsApi {
+    api_key: String,
+    signer: RequestSigner,
+    next_id: AtomicU64,
+    pending: Arc<PendingRequests>,
+    connected: Arc<AtomicBool>,
+    outgoing: mpsc::UnboundedSender<Message>,
+    request_timeout: Duration,
+}
+
+impl fmt::Debug for BinanceWsApi {
+    fn fmt(&self, f: &mut fmt::Formatter<'_>) -> fmt::Result {
+        f.debug_struct("BinanceWsApi")
+            .field("connected", &self.is_connected())
+            .field("in_flight", &self.in_flight())
+            .field("request_timeout", &self.request_timeout)
+            .finish()
+    }
+}
+
+impl BinanceWsApi {
+    /// 连接币安期货 WebSocket API
+    pub async fn connect(api_key: String, secret_key: String) -> Result<Self> {
+        Self::connect_url(BINANCE_WS_FAPI, api_key, secret_key).await
+    }
+
+    /// 连接指定地址（测试和基准使用本地 mock 服务器）
+    ///
+    /// 首次连接失败直接返回错误；之后的断线由后台任务重连。
+    pub async fn connect_url(url: &str, api_key: String, secret_key: String) -> Result<Self> {
+        let (ws_stream, _) = connect_async(url).await?;
+        let (outgoing, outgoing_rx) = mpsc::unbounded_channel::<Message>();
+        let pending: Arc<PendingRequests> = Arc::new(DashMap::new());
+        let connected = Arc::new(AtomicBool::new(true));
+
+        tokio::spawn(run_connection(
+            url.to_string(),
+            ws_stream,
+            outgoing_rx,
+            pending.clone(),
+            connected.clone(),
+        ));
+
+        Ok(Self {
+            api_key,
+            signer: RequestSigner::new(&secret_key),
+            next_id: AtomicU64::new(1),
+            pending,
+            connected,
+            outgoing,
+            request_timeout: DEFAULT_REQUEST_TIMEOUT,
+        })
+    }
+
+    /// 设置单个请求等待响应的超时
+    pub fn with_request_timeout(mut self, timeout: Duration) -> Self {
+        self.request_timeout = timeout;
+        self
+    }
+
+    /// 连接是否仍然可用
+    pub fn is_connected(&self) -> bool {
+        self.connected.load(Ordering::SeqCst)
+    }
+
+    /// 当前在途（已发送、未收到响应）的请求数
+    pub fn in_flight(&self) -> usize {
+        self.pending.len()
+    }
+
+    /// 发送一个签名请求并等待对应 id 的响应
+    async fn request(&self, method: &str, mut params: BTreeMap<String, String>) -> Result<WsApiResponse> {
+        params.insert("apiKey".to_string(), self.api_key.clone());
+        params.entry("timestamp".to_string()).or_insert_with(|| timestamp_ms().to_string());
+        // BTreeMap 已按字母排序，与 REST 签名规则相同
+        let mut payload = SignedQuery::new("");
+        for (key, value) in &params {
+            payload.push(key, value);
+        }
+        let signature = self.signer.sign(payload.query().as_bytes());
+        params.insert("signature".to_string(), signature.to_string());
+
+        let id = self.next_id.fetch_add(1, Ordering::Relaxed);
+        let frame = serde_json::to_string(&WsApiRequest { id, method, params: &params })?;
+
+        let (tx, rx) = oneshot::channel();
+        self.pending.insert(id, tx);
+        if !self.is_connected() || self.outgoing.send(Message::Text(frame)).is_err() {
+            self.pending.remove(&id);
+            return Err(anyhow::anyhow!("ws-fapi 连接已断开: method={}", method));
+        }
+
+        match tokio::time::timeout(self.request_timeout, rx).await {
+            Ok(Ok(response)) => Ok(response),
+            Ok(Err(_)) => Err(anyhow::anyhow!("ws-fapi 连接已断开: method={}, id={}", method, id)),
+            Err(_) => {
+                self.pending.remove(&id);
+                Err(anyhow::anyhow!("ws-fapi 请求超时: method={}, id={}", method, id))
+            }
+        }
+    }
+
+    /// 发送 `order.place`：外层错误为连接/超时，内层错误为交易所拒单
+    async fn place_order(&self, request: &OrderRequest) -> Result<Result<OrderResponse, BinanceErrorResponse>> {
+        let mut params: BTreeMap<String, String> = request.to_params()?.into_iter().collect();
+        if let Some(timestamp) = request.timestamp {
+            params.insert("timestamp".to_string(), timestamp.to_string());
+        }
+        params.insert("recvWindow".to_string(), request.recv_window.unwrap_or(60000).to_string());
+
+        match self.request("order.place", params).await?.into_result() {
+            Ok(result) => Ok(Ok(serde_json::from_value(result)?)),
+            Err(error) => Ok(Err(error)),
+        }
+    }
+
+    /// 下单（与 `BinanceFuturesApi::new_order` 语义相同）
+    pub async fn new_order(&self, request: OrderRequest) -> Result<OrderResponse> {
+        self.place_order(&request)
+            .await?
+            .map_err(|e| anyhow::anyhow!("API 请求失败: 错误码={}, 消息={}", e.code, e.msg))
+    }
+
+    /// 批量下单：ws-fapi 没有批量接口，每个订单一个 `order.place`，全部同时在途
+    ///
+    /// 结果按原始顺序汇总为 `BatchOrderResult`，连接层失败的订单记为 -1001。
+    pub async fn batch_orders(&self, orders: Vec<OrderRequest>, recv_window: Option<u64>) -> Result<BatchOrderResult> {
+        if orders.is_empty() {
+            return Err(anyhow::anyhow!("订单列表不能为空"));
+        }
+
+        let requests: Vec<OrderRequest> = orders
+            .into_iter()
+            .map(|mut order| {
+                if order.recv_window.is_none() {
+                    order.recv_window = recv_window;
+                }
+                order
+            })
+            .collect();
+        let responses = join_all(requests.iter().map(|order| self.place_order(order))).await;
+
+        let mut result = BatchOrderResult::new(requests.len());
+        for (index, response) in responses.into_iter().enumerate() {
+            match response {
+                Ok(Ok(order)) => {
+                    order_log!(info, "✅ 订单{}成功(ws): ID={}, 状态={}", index + 1, order.order_id, order.status);
+                    result.add_success(order);
+                }
+                Ok(Err(error)) => {
+                    order_log!(error, "❌ 订单{}失败(ws): 错误码={}, 消息={}", index + 1, error.code, error.msg);
+                    result.add_failure(index, error);
+                }
+                Err(e) => {
+                    order_log!(error, "❌ 订单{}失败(ws): {}", index + 1, e);
+                    result.add_failure(index, BinanceErrorResponse { code: DISCONNECTED, msg: e.to_string() });
+                }
+            }
+        }
+        Ok(result)
+    }
+}
+
+/// 连接任务：请求帧从 `outgoing_rx` 串行写入当前连接，响应按 id 分发，服务器 ping 回 pong
+///
+/// 断线后让所有在途请求失败，按指数退避重连，连上后换用新连接的读写两端继续服务。
+/// 客户端被 drop（`outgoing` 关闭）时退出。
+async fn run_connection(
+    url: String,
+    mut ws_stream: WsStream,
+    mut outgoing_rx: mpsc::UnboundedReceiver<Message>,
+    pending: Arc<PendingRequests>,
+    connected: Arc<AtomicBool>,
+) {
+    loop {
+        let (mut sink, mut stream) = ws_stream.split();
+
+        loop {
+            tokio::select! {
+                message = outgoing_rx.recv() => {
+                    let Some(message) = message else {
+                        let _ = sink.close().await;
+                        return;
+                    };
+                    if let Err(e) = sink.send(message).await {
+                        error_log!(error, "❌ ws-fapi 发送失败: {}", e);
+                        break;
+                    }
+                }
+                message = stream.next() => {
+                    match message {
+                        Some(Ok(Message::Text(text))) => dispatch_response(&pending, &text),
+                        Some(Ok(Message::Ping(payload))) => {
+                            if let Err(e) = sink.send(Message::Pong(payload)).await {
+                                error_log!(error, "❌ ws-fapi 发送 pong 失败: {}", e);
+                                break;
+                            }
+                        }
+                        Some(Ok(Message::Close(_))) | None => break,
+                        Some(Ok(_)) => {}
+                        Some(Err(e)) => {
+                            error_log!(error, "❌ ws-fapi 连接错误: {}", e);
+                            break;
+                        }
+                    }
+                }
+            }
+        }
+
+        // 先标记断开再清空等待者：请求方登记后会再检查一次连接状态，不会漏掉
+        connected.store(false, Ordering::SeqCst);
+        pending.clear();
+        order_log!(warn, "⚠️ ws-fapi 连接已断开，开始重连");
+
+        let mut delay = RECONNECT_INITIAL_DELAY;
+        ws_stream = loop {
+            // 等待期间排队的请求帧直接丢弃：对应的调用方已经收到断线错误，不能在新连接上补发
+            let sleep = tokio::time::sleep(delay);
+            tokio::pin!(sleep);
+            loop {
+                tokio::select! {
+                    _ = &mut sleep => break,
+                    message = outgoing_rx.recv() => {
+                        if message.is_none() {
+                            return;
+                        }
+                    }
+                }
+            }
+
+            match connect_async(url.as_str()).await {
+                Ok((ws_stream, _)) => break ws_stream,
+                Err(e) => {
+                    delay = (delay * 2).min(RECONNECT_MAX_DELAY);
+                    order_log!(warn, "⚠️ ws-fapi 重连失败: {}，{:?} 后重试", e, delay);
+                }
+            }
+        };
+
+        while outgoing_rx.try_recv().is_ok() {}
+        connected.store(true, Ordering::SeqCst);
+        order_log!(info, "✅ ws-fapi 已重连");
+    }
+}
+
+/// 按响应 id 唤醒等待者；id 缺失（请求格式错误）或已超时的响应只记录日志
+fn dispatch_response(pending: &PendingRequests, text: &str) {
+    let response: WsApiResponse = match serde_json::from_str(text) {
+        Ok(response) => response,
+        Err(e) => {
+            error_log!(warn, "⚠️ 无法解析 ws-fapi 响应: {}, 原文: {}", e, text);
+            return;
+        }
+    };
+    match response.id.and_then(|id| pending.remove(&id)) {
+        Some((_, waiter)) => {
+            let _ = waiter.send(response);
+        }
+        None => {
+            order_log!(warn, "⚠️ 未匹配的 ws-fapi 响应: {}", text);
+        }
+    }
+}
+
+fn timestamp_ms() -> u64 {
+    SystemTime::now()
+        .duration_since(UNIX_EPOCH)
+        .unwrap()
+        .as_millis() as u64
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use crate::dto::binance::rest_api::{OrderSide, OrderType};
+    use tokio::net::TcpListener;
+
+    /// 本地 mock ws-fapi：校验签名字段，数量为 "0" 时拒单，
+    /// 收集 `batch` 个请求后倒序响应，验证按 id 匹配而不是按顺序匹配
+    async fn spawn_mock_server(batch: usize) -> String {
+        let listener = TcpListener::bind("127.0.0.1:0").await.unwrap();
+        let addr = listener.local_addr().unwrap();
+        tokio::spawn(async move {
+            let (stream, _) = listener.accept().await.unwrap();
+            let mut ws = tokio_tungstenite::accept_async(stream).await.unwrap();
+            let mut requests = Vec::new();
+            while let Some(Ok(Message::Text(text))) = ws.next().await {
+                requests.push(serde_json::from_str::<serde_json::Value>(&text).unwrap());
+                if requests.len() < batch {
+                    continue;
+                }
+                for request in requests.drain(..).rev() {
+                    ws.send(Message::Text(mock_response(&request).to_string())).await.unwrap();
+                }
+            }
+        });
+        format!("ws://{}", addr)
+    }
+
+    /// 校验签名字段后按数量生成成交或拒单响应
+    fn mock_response(request: &serde_json::Value) -> serde_json::Value {
+        let params = &request["params"];
+        assert_eq!(request["method"], "order.place");
+        assert_eq!(params["apiKey"], "key");
+        assert!(params["signature"].as_str().unwrap().len() == 64);
+        if params["quantity"] == "0" {
+            serde_json::json!({"id": request["id"], "status": 400,
+                "error": {"code": -4003, "msg": "Quantity less than or equal to zero."}})
+        } else {
+            serde_json::json!({"id": request["id"], "status": 200, "result": {
+                "orderId": request["id"], "symbol": params["symbol"], "status": "FILLED",
+                "clientOrderId": "c", "price": "0", "avgPrice": "100.5", "origQty": params["quantity"],
+                "executedQty": params["quantity"], "cumQty": params["quantity"], "cumQuote": "0",
+                "timeInForce": "GTC", "type": params["type"], "reduceOnly": false, "closePosition": false,
+                "side": params["side"], "positionSide": "BOTH", "stopPrice": "0",
+                "workingType": "CONTRACT_PRICE", "priceProtect": false, "origType": params["type"],
+                "priceMatch": "NONE", "selfTradePreventionMode": "NONE", "goodTillDate": 0,
+                "updateTime": 0}})
+        }
+    }
+
+    fn market_order(quantity: &str) -> OrderRequest {
+        OrderRequest {
+            symbol: "ETHUSDT".to_string(),
+            side: OrderSide::Buy,
+            order_type: OrderType::Market,
+            quantity: Some(quantity.to_string()),
+            ..Default::default()
+        }
+    }
+
+    #[tokio::test]
+    async fn test_concurrent_requests_matched_by_id() {
+        let url = spawn_mock_server(3).await;
+        let api = BinanceWsApi::connect_url(&url, "key".to_string(), "secret".to_string())
+            .await
+            .unwrap();
+
+        let result = api
+            .batch_orders(vec![market_order("1"), market_order("0"), market_order("3")], None)
+            .await
+            .unwrap();
+        assert_eq!(result.success_count(), 2);
+        assert_eq!(result.successful_orders[0].executed_qty, "1");
+        assert_eq!(result.successful_orders[1].executed_qty, "3");
+        assert_eq!(result.failed_orders[0].0, 1);
+        assert_eq!(result.failed_orders[0].1.code, -4003);
+        assert_eq!(api.in_flight(), 0);
+    }
+
+    #[tokio::test]
+    async fn test_disconnect_fails_in_flight_requests() {
+        let listener = TcpListener::bind("127.0.0.1:0").await.unwrap();
+        let addr = listener.local_addr().unwrap();
+        tokio::spawn(async move {
+            let (stream, _) = listener.accept().await.unwrap();
+            let mut ws = tokio_tungstenite::accept_async(stream).await.unwrap();
+            // 收到请求后直接关闭连接
+            let _ = ws.next().await;
+            let _ = ws.close(None).await;
+        });
+        let api = BinanceWsApi::connect_url(&format!("ws://{}", addr), "key".to_string(), "secret".to_string())
+            .await
+            .unwrap();
+
+        assert!(api.new_order(market_order("1")).await.is_err());
+        assert!(!api.is_connected());
+        assert!(api.new_order(market_order("1")).await.is_err());
+    }
+
+    #[tokio::test]
+    async fn test_reconnects_after_disconnect() {
+        let listener = TcpListener::bind("127.0.0.1:0").await.unwrap();
+        let addr = listener.local_addr().unwrap();
+        tokio::spawn(async move {
+            // 第一个连接收到请求后直接关闭，之后的连接正常响应
+            let (stream, _) = listener.accept().await.unwrap();
+            let mut ws = tokio_tungstenite::accept_async(stream).await.unwrap();
+            let _ = ws.next().await;
+            let _ = ws.close(None).await;
+
+            let (stream, _) = listener.accept().await.unwrap();
+            let mut ws = tokio_tungstenite::accept_async(stream).await.unwrap();
+            while let Some(Ok(Message::Text(text))) = ws.next().await {
+                let request: serde_json::Value = serde_json::from_str(&text).unwrap();
+                ws.send(Message::Text(mock_response(&request).to_string())).await.unwrap();
+            }
+        });
+        let api = BinanceWsApi::connect_url(&format!("ws://{}", addr), "key".to_string(), "secret".to_string())
+            .await
+            .unwrap();
+
+        assert!(api.new_order(market_order("1")).await.is_err());
+        tokio::time::timeout(Duration::from_secs(5), async {
+            while !api.is_connected() {
+                tokio::time::sleep(Duration::from_millis(10)).await;
+            }
+        })
+        .await
+        .expect("ws-fapi did not reconnect");
+
+        let order = api.new_order(market_order("2")).await.unwrap();
+        assert_eq!(order.executed_qty, "2");
+        assert_eq!(api.in_flight(), 0);
+    }
+}
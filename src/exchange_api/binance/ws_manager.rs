@@ -1,14 +1,22 @@
+use crate::common::bounded_channel::{bounded_channel, ChannelStats, MessageSink, OverflowPolicy, PolicyReceiver, PolicySender};
+use crate::common::json::{json_decoder, set_json_decoder};
 use crate::common::config::ws_config::{
-    MarkPriceConfig, KlineConfig, PartialDepthConfig, DiffDepthConfig, ConfigLoader, BookTickerConfig
+    MarkPriceConfig, KlineConfig, PartialDepthConfig, DiffDepthConfig, ConfigLoader, BookTickerConfig, ChannelConfig
 };
+use super::api::BinanceFuturesApi;
+use super::depth_sync::DepthSynchronizer;
+use super::stream_mux::decode_stream_message;
 use super::ws::BinanceWebSocket;
-use crate::dto::binance::websocket::{MarkPriceData, BinancePartialDepth, KlineData, BookTickerData};
+use crate::dto::binance::websocket::{MarkPriceData, BinancePartialDepth, BinanceDepthUpdate, KlineData, BookTickerData, BinanceTradeData};
+use crate::common::enums::Exchange;
+use crate::models::{CommonDepth, LatestQuoteBook, QuoteSource, TopOfBook, TradingSymbol};
 use anyhow::Result;
 use std::collections::HashMap;
 use std::sync::Arc;
-use std::time::Duration;
+use std::sync::atomic::{AtomicBool, Ordering};
+use std::time::{Duration, Instant};
 use tokio::sync::{mpsc, Mutex};
-use tokio::task::JoinHandle;
+use tokio::task::{JoinHandle, JoinSet};
 use crate::{websocket_log, system_log};
 
 /// WebSocket 数据类型
@@ -19,6 +27,7 @@ pub enum WebSocketDataType {
     PartialDepth,   // 部分订单簿深度
     DiffDepth,      // 订单簿深度差异
     BookTicker,     // Book Ticker数据
+    Trade,          // 逐笔成交
 }
 
 /// WebSocket 消息类型 - 使用 Arc 优化内存使用
@@ -27,10 +36,69 @@ pub enum WebSocketMessage {
     MarkPrice(Arc<MarkPriceData>),
     Kline(Arc<KlineData>),
     PartialDepth(Arc<BinancePartialDepth>),
-    DiffDepth(Arc<BinancePartialDepth>),
+    DiffDepth(Arc<CommonDepth>),    // 本地订单簿（快照 + 增量）截取的深度
     BookTicker(Arc<BookTickerData>),
+    Trade(Arc<BinanceTradeData>),
 }
 
+impl WebSocketMessage {
+    pub fn data_type(&self) -> WebSocketDataType {
+        match self {
+            WebSocketMessage::MarkPrice(_) => WebSocketDataType::MarkPrice,
+            WebSocketMessage::Kline(_) => WebSocketDataType::Kline,
+            WebSocketMessage::PartialDepth(_) => WebSocketDataType::PartialDepth,
+            WebSocketMessage::DiffDepth(_) => WebSocketDataType::DiffDepth,
+            WebSocketMessage::BookTicker(_) => WebSocketDataType::BookTicker,
+            WebSocketMessage::Trade(_) => WebSocketDataType::Trade,
+        }
+    }
+
+    /// 合并键：同一数据类型、同一交易对的消息可以互相覆盖
+    ///
+    /// Partial Depth 推送不带交易对，没有合并键，队列满时退化为丢弃最旧
+    pub fn conflation_key(&self) -> Option<(WebSocketDataType, TradingSymbol)> {
+        let symbol = match self {
+            WebSocketMessage::MarkPrice(data) => data.symbol,
+            WebSocketMessage::Kline(data) => data.symbol,
+            WebSocketMessage::PartialDepth(_) => return None,
+            WebSocketMessage::DiffDepth(depth) => depth.symbol,
+            WebSocketMessage::BookTicker(data) => data.symbol,
+            WebSocketMessage::Trade(data) => data.symbol,
+        };
+        Some((self.data_type(), symbol))
+    }
+}
+
+/// 行情汇总通道发送端
+pub type WebSocketMessageSender = PolicySender<WebSocketMessage, (WebSocketDataType, TradingSymbol)>;
+/// 行情汇总通道接收端
+pub type WebSocketMessageReceiver = PolicyReceiver<WebSocketMessage>;
+
+/// 按配置创建行情汇总通道，每种数据类型使用各自的溢出策略
+pub fn websocket_message_channel(config: &ChannelConfig) -> (WebSocketMessageSender, WebSocketMessageReceiver) {
+    let config = config.clone();
+    bounded_channel(config.capacity, move |message: &WebSocketMessage| {
+        let policy = match message {
+            WebSocketMessage::MarkPrice(_) => config.mark_price,
+            WebSocketMessage::Kline(_) => config.kline,
+            WebSocketMessage::PartialDepth(_) => config.partial_depth,
+            WebSocketMessage::DiffDepth(_) => config.diff_depth,
+            WebSocketMessage::BookTicker(_) => config.book_ticker,
+            WebSocketMessage::Trade(_) => config.trade,
+        };
+        let key = match policy {
+            OverflowPolicy::Conflate => message.conflation_key(),
+            _ => None,
+        };
+        (policy, key)
+    })
+}
+
+/// 增量深度读循环到同步器的队列容量；增量不能丢弃，队列满时反压到 socket 读取
+const DEPTH_UPDATE_CHANNEL_CAPACITY: usize = 1024;
+
+type ConnectionMap = Arc<Mutex<HashMap<String, (JoinHandle<()>, ConnectionInfo)>>>;
+
 /// WebSocket 连接信息
 #[derive(Debug, Clone)]
 pub struct ConnectionInfo {
@@ -41,6 +109,8 @@ pub struct ConnectionInfo {
     pub created_at: std::time::Instant,
     pub last_message_at: Option<std::time::Instant>,
     pub tags: Vec<String>,
+    /// 各交易对从发起连接到收到首条消息的耗时
+    pub connect_latency: HashMap<String, Duration>,
 }
 
 #[derive(Debug, Clone)]
@@ -54,19 +124,35 @@ pub enum ConnectionStatus {
 #[derive(Debug, Clone)]
 pub struct WebSocketManager {
     ws_client: BinanceWebSocket,
-    connections: Arc<Mutex<HashMap<String, (JoinHandle<()>, ConnectionInfo)>>>,
-    message_tx: mpsc::UnboundedSender<WebSocketMessage>,
+    rest_client: BinanceFuturesApi,
+    connections: ConnectionMap,
+    message_tx: WebSocketMessageSender,
+    /// Book Ticker / Partial Depth 的最新值槽位，按需读取时可跳过过期数据
+    latest_quotes: Arc<LatestQuoteBook>,
 }
 
 impl WebSocketManager {
-    pub fn new(message_tx: mpsc::UnboundedSender<WebSocketMessage>) -> Self {
+    pub fn new(message_tx: WebSocketMessageSender) -> Self {
         Self {
             ws_client: BinanceWebSocket::new(),
+            // 深度快照是公开接口，不需要 API key
+            rest_client: BinanceFuturesApi::new(String::new(), String::new()),
             connections: Arc::new(Mutex::new(HashMap::new())),
             message_tx,
+            latest_quotes: Arc::new(LatestQuoteBook::new()),
         }
     }
 
+    /// 共享外部的最新值槽位表
+    pub fn with_latest_quotes(mut self, latest_quotes: Arc<LatestQuoteBook>) -> Self {
+        self.latest_quotes = latest_quotes;
+        self
+    }
+
+    pub fn latest_quotes(&self) -> Arc<LatestQuoteBook> {
+        self.latest_quotes.clone()
+    }
+
     /// 启动标记价格 WebSocket 连接
     pub async fn start_mark_price(&self, config: MarkPriceConfig) -> Result<()> {
         let connection_id = format!("mark_price_{}_{}", config.symbol.join("_"), config.interval);
@@ -93,75 +179,54 @@ impl WebSocketManager {
             created_at: std::time::Instant::now(),
             last_message_at: None,
             tags: tags.clone(),
+            connect_latency: HashMap::new(),
         };
         
         let handle = tokio::spawn(async move {
-            let result: Result<(), Box<dyn std::error::Error + Send + Sync>> = if auto_reconnect {
-                // 为每个交易对创建连接
-                for symbol in &symbols {
-                    // 创建专门用于 MarkPriceData 的通道
-                    let (mark_price_tx, mut mark_price_rx) = mpsc::unbounded_channel::<MarkPriceData>();
-                    
-                    // 启动消息转发任务
-                    let message_tx_clone = message_tx.clone();
-                    tokio::spawn(async move {
-                        while let Some(data) = mark_price_rx.recv().await {
-                            if let Err(e) = message_tx_clone.send(WebSocketMessage::MarkPrice(Arc::new(data))) {
-                                websocket_log!(warn, "Failed to forward mark price message: {}", e);
-                                break;
-                            }
-                        }
-                    });
-                    
-                    let result = ws_client
-                        .subscribe_with_reconnect(
-                            symbol,
-                            &interval,
-                            mark_price_tx,
-                            max_retries,
-                            retry_delay,
-                        )
-                        .await;
-                    
-                    if let Err(e) = result {
+            // 所有交易对并发建立连接，互不等待；外层任务被 abort 时 JoinSet 会一并取消
+            let mut subscriptions = JoinSet::new();
+
+            for symbol in symbols {
+                // 读循环直接投递到行情汇总通道，收到首条消息时记录连接耗时
+                let mark_price_tx = ForwardSink::new(message_tx.clone(), |data: MarkPriceData| {
+                    WebSocketMessage::MarkPrice(Arc::new(data))
+                })
+                .with_probe(ConnectionProbe::new(connections.clone(), &connection_id_clone, &symbol));
+
+                let ws_client = ws_client.clone();
+                let interval = interval.clone();
+                subscriptions.spawn(async move {
+                    let result = if auto_reconnect {
+                        ws_client
+                            .subscribe_with_reconnect(&symbol, &interval, mark_price_tx, max_retries, retry_delay)
+                            .await
+                    } else {
+                        ws_client.subscribe_mark_price(&symbol, &interval, mark_price_tx).await
+                    };
+                    (symbol, result)
+                });
+            }
+
+            let mut last_error: Option<String> = None;
+            while let Some(joined) = subscriptions.join_next().await {
+                match joined {
+                    Ok((_, Ok(()))) => {}
+                    Ok((symbol, Err(e))) => {
                         websocket_log!(warn, "Mark price connection failed: {} - {}", symbol, e);
+                        last_error = Some(format!("{}: {}", symbol, e));
                     }
-                }
-                Ok(())
-            } else {
-                // 为每个交易对创建连接
-                for symbol in &symbols {
-                    // 创建专门用于 MarkPriceData 的通道
-                    let (mark_price_tx, mut mark_price_rx) = mpsc::unbounded_channel::<MarkPriceData>();
-                    
-                    // 启动消息转发任务
-                    let message_tx_clone = message_tx.clone();
-                    tokio::spawn(async move {
-                        while let Some(data) = mark_price_rx.recv().await {
-                            if let Err(e) = message_tx_clone.send(WebSocketMessage::MarkPrice(Arc::new(data))) {
-                                websocket_log!(warn, "Failed to forward mark price message: {}", e);
-                                break;
-                            }
-                        }
-                    });
-                    
-                    let result = ws_client
-                        .subscribe_mark_price(symbol, &interval, mark_price_tx)
-                        .await;
-                    
-                    if let Err(e) = result {
-                        websocket_log!(warn, "Mark price connection failed: {} - {}", symbol, e);
+                    Err(e) => {
+                        websocket_log!(warn, "Mark price subscription task panicked: {:?}", e);
                     }
                 }
-                Ok(())
-            };
-            
-            if let Err(e) = result {
+            }
+
+            if let Some(e) = last_error {
                 websocket_log!(error, "Mark price connection failed: {}", e);
                 // 更新连接状态
                 let mut conns = connections.lock().await;
                 if let Some((_, info)) = conns.get_mut(&connection_id_clone) {
-                    info.status = ConnectionStatus::Error(e.to_string());
+                    info.status = ConnectionStatus::Error(e);
                 }
             }
             
@@ -200,56 +265,22 @@ impl WebSocketManager {
             created_at: std::time::Instant::now(),
             last_message_at: None,
             tags: tags.clone(),
+            connect_latency: HashMap::new(),
         };
         
         let handle = tokio::spawn(async move {
-            // 创建专门用于 KlineData 的通道
-            let (kline_tx, mut kline_rx) = mpsc::unbounded_channel::<KlineData>();
-            
-            // 启动消息转发任务 - 这个任务会持续运行，直到通道关闭
-            let message_tx_clone = message_tx.clone();
-            let forward_handle = tokio::spawn(async move {
-                let mut forward_count = 0;
-                while let Some(data) = kline_rx.recv().await {
-                    forward_count += 1;
-                    if let Err(e) = message_tx_clone.send(WebSocketMessage::Kline(Arc::new(data))) {
-                        websocket_log!(warn, "Failed to forward kline message: {} (message_tx closed, total forwarded: {})", e, forward_count);
-                        // 如果 message_tx 关闭了，说明主循环已经退出，我们也应该退出
-                        break;
-                    }
-                }
-                websocket_log!(info, "Message forwarding task exited (total forwarded: {})", forward_count);
-            });
-            
+            // K线直接投递到行情汇总通道（K线通常配置为 Block，队列满时读循环等待）
+            let kline_tx = ForwardSink::new(message_tx, |data: KlineData| WebSocketMessage::Kline(Arc::new(data)));
+
             // 使用带重试的批量订阅方法
-            // 注意：即使重连失败，消息转发任务也会继续运行直到通道关闭
-            // kline_tx 会在 subscribe_multiple_klines_with_reconnect 返回时自动 drop
             let result = ws_client.subscribe_multiple_klines_with_reconnect(
                 &symbols, 
                 &interval, 
-                kline_tx,  // kline_tx 会被 move 到这里，当函数返回时会自动 drop
+                kline_tx,
                 10000,
                 std::time::Duration::from_millis(100) // retry_delay
             ).await;
             
-            // subscribe_multiple_klines_with_reconnect 返回后，kline_tx 已经被 drop
-            // 消息转发任务会收到 None 并退出
-            // 等待消息转发任务完成（最多等待1秒）
-            match tokio::time::timeout(std::time::Duration::from_secs(1), forward_handle).await {
-                Ok(result) => {
-                    if let Err(e) = result {
-                        websocket_log!(warn, "Message forwarding task panicked: {:?}", e);
-                    } else {
-                        websocket_log!(info, "Message forwarding task completed");
-                    }
-                }
-                Err(_) => {
-                    websocket_log!(warn, "Message forwarding task did not complete within timeout, aborting");
-                    // 注意：forward_handle 已经被 move 到 timeout 中，无法 abort
-                    // 但这不是问题，因为 kline_tx 已经 drop，任务应该很快退出
-                }
-            }
-            
             if let Err(e) = result {
                 websocket_log!(error, "Multi kline connection failed after all retries: {}", e);
                 // 更新连接状态
@@ -297,25 +328,16 @@ impl WebSocketManager {
             created_at: std::time::Instant::now(),
             last_message_at: None,
             tags: tags.clone(),
+            connect_latency: HashMap::new(),
         };
         
         let handle = tokio::spawn(async move {
             // 为每个交易对创建连接
             for symbol in &symbols {
-                // 创建专门用于 KlineData 的通道
-                let (kline_tx, mut kline_rx) = mpsc::unbounded_channel::<KlineData>();
-                
-                // 启动消息转发任务
-                let message_tx_clone = message_tx.clone();
-                tokio::spawn(async move {
-                    while let Some(data) = kline_rx.recv().await {
-                        if let Err(e) = message_tx_clone.send(WebSocketMessage::Kline(Arc::new(data))) {
-                            websocket_log!(warn, "Failed to forward kline message: {}", e);
-                            break;
-                        }
-                    }
+                let kline_tx = ForwardSink::new(message_tx.clone(), |data: KlineData| {
+                    WebSocketMessage::Kline(Arc::new(data))
                 });
-                
+
                 let result = ws_client.subscribe_kline_with_reconnect(
                     symbol, 
                     &interval, 
@@ -345,6 +367,7 @@ impl WebSocketManager {
     pub async fn start_partial_depth(&self, config: PartialDepthConfig) -> Result<()> {
         let connection_id = format!("partial_depth_{}_{}_{}", config.symbol.join("_"), config.levels, config.interval);
         let message_tx = self.message_tx.clone();
+        let latest_quotes = self.latest_quotes.clone();
         
         let ws_client = self.ws_client.clone();
         let connections = self.connections.clone();
@@ -352,7 +375,7 @@ impl WebSocketManager {
         
         // 克隆配置数据以避免生命周期问题
         let symbols = config.symbol.clone();
-        let _levels = config.levels;
+        let levels = config.levels as u8;
         let interval = config.interval.clone();
         let tags = config.base.tags.clone();
         
@@ -365,26 +388,30 @@ impl WebSocketManager {
             created_at: std::time::Instant::now(),
             last_message_at: None,
             tags: tags.clone(),
+            connect_latency: HashMap::new(),
         };
         
         let handle = tokio::spawn(async move {
+            // 250ms 是默认推送间隔，不需要在 stream 名称中指定
+            let interval = if interval == "250ms" { None } else { Some(interval.as_str()) };
+
             // 为每个交易对创建连接
             for symbol in &symbols {
-                // 创建专门用于 BinanceDepth 的通道
-                let (depth_tx, mut depth_rx) = mpsc::unbounded_channel::<BinancePartialDepth>();
-                
-                // 启动消息转发任务
-                let message_tx_clone = message_tx.clone();
-                tokio::spawn(async move {
-                    while let Some(data) = depth_rx.recv().await {
-                        if let Err(e) = message_tx_clone.send(WebSocketMessage::PartialDepth(Arc::new(data))) {
-                            websocket_log!(warn, "Failed to forward partial depth message: {}", e);
-                            break;
-                        }
+                let latest = latest_quotes.cell(
+                    Exchange::Binance,
+                    TradingSymbol::from_string(symbol.to_ascii_uppercase()),
+                    QuoteSource::PartialDepth,
+                );
+
+                // 读循环中先写入最新值槽位，再按溢出策略投递到行情汇总通道
+                let depth_tx = ForwardSink::new(message_tx.clone(), move |data: BinancePartialDepth| {
+                    if let Some(quote) = TopOfBook::from_partial_depth(&data) {
+                        latest.store(quote);
                     }
+                    WebSocketMessage::PartialDepth(Arc::new(data))
                 });
-                
-                let result = ws_client.subscribe_depth(symbol, &interval, depth_tx).await;
+
+                let result = ws_client.subscribe_partial_depth(symbol, levels, interval, depth_tx).await;
                 
                 if let Err(e) = result {
                     websocket_log!(warn, "Partial depth connection failed: {} - {}", symbol, e);
@@ -403,18 +430,24 @@ impl WebSocketManager {
         Ok(())
     }
 
-    /// 启动订单簿深度差异 WebSocket 连接
+    /// 启动增量深度 WebSocket 连接
+    ///
+    /// 每个交易对维护一个本地订单簿：REST 快照 + @depth@100ms 增量，
+    /// 按 U/u/pu 检测断档并自动重新同步，输出截取 `level` 档的深度。
     pub async fn start_diff_depth(&self, config: DiffDepthConfig) -> Result<()> {
         let connection_id = format!("diff_depth_{}_{}", config.symbol.join("_"), config.level);
         let message_tx = self.message_tx.clone();
         
         let ws_client = self.ws_client.clone();
+        let rest_client = self.rest_client.clone();
         let connections = self.connections.clone();
         let connection_id_clone = connection_id.clone();
         
         // 克隆配置数据以避免生命周期问题
         let symbols = config.symbol.clone();
-        let _level = config.level;
+        let level = config.level as usize;
+        let max_retries = config.base.max_retries;
+        let retry_delay = config.base.retry_delay();
         let tags = config.base.tags.clone();
         
         // 创建连接信息
@@ -426,32 +459,41 @@ impl WebSocketManager {
             created_at: std::time::Instant::now(),
             last_message_at: None,
             tags: tags.clone(),
+            connect_latency: HashMap::new(),
         };
         
         let handle = tokio::spawn(async move {
-            // 为每个交易对创建连接
-            for symbol in &symbols {
-                // 创建专门用于 BinanceDepth 的通道
-                let (depth_tx, mut depth_rx) = mpsc::unbounded_channel::<BinancePartialDepth>();
-                
-                // 启动消息转发任务
-                let message_tx_clone = message_tx.clone();
+            let synchronizer = DepthSynchronizer::new(rest_client, level);
+            let mut tasks = Vec::with_capacity(symbols.len());
+
+            // 每个交易对独立的增量流和同步任务，互不阻塞
+            for symbol in symbols {
+                // 增量事件不能丢弃，读循环到同步器之间用有界通道反压；
+                // 同步器输出的深度直接按溢出策略投递到行情汇总通道
+                let (update_tx, update_rx) = mpsc::channel::<BinanceDepthUpdate>(DEPTH_UPDATE_CHANNEL_CAPACITY);
+                let depth_tx = ForwardSink::new(message_tx.clone(), WebSocketMessage::DiffDepth);
+                let trading_symbol = TradingSymbol::from(symbol.to_uppercase());
+
+                let synchronizer = synchronizer.clone();
                 tokio::spawn(async move {
-                    while let Some(data) = depth_rx.recv().await {
-                        if let Err(e) = message_tx_clone.send(WebSocketMessage::DiffDepth(Arc::new(data))) {
-                            websocket_log!(warn, "Failed to forward diff depth message: {}", e);
-                            break;
-                        }
+                    if let Err(e) = synchronizer.run(trading_symbol, update_rx, depth_tx).await {
+                        websocket_log!(warn, "Depth synchronizer failed: {} - {}", trading_symbol, e);
                     }
                 });
-                
-                // 这里需要根据实际的WebSocket客户端API来调用相应的方法
-                // 暂时使用subscribe_depth作为占位符
-                let result = ws_client.subscribe_depth(symbol, "100ms", depth_tx).await;
-                
-                if let Err(e) = result {
-                    websocket_log!(warn, "Diff depth connection failed: {} - {}", symbol, e);
-                }
+
+                let ws_client = ws_client.clone();
+                tasks.push(tokio::spawn(async move {
+                    let result = ws_client
+                        .subscribe_depth_with_reconnect(&symbol, "100ms", update_tx, max_retries, retry_delay)
+                        .await;
+                    if let Err(e) = result {
+                        websocket_log!(warn, "Diff depth connection failed: {} - {}", symbol, e);
+                    }
+                }));
+            }
+
+            for task in tasks {
+                let _ = task.await;
             }
             
             // 从连接映射中移除
@@ -467,9 +509,12 @@ impl WebSocketManager {
     }
 
     /// 启动 Book Ticker WebSocket 连接
+    ///
+    /// 所有交易对共用一个连接，读循环收到的每一帧都经 `route_frame` 解析：
+    /// 写入最新值槽位后发送到行情汇总通道。
     pub async fn start_book_ticker(&self, config: BookTickerConfig) -> Result<()> {
         let connection_id = format!("book_ticker_{}", config.symbol.join("_"));
-        let message_tx = self.message_tx.clone();
+        let manager = self.clone();
         
         let ws_client = self.ws_client.clone();
         let connections = self.connections.clone();
@@ -477,6 +522,9 @@ impl WebSocketManager {
         
         // 克隆配置数据以避免生命周期问题
         let symbols = config.symbol.clone();
+        let auto_reconnect = config.base.auto_reconnect;
+        let max_retries = config.base.max_retries;
+        let retry_delay = config.base.retry_delay();
         let tags = config.base.tags.clone();
         
         // 创建连接信息
@@ -488,30 +536,34 @@ impl WebSocketManager {
             created_at: std::time::Instant::now(),
             last_message_at: None,
             tags: tags.clone(),
+            connect_latency: HashMap::new(),
         };
         
         let handle = tokio::spawn(async move {
-            // 为每个交易对创建连接
-            for symbol in &symbols {
-                // 创建专门用于 BookTickerData 的通道
-                let (book_ticker_tx, mut book_ticker_rx) = mpsc::unbounded_channel::<BookTickerData>();
-                
-                // 启动消息转发任务
-                let message_tx_clone = message_tx.clone();
-                tokio::spawn(async move {
-                    while let Some(data) = book_ticker_rx.recv().await {
-                        if let Err(e) = message_tx_clone.send(WebSocketMessage::BookTicker(Arc::new(data))) {
-                            websocket_log!(warn, "Failed to forward book ticker message: {}", e);
-                            break;
-                        }
+            let streams: Vec<String> = symbols.iter().map(|symbol| format!("{}@bookTicker", symbol)).collect();
+            // 读循环收到的帧直接在 route_frame 中解析、更新最新值槽位并按溢出策略发送
+            let frame_tx = RouteFrameSink {
+                manager,
+                probe: ConnectionProbe::new(connections.clone(), &connection_id_clone, &symbols.join(",")),
+            };
+
+            let mut retry_count = 0;
+            loop {
+                match ws_client.subscribe_frames(&streams, &frame_tx).await {
+                    Ok(()) => {
+                        // 正常关闭（服务端定期断开）不计入失败次数
+                        websocket_log!(warn, "Book ticker connection closed: {}", symbols.join(","));
+                        retry_count = 0;
+                    }
+                    Err(e) => {
+                        websocket_log!(warn, "Book ticker connection failed: {} - {}", symbols.join(","), e);
+                        retry_count += 1;
                     }
-                });
-                
-                let result = ws_client.subscribe_book_ticker(symbol, book_ticker_tx).await;
-                
-                if let Err(e) = result {
-                    websocket_log!(warn, "Book ticker connection failed: {} - {}", symbol, e);
                 }
+                if !auto_reconnect || retry_count >= max_retries || frame_tx.is_closed() {
+                    break;
+                }
+                tokio::time::sleep(retry_delay).await;
             }
             
             // 从连接映射中移除
@@ -530,6 +582,11 @@ impl WebSocketManager {
     pub async fn start_from_config(&self, config_path: &str) -> Result<()> {
         let configs = ConfigLoader::load_from_file(config_path)
             .map_err(|e| anyhow::anyhow!("Failed to load config: {}", e))?;
+
+        set_json_decoder(configs.json_decoder);
+        if configs.json_decoder != json_decoder() {
+            system_log!(warn, "json_decoder = {:?} requires the simd-json feature, falling back to serde_json", configs.json_decoder);
+        }
         
         // 启动标记价格连接
         for config in configs.mark_price {
@@ -589,6 +646,34 @@ impl WebSocketManager {
         conns.len()
     }
 
+    /// 解析一条原始推送（组合流帧或单一 stream 推送）并发送到行情汇总通道
+    ///
+    /// 按 `stream` / `e` 字段前缀扫描后直接解析为对应的 DTO，Book Ticker 同时写入最新值槽位。
+    /// 返回 Ok(false) 表示消息被忽略（控制帧响应、未知类型或增量深度）。
+    pub async fn route_frame(&self, text: &str) -> Result<bool> {
+        let Some(message) = decode_stream_message(text)? else {
+            return Ok(false);
+        };
+        if let WebSocketMessage::BookTicker(data) = &message {
+            self.latest_quotes.store(
+                Exchange::Binance,
+                data.symbol,
+                QuoteSource::BookTicker,
+                TopOfBook::from_binance_book_ticker(data),
+            );
+        }
+        self.message_tx
+            .send(message)
+            .await
+            .map_err(|_| anyhow::anyhow!("Message receiver closed"))?;
+        Ok(true)
+    }
+
+    /// 行情汇总通道的队列深度、丢弃和合并计数
+    pub fn channel_stats(&self) -> Arc<ChannelStats> {
+        self.message_tx.stats()
+    }
+
     /// 获取活跃连接列表
     pub async fn list_connections(&self) -> Vec<ConnectionInfo> {
         let conns = self.connections.lock().await;
@@ -638,9 +723,127 @@ impl WebSocketManager {
     }
 }
 
+/// 记录某个交易对的连接耗时，并把连接标记为已连接
+/// 首条消息到达时记录连接耗时（只记录一次）
+struct ConnectionProbe {
+    connections: ConnectionMap,
+    connection_id: String,
+    symbol: String,
+    started_at: Instant,
+    connected: AtomicBool,
+}
+
+impl ConnectionProbe {
+    fn new(connections: ConnectionMap, connection_id: &str, symbol: &str) -> Self {
+        Self {
+            connections,
+            connection_id: connection_id.to_string(),
+            symbol: symbol.to_string(),
+            started_at: Instant::now(),
+            connected: AtomicBool::new(false),
+        }
+    }
+
+    async fn on_message(&self) {
+        if !self.connected.swap(true, Ordering::Relaxed) {
+            record_connection_up(&self.connections, &self.connection_id, &self.symbol, self.started_at.elapsed()).await;
+        }
+    }
+}
+
+/// 把一路推送转换为 `WebSocketMessage` 后在读循环中直接投递到行情汇总通道
+///
+/// 溢出策略在 socket 读取处生效，中间没有转发任务和无界队列。
+struct ForwardSink<F> {
+    message_tx: WebSocketMessageSender,
+    wrap: F,
+    probe: Option<ConnectionProbe>,
+}
+
+impl<F> ForwardSink<F> {
+    fn new(message_tx: WebSocketMessageSender, wrap: F) -> Self {
+        Self { message_tx, wrap, probe: None }
+    }
+
+    fn with_probe(mut self, probe: ConnectionProbe) -> Self {
+        self.probe = Some(probe);
+        self
+    }
+}
+
+impl<T, F> MessageSink<T> for ForwardSink<F>
+where
+    T: Send,
+    F: Fn(T) -> WebSocketMessage + Send + Sync,
+{
+    async fn deliver(&self, value: T) -> bool {
+        if let Some(probe) = &self.probe {
+            probe.on_message().await;
+        }
+        match self.message_tx.send((self.wrap)(value)).await {
+            Ok(()) => true,
+            Err(_) => {
+                websocket_log!(warn, "Message receiver closed, stopping forwarding");
+                false
+            }
+        }
+    }
+
+    fn is_closed(&self) -> bool {
+        self.message_tx.is_closed()
+    }
+}
+
+/// 原始帧经 `route_frame` 解析后投递到行情汇总通道，解析失败的帧记录后跳过
+struct RouteFrameSink {
+    manager: WebSocketManager,
+    probe: ConnectionProbe,
+}
+
+impl MessageSink<String> for RouteFrameSink {
+    async fn deliver(&self, text: String) -> bool {
+        self.probe.on_message().await;
+        if let Err(e) = self.manager.route_frame(&text).await {
+            if self.manager.message_tx.is_closed() {
+                websocket_log!(warn, "Failed to forward book ticker message: {}", e);
+                return false;
+            }
+            websocket_log!(warn, "Failed to decode book ticker frame: {}", e);
+            websocket_log!(debug, "Failed message content: {}", text);
+        }
+        true
+    }
+
+    fn is_closed(&self) -> bool {
+        self.manager.message_tx.is_closed()
+    }
+}
+
+async fn record_connection_up(
+    connections: &Mutex<HashMap<String, (JoinHandle<()>, ConnectionInfo)>>,
+    connection_id: &str,
+    symbol: &str,
+    latency: Duration,
+) {
+    websocket_log!(info, "Connection up: {} {} in {:?}", connection_id, symbol, latency);
+    let mut conns = connections.lock().await;
+    if let Some((_, info)) = conns.get_mut(connection_id) {
+        info.connect_latency.insert(symbol.to_string(), latency);
+        info.status = ConnectionStatus::Connected;
+        info.last_message_at = Some(std::time::Instant::now());
+    }
+}
+
 // 便捷的工厂函数
-pub async fn create_websocket_manager() -> Result<(WebSocketManager, mpsc::UnboundedReceiver<WebSocketMessage>)> {
-    let (tx, rx) = mpsc::unbounded_channel();
+pub async fn create_websocket_manager() -> Result<(WebSocketManager, WebSocketMessageReceiver)> {
+    create_websocket_manager_with_channel(&ChannelConfig::default()).await
+}
+
+/// 使用指定的通道配置创建管理器
+pub async fn create_websocket_manager_with_channel(
+    config: &ChannelConfig,
+) -> Result<(WebSocketManager, WebSocketMessageReceiver)> {
+    let (tx, rx) = websocket_message_channel(config);
     let manager = WebSocketManager::new(tx);
     Ok((manager, rx))
 }
@@ -671,6 +874,9 @@ pub async fn example_usage() -> Result<()> {
                 WebSocketMessage::BookTicker(book_ticker) => {
                     websocket_log!(info, "Received book ticker: {:?}", book_ticker);
                 },
+                WebSocketMessage::Trade(trade) => {
+                    websocket_log!(info, "Received trade: {:?}", trade);
+                },
             }
         }
     });
@@ -1,4 +1,4 @@
-use crate::common::utils::generate_hmac_signature;
+use crate::common::signer::{canonical_query, RequestSigner, SignedQuery};
 use crate::dto::mexc::rest_api::{MexcOrderRequest, MexcOrderResponse, MexcOrderSide, MexcOrderType};
 use anyhow::Result;
 use reqwest::Client;
@@ -11,7 +11,7 @@ pub struct MexcSpotApi {
     pub base_url: String,
     client: Client,
     api_key: String,
-    secret_key: String,
+    signer: RequestSigner,
 }
 
 impl MexcSpotApi {
@@ -21,7 +21,7 @@ impl MexcSpotApi {
             base_url: "https://api.mexc.com".to_string(),
             client: Client::new(),
             api_key,
-            secret_key,
+            signer: RequestSigner::new(&secret_key),
         }
     }
 
@@ -33,16 +33,14 @@ impl MexcSpotApi {
             .as_millis() as u64
     }
 
-    /// 构建查询字符串（按字母顺序排序）
+    /// 构建查询字符串（MEXC 要求参数按字母顺序排序）
     pub fn build_query_string(&self, params: &HashMap<String, String>) -> String {
-        let mut pairs: Vec<String> = params.iter().map(|(k, v)| format!("{}={}", k, v)).collect();
-        pairs.sort(); // MEXC 要求参数按字母顺序排序
-        pairs.join("&")
+        canonical_query(params)
     }
 
     /// 生成签名
     pub fn generate_signature(&self, query_string: &str) -> String {
-        generate_hmac_signature(query_string, &self.secret_key)
+        self.signer.sign(query_string.as_bytes()).to_string()
     }
 
     /// 下单
@@ -69,25 +67,15 @@ impl MexcSpotApi {
     /// let response = api.new_order(request).await?;
     /// ```
     pub async fn new_order(&self, request: MexcOrderRequest) -> Result<MexcOrderResponse> {
-        // 构建请求参数
-        let params = request.to_params();
-
-        // 构建查询字符串
-        let query_string = self.build_query_string(&params);
-
-        // 生成签名
-        let signature = self.generate_signature(&query_string);
-
-        // 构建完整 URL
-        let url = format!(
-            "{}/api/v3/order?{}&signature={}",
-            self.base_url, query_string, signature
-        );
+        // 参数按规范顺序直接写入 URL 缓冲区并签名
+        let mut query = SignedQuery::url(&self.base_url, "/api/v3/order?");
+        request.write_params(&mut query);
+        let url = query.sign(&self.signer);
 
         // 发送请求
         let response = self
             .client
-            .post(&url)
+            .post(url)
             .header("X-MEXC-APIKEY", &self.api_key)
             .send()
             .await?;
@@ -391,5 +379,29 @@ mod tests {
         assert!(query_string.contains("timestamp=1666676533741"));
         assert!(query_string.contains("type=LIMIT"));
     }
+
+    #[test]
+    fn test_signed_order_query_matches_sorted_params() {
+        let api = MexcSpotApi::new("test_key".to_string(), "test_secret".to_string());
+        let request = MexcOrderRequest {
+            symbol: "MXUSDT".to_string(),
+            side: MexcOrderSide::Buy,
+            order_type: MexcOrderType::Limit,
+            quantity: Some("50".to_string()),
+            quote_order_qty: None,
+            price: Some("0.1".to_string()),
+            new_client_order_id: None,
+            recv_window: None,
+            timestamp: Some(1666676533741),
+        };
+
+        let expected = api.build_query_string(&request.to_params());
+        let mut query = SignedQuery::url(&api.base_url, "/api/v3/order?");
+        request.write_params(&mut query);
+        assert_eq!(query.query(), expected);
+
+        let url = query.sign(&api.signer).to_string();
+        assert!(url.ends_with(&format!("&signature={}", api.generate_signature(&expected))));
+    }
 }
 
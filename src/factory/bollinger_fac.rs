@@ -1,13 +1,13 @@
 use crate::{
     common::{
-        config::ws_config::{KlineConfig, WebSocketBaseConfig},
+        config::ws_config::{ConfigLoader, KlineConfig, WebSocketBaseConfig},
         config::user_config::load_binance_user_config,
         ts::Strategy,
-        consts::TURBO_USDT_SYMBOL,
+        consts::{TURBO_USDT_SYMBOL, WS_CONFIG_FILE},
     },
     models::Side,
     exchange_api::binance::{
-        ws_manager::{create_websocket_manager, WebSocketMessage},
+        ws_manager::{create_websocket_manager_with_channel, WebSocketMessage},
         api_manager::{create_api_manager, ApiMessage},
     },
     strategy::bollinger::BollingerStrategy,
@@ -75,14 +75,19 @@ impl BollingerFactory {
         info!("✅ API管理器创建成功");
 
         // 从API管理器获取共享的BinanceFuturesApi实例
-        let shared_api_client = api_manager.get_api_client();
+        // 下单通道由 BINANCE_USER__ORDER_TRANSPORT 配置（rest / websocket）
+        let shared_api_client = api_manager
+            .get_api_client()
+            .with_order_transport(user_config.order_transport)
+            .await?;
         
         // 创建SignalManager，使用共享的API实例
         let mut signal_manager = SignalManager::new_with_client(
             signal_rx,
             position_manager,
             shared_api_client,
-        );
+        )
+        .with_max_concurrent(user_config.max_concurrent_signals);
         info!("✅ 信号管理器创建成功（使用共享API实例）");
 
         // 启动信号处理任务
@@ -94,7 +99,9 @@ impl BollingerFactory {
         });
 
         // 创建WebSocket管理器
-        let (ws_manager, mut ws_rx) = create_websocket_manager().await?;
+        // 汇总通道的容量和溢出策略来自 config.toml 的 [channel] 段
+        let channel_config = ConfigLoader::load_channel_config(WS_CONFIG_FILE);
+        let (ws_manager, mut ws_rx) = create_websocket_manager_with_channel(&channel_config).await?;
         info!("✅ WebSocket管理器创建成功");
 
         // 创建布林带策略实例
@@ -0,0 +1,153 @@
+use crate::{
+    common::{
+        bounded_channel::MessageSink,
+        config::user_config::load_aster_user_config,
+        simple_logging::{SimpleLoggingManager, SimpleLoggingConfig},
+        Exchange, TradingSymbol,
+    },
+    dto::{aster::websocket::AsterBookTickerData, binance::websocket::BookTickerData},
+    exchange_api::{
+        aster::{AsterFuturesApi, AsterWebSocket},
+        binance::ws::BinanceWebSocket,
+    },
+    models::{install_symbol_filters, LatestQuote, LatestQuoteBook, QuoteSource, TopOfBook},
+    strategy::order_book_taker::lead_lag::LeadLagStrategy,
+};
+
+use anyhow::Result;
+use std::sync::Arc;
+use std::time::Duration;
+use tokio::sync::mpsc;
+use tracing::{info, warn, error};
+
+/// 每次开仓的数量（启动时按 stepSize 取整）
+const LEAD_LAG_QUANTITY: &str = "10";
+/// bookTicker 连接断开后的重连间隔
+const RECONNECT_DELAY: Duration = Duration::from_secs(5);
+
+/// Lead-Lag 策略工厂
+///
+/// Binance / ASTER 的 bookTicker 推送直接覆盖各自的 `LatestQuote` 槽位，
+/// 策略通过 `run_on_latest` 只读取最新盘口，在 ASTER 下单。
+pub struct LeadLagFactory;
+
+impl LeadLagFactory {
+    /// 设置日志系统
+    pub fn setup_logging() -> Result<()> {
+        let config = SimpleLoggingConfig {
+            log_dir: "logs".to_string(),
+            enable_console: true,
+        };
+
+        let logging_manager = SimpleLoggingManager::new(config);
+        logging_manager.init()?;
+
+        info!("🚀 Lead-Lag 策略工厂启动");
+
+        Ok(())
+    }
+
+    /// 运行 Lead-Lag 策略
+    pub async fn run_lead_lag_strategy() -> Result<()> {
+        let symbol = TradingSymbol::ASTERUSDT;
+        info!("🚀 启动 Lead-Lag 策略: {}", symbol);
+
+        // 加载 ASTER API 配置
+        let user_config = load_aster_user_config()?;
+        let aster_api = Arc::new(AsterFuturesApi::new(user_config.api_key, user_config.secret_key));
+
+        // 加载 ASTER 的交易对过滤器（tickSize / stepSize / 最小名义价值），策略构造时读取；
+        // 加载失败时策略使用交易对默认精度，不做最小名义价值检查
+        match aster_api.load_symbol_filters().await {
+            Ok(cache) => {
+                info!("📐 已加载 {} 个 ASTER 交易对的下单过滤器", cache.len());
+                install_symbol_filters(cache);
+            }
+            Err(e) => error!("❌ 加载 ASTER 交易对过滤器失败: {}，使用默认精度", e),
+        }
+
+        // 两个交易所的最新值槽位，生产者覆盖写入，策略按版本号读取
+        let latest_quotes = LatestQuoteBook::new();
+        let binance_quote = latest_quotes.cell(Exchange::Binance, symbol, QuoteSource::BookTicker);
+        let aster_quote = latest_quotes.cell(Exchange::Aster, symbol, QuoteSource::BookTicker);
+
+        let binance_handle = tokio::spawn(publish_binance_quotes(
+            symbol.id().stream_name(Exchange::Binance).to_string(),
+            binance_quote.clone(),
+        ));
+        let aster_handle = tokio::spawn(publish_aster_quotes(
+            symbol.id().stream_name(Exchange::Aster).to_string(),
+            aster_quote.clone(),
+        ));
+
+        let mut strategy = LeadLagStrategy::new_on_latest(
+            aster_api,
+            symbol.as_str().to_string(),
+            LEAD_LAG_QUANTITY.to_string(),
+        );
+
+        tokio::select! {
+            result = strategy.run_on_latest(binance_quote, aster_quote) => {
+                if let Err(e) = result {
+                    error!("❌ Lead-Lag 策略运行失败: {}", e);
+                }
+            }
+            result = binance_handle => {
+                error!("❌ Binance bookTicker 任务退出: {:?}", result);
+            }
+            result = aster_handle => {
+                error!("❌ ASTER bookTicker 任务退出: {:?}", result);
+            }
+        }
+
+        error!("🛑 Lead-Lag 策略程序退出");
+        Ok(())
+    }
+}
+
+/// 在读循环中直接覆盖最新值槽位的 bookTicker 接收端，没有中间队列
+struct LatestQuoteSink(Arc<LatestQuote>);
+
+impl MessageSink<BookTickerData> for LatestQuoteSink {
+    async fn deliver(&self, data: BookTickerData) -> bool {
+        self.0.store(TopOfBook::from_binance_book_ticker(&data));
+        true
+    }
+
+    fn is_closed(&self) -> bool {
+        false
+    }
+}
+
+/// 订阅 Binance bookTicker，每条推送直接覆盖最新值槽位；连接断开后间隔重连
+async fn publish_binance_quotes(stream_symbol: String, cell: Arc<LatestQuote>) {
+    let ws_client = BinanceWebSocket::new();
+    let sink = LatestQuoteSink(cell);
+
+    loop {
+        match ws_client.subscribe_book_ticker(&stream_symbol, &sink).await {
+            Ok(()) => warn!("Binance bookTicker 连接已关闭: {}", stream_symbol),
+            Err(e) => warn!("Binance bookTicker 连接失败: {} - {}", stream_symbol, e),
+        }
+        tokio::time::sleep(RECONNECT_DELAY).await;
+    }
+}
+
+/// 订阅 ASTER bookTicker，每条推送直接覆盖最新值槽位；连接断开后间隔重连
+async fn publish_aster_quotes(stream_symbol: String, cell: Arc<LatestQuote>) {
+    let ws_client = AsterWebSocket::new();
+    let (tx, mut rx) = mpsc::unbounded_channel::<AsterBookTickerData>();
+    tokio::spawn(async move {
+        while let Some(data) = rx.recv().await {
+            cell.store(TopOfBook::from_aster_book_ticker(&data));
+        }
+    });
+
+    loop {
+        match ws_client.subscribe_book_ticker(&stream_symbol, tx.clone()).await {
+            Ok(()) => warn!("ASTER bookTicker 连接已关闭: {}", stream_symbol),
+            Err(e) => warn!("ASTER bookTicker 连接失败: {} - {}", stream_symbol, e),
+        }
+        tokio::time::sleep(RECONNECT_DELAY).await;
+    }
+}
@@ -1,5 +1,9 @@
 pub mod bollinger_fac;
+pub mod lead_lag_fac;
+pub mod orderbook_fac;
 pub mod q1_fac;
 
 pub use bollinger_fac::BollingerFactory;
+pub use lead_lag_fac::LeadLagFactory;
+pub use orderbook_fac::OrderBookFactory;
 pub use q1_fac::Q1Factory;
\ No newline at end of file
@@ -0,0 +1,212 @@
+use crate::{
+    common::{
+        bounded_channel::MessageSink,
+        simple_logging::{SimpleLoggingManager, SimpleLoggingConfig},
+        ts::OrderBookStrategy,
+        Exchange, TradingSymbol,
+    },
+    exchange_api::binance::{
+        stream_mux::StreamMultiplexer,
+        ws::BinanceWebSocket,
+    },
+    middle_processor::{
+        multi_symbol::MultiSymbolSnapshotCreator,
+        snapshot_creator_u64::{BinanceFrameSinkU64, SnapShotU64, SnapshotCreatorU64},
+    },
+    models::strategy::{StrategyContext, StrategyType},
+    strategy::order_book_taker::test_strategy::TestStrategyU64,
+};
+
+use anyhow::Result;
+use std::time::Duration;
+use tokio::sync::mpsc;
+use tokio::task::JoinSet;
+use tracing::{info, debug, warn, error};
+
+/// 快照创建器各输入通道的容量
+const INPUT_CHANNEL_CAPACITY: usize = 1000;
+/// 快照通道容量，策略处理不过来时快照创建器等待
+const SNAPSHOT_CHANNEL_CAPACITY: usize = 16;
+/// Partial Depth 档位
+const DEPTH_LEVELS: u32 = 20;
+/// 行情连接断开后的重连间隔
+const RECONNECT_DELAY: Duration = Duration::from_secs(5);
+/// 多交易对模式下计算挂单量不平衡度的档位数
+const IMBALANCE_LEVELS: usize = 5;
+
+/// 订单簿策略工厂
+///
+/// - 单交易对：Binance Partial Depth / Book Ticker / 逐笔成交 -> `SnapshotCreatorU64`（整数 tick 快照）
+///   -> `TestStrategyU64`，整条链路不经过 f64。
+/// - 多交易对：`StreamMultiplexer` 组合流 -> `MultiSymbolSnapshotCreator` 按交易对分片，
+///   每个交易对的快照由各自的消费任务处理。
+pub struct OrderBookFactory;
+
+impl OrderBookFactory {
+    /// 设置日志系统
+    pub fn setup_logging() -> Result<()> {
+        let config = SimpleLoggingConfig {
+            log_dir: "logs".to_string(),
+            enable_console: true,
+        };
+
+        let logging_manager = SimpleLoggingManager::new(config);
+        logging_manager.init()?;
+
+        info!("🚀 订单簿策略工厂启动");
+
+        Ok(())
+    }
+
+    /// 运行整数 tick 订单簿测试策略
+    pub async fn run_orderbook_strategy() -> Result<()> {
+        let symbol = TradingSymbol::ETHUSDT;
+        let stream_symbol = symbol.id().stream_name(Exchange::Binance).to_string();
+        info!("🚀 启动订单簿策略 (u64): {}", symbol);
+
+        // 快照创建器的输入通道
+        let (mexc_tx, mexc_rx) = mpsc::channel(INPUT_CHANNEL_CAPACITY);
+        let (depth_tx, depth_rx) = mpsc::channel(INPUT_CHANNEL_CAPACITY);
+        let (ticker_tx, ticker_rx) = mpsc::channel(INPUT_CHANNEL_CAPACITY);
+        let (trade_tx, trade_rx) = mpsc::channel(INPUT_CHANNEL_CAPACITY);
+        let (snapshot_tx, mut snapshot_rx) = mpsc::channel::<SnapShotU64>(SNAPSHOT_CHANNEL_CAPACITY);
+        // 未接入 MEXC 行情，关闭该输入后快照使用空的 MEXC tick
+        drop(mexc_tx);
+
+        let mut snapshot_creator = SnapshotCreatorU64::new(symbol, mexc_rx, depth_rx, ticker_rx, trade_rx, snapshot_tx);
+        let pool_stats = snapshot_creator.pool_stats();
+        let snapshot_creator_handle = tokio::spawn(async move { snapshot_creator.run().await });
+
+        let mut strategy = TestStrategyU64 {
+            cxt: StrategyContext::new(Exchange::Binance, symbol, StrategyType::OrderBook),
+            depth_levels: 5,
+        };
+        let strategy_handle = tokio::spawn(async move {
+            while let Some(snapshot) = snapshot_rx.recv().await {
+                if let Some(signal) = strategy.on_orderbook_update(&snapshot) {
+                    info!("📡 订单簿策略信号（测试策略不下单）: {:?}", signal);
+                }
+            }
+            info!("快照通道已关闭，订单簿策略退出");
+        });
+
+        // Partial Depth / Book Ticker / 逐笔成交共用一个连接，读循环把原始帧直接解析为整数 tick
+        let streams = vec![
+            format!("{}@depth{}@100ms", stream_symbol, DEPTH_LEVELS),
+            format!("{}@bookTicker", stream_symbol),
+            format!("{}@trade", stream_symbol),
+        ];
+        let frame_sink = BinanceFrameSinkU64::new(symbol, depth_tx, ticker_tx, trade_tx);
+        let frames_handle = tokio::spawn(async move {
+            let ws_client = BinanceWebSocket::new();
+            loop {
+                match ws_client.subscribe_frames(&streams, &frame_sink).await {
+                    Ok(()) => warn!("Binance 行情连接已关闭: {}", streams.join(",")),
+                    Err(e) => error!("❌ Binance 行情连接失败: {} - {}", streams.join(","), e),
+                }
+                if frame_sink.is_closed() {
+                    break;
+                }
+                tokio::time::sleep(RECONNECT_DELAY).await;
+            }
+        });
+        let frames_abort = frames_handle.abort_handle();
+
+        info!("🎯 开始接收实时数据...");
+
+        tokio::select! {
+            result = frames_handle => {
+                if let Err(e) = result {
+                    error!("❌ Binance 行情任务异常: {:?}", e);
+                }
+                error!("🔌 快照创建器已退出，停止接收行情");
+            }
+            result = snapshot_creator_handle => {
+                if let Err(e) = result {
+                    error!("❌ 快照创建器任务异常: {:?}", e);
+                }
+            }
+            result = strategy_handle => {
+                if let Err(e) = result {
+                    error!("❌ 订单簿策略任务异常: {:?}", e);
+                }
+            }
+        }
+
+        info!(
+            "📊 缓冲池统计: 命中 {} 次, 未命中 {} 次",
+            pool_stats.hits(),
+            pool_stats.misses()
+        );
+        frames_abort.abort();
+        error!("🛑 订单簿策略程序退出");
+        Ok(())
+    }
+
+    /// 多交易对订单簿快照：所有交易对的 depth / bookTicker / trade 共用组合流连接
+    pub async fn run_multi_symbol_snapshots() -> Result<()> {
+        let trading_symbols = vec![
+            TradingSymbol::BTCUSDT,
+            TradingSymbol::ETHUSDT,
+            TradingSymbol::BNBUSDT,
+            TradingSymbol::TAOUSDT,
+            TradingSymbol::ONDOUSDT,
+        ];
+        info!("🚀 启动多交易对订单簿快照: {} 个交易对", trading_symbols.len());
+
+        // 每个交易对一个分片和一条快照通道，某个交易对消费变慢不会拖住其他交易对
+        let (snapshot_creator, receivers, _shard_handles) =
+            MultiSymbolSnapshotCreator::spawn(&trading_symbols, SNAPSHOT_CHANNEL_CAPACITY);
+
+        let mut consumers = JoinSet::new();
+        for (symbol, mut snapshot_rx) in receivers {
+            consumers.spawn(async move {
+                let mut snapshot_count: u64 = 0;
+                while let Some(snapshot) = snapshot_rx.recv().await {
+                    snapshot_count += 1;
+                    let depth = &snapshot.binance_depth;
+                    debug!(
+                        "📊 {} mid: {:?}, volume imbalance: {:.6}, trades: {}, book tickers: {}",
+                        symbol,
+                        depth.mid_price(),
+                        depth.volume_imbalance(IMBALANCE_LEVELS),
+                        snapshot.trade_tick.len(),
+                        snapshot.order_tick.len(),
+                    );
+                }
+                (symbol, snapshot_count)
+            });
+        }
+
+        // 组合流帧在分片读循环中直接按 stream 名称路由到对应交易对的分片
+        let mut mux = StreamMultiplexer::with_frame_router(move |text| snapshot_creator.route_combined_frame(text));
+        let streams: Vec<String> = trading_symbols
+            .iter()
+            .flat_map(|symbol| {
+                let name = symbol.id().stream_name(Exchange::Binance);
+                [
+                    format!("{}@depth{}@100ms", name, DEPTH_LEVELS),
+                    format!("{}@bookTicker", name),
+                    format!("{}@trade", name),
+                ]
+            })
+            .collect();
+        mux.subscribe(streams)?;
+        info!(
+            "🔌 组合流已订阅 {} 个 stream，{} 个连接",
+            mux.stream_count(),
+            mux.connection_count()
+        );
+
+        while let Some(joined) = consumers.join_next().await {
+            match joined {
+                Ok((symbol, count)) => warn!("{} 快照通道已关闭，共处理 {} 个快照", symbol, count),
+                Err(e) => error!("❌ 快照消费任务异常: {:?}", e),
+            }
+        }
+
+        mux.shutdown();
+        error!("🛑 多交易对订单簿快照程序退出");
+        Ok(())
+    }
+}
@@ -1,12 +1,14 @@
 use crate::{
     common::{
-        config::ws_config::{KlineConfig, WebSocketBaseConfig},
+        config::ws_config::{ConfigLoader, KlineConfig, WebSocketBaseConfig},
         config::user_config::load_binance_user_config,
         simple_logging::{SimpleLoggingManager, SimpleLoggingConfig},
-        TradingSymbol,
+        consts::{EXCHANGE_INFO_FILE, WS_CONFIG_FILE},
+        Exchange, TradingSymbol,
     },
+    models::install_symbol_filters,
     exchange_api::binance::{
-        ws_manager::{create_websocket_manager, WebSocketMessage},
+        ws_manager::{create_websocket_manager_with_channel, WebSocketMessage},
         api_manager::{create_api_manager, ApiMessage},
     },
     strategy::{
@@ -72,14 +74,28 @@ impl Q1Factory {
         ).await?;
 
         // 从API管理器获取共享的BinanceFuturesApi实例
-        let shared_api_client = api_manager.get_api_client();
+        // 下单通道由 BINANCE_USER__ORDER_TRANSPORT 配置（rest / websocket）
+        let shared_api_client = api_manager
+            .get_api_client()
+            .with_order_transport(user_config.order_transport)
+            .await?;
+
+        // 加载交易对过滤器（tickSize / stepSize / 最小名义价值），下单时用于数量和价格取整
+        match shared_api_client.load_symbol_filters(EXCHANGE_INFO_FILE).await {
+            Ok(cache) => {
+                info!("📐 已加载 {} 个交易对的下单过滤器", cache.len());
+                install_symbol_filters(cache);
+            }
+            Err(e) => error!("❌ 加载交易对过滤器失败: {}，使用默认精度", e),
+        }
         
         // 创建SignalManager，使用共享的API实例
         let mut signal_manager = SignalManager::new_with_client(
             signal_rx,
             position_manager,
             shared_api_client,
-        );
+        )
+        .with_max_concurrent(user_config.max_concurrent_signals);
 
         // 启动信号处理任务
         let signal_manager_handle = tokio::spawn(async move {
@@ -89,7 +105,9 @@ impl Q1Factory {
         });
 
         // 创建WebSocket管理器
-        let (ws_manager, mut ws_rx) = create_websocket_manager().await?;
+        // 汇总通道的容量和溢出策略来自 config.toml 的 [channel] 段
+        let channel_config = ConfigLoader::load_channel_config(WS_CONFIG_FILE);
+        let (ws_manager, mut ws_rx) = create_websocket_manager_with_channel(&channel_config).await?;
 
         // 创建策略管理器相关的通道
         let (strategy_data_tx, strategy_data_rx) = mpsc::channel::<Arc<UnifiedKlineData>>(1000);
@@ -227,7 +245,7 @@ impl Q1Factory {
 
         // 配置批量WebSocket连接 - 为所有币种
         let symbol_strings: Vec<String> = trading_symbols.iter()
-            .map(|symbol| symbol.as_str().to_lowercase())
+            .map(|symbol| symbol.id().stream_name(Exchange::Binance).to_string())
             .collect();
         
         let interval = "1h";
@@ -1,7 +1,7 @@
 //! 主程序入口，用于启动交易策略。
 
 // 从我们的库中导入必要的模块
-use rust_system::factory::{BollingerFactory, Q1Factory};
+use rust_system::factory::{BollingerFactory, LeadLagFactory, OrderBookFactory, Q1Factory};
 use std::env;
 
 #[tokio::main]
@@ -21,11 +21,29 @@ async fn main() -> Result<(), Box<dyn std::error::Error>> {
             Q1Factory::setup_logging()?;
             Q1Factory::run_q1_strategy().await?;
         }
+        "lead_lag" => {
+            println!("🚀 启动 Lead-Lag 策略...");
+            LeadLagFactory::setup_logging()?;
+            LeadLagFactory::run_lead_lag_strategy().await?;
+        }
+        "orderbook" => {
+            println!("🚀 启动订单簿策略...");
+            OrderBookFactory::setup_logging()?;
+            OrderBookFactory::run_orderbook_strategy().await?;
+        }
+        "orderbook_multi" => {
+            println!("🚀 启动多交易对订单簿快照...");
+            OrderBookFactory::setup_logging()?;
+            OrderBookFactory::run_multi_symbol_snapshots().await?;
+        }
         _ => {
             println!("❌ 未知的策略: {}", strategy);
             println!("支持的策略:");
             println!("  - bollinger: 布林带策略");
             println!("  - q1: Q1策略（默认）");
+            println!("  - lead_lag: Lead-Lag 策略（Binance 领先 ASTER）");
+            println!("  - orderbook: 订单簿策略（整数 tick 快照）");
+            println!("  - orderbook_multi: 多交易对订单簿快照（组合流）");
             return Ok(());
         }
     }
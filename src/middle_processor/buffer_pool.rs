@@ -0,0 +1,235 @@
+use crate::models::{OrderTickBuffer, OrderTickBufferU64, TradeTickBuffer, TradeTickBufferU64};
+use std::sync::Arc;
+use std::sync::atomic::{AtomicU64, Ordering};
+use tokio::sync::mpsc;
+
+/// 可以放进缓冲池循环使用的一组缓冲区
+pub trait PooledBuffers {
+    fn with_capacity(capacity: usize) -> Self;
+
+    /// 清空内容，保留容量
+    fn clear(&mut self);
+}
+
+/// 快照使用的一组 tick 缓冲区
+pub struct TickBuffers {
+    pub order_tick: OrderTickBuffer,
+    pub trade_tick: TradeTickBuffer,
+}
+
+impl TickBuffers {
+    pub fn new(capacity: usize) -> Self {
+        Self {
+            order_tick: OrderTickBuffer::new(capacity),
+            trade_tick: TradeTickBuffer::new(capacity),
+        }
+    }
+
+    /// 不分配内存的空缓冲区，仅用于占位
+    pub(crate) fn empty() -> Self {
+        Self::new(0)
+    }
+
+    pub fn clear(&mut self) {
+        self.order_tick.clear();
+        self.trade_tick.clear();
+    }
+}
+
+impl PooledBuffers for TickBuffers {
+    fn with_capacity(capacity: usize) -> Self {
+        Self::new(capacity)
+    }
+
+    fn clear(&mut self) {
+        TickBuffers::clear(self);
+    }
+}
+
+/// 整数 tick 快照使用的一组缓冲区
+pub struct TickBuffersU64 {
+    pub order_tick: OrderTickBufferU64,
+    pub trade_tick: TradeTickBufferU64,
+}
+
+impl TickBuffersU64 {
+    pub fn new(capacity: usize) -> Self {
+        Self {
+            order_tick: OrderTickBufferU64::new(capacity),
+            trade_tick: TradeTickBufferU64::new(capacity),
+        }
+    }
+
+    /// 不分配内存的空缓冲区，仅用于占位
+    pub(crate) fn empty() -> Self {
+        Self::new(0)
+    }
+
+    pub fn clear(&mut self) {
+        self.order_tick.clear();
+        self.trade_tick.clear();
+    }
+}
+
+impl PooledBuffers for TickBuffersU64 {
+    fn with_capacity(capacity: usize) -> Self {
+        Self::new(capacity)
+    }
+
+    fn clear(&mut self) {
+        TickBuffersU64::clear(self);
+    }
+}
+
+/// 缓冲池统计
+#[derive(Debug, Default)]
+pub struct PoolStats {
+    acquired: AtomicU64,
+    hits: AtomicU64,
+    returned: AtomicU64,
+}
+
+impl PoolStats {
+    /// 累计取用次数
+    pub fn acquired(&self) -> u64 {
+        self.acquired.load(Ordering::Relaxed)
+    }
+
+    /// 命中（复用已归还缓冲区）次数
+    pub fn hits(&self) -> u64 {
+        self.hits.load(Ordering::Relaxed)
+    }
+
+    /// 未命中（需要新分配）次数
+    pub fn misses(&self) -> u64 {
+        self.acquired().saturating_sub(self.hits())
+    }
+
+    /// 消费者归还次数
+    pub fn returned(&self) -> u64 {
+        self.returned.load(Ordering::Relaxed)
+    }
+
+    /// 命中率，尚未取用时返回 0
+    pub fn hit_rate(&self) -> f64 {
+        let acquired = self.acquired();
+        if acquired == 0 {
+            return 0.0;
+        }
+        self.hits() as f64 / acquired as f64
+    }
+}
+
+/// 缓冲区归还句柄，随快照一起交给消费者
+pub struct BufferRecycler<B = TickBuffers> {
+    tx: mpsc::UnboundedSender<B>,
+    stats: Arc<PoolStats>,
+}
+
+impl<B> Clone for BufferRecycler<B> {
+    fn clone(&self) -> Self {
+        Self {
+            tx: self.tx.clone(),
+            stats: self.stats.clone(),
+        }
+    }
+}
+
+impl<B: PooledBuffers> BufferRecycler<B> {
+    /// 归还缓冲区；缓冲池已关闭时直接释放
+    pub fn recycle(&self, buffers: B) {
+        if self.tx.send(buffers).is_ok() {
+            self.stats.returned.fetch_add(1, Ordering::Relaxed);
+        }
+    }
+}
+
+/// tick 缓冲池
+///
+/// 生产者通过 `acquire` 取出一组缓冲区填充数据，随快照发送给消费者；
+/// 消费者处理完成后经由 `BufferRecycler` 的归还通道送回。稳定状态下
+/// 缓冲区在生产者与消费者之间循环使用，不再产生堆分配。
+pub struct TickBufferPool<B = TickBuffers> {
+    capacity: usize,
+    rx: mpsc::UnboundedReceiver<B>,
+    recycler: BufferRecycler<B>,
+    stats: Arc<PoolStats>,
+}
+
+impl<B: PooledBuffers> TickBufferPool<B> {
+    pub fn new(capacity: usize) -> Self {
+        let (tx, rx) = mpsc::unbounded_channel();
+        let stats = Arc::new(PoolStats::default());
+        Self {
+            capacity,
+            rx,
+            recycler: BufferRecycler {
+                tx,
+                stats: stats.clone(),
+            },
+            stats,
+        }
+    }
+
+    /// 创建缓冲池并预先分配 `count` 组缓冲区
+    pub fn with_preallocated(capacity: usize, count: usize) -> Self {
+        let pool = Self::new(capacity);
+        for _ in 0..count {
+            let _ = pool.recycler.tx.send(B::with_capacity(capacity));
+        }
+        pool
+    }
+
+    /// 取出一组已清空的缓冲区，池中没有可用缓冲区时新分配
+    pub fn acquire(&mut self) -> B {
+        self.stats.acquired.fetch_add(1, Ordering::Relaxed);
+        match self.rx.try_recv() {
+            Ok(mut buffers) => {
+                self.stats.hits.fetch_add(1, Ordering::Relaxed);
+                buffers.clear();
+                buffers
+            }
+            Err(_) => B::with_capacity(self.capacity),
+        }
+    }
+
+    pub fn recycler(&self) -> BufferRecycler<B> {
+        self.recycler.clone()
+    }
+
+    pub fn stats(&self) -> Arc<PoolStats> {
+        self.stats.clone()
+    }
+
+    pub fn capacity(&self) -> usize {
+        self.capacity
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_pool_reuses_returned_buffers() {
+        let mut pool: TickBufferPool = TickBufferPool::with_preallocated(8, 1);
+        let recycler = pool.recycler();
+
+        let first = pool.acquire();
+        // 预分配的一组已被取走，第二次取用需要新分配
+        let second = pool.acquire();
+        assert_eq!(pool.stats().hits(), 1);
+        assert_eq!(pool.stats().misses(), 1);
+
+        recycler.recycle(first);
+        recycler.recycle(second);
+        let reused = pool.acquire();
+        assert!(reused.trade_tick.is_empty());
+        assert_eq!(reused.trade_tick.capacity(), 8);
+
+        let stats = pool.stats();
+        assert_eq!(stats.returned(), 2);
+        assert_eq!(stats.acquired(), 3);
+        assert!((stats.hit_rate() - 2.0 / 3.0).abs() < 1e-9);
+    }
+}
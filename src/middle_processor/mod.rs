@@ -1 +1,4 @@
-pub mod snapshot_creator;
\ No newline at end of file
+pub mod buffer_pool;
+pub mod multi_symbol;
+pub mod snapshot_creator;
+pub mod snapshot_creator_u64;
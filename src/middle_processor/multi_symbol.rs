@@ -0,0 +1,264 @@
+use super::buffer_pool::{PoolStats, TickBufferPool};
+use super::snapshot_creator::SnapShot;
+use crate::dto::binance::combined_stream::{decode_data, extract_stream_name};
+use crate::dto::binance::borrowed::{BookTickerRef, PartialDepthRef, TradeRef};
+use crate::dto::mexc::PushDataV3ApiWrapper;
+use crate::models::symbol::MAX_CUSTOM_SYMBOL_LEN;
+use crate::models::{CommonDepth, Exchange, OrderTick, TradeTick, TradingSymbol};
+use crate::system_log;
+use anyhow::Result;
+use std::collections::HashMap;
+use std::sync::Arc;
+use tokio::sync::mpsc;
+use tokio::task::JoinHandle;
+
+/// 每个交易对的 tick 缓冲区容量
+const TICK_BUFFER_CAPACITY: usize = 1000;
+
+/// 单个交易对的行情事件
+///
+/// 路由端从帧缓冲区直接解析出借用 DTO 并转换为模型类型，分片任务不再处理原始 DTO
+#[derive(Debug)]
+pub enum MarketEvent {
+    /// Binance Partial Depth，触发快照
+    Depth(CommonDepth),
+    Trade(TradeTick),
+    BookTicker(OrderTick),
+    MexcOrderTick(PushDataV3ApiWrapper),
+}
+
+/// 组合流中的 stream 类型
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub enum StreamKind {
+    /// <symbol>@depth<levels>[@<interval>]
+    PartialDepth,
+    /// <symbol>@trade
+    Trade,
+    /// <symbol>@bookTicker
+    BookTicker,
+}
+
+/// 解析 stream 名称，如 "btcusdt@depth20@100ms" -> (BTCUSDT, PartialDepth)
+///
+/// 不支持的 stream 类型（如增量深度 "btcusdt@depth"）以及无法表示的交易对返回 None。
+/// 交易对名称在栈上转为大写后查表，不为每帧分配字符串。
+pub fn parse_stream_name(stream: &str) -> Option<(TradingSymbol, StreamKind)> {
+    let (symbol, rest) = stream.split_once('@')?;
+    let channel = rest.split('@').next().unwrap_or(rest);
+    let kind = match channel {
+        "trade" => StreamKind::Trade,
+        "bookTicker" => StreamKind::BookTicker,
+        c if c.len() > 5 && c.starts_with("depth") && c[5..].bytes().all(|b| b.is_ascii_digit()) => {
+            StreamKind::PartialDepth
+        }
+        _ => return None,
+    };
+    if symbol.is_empty() {
+        return None;
+    }
+    // 预定义符号都不超过自定义符号的缓冲区长度，更长的交易对本来就无法表示
+    let mut buf = [0u8; MAX_CUSTOM_SYMBOL_LEN];
+    let upper = buf.get_mut(..symbol.len())?;
+    upper.copy_from_slice(symbol.as_bytes());
+    upper.make_ascii_uppercase();
+    let symbol = TradingSymbol::try_from_symbol(std::str::from_utf8(upper).ok()?)?;
+    Some((symbol, kind))
+}
+
+/// 多交易对快照创建器
+///
+/// 每个交易对一个独立的 tokio 任务（分片），各自持有 tick 缓冲区、最新 MEXC tick、
+/// 缓冲池和快照输出通道；路由端按 `TradingSymbol` 查表把事件投递到对应分片的无界通道，
+/// 某个交易对的突发流量或消费变慢只会阻塞它自己的分片，不影响其他交易对的快照生成。
+pub struct MultiSymbolSnapshotCreator {
+    shards: HashMap<TradingSymbol, mpsc::UnboundedSender<MarketEvent>>,
+    pool_stats: HashMap<TradingSymbol, Arc<PoolStats>>,
+}
+
+impl MultiSymbolSnapshotCreator {
+    /// 为每个交易对启动一个分片任务，返回每个交易对各自的快照接收端（容量 `snapshot_capacity`）
+    pub fn spawn(
+        symbols: &[TradingSymbol],
+        snapshot_capacity: usize,
+    ) -> (Self, HashMap<TradingSymbol, mpsc::Receiver<SnapShot>>, Vec<JoinHandle<()>>) {
+        let mut shards = HashMap::with_capacity(symbols.len());
+        let mut pool_stats = HashMap::with_capacity(symbols.len());
+        let mut receivers = HashMap::with_capacity(symbols.len());
+        let mut handles = Vec::with_capacity(symbols.len());
+
+        for &symbol in symbols {
+            if shards.contains_key(&symbol) {
+                continue;
+            }
+            let (tx, rx) = mpsc::unbounded_channel();
+            let (snapshot_tx, snapshot_rx) = mpsc::channel(snapshot_capacity);
+            let shard = SymbolShard {
+                symbol,
+                pool: TickBufferPool::with_preallocated(TICK_BUFFER_CAPACITY, 2),
+                sender_snapshot: snapshot_tx,
+            };
+            pool_stats.insert(symbol, shard.pool.stats());
+            shards.insert(symbol, tx);
+            receivers.insert(symbol, snapshot_rx);
+            handles.push(tokio::spawn(shard.run(rx)));
+        }
+
+        (Self { shards, pool_stats }, receivers, handles)
+    }
+
+    /// 投递事件到对应交易对的分片；交易对未注册或分片已退出时返回 false
+    pub fn route(&self, symbol: TradingSymbol, event: MarketEvent) -> bool {
+        match self.shards.get(&symbol) {
+            Some(tx) => tx.send(event).is_ok(),
+            None => false,
+        }
+    }
+
+    /// 解析组合流帧并按 stream 名称路由
+    ///
+    /// 返回 Ok(false) 表示控制帧响应（没有 stream 字段）、stream 类型不受支持或交易对未注册
+    pub fn route_combined_frame(&self, text: &str) -> Result<bool> {
+        let Some(stream) = extract_stream_name(text) else {
+            return Ok(false);
+        };
+        let Some((symbol, kind)) = parse_stream_name(&stream) else {
+            return Ok(false);
+        };
+        if !self.shards.contains_key(&symbol) {
+            return Ok(false);
+        }
+
+        let event = match kind {
+            StreamKind::PartialDepth => {
+                let depth: PartialDepthRef = decode_data(text)?;
+                MarketEvent::Depth(CommonDepth::new_from_binance_ref(depth, symbol))
+            }
+            StreamKind::Trade => {
+                let trade: TradeRef = decode_data(text)?;
+                MarketEvent::Trade(TradeTick::new_from_binance_ref(&trade))
+            }
+            StreamKind::BookTicker => {
+                let ticker: BookTickerRef = decode_data(text)?;
+                MarketEvent::BookTicker(OrderTick::new_from_binance_ref(&ticker))
+            }
+        };
+        Ok(self.route(symbol, event))
+    }
+
+    pub fn symbols(&self) -> impl Iterator<Item = &TradingSymbol> {
+        self.shards.keys()
+    }
+
+    pub fn pool_stats(&self, symbol: &TradingSymbol) -> Option<Arc<PoolStats>> {
+        self.pool_stats.get(symbol).cloned()
+    }
+}
+
+/// 单个交易对的快照分片
+struct SymbolShard {
+    symbol: TradingSymbol,
+    pool: TickBufferPool,
+    sender_snapshot: mpsc::Sender<SnapShot>,
+}
+
+impl SymbolShard {
+    async fn run(mut self, mut rx: mpsc::UnboundedReceiver<MarketEvent>) {
+        let recycler = self.pool.recycler();
+        let mut buffers = self.pool.acquire();
+        let mut latest_mexc_tick: Option<OrderTick> = None;
+
+        while let Some(event) = rx.recv().await {
+            match event {
+                MarketEvent::Trade(tick) => {
+                    buffers.trade_tick.push_trade(tick);
+                }
+                MarketEvent::BookTicker(tick) => {
+                    buffers.order_tick.push_tick(tick);
+                }
+                MarketEvent::MexcOrderTick(data) => match OrderTick::new_from_mexc(data) {
+                    Ok(tick) => latest_mexc_tick = Some(tick),
+                    Err(e) => {
+                        system_log!(warn, "Failed to parse MEXC OrderTick for {}: {}", self.symbol, e);
+                    }
+                },
+                MarketEvent::Depth(depth) => {
+                    let mexc_tick = latest_mexc_tick
+                        .unwrap_or_else(|| OrderTick::empty(Exchange::Mexc, self.symbol));
+                    let filled = std::mem::replace(&mut buffers, self.pool.acquire());
+                    let snapshot = SnapShot::pooled(depth, mexc_tick, filled, recycler.clone());
+                    if self.sender_snapshot.send(snapshot).await.is_err() {
+                        system_log!(info, "Snapshot consumer closed, stopping shard: {}", self.symbol);
+                        break;
+                    }
+                }
+            }
+        }
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_parse_stream_name() {
+        assert_eq!(
+            parse_stream_name("btcusdt@depth20@100ms"),
+            Some((TradingSymbol::BTCUSDT, StreamKind::PartialDepth))
+        );
+        assert_eq!(
+            parse_stream_name("ethusdt@bookTicker"),
+            Some((TradingSymbol::ETHUSDT, StreamKind::BookTicker))
+        );
+        assert_eq!(
+            parse_stream_name("1000pepeusdt@trade"),
+            Some((TradingSymbol::PEPEUSDT, StreamKind::Trade))
+        );
+        // 增量深度不在快照路由范围内
+        assert_eq!(parse_stream_name("btcusdt@depth@100ms"), None);
+        assert_eq!(parse_stream_name("btcusdt"), None);
+        // 超过符号缓冲区的交易对无法表示，返回 None 而不是 panic
+        assert_eq!(parse_stream_name("averyveryverylongusdt@trade"), None);
+    }
+
+    #[tokio::test]
+    async fn test_routes_combined_frames_per_symbol() {
+        let (creator, mut receivers, _handles) =
+            MultiSymbolSnapshotCreator::spawn(&[TradingSymbol::BTCUSDT, TradingSymbol::ETHUSDT], 16);
+        let mut snapshot_rx = receivers.remove(&TradingSymbol::ETHUSDT).unwrap();
+
+        let frame = r#"{"stream":"ethusdt@depth5@100ms","data":{"e":"depthUpdate","E":1,"T":1,"s":"ETHUSDT","U":1,"u":2,"pu":0,"b":[["100.0","1.0"]],"a":[["101.0","2.0"]]}}"#;
+        assert!(creator.route_combined_frame(frame).unwrap());
+
+        let unknown = r#"{"stream":"solusdt@depth5@100ms","data":{"lastUpdateId":1,"bids":[],"asks":[]}}"#;
+        assert!(!creator.route_combined_frame(unknown).unwrap());
+        assert!(!creator.route_combined_frame(r#"{"result":null,"id":1}"#).unwrap());
+
+        let snapshot = snapshot_rx.recv().await.unwrap();
+        assert_eq!(snapshot.symbol(), TradingSymbol::ETHUSDT);
+        assert_eq!(snapshot.binance_depth.best_bid(), Some((100.0, 1.0)));
+        assert_eq!(snapshot.mexc_order_tick.symbol, TradingSymbol::ETHUSDT);
+    }
+
+    #[tokio::test]
+    async fn test_slow_consumer_does_not_block_other_shards() {
+        let (creator, mut receivers, _handles) =
+            MultiSymbolSnapshotCreator::spawn(&[TradingSymbol::BTCUSDT, TradingSymbol::ETHUSDT], 1);
+        // BTCUSDT 的消费者不读取，输出通道很快被占满
+        let _btc_rx = receivers.remove(&TradingSymbol::BTCUSDT).unwrap();
+        let mut eth_rx = receivers.remove(&TradingSymbol::ETHUSDT).unwrap();
+
+        let btc = r#"{"stream":"btcusdt@depth5@100ms","data":{"lastUpdateId":1,"bids":[["100.0","1.0"]],"asks":[["101.0","2.0"]]}}"#;
+        for _ in 0..4 {
+            assert!(creator.route_combined_frame(btc).unwrap());
+        }
+        let eth = r#"{"stream":"ethusdt@depth5@100ms","data":{"lastUpdateId":1,"bids":[["10.0","1.0"]],"asks":[["11.0","2.0"]]}}"#;
+        assert!(creator.route_combined_frame(eth).unwrap());
+
+        let snapshot = tokio::time::timeout(std::time::Duration::from_secs(1), eth_rx.recv())
+            .await
+            .expect("ETHUSDT snapshot blocked by BTCUSDT consumer")
+            .unwrap();
+        assert_eq!(snapshot.symbol(), TradingSymbol::ETHUSDT);
+    }
+}
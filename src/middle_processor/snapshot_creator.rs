@@ -1,40 +1,113 @@
 pub use crate::dto::mexc::PushDataV3ApiWrapper;
 pub use crate::dto::binance::websocket::{BinancePartialDepth, BookTickerData,BinanceTradeData};
-pub use crate::models::{CommonDepth, OrderTick, OrderTickBuffer, TradeTick, TradeTickBuffer};
+pub use crate::models::{CommonDepth, OrderTick, OrderTickBuffer, TradeTick, TradeTickBuffer, TradingSymbol};
 pub use tokio::sync::mpsc;
 pub use ta::{TradeTickerf64,OrderTickerf64,BatchTradeTickerf64,BatchOrderTickerf64,Orderbookf64};
+pub use super::buffer_pool::{BufferRecycler, PoolStats, TickBufferPool, TickBuffers};
 use std::collections::BTreeMap;
+use std::sync::Arc;
 use ordered_float::OrderedFloat;
+
+/// 每组缓冲区最多存储的 tick 数量
+const TICK_BUFFER_CAPACITY: usize = 1000;
+
+/// 快照
+///
+/// 快照被 drop 时（即消费者处理完 `on_orderbook_update` 后）会把
+/// tick 缓冲区归还给 SnapshotCreator 的缓冲池复用。
 pub struct SnapShot {
     pub binance_depth: CommonDepth,
     pub mexc_order_tick: OrderTick,
     pub order_tick: OrderTickBuffer,
     pub trade_tick: TradeTickBuffer,
+    recycler: Option<BufferRecycler>,
+}
+
+impl SnapShot {
+    /// 创建不归还缓冲区的独立快照
+    pub fn new(
+        binance_depth: CommonDepth,
+        mexc_order_tick: OrderTick,
+        order_tick: OrderTickBuffer,
+        trade_tick: TradeTickBuffer,
+    ) -> Self {
+        Self {
+            binance_depth,
+            mexc_order_tick,
+            order_tick,
+            trade_tick,
+            recycler: None,
+        }
+    }
+
+    /// 使用缓冲池中的缓冲区创建快照，drop 时归还
+    pub(crate) fn pooled(
+        binance_depth: CommonDepth,
+        mexc_order_tick: OrderTick,
+        buffers: TickBuffers,
+        recycler: BufferRecycler,
+    ) -> Self {
+        Self {
+            binance_depth,
+            mexc_order_tick,
+            order_tick: buffers.order_tick,
+            trade_tick: buffers.trade_tick,
+            recycler: Some(recycler),
+        }
+    }
+
+    pub fn symbol(&self) -> TradingSymbol {
+        self.binance_depth.symbol
+    }
+}
+
+impl Drop for SnapShot {
+    fn drop(&mut self) {
+        if let Some(recycler) = self.recycler.take() {
+            // 用零容量缓冲区占位，不产生分配
+            let empty = TickBuffers::empty();
+            recycler.recycle(TickBuffers {
+                order_tick: std::mem::replace(&mut self.order_tick, empty.order_tick),
+                trade_tick: std::mem::replace(&mut self.trade_tick, empty.trade_tick),
+            });
+        }
+    }
 }
 
 pub struct SnapshotCreator {
+    symbol: TradingSymbol,
     pub rec_mexc_order_tick: mpsc::Receiver<PushDataV3ApiWrapper>,
     pub rec_binance_depth: mpsc::Receiver<BinancePartialDepth>,
     pub rec_order_tick: mpsc::Receiver<BookTickerData>,
     pub rec_trade_tick: mpsc::Receiver<BinanceTradeData>,
     pub sender_snapshot: mpsc::Sender<SnapShot>,
+    buffer_pool: TickBufferPool,
 }
 
 impl SnapshotCreator {
-    pub fn new(rec_mexc_order_tick: mpsc::Receiver<PushDataV3ApiWrapper>,
+    pub fn new(symbol: TradingSymbol,
+    rec_mexc_order_tick: mpsc::Receiver<PushDataV3ApiWrapper>,
     rec_binance_depth: mpsc::Receiver<BinancePartialDepth>,
     rec_order_tick: mpsc::Receiver<BookTickerData>,
     rec_trade_tick: mpsc::Receiver<BinanceTradeData>,
     sender_snapshot: mpsc::Sender<SnapShot>) -> Self {
         Self {
+            symbol,
             rec_mexc_order_tick,
             rec_binance_depth,
             rec_order_tick,
             rec_trade_tick,
             sender_snapshot,
+            // 双缓冲：一组由本任务填充，一组在消费者手中
+            buffer_pool: TickBufferPool::with_preallocated(TICK_BUFFER_CAPACITY, 2),
         }
     }
 
+    /// 缓冲池统计（命中率等）
+    pub fn pool_stats(&self) -> Arc<PoolStats> {
+        self.buffer_pool.stats()
+    }
+
     /// 启动快照创建器的主循环
     /// 
     /// 处理逻辑：
@@ -43,9 +116,10 @@ impl SnapshotCreator {
     /// 3. MEXC OrderTick 数据持续更新
     /// 4. 当 BinanceDepth 数据到达时，触发快照创建并发送
     /// 5. 如果某些数据没有更新，使用旧数据
+    /// 6. 快照中的缓冲区来自缓冲池，消费者 drop 快照后归还复用
     pub async fn run(&mut self) -> Result<(), Box<dyn std::error::Error + Send + Sync>> {
-        let mut trade_buffer = TradeTickBuffer::new(1000); // 最多存储1000笔交易
-        let mut order_buffer = OrderTickBuffer::new(1000); // 最多存储1000个订单tick
+        let recycler = self.buffer_pool.recycler();
+        let mut buffers = self.buffer_pool.acquire();
         let mut latest_mexc_tick: Option<OrderTick> = None;
         
         println!("🚀 SnapshotCreator 启动，开始处理数据流...");
@@ -58,8 +132,8 @@ impl SnapshotCreator {
                         Some(trade_data) => {
                             // 将 BinanceTradeData 转换为 TradeTick 并存储到缓冲区
                             let tick = TradeTick::new_from_binance(trade_data);
-                            trade_buffer.push_trade(tick);
-                            println!("📊 收到 TradeTick，当前缓冲区大小: {}", trade_buffer.len());
+                            buffers.trade_tick.push_trade(tick);
+                            println!("📊 收到 TradeTick，当前缓冲区大小: {}", buffers.trade_tick.len());
                         }
                         None => {
                             println!("⚠️ TradeTick 通道已关闭");
@@ -74,8 +148,8 @@ impl SnapshotCreator {
                         Some(order_data) => {
                             // 将 BookTickerData 转换为 OrderTick 并存储到缓冲区
                             let tick = OrderTick::new_from_binance(order_data);
-                            order_buffer.push_tick(tick);
-                            println!("📈 收到 OrderTick，当前缓冲区大小: {}", order_buffer.len());
+                            buffers.order_tick.push_tick(tick);
+                            println!("📈 收到 OrderTick，当前缓冲区大小: {}", buffers.order_tick.len());
                         }
                         None => {
                             println!("⚠️ OrderTick 通道已关闭");
@@ -115,46 +189,30 @@ impl SnapshotCreator {
                             println!("🎯 收到 BinanceDepth，准备创建快照...");
                             
                             // 将 BinanceDepth 转换为 CommonDepth
-                            let common_depth = CommonDepth::new_from_binance(depth_data);
+                            let common_depth = CommonDepth::new_from_binance(depth_data, self.symbol);
                             
                             // 获取最新的 MEXC OrderTick，如果没有则使用默认值
                             let mexc_tick = latest_mexc_tick.clone().unwrap_or_else(|| {
                                 println!("⚠️ 没有最新的 MEXC OrderTick，使用默认值");
-                                OrderTick {
-                                    data: crate::models::order_tick::OrderTickData {
-                                        best_bid_price: 0.0,
-                                        best_ask_price: 0.0,
-                                        best_bid_quantity: 0.0,
-                                        best_ask_quantity: 0.0,
-                                    },
-                                    exchange: crate::models::Exchange::Mexc,
-                                    symbol: crate::models::TradingSymbol::BTCUSDT,
-                                    timestamp: 0,
-                                }
+                                OrderTick::empty(crate::models::Exchange::Mexc, common_depth.symbol)
                             });
                             
-                            // 创建快照，直接移动缓冲区所有权（不克隆）
-                            let snapshot = SnapShot {
-                                binance_depth: common_depth,
-                                mexc_order_tick: mexc_tick,
-                                order_tick: order_buffer,  // 直接移动所有权
-                                trade_tick: trade_buffer,  // 直接移动所有权
-                            };
+                            // 换出当前缓冲区放入快照（不克隆），同时从缓冲池取一组继续接收数据
+                            let filled = std::mem::replace(&mut buffers, self.buffer_pool.acquire());
+                            let snapshot = SnapShot::pooled(common_depth, mexc_tick, filled, recycler.clone());
                             
                             // 发送前打印详细信息
-                            println!("📊 准备发送快照: Binance深度={}档, MEXC tick={}, OrderTick数={}, 交易数={}", 
+                            println!("📊 准备发送快照: Binance深度={}档, MEXC tick={}, OrderTick数={}, 交易数={}, 缓冲池命中率={:.2}", 
                                 snapshot.binance_depth.bid_list.len() + snapshot.binance_depth.ask_list.len(),
                                 latest_mexc_tick.is_some(),
                                 snapshot.order_tick.len(),
-                                snapshot.trade_tick.len());
+                                snapshot.trade_tick.len(),
+                                self.buffer_pool.stats().hit_rate());
                             
                             // 发送快照
                             match self.sender_snapshot.send(snapshot).await {
                                 Ok(_) => {
                                     println!("✅ 快照发送成功");
-                                    // 发送后重新创建新的缓冲区来继续接收数据
-                                    trade_buffer = TradeTickBuffer::new(1000);
-                                    order_buffer = OrderTickBuffer::new(1000);
                                 }
                                 Err(e) => {
                                     println!("❌ 快照发送失败: {}", e);
@@ -187,9 +245,9 @@ impl BatchTradeTickerf64<TradeTick> for SnapShot{
 }
 impl Orderbookf64 for SnapShot{
     fn get_bids_btm(&self) -> &BTreeMap<OrderedFloat<f64>, f64> {
-        &self.binance_depth.bid_list
+        self.binance_depth.get_bids_btm()
     }
     fn get_asks_btm(&self) -> &BTreeMap<OrderedFloat<f64>, f64> {
-        &self.binance_depth.ask_list
+        self.binance_depth.get_asks_btm()
     }
 }
\ No newline at end of file
@@ -0,0 +1,288 @@
+use super::buffer_pool::{BufferRecycler, PoolStats, TickBufferPool, TickBuffersU64};
+use crate::common::bounded_channel::MessageSink;
+use crate::dto::binance::borrowed::{BookTickerStrRef, PartialDepthStrRef, TradeStrRef};
+use crate::dto::binance::combined_stream::extract_event_type;
+use crate::dto::mexc::PushDataV3ApiWrapper;
+use crate::models::{
+    CommonDepthU64, Exchange, OrderTickBufferU64, OrderTickU64, SymbolPrecision, TradeTickBufferU64, TradeTickU64,
+    TradingSymbol,
+};
+use crate::system_log;
+use std::collections::BTreeMap;
+use std::sync::Arc;
+use ta::OrderbookU64;
+use tokio::sync::mpsc;
+
+/// 每组缓冲区最多存储的 tick 数量
+const TICK_BUFFER_CAPACITY: usize = 1000;
+
+/// 整数 tick 快照
+///
+/// 价格/数量均为交易对精度下的整数 tick / lot，下单时通过 `precision()` 直接格式化，
+/// 不经过 f64。drop 时把 tick 缓冲区归还给缓冲池。
+pub struct SnapShotU64 {
+    pub binance_depth: CommonDepthU64,
+    pub mexc_order_tick: OrderTickU64,
+    pub order_tick: OrderTickBufferU64,
+    pub trade_tick: TradeTickBufferU64,
+    recycler: Option<BufferRecycler<TickBuffersU64>>,
+}
+
+impl SnapShotU64 {
+    /// 创建不归还缓冲区的独立快照
+    pub fn new(
+        binance_depth: CommonDepthU64,
+        mexc_order_tick: OrderTickU64,
+        order_tick: OrderTickBufferU64,
+        trade_tick: TradeTickBufferU64,
+    ) -> Self {
+        Self {
+            binance_depth,
+            mexc_order_tick,
+            order_tick,
+            trade_tick,
+            recycler: None,
+        }
+    }
+
+    /// 使用缓冲池中的缓冲区创建快照，drop 时归还
+    pub(crate) fn pooled(
+        binance_depth: CommonDepthU64,
+        mexc_order_tick: OrderTickU64,
+        buffers: TickBuffersU64,
+        recycler: BufferRecycler<TickBuffersU64>,
+    ) -> Self {
+        Self {
+            binance_depth,
+            mexc_order_tick,
+            order_tick: buffers.order_tick,
+            trade_tick: buffers.trade_tick,
+            recycler: Some(recycler),
+        }
+    }
+
+    pub fn symbol(&self) -> TradingSymbol {
+        self.binance_depth.symbol
+    }
+
+    pub fn precision(&self) -> SymbolPrecision {
+        self.binance_depth.precision()
+    }
+}
+
+impl Drop for SnapShotU64 {
+    fn drop(&mut self) {
+        if let Some(recycler) = self.recycler.take() {
+            // 用零容量缓冲区占位，不产生分配
+            let empty = TickBuffersU64::empty();
+            recycler.recycle(TickBuffersU64 {
+                order_tick: std::mem::replace(&mut self.order_tick, empty.order_tick),
+                trade_tick: std::mem::replace(&mut self.trade_tick, empty.trade_tick),
+            });
+        }
+    }
+}
+
+impl OrderbookU64 for SnapShotU64 {
+    fn get_bids_btm(&self) -> &BTreeMap<u64, u64> {
+        self.binance_depth.get_bids_btm()
+    }
+    fn get_asks_btm(&self) -> &BTreeMap<u64, u64> {
+        self.binance_depth.get_asks_btm()
+    }
+}
+
+/// 单条 Binance 推送解析出的整数 tick 数据
+enum BinanceTickU64 {
+    Depth(CommonDepthU64),
+    Ticker(OrderTickU64),
+    Trade(TradeTickU64),
+}
+
+/// 把 Binance 原始推送帧直接解析为整数 tick，投递到 `SnapshotCreatorU64` 的输入
+///
+/// 作为 `subscribe_frames` 的接收端在读循环中执行：帧按 `e` 字段分发
+/// （`bookTicker` / `trade` / `depthUpdate`，该连接只订阅 Partial Depth），
+/// 价格/数量从原始字符串按交易对精度解析，不经过 f64。输入队列满时读循环等待。
+pub struct BinanceFrameSinkU64 {
+    symbol: TradingSymbol,
+    depth_tx: mpsc::Sender<CommonDepthU64>,
+    ticker_tx: mpsc::Sender<OrderTickU64>,
+    trade_tx: mpsc::Sender<TradeTickU64>,
+}
+
+impl BinanceFrameSinkU64 {
+    pub fn new(
+        symbol: TradingSymbol,
+        depth_tx: mpsc::Sender<CommonDepthU64>,
+        ticker_tx: mpsc::Sender<OrderTickU64>,
+        trade_tx: mpsc::Sender<TradeTickU64>,
+    ) -> Self {
+        Self {
+            symbol,
+            depth_tx,
+            ticker_tx,
+            trade_tx,
+        }
+    }
+
+    fn decode(&self, text: &str) -> anyhow::Result<Option<BinanceTickU64>> {
+        let tick = match extract_event_type(text) {
+            Some("bookTicker") => {
+                let ticker: BookTickerStrRef = serde_json::from_str(text)?;
+                BinanceTickU64::Ticker(OrderTickU64::new_from_binance_ref(&ticker)?)
+            }
+            Some("trade") => {
+                let trade: TradeStrRef = serde_json::from_str(text)?;
+                BinanceTickU64::Trade(TradeTickU64::new_from_binance_ref(&trade)?)
+            }
+            Some("depthUpdate") => {
+                let depth: PartialDepthStrRef = serde_json::from_str(text)?;
+                BinanceTickU64::Depth(CommonDepthU64::new_from_binance_ref(&depth, self.symbol))
+            }
+            _ => return Ok(None),
+        };
+        Ok(Some(tick))
+    }
+}
+
+impl MessageSink<String> for BinanceFrameSinkU64 {
+    async fn deliver(&self, text: String) -> bool {
+        match self.decode(&text) {
+            Ok(Some(BinanceTickU64::Depth(depth))) => self.depth_tx.send(depth).await.is_ok(),
+            Ok(Some(BinanceTickU64::Ticker(tick))) => self.ticker_tx.send(tick).await.is_ok(),
+            Ok(Some(BinanceTickU64::Trade(trade))) => self.trade_tx.send(trade).await.is_ok(),
+            Ok(None) => true,
+            Err(e) => {
+                system_log!(warn, "Failed to decode Binance frame for {}: {}", self.symbol, e);
+                true
+            }
+        }
+    }
+
+    fn is_closed(&self) -> bool {
+        self.depth_tx.is_closed()
+    }
+}
+
+/// 整数 tick 快照创建器
+///
+/// 与 `SnapshotCreator` 的触发逻辑相同（Binance Partial Depth 到达时生成快照），
+/// Binance 推送由 `BinanceFrameSinkU64` 在读循环中解析为整数 tick 后输入，
+/// 之后的快照和策略计算不再涉及 f64。
+pub struct SnapshotCreatorU64 {
+    symbol: TradingSymbol,
+    pub rec_mexc_order_tick: mpsc::Receiver<PushDataV3ApiWrapper>,
+    pub rec_binance_depth: mpsc::Receiver<CommonDepthU64>,
+    pub rec_order_tick: mpsc::Receiver<OrderTickU64>,
+    pub rec_trade_tick: mpsc::Receiver<TradeTickU64>,
+    pub sender_snapshot: mpsc::Sender<SnapShotU64>,
+    buffer_pool: TickBufferPool<TickBuffersU64>,
+}
+
+impl SnapshotCreatorU64 {
+    pub fn new(
+        symbol: TradingSymbol,
+        rec_mexc_order_tick: mpsc::Receiver<PushDataV3ApiWrapper>,
+        rec_binance_depth: mpsc::Receiver<CommonDepthU64>,
+        rec_order_tick: mpsc::Receiver<OrderTickU64>,
+        rec_trade_tick: mpsc::Receiver<TradeTickU64>,
+        sender_snapshot: mpsc::Sender<SnapShotU64>,
+    ) -> Self {
+        Self {
+            symbol,
+            rec_mexc_order_tick,
+            rec_binance_depth,
+            rec_order_tick,
+            rec_trade_tick,
+            sender_snapshot,
+            // 双缓冲：一组由本任务填充，一组在消费者手中
+            buffer_pool: TickBufferPool::with_preallocated(TICK_BUFFER_CAPACITY, 2),
+        }
+    }
+
+    /// 缓冲池统计（命中率等）
+    pub fn pool_stats(&self) -> Arc<PoolStats> {
+        self.buffer_pool.stats()
+    }
+
+    /// 启动快照创建器的主循环，所有输入通道关闭或快照消费者关闭时退出
+    pub async fn run(&mut self) {
+        let recycler = self.buffer_pool.recycler();
+        let mut buffers = self.buffer_pool.acquire();
+        let mut latest_mexc_tick: Option<OrderTickU64> = None;
+
+        loop {
+            tokio::select! {
+                Some(trade) = self.rec_trade_tick.recv() => {
+                    buffers.trade_tick.push_trade(trade);
+                }
+
+                Some(tick) = self.rec_order_tick.recv() => {
+                    buffers.order_tick.push_tick(tick);
+                }
+
+                Some(data) = self.rec_mexc_order_tick.recv() => {
+                    match OrderTickU64::new_from_mexc(data) {
+                        Ok(tick) => latest_mexc_tick = Some(tick),
+                        Err(e) => {
+                            system_log!(warn, "Failed to parse MEXC OrderTick for {}: {}", self.symbol, e);
+                        }
+                    }
+                }
+
+                Some(depth) = self.rec_binance_depth.recv() => {
+                    let mexc_tick = latest_mexc_tick
+                        .unwrap_or_else(|| OrderTickU64::empty(Exchange::Mexc, self.symbol));
+                    // 换出当前缓冲区放入快照（不克隆），同时从缓冲池取一组继续接收数据
+                    let filled = std::mem::replace(&mut buffers, self.buffer_pool.acquire());
+                    let snapshot = SnapShotU64::pooled(depth, mexc_tick, filled, recycler.clone());
+                    if self.sender_snapshot.send(snapshot).await.is_err() {
+                        system_log!(info, "Snapshot consumer closed, stopping u64 snapshot creator: {}", self.symbol);
+                        break;
+                    }
+                }
+
+                else => break,
+            }
+        }
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[tokio::test]
+    async fn test_depth_triggers_integer_snapshot() {
+        let (_mexc_tx, mexc_rx) = mpsc::channel(8);
+        let (depth_tx, depth_rx) = mpsc::channel(8);
+        let (ticker_tx, ticker_rx) = mpsc::channel(8);
+        let (trade_tx, trade_rx) = mpsc::channel(8);
+        let (snapshot_tx, mut snapshot_rx) = mpsc::channel(8);
+        let sink = BinanceFrameSinkU64::new(TradingSymbol::ETHUSDT, depth_tx, ticker_tx, trade_tx);
+        let mut creator = SnapshotCreatorU64::new(
+            TradingSymbol::ETHUSDT,
+            mexc_rx,
+            depth_rx,
+            ticker_rx,
+            trade_rx,
+            snapshot_tx,
+        );
+        tokio::spawn(async move { creator.run().await });
+
+        let ticker = r#"{"e":"bookTicker","u":1,"E":2,"T":3,"s":"ETHUSDT","b":"3512.34","B":"1.5","a":"3512.35","A":"2"}"#;
+        assert!(sink.deliver(ticker.to_string()).await);
+        assert!(sink.deliver("not a frame".to_string()).await);
+        tokio::task::yield_now().await;
+        let depth = r#"{"e":"depthUpdate","E":5,"T":4,"s":"ETHUSDT","U":1,"u":2,"pu":0,"b":[["3512.34","1.500"]],"a":[["3512.35","2.000"]]}"#;
+        assert!(sink.deliver(depth.to_string()).await);
+
+        let snapshot = snapshot_rx.recv().await.unwrap();
+        assert_eq!(snapshot.symbol(), TradingSymbol::ETHUSDT);
+        assert_eq!(snapshot.binance_depth.best_bid(), Some((351_234, 1_500)));
+        assert_eq!(snapshot.order_tick.get_latest_tick().unwrap().data.best_ask_price, 351_235);
+        assert_eq!(snapshot.precision().format_price(351_235), "3512.35");
+        assert!(!snapshot.mexc_order_tick.is_valid());
+    }
+}
@@ -0,0 +1,244 @@
+use std::collections::BTreeMap;
+use std::iter::Sum;
+use std::sync::OnceLock;
+
+/// 订单簿方向
+#[derive(Debug, Clone, Copy, PartialEq, Eq, Hash)]
+pub enum BookSide {
+    Bid,
+    Ask,
+}
+
+/// 连续内存的单边订单簿档位
+///
+/// 档位按"最优优先"排序存放在一个 Vec 中：买盘价格降序，卖盘价格升序。
+/// - 最优价是 `levels[0]`，O(1)
+/// - 前 N 档累计、不平衡度等计算直接遍历连续内存
+/// - 增删改通过二分查找定位，只在插入/删除时移动尾部元素，不产生树节点分配
+///
+/// 热路径上的订单簿指标直接基于 `as_slice` / `top` 计算；只有 ta 库中以 `BTreeMap`
+/// 为输入的 `Orderbookf64` / `OrderbookU64` 访问器才会调用 `as_btree_map`，
+/// 首次调用时按需构建一份只读 BTreeMap 并缓存，任何修改都会使缓存失效。
+#[derive(Debug, Clone)]
+pub struct DepthLevels<P, Q> {
+    side: BookSide,
+    levels: Vec<(P, Q)>,
+    btm: OnceLock<BTreeMap<P, Q>>,
+}
+
+impl<P: Ord + Copy, Q: Copy> DepthLevels<P, Q> {
+    pub fn new(side: BookSide) -> Self {
+        Self::with_capacity(side, 0)
+    }
+
+    pub fn with_capacity(side: BookSide, capacity: usize) -> Self {
+        Self {
+            side,
+            levels: Vec::with_capacity(capacity),
+            btm: OnceLock::new(),
+        }
+    }
+
+    /// 从任意顺序的 (price, quantity) 构建，重复价格以最后一次出现为准
+    pub fn from_levels<I: IntoIterator<Item = (P, Q)>>(side: BookSide, items: I) -> Self {
+        let mut book = Self::new(side);
+        book.replace(items);
+        book
+    }
+
+    /// 直接接管已有的档位 Vec（任意顺序），不再额外分配
+    pub fn from_vec(side: BookSide, levels: Vec<(P, Q)>) -> Self {
+        let mut book = Self {
+            side,
+            levels,
+            btm: OnceLock::new(),
+        };
+        book.normalize();
+        book
+    }
+
+    /// 用一组新的档位整体替换（复用已有内存）
+    pub fn replace<I: IntoIterator<Item = (P, Q)>>(&mut self, items: I) {
+        self.levels.clear();
+        self.levels.extend(items);
+        self.normalize();
+    }
+
+    /// 按最优优先排序并合并重复价格
+    fn normalize(&mut self) {
+        let side = self.side;
+        // 稳定排序保证相同价格的档位保持原始顺序，dedup 时保留最后一个
+        self.levels.sort_by(|a, b| Self::order(side, &a.0, &b.0));
+        self.levels.dedup_by(|later, earlier| {
+            if later.0 == earlier.0 {
+                earlier.1 = later.1;
+                true
+            } else {
+                false
+            }
+        });
+        self.invalidate();
+    }
+
+    #[inline]
+    fn order(side: BookSide, a: &P, b: &P) -> std::cmp::Ordering {
+        match side {
+            BookSide::Bid => b.cmp(a),
+            BookSide::Ask => a.cmp(b),
+        }
+    }
+
+    #[inline]
+    fn search(&self, price: &P) -> Result<usize, usize> {
+        let side = self.side;
+        self.levels.binary_search_by(|(p, _)| Self::order(side, p, price))
+    }
+
+    #[inline]
+    fn invalidate(&mut self) {
+        self.btm.take();
+    }
+
+    /// 设置某个价格的数量，数量为 None 表示删除该档
+    pub fn set(&mut self, price: P, quantity: Option<Q>) {
+        match (self.search(&price), quantity) {
+            (Ok(idx), Some(q)) => self.levels[idx].1 = q,
+            (Ok(idx), None) => {
+                self.levels.remove(idx);
+            }
+            (Err(idx), Some(q)) => self.levels.insert(idx, (price, q)),
+            (Err(_), None) => return,
+        }
+        self.invalidate();
+    }
+
+    /// 插入或更新某个价格的数量
+    pub fn upsert(&mut self, price: P, quantity: Q) {
+        self.set(price, Some(quantity));
+    }
+
+    /// 删除某个价格
+    pub fn remove(&mut self, price: P) {
+        self.set(price, None);
+    }
+
+    /// 只保留最优的 `n` 档
+    pub fn truncate(&mut self, n: usize) {
+        if self.levels.len() > n {
+            self.levels.truncate(n);
+            self.invalidate();
+        }
+    }
+
+    pub fn clear(&mut self) {
+        self.levels.clear();
+        self.invalidate();
+    }
+
+    pub fn side(&self) -> BookSide {
+        self.side
+    }
+
+    /// 最优档位，O(1)
+    #[inline]
+    pub fn best(&self) -> Option<(P, Q)> {
+        self.levels.first().copied()
+    }
+
+    #[inline]
+    pub fn best_price(&self) -> Option<P> {
+        self.levels.first().map(|(p, _)| *p)
+    }
+
+    pub fn get(&self, price: &P) -> Option<Q> {
+        self.search(price).ok().map(|idx| self.levels[idx].1)
+    }
+
+    pub fn len(&self) -> usize {
+        self.levels.len()
+    }
+
+    pub fn is_empty(&self) -> bool {
+        self.levels.is_empty()
+    }
+
+    /// 按最优优先顺序的全部档位
+    pub fn as_slice(&self) -> &[(P, Q)] {
+        &self.levels
+    }
+
+    /// 最优的前 `n` 档（零拷贝）
+    pub fn top(&self, n: usize) -> &[(P, Q)] {
+        &self.levels[..n.min(self.levels.len())]
+    }
+
+    /// 按最优优先顺序迭代
+    pub fn iter(&self) -> std::slice::Iter<'_, (P, Q)> {
+        self.levels.iter()
+    }
+
+    /// 前 `n` 档数量之和
+    pub fn quantity_sum(&self, n: usize) -> Q
+    where
+        Q: Sum<Q>,
+    {
+        self.top(n).iter().map(|(_, q)| *q).sum()
+    }
+
+    /// 兼容 ta 库的 BTreeMap 视图（按需构建并缓存）
+    pub fn as_btree_map(&self) -> &BTreeMap<P, Q> {
+        self.btm.get_or_init(|| self.levels.iter().copied().collect())
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_bid_side_keeps_descending_order() {
+        let mut bids = DepthLevels::from_levels(BookSide::Bid, vec![(100u64, 1u64), (102, 2), (101, 3)]);
+        assert_eq!(bids.best(), Some((102, 2)));
+        assert_eq!(bids.as_slice(), &[(102, 2), (101, 3), (100, 1)]);
+
+        bids.upsert(103, 5);
+        bids.upsert(101, 7);
+        bids.remove(102);
+        assert_eq!(bids.as_slice(), &[(103, 5), (101, 7), (100, 1)]);
+        assert_eq!(bids.quantity_sum(2), 12);
+    }
+
+    #[test]
+    fn test_ask_side_keeps_ascending_order() {
+        let mut asks = DepthLevels::from_levels(BookSide::Ask, vec![(101u64, 1u64), (100, 2), (101, 4)]);
+        // 重复价格以最后一次为准
+        assert_eq!(asks.as_slice(), &[(100, 2), (101, 4)]);
+
+        asks.upsert(99, 1);
+        assert_eq!(asks.best(), Some((99, 1)));
+        asks.truncate(2);
+        assert_eq!(asks.len(), 2);
+        assert_eq!(asks.get(&101), None);
+    }
+
+    #[test]
+    fn test_btree_view_is_invalidated_on_update() {
+        let mut asks = DepthLevels::from_levels(BookSide::Ask, vec![(100u64, 1u64)]);
+        assert_eq!(asks.as_btree_map().len(), 1);
+        asks.upsert(101, 2);
+        assert_eq!(asks.as_btree_map().len(), 2);
+        assert_eq!(asks.as_btree_map().get(&101), Some(&2));
+    }
+
+    #[test]
+    fn test_top_and_sum_follow_updates() {
+        let mut asks = DepthLevels::from_levels(BookSide::Ask, vec![(100u64, 1u64)]);
+        assert_eq!(asks.top(5), &[(100, 1)]);
+        asks.upsert(101, 2);
+        asks.upsert(99, 4);
+        assert_eq!(asks.top(2), &[(99, 4), (100, 1)]);
+        assert_eq!(asks.quantity_sum(5), 7);
+        asks.remove(99);
+        assert_eq!(asks.quantity_sum(1), 1);
+    }
+}
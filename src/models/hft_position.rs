@@ -1,19 +1,36 @@
-use std::sync::atomic::{AtomicU64, AtomicI64, Ordering};
+use std::ops::Deref;
+#[cfg(loom)]
+use loom::sync::atomic::{fence, AtomicBool, AtomicI64, AtomicU64, Ordering};
+#[cfg(not(loom))]
+use std::sync::atomic::{fence, AtomicBool, AtomicI64, AtomicU64, Ordering};
 use std::sync::Arc;
 use std::time::{SystemTime, UNIX_EPOCH};
 use dashmap::DashMap;
 
 use crate::common::enums::{Exchange, PositionSide, StrategyName};
-use crate::models::TradingSymbol;
+use crate::models::SymbolId;
 
-/// 无锁仓位数据（使用原子类型）
+/// 仓位各字段的整数值（数量/价格/盈亏均为 实际值 * 1e8）
+#[derive(Debug, Clone, Copy, Default, PartialEq, Eq)]
+struct RawPosition {
+    quantity: i64, // 空头为负
+    entry_price: u64,
+    realized_pnl: i64,
+    last_updated_ts_ms: u64,
+}
+
+/// 无锁仓位数据（seqlock）
 /// 
 /// 设计原则：
-/// - 所有字段都是原子类型，支持无锁并发读写
-/// - 使用 CAS 操作保证原子性
-/// - 版本号用于乐观锁检测
+/// - `version` 是 seqlock 序号：偶数表示数据稳定，奇数表示有写者正在更新
+/// - 写者把序号从偶数 CAS 成奇数后独占写入，数量、开仓均价、盈亏在同一个临界区内更新，写完序号 +1 回到偶数
+/// - 读者不加锁：读序号、读字段、再读序号，两次相同且为偶数才接受，否则循环重读（不递归）
+/// - 单个字段仍然是原子类型，单字段读取不需要走 seqlock
 #[derive(Debug)]
 pub struct LockFreePosition {
+    // seqlock 序号（每次更新 +2）
+    version: AtomicU64,
+
     // 仓位数量（使用 i64 存储，实际值 = quantity / 1e8，支持 8 位小数精度）
     quantity: AtomicI64,
     
@@ -25,20 +42,26 @@ pub struct LockFreePosition {
     
     // 最后更新时间戳（毫秒）
     last_updated_ts_ms: AtomicU64,
-    
-    // 版本号（用于乐观锁）
-    version: AtomicU64,
+}
+
+/// seqlock 等待时让出 CPU；loom 模型下需要显式 yield 才能调度到写者
+#[inline]
+fn spin_wait() {
+    #[cfg(loom)]
+    loom::thread::yield_now();
+    #[cfg(not(loom))]
+    std::hint::spin_loop();
 }
 
 impl LockFreePosition {
     /// 创建新的无锁仓位
     pub fn new() -> Self {
         Self {
+            version: AtomicU64::new(0),
             quantity: AtomicI64::new(0),
             entry_price: AtomicU64::new(0),
             realized_pnl: AtomicI64::new(0),
             last_updated_ts_ms: AtomicU64::new(0),
-            version: AtomicU64::new(0),
         }
     }
     
@@ -62,59 +85,89 @@ impl LockFreePosition {
         self.last_updated_ts_ms.load(Ordering::Acquire)
     }
     
-    /// 原子读取版本号
+    /// 原子读取版本号（seqlock 序号）
     pub fn get_version(&self) -> u64 {
         self.version.load(Ordering::Acquire)
     }
     
-    /// 原子快照（一次性读取所有字段，保证一致性）
+    /// 一致性快照：所有字段来自同一次更新之后的状态
     pub fn snapshot(&self) -> PositionSnapshot {
-        // 使用 Acquire 顺序保证读取顺序
-        let version = self.version.load(Ordering::Acquire);
-        let quantity = self.quantity.load(Ordering::Acquire);
-        let entry_price = self.entry_price.load(Ordering::Acquire);
-        let realized_pnl = self.realized_pnl.load(Ordering::Acquire);
-        let last_updated = self.last_updated_ts_ms.load(Ordering::Acquire);
-        
-        // 验证版本号一致性（简单的一致性检查）
-        let version_after = self.version.load(Ordering::Acquire);
-        if version != version_after {
-            // 如果版本号变化，说明在读取过程中有更新，重新读取
-            return self.snapshot();
-        }
-        
+        let (raw, version) = self.read_raw();
         PositionSnapshot {
-            quantity: quantity as f64 / 1e8,
-            entry_price: entry_price as f64 / 1e8,
-            realized_pnl: realized_pnl as f64 / 1e8,
-            last_updated_ts_ms: last_updated,
+            quantity: raw.quantity as f64 / 1e8,
+            entry_price: raw.entry_price as f64 / 1e8,
+            realized_pnl: raw.realized_pnl as f64 / 1e8,
+            last_updated_ts_ms: raw.last_updated_ts_ms,
             version,
         }
     }
-    
-    /// CAS 更新仓位数量
-    fn cas_quantity(&self, expected: i64, new: i64) -> bool {
-        self.quantity.compare_exchange(expected, new, Ordering::AcqRel, Ordering::Acquire).is_ok()
-    }
-    
-    /// CAS 更新开仓价格
-    fn cas_entry_price(&self, expected: u64, new: u64) -> bool {
-        self.entry_price.compare_exchange(expected, new, Ordering::AcqRel, Ordering::Acquire).is_ok()
+
+    /// seqlock 读：字段用 Relaxed 读取，Acquire 栅栏保证字段读取发生在第二次读序号之前
+    fn read_raw(&self) -> (RawPosition, u64) {
+        loop {
+            let before = self.version.load(Ordering::Acquire);
+            if before & 1 == 1 {
+                spin_wait();
+                continue;
+            }
+            let raw = RawPosition {
+                quantity: self.quantity.load(Ordering::Relaxed),
+                entry_price: self.entry_price.load(Ordering::Relaxed),
+                realized_pnl: self.realized_pnl.load(Ordering::Relaxed),
+                last_updated_ts_ms: self.last_updated_ts_ms.load(Ordering::Relaxed),
+            };
+            fence(Ordering::Acquire);
+            if self.version.load(Ordering::Relaxed) == before {
+                return (raw, before);
+            }
+            spin_wait();
+        }
     }
-    
-    /// 原子增加已实现盈亏
-    fn add_realized_pnl(&self, delta: i64) {
-        self.realized_pnl.fetch_add(delta, Ordering::AcqRel);
+
+    /// seqlock 写：独占当前仓位后在副本上修改，再一次性写回所有字段
+    ///
+    /// 多个写者通过序号的偶数 -> 奇数 CAS 互斥，`update` 内不能再次更新同一个仓位。
+    fn update<R>(&self, apply: impl FnOnce(&mut RawPosition) -> R) -> R {
+        let mut current = self.version.load(Ordering::Relaxed);
+        loop {
+            if current & 1 == 1 {
+                spin_wait();
+                current = self.version.load(Ordering::Relaxed);
+                continue;
+            }
+            match self.version.compare_exchange_weak(current, current + 1, Ordering::Acquire, Ordering::Relaxed) {
+                Ok(_) => break,
+                Err(actual) => current = actual,
+            }
+        }
+        // 奇数序号对读者可见之后才能写字段
+        fence(Ordering::Release);
+
+        let mut raw = RawPosition {
+            quantity: self.quantity.load(Ordering::Relaxed),
+            entry_price: self.entry_price.load(Ordering::Relaxed),
+            realized_pnl: self.realized_pnl.load(Ordering::Relaxed),
+            last_updated_ts_ms: self.last_updated_ts_ms.load(Ordering::Relaxed),
+        };
+        let result = apply(&mut raw);
+        self.quantity.store(raw.quantity, Ordering::Relaxed);
+        self.entry_price.store(raw.entry_price, Ordering::Relaxed);
+        self.realized_pnl.store(raw.realized_pnl, Ordering::Relaxed);
+        self.last_updated_ts_ms.store(raw.last_updated_ts_ms, Ordering::Relaxed);
+
+        self.version.store(current + 2, Ordering::Release);
+        result
     }
-    
-    /// 原子更新最后更新时间
-    fn update_timestamp(&self, ts_ms: u64) {
-        self.last_updated_ts_ms.store(ts_ms, Ordering::Release);
+
+    /// 清空仓位（版本号继续递增，不回退）
+    fn reset(&self) {
+        self.update(|raw| *raw = RawPosition::default());
     }
-    
-    /// 原子递增版本号
-    fn increment_version(&self) {
-        self.version.fetch_add(1, Ordering::AcqRel);
+}
+
+impl Default for LockFreePosition {
+    fn default() -> Self {
+        Self::new()
     }
 }
 
@@ -129,10 +182,10 @@ pub struct PositionSnapshot {
 }
 
 /// 仓位键值（用于 SkipMap）
-#[derive(Debug, Clone, PartialEq, Eq, Hash)]
+#[derive(Debug, Clone, Copy, PartialEq, Eq, Hash)]
 pub struct HftPositionKey {
     pub exchange: Exchange,
-    pub symbol: TradingSymbol,
+    pub symbol: SymbolId,
     pub strategy: StrategyName,
     pub side: PositionSide,
 }
@@ -140,29 +193,76 @@ pub struct HftPositionKey {
 impl HftPositionKey {
     pub fn new(
         exchange: Exchange,
-        symbol: TradingSymbol,
+        symbol: impl Into<SymbolId>,
         strategy: StrategyName,
         side: PositionSide,
     ) -> Self {
         Self {
             exchange,
-            symbol,
+            symbol: symbol.into(),
             strategy,
             side,
         }
     }
 }
 
+/// 稠密仓位表默认预留的交易对数量（`SymbolId` 小于该值的交易对走数组）
+pub const DEFAULT_DENSE_SYMBOLS: usize = 64;
+
+const EXCHANGE_SLOTS: usize = 4; // Binance / Mexc / Okex / Aster
+const STRATEGY_SLOTS: usize = 4; // StrategyName 的判别值 0..=3
+const SIDE_SLOTS: usize = 2; // Long / Short，NoPosition 走冷路径
+
+/// 稠密仓位表的槽位，按缓存行对齐，相邻仓位的更新不会互相伪共享
+#[repr(align(64))]
+#[derive(Debug)]
+struct PositionSlot {
+    position: LockFreePosition,
+    // 槽位是否有仓位（对应 DashMap 中是否存在该键）
+    live: AtomicBool,
+}
+
+impl PositionSlot {
+    fn new() -> Self {
+        Self {
+            position: LockFreePosition::new(),
+            live: AtomicBool::new(false),
+        }
+    }
+}
+
+/// 仓位引用：稠密表中的仓位直接借用，冷路径的仓位持有 Arc
+pub enum PositionRef<'a> {
+    Dense(&'a LockFreePosition),
+    Cold(Arc<LockFreePosition>),
+}
+
+impl Deref for PositionRef<'_> {
+    type Target = LockFreePosition;
+
+    fn deref(&self) -> &LockFreePosition {
+        match self {
+            PositionRef::Dense(pos) => pos,
+            PositionRef::Cold(pos) => pos,
+        }
+    }
+}
+
 /// 无锁高频交易仓位管理器
 /// 
 /// 设计特点：
-/// - 使用 DashMap 作为高性能并发键值存储（读操作无锁）
+/// - 预分配稠密仓位表，按 (exchange, symbol_id, strategy, side) 计算下标，热路径读取是一次数组访问，
+///   不做哈希、不拿分片锁、不增减引用计数
+/// - `SymbolId` 超出预留范围或 NoPosition 方向的键退回 DashMap（冷路径）
 /// - 所有仓位操作都是原子化的
-/// - 支持 CAS 操作，避免锁竞争
+/// - 单个仓位的多字段更新由 seqlock 保证原子可见，读者不阻塞写者
 /// - 适合高频交易场景（微秒级延迟）
 pub struct HftPositionManager {
-    // 高性能并发键值存储：Key -> Arc<LockFreePosition>
-    // DashMap 的读操作是无锁的，写操作使用细粒度锁
+    // 稠密仓位表，下标见 dense_index
+    dense: Box<[PositionSlot]>,
+    dense_symbols: usize,
+
+    // 冷路径：Key -> Arc<LockFreePosition>
     positions: Arc<DashMap<HftPositionKey, Arc<LockFreePosition>>>,
     
     // 全局版本号（用于检测并发修改）
@@ -170,28 +270,90 @@ pub struct HftPositionManager {
 }
 
 impl HftPositionManager {
-    /// 创建新的无锁仓位管理器
+    /// 创建新的无锁仓位管理器，预留 `DEFAULT_DENSE_SYMBOLS` 个交易对
     pub fn new() -> Self {
+        Self::with_symbol_capacity(DEFAULT_DENSE_SYMBOLS)
+    }
+
+    /// 创建仓位管理器，稠密表覆盖 `SymbolId` 小于 `dense_symbols` 的交易对
+    pub fn with_symbol_capacity(dense_symbols: usize) -> Self {
+        let slots = EXCHANGE_SLOTS * dense_symbols * STRATEGY_SLOTS * SIDE_SLOTS;
         Self {
+            dense: (0..slots).map(|_| PositionSlot::new()).collect(),
+            dense_symbols,
             positions: Arc::new(DashMap::new()),
             global_version: Arc::new(AtomicU64::new(0)),
         }
     }
+
+    /// 稠密表下标，不在稠密表覆盖范围内时返回 None
+    #[inline]
+    fn dense_index(&self, key: &HftPositionKey) -> Option<usize> {
+        let side = match key.side {
+            PositionSide::Long => 0,
+            PositionSide::Short => 1,
+            PositionSide::NoPosition => return None,
+        };
+        let symbol = key.symbol.index();
+        if symbol >= self.dense_symbols {
+            return None;
+        }
+        let exchange = match key.exchange {
+            Exchange::Binance => 0,
+            Exchange::Mexc => 1,
+            Exchange::Okex => 2,
+            Exchange::Aster => 3,
+        };
+        let strategy = key.strategy as usize;
+        Some(((exchange * self.dense_symbols + symbol) * STRATEGY_SLOTS + strategy) * SIDE_SLOTS + side)
+    }
+
+    #[inline]
+    fn dense_slot(&self, key: &HftPositionKey) -> Option<&PositionSlot> {
+        self.dense_index(key).map(|index| &self.dense[index])
+    }
     
-    /// 获取或创建仓位（读操作无锁，写操作使用细粒度锁）
+    /// 获取或创建仓位（稠密表直接标记为存在，冷路径使用 DashMap 的细粒度锁）
     pub fn get_or_create_position(
         &self,
         key: HftPositionKey,
-    ) -> Arc<LockFreePosition> {
-        // DashMap 的 get_or_insert 使用细粒度锁，但读操作是无锁的
-        self.positions.entry(key).or_insert_with(|| {
-            Arc::new(LockFreePosition::new())
-        }).value().clone()
+    ) -> PositionRef<'_> {
+        if let Some(slot) = self.dense_slot(&key) {
+            slot.live.store(true, Ordering::Release);
+            return PositionRef::Dense(&slot.position);
+        }
+        PositionRef::Cold(
+            self.positions
+                .entry(key)
+                .or_insert_with(|| Arc::new(LockFreePosition::new()))
+                .value()
+                .clone(),
+        )
     }
     
     /// 获取仓位（只读，无锁）
-    pub fn get_position(&self, key: &HftPositionKey) -> Option<Arc<LockFreePosition>> {
-        self.positions.get(key).map(|entry| entry.value().clone())
+    pub fn get_position(&self, key: &HftPositionKey) -> Option<PositionRef<'_>> {
+        if let Some(slot) = self.dense_slot(key) {
+            return slot
+                .live
+                .load(Ordering::Acquire)
+                .then_some(PositionRef::Dense(&slot.position));
+        }
+        self.positions.get(key).map(|entry| PositionRef::Cold(entry.value().clone()))
+    }
+
+    /// 移除仓位：稠密表清空槽位，冷路径从 DashMap 删除
+    fn remove_position(&self, key: &HftPositionKey) {
+        match self.dense_slot(key) {
+            Some(slot) => {
+                if slot.live.swap(false, Ordering::AcqRel) {
+                    slot.position.reset();
+                }
+            }
+            None => {
+                self.positions.remove(key);
+            }
+        }
     }
     
     /// 检查是否有仓位（无锁）
@@ -212,7 +374,7 @@ impl HftPositionManager {
         }
     }
     
-    /// 开仓/加仓（无锁 CAS 操作）
+    /// 开仓/加仓（seqlock 单次写入）
     /// 
     /// # Returns
     /// * `Ok(())` - 成功
@@ -227,67 +389,34 @@ impl HftPositionManager {
             return Err("数量必须大于0".to_string());
         }
         
-        let pos = self.get_or_create_position(key.clone());
+        let pos = self.get_or_create_position(key);
         let now = current_timestamp_ms();
         
         // 将 f64 转换为整数存储（8位小数精度）
         let qty_int = (quantity * 1e8) as i64;
         let price_int = (price * 1e8) as u64;
         
-        // CAS 循环：原子更新仓位
-        loop {
-            let snapshot = pos.snapshot();
-            let current_qty_int = (snapshot.quantity * 1e8) as i64;
-            let current_price_int = (snapshot.entry_price * 1e8) as u64;
-            
-            if current_qty_int == 0 {
+        // 数量、开仓均价、时间戳在同一个 seqlock 写临界区内更新，读者不会看到新数量配旧价格
+        pos.update(|raw| {
+            if raw.quantity == 0 {
                 // 开仓：直接设置
-                let new_qty_int = if key.side == PositionSide::Long {
-                    qty_int
-                } else {
-                    -qty_int
-                };
-                
-                // CAS 更新数量
-                if pos.cas_quantity(0, new_qty_int) {
-                    // 更新价格
-                    pos.cas_entry_price(0, price_int);
-                    pos.update_timestamp(now);
-                    pos.increment_version();
-                    self.global_version.fetch_add(1, Ordering::AcqRel);
-                    return Ok(());
-                }
-                // CAS 失败，重试
-                continue;
+                raw.quantity = if key.side == PositionSide::Long { qty_int } else { -qty_int };
+                raw.entry_price = price_int;
             } else {
-                // 加仓：计算加权平均价格
-                let current_qty = snapshot.quantity.abs();
-                let total_cost = snapshot.entry_price * current_qty + price * quantity;
-                let new_qty = current_qty + quantity;
-                let new_price = total_cost / new_qty;
-                
-                let new_qty_int = if snapshot.quantity > 0.0 {
-                    (new_qty * 1e8) as i64
-                } else {
-                    -((new_qty * 1e8) as i64)
-                };
-                let new_price_int = (new_price * 1e8) as u64;
-                
-                // CAS 更新（需要同时更新数量和价格）
-                if pos.cas_quantity(current_qty_int, new_qty_int) {
-                    pos.cas_entry_price(current_price_int, new_price_int);
-                    pos.update_timestamp(now);
-                    pos.increment_version();
-                    self.global_version.fetch_add(1, Ordering::AcqRel);
-                    return Ok(());
-                }
-                // CAS 失败，重试
-                continue;
+                // 加仓：整数计算加权平均价格
+                let current_qty = raw.quantity.abs();
+                let new_qty = current_qty + qty_int;
+                let total_cost = raw.entry_price as u128 * current_qty as u128 + price_int as u128 * qty_int as u128;
+                raw.entry_price = (total_cost / new_qty as u128) as u64;
+                raw.quantity = if raw.quantity > 0 { new_qty } else { -new_qty };
             }
-        }
+            raw.last_updated_ts_ms = now;
+        });
+        self.global_version.fetch_add(1, Ordering::AcqRel);
+        Ok(())
     }
     
-    /// 平仓/减仓（无锁 CAS 操作）
+    /// 平仓/减仓（seqlock 单次写入）
     /// 
     /// # Returns
     /// * `Ok(f64)` - 成功，返回已平仓数量
@@ -308,53 +437,38 @@ impl HftPositionManager {
         };
         
         let now = current_timestamp_ms();
+        let close_int = (quantity * 1e8) as i64;
         
-        // CAS 循环：原子更新仓位
-        loop {
-            let snapshot = pos.snapshot();
-            let current_qty = snapshot.quantity;
-            
-            if current_qty.abs() < 1e-12 {
+        let (closed, fully_closed) = pos.update(|raw| {
+            if raw.quantity == 0 {
                 return Err("仓位为空".to_string());
             }
             
             // 计算可平仓数量
-            let qty_to_close = quantity.min(current_qty.abs());
-            let remaining_qty = current_qty.abs() - qty_to_close;
+            let current_qty = raw.quantity.abs();
+            let to_close = close_int.min(current_qty);
+            let remaining = current_qty - to_close;
             
             // 计算盈亏
+            let entry_price = raw.entry_price as f64 / 1e8;
             let pnl_per_unit = match key.side {
-                PositionSide::Long => price - snapshot.entry_price,
-                PositionSide::Short => snapshot.entry_price - price,
+                PositionSide::Long => price - entry_price,
+                PositionSide::Short => entry_price - price,
                 PositionSide::NoPosition => 0.0,
             };
-            let pnl_delta = (pnl_per_unit * qty_to_close * 1e8) as i64;
-            
-            // 更新数量
-            let current_qty_int = (current_qty * 1e8) as i64;
-            let new_qty_int = if current_qty > 0.0 {
-                (remaining_qty * 1e8) as i64
-            } else {
-                -((remaining_qty * 1e8) as i64)
-            };
-            
-            // CAS 更新
-            if pos.cas_quantity(current_qty_int, new_qty_int) {
-                // 更新盈亏
-                pos.add_realized_pnl(pnl_delta);
-                pos.update_timestamp(now);
-                pos.increment_version();
-                self.global_version.fetch_add(1, Ordering::AcqRel);
-                
-                // 如果仓位归零，可以选择移除（可选）
-                if remaining_qty < 1e-12 {
-                    self.positions.remove(key);
-                }
-                
-                return Ok(qty_to_close);
-            }
-            // CAS 失败，重试
+            raw.realized_pnl += (pnl_per_unit * to_close as f64) as i64;
+            raw.quantity = if raw.quantity > 0 { remaining } else { -remaining };
+            raw.last_updated_ts_ms = now;
+            Ok((to_close as f64 / 1e8, remaining == 0))
+        })?;
+        self.global_version.fetch_add(1, Ordering::AcqRel);
+        
+        // 仓位归零后移除
+        if fully_closed {
+            self.remove_position(key);
         }
+        
+        Ok(closed)
     }
     
     /// 获取仓位快照（无锁）
@@ -372,9 +486,92 @@ impl HftPositionManager {
     
     /// 清除仓位（无锁）
     pub fn clear_position(&self, key: &HftPositionKey) {
-        self.positions.remove(key);
+        self.remove_position(key);
+        self.global_version.fetch_add(1, Ordering::AcqRel);
+    }
+
+    /// 按成交更新仓位：开仓/加仓成交调用 `open_position`，减仓成交调用 `close_position`
+    ///
+    /// # Returns
+    /// * `Ok(f64)` - 实际计入仓位的数量
+    pub fn apply_fill(&self, fill: &FillEvent) -> Result<f64, String> {
+        if fill.reduce_only {
+            self.close_position(&fill.key, fill.quantity, fill.price)
+        } else {
+            self.open_position(fill.key, fill.quantity, fill.price)?;
+            Ok(fill.quantity)
+        }
+    }
+
+    /// 同一 (exchange, symbol, strategy) 下多空两个方向的持仓数量之和
+    pub fn strategy_quantity(&self, exchange: Exchange, symbol: SymbolId, strategy: StrategyName) -> f64 {
+        [PositionSide::Long, PositionSide::Short]
+            .into_iter()
+            .map(|side| self.get_closable_quantity(&HftPositionKey::new(exchange, symbol, strategy, side)))
+            .sum()
+    }
+
+    /// 清除同一 (exchange, symbol, strategy) 下多空两个方向的仓位
+    pub fn clear_strategy_positions(&self, exchange: Exchange, symbol: SymbolId, strategy: StrategyName) {
+        for side in [PositionSide::Long, PositionSide::Short] {
+            self.remove_position(&HftPositionKey::new(exchange, symbol, strategy, side));
+        }
         self.global_version.fetch_add(1, Ordering::AcqRel);
     }
+
+    /// 创建只读句柄（仓位管理器需要放在 Arc 中共享）
+    pub fn reader(self: &Arc<Self>) -> PositionReader {
+        PositionReader {
+            positions: Arc::clone(self),
+        }
+    }
+}
+
+/// 成交事件：仓位只由交易所的成交回报驱动更新，下单前不做乐观写入
+#[derive(Debug, Clone, Copy, PartialEq)]
+pub struct FillEvent {
+    /// 仓位键，`side` 是被开仓或被平仓的仓位方向
+    pub key: HftPositionKey,
+    pub quantity: f64,
+    pub price: f64,
+    /// 减仓成交（平仓），否则为开仓/加仓
+    pub reduce_only: bool,
+}
+
+/// 只读仓位句柄
+///
+/// 策略和信号过滤只需要查询仓位，持有该句柄即可在任意线程并发读取，
+/// 仓位的写入只发生在成交回报的处理路径上。
+#[derive(Clone)]
+pub struct PositionReader {
+    positions: Arc<HftPositionManager>,
+}
+
+impl PositionReader {
+    /// 获取仓位快照（无锁）
+    pub fn get_position_snapshot(&self, key: &HftPositionKey) -> Option<PositionSnapshot> {
+        self.positions.get_position_snapshot(key)
+    }
+
+    /// 检查是否有仓位（无锁）
+    pub fn has_position(&self, key: &HftPositionKey) -> bool {
+        self.positions.has_position(key)
+    }
+
+    /// 获取可平仓数量（无锁）
+    pub fn get_closable_quantity(&self, key: &HftPositionKey) -> f64 {
+        self.positions.get_closable_quantity(key)
+    }
+
+    /// 同一 (exchange, symbol, strategy) 下多空两个方向的持仓数量之和
+    pub fn strategy_quantity(&self, exchange: Exchange, symbol: SymbolId, strategy: StrategyName) -> f64 {
+        self.positions.strategy_quantity(exchange, symbol, strategy)
+    }
+
+    /// 获取全局版本号（用于检测并发修改）
+    pub fn get_global_version(&self) -> u64 {
+        self.positions.get_global_version()
+    }
 }
 
 impl Default for HftPositionManager {
@@ -394,6 +591,7 @@ fn current_timestamp_ms() -> u64 {
 #[cfg(test)]
 mod tests {
     use super::*;
+    use crate::models::TradingSymbol;
     
     #[test]
     fn test_lock_free_position() {
@@ -434,5 +632,181 @@ mod tests {
         assert_eq!(snapshot.quantity, 0.5);
         assert!(snapshot.realized_pnl > 0.0); // 应该有盈利
     }
+
+    #[test]
+    fn test_dense_and_cold_positions() {
+        assert_eq!(std::mem::align_of::<PositionSlot>(), 64);
+
+        let manager = HftPositionManager::with_symbol_capacity(1);
+        let dense = HftPositionKey::new(Exchange::Aster, TradingSymbol::BTCUSDT, StrategyName::TURTLE, PositionSide::Short);
+        let cold = HftPositionKey::new(Exchange::Aster, TradingSymbol::ETHUSDT, StrategyName::TURTLE, PositionSide::Short);
+        assert!(manager.dense_index(&dense).is_some());
+        assert!(manager.dense_index(&cold).is_none());
+
+        for key in [dense, cold] {
+            assert!(manager.get_position(&key).is_none());
+            manager.open_position(key, 2.0, 100.0).unwrap();
+            assert_eq!(manager.get_closable_quantity(&key), 2.0);
+            assert!(matches!(
+                (manager.get_position(&key).unwrap(), key == dense),
+                (PositionRef::Dense(_), true) | (PositionRef::Cold(_), false)
+            ));
+
+            // 全部平仓后仓位被移除，重新开仓从零开始
+            assert_eq!(manager.close_position(&key, 5.0, 90.0), Ok(2.0));
+            assert!(manager.get_position(&key).is_none());
+            manager.open_position(key, 1.0, 80.0).unwrap();
+            let snapshot = manager.get_position_snapshot(&key).unwrap();
+            assert_eq!(snapshot.quantity, -1.0);
+            assert_eq!(snapshot.entry_price, 80.0);
+            assert_eq!(snapshot.realized_pnl, 0.0);
+        }
+
+        // 不同的稠密键互不影响
+        let other = HftPositionKey::new(Exchange::Aster, TradingSymbol::BTCUSDT, StrategyName::TURTLE, PositionSide::Long);
+        assert!(!manager.has_position(&other));
+    }
+
+    #[test]
+    fn test_weighted_entry_price() {
+        let manager = HftPositionManager::new();
+        let key = HftPositionKey::new(Exchange::Binance, TradingSymbol::ETHUSDT, StrategyName::MACD, PositionSide::Short);
+        manager.open_position(key, 1.0, 3000.0).unwrap();
+        manager.open_position(key, 3.0, 3100.0).unwrap();
+
+        let snapshot = manager.get_position_snapshot(&key).unwrap();
+        assert_eq!(snapshot.quantity, -4.0);
+        assert_eq!(snapshot.entry_price, 3075.0);
+        // 每次更新序号 +2，快照序号一定是偶数
+        assert_eq!(snapshot.version, 4);
+
+        assert_eq!(manager.close_position(&key, 1.0, 3000.0), Ok(1.0));
+        let snapshot = manager.get_position_snapshot(&key).unwrap();
+        assert_eq!(snapshot.quantity, -3.0);
+        assert_eq!(snapshot.realized_pnl, 75.0);
+    }
+
+    #[test]
+    fn test_fill_driven_updates() {
+        let manager = Arc::new(HftPositionManager::new());
+        let reader = manager.reader();
+        let key = HftPositionKey::new(Exchange::Binance, TradingSymbol::BNBUSDT, StrategyName::HBFC, PositionSide::Long);
+        let symbol = TradingSymbol::BNBUSDT.id();
+
+        let open = FillEvent { key, quantity: 2.0, price: 600.0, reduce_only: false };
+        assert_eq!(manager.apply_fill(&open), Ok(2.0));
+        assert_eq!(reader.strategy_quantity(Exchange::Binance, symbol, StrategyName::HBFC), 2.0);
+        assert_eq!(reader.strategy_quantity(Exchange::Binance, symbol, StrategyName::MACD), 0.0);
+
+        let close = FillEvent { key, quantity: 3.0, price: 610.0, reduce_only: true };
+        assert_eq!(manager.apply_fill(&close), Ok(2.0));
+        assert!(!reader.has_position(&key));
+        assert!(manager.apply_fill(&close).is_err());
+
+        manager.apply_fill(&open).unwrap();
+        manager.clear_strategy_positions(Exchange::Binance, symbol, StrategyName::HBFC);
+        assert_eq!(reader.get_closable_quantity(&key), 0.0);
+    }
+
+    #[test]
+    fn test_snapshot_never_torn() {
+        use std::sync::atomic::AtomicBool;
+
+        // 写者保持 entry_price == quantity * 10，读者在快照中检查该不变式
+        let pos = Arc::new(LockFreePosition::new());
+        let stop = Arc::new(AtomicBool::new(false));
+        let writers: Vec<_> = (0..2)
+            .map(|_| {
+                let pos = pos.clone();
+                std::thread::spawn(move || {
+                    for _ in 0..20_000 {
+                        pos.update(|raw| {
+                            raw.quantity += 1;
+                            raw.entry_price = raw.quantity as u64 * 10;
+                            raw.realized_pnl = -raw.quantity;
+                        });
+                    }
+                })
+            })
+            .collect();
+        let reader = {
+            let pos = pos.clone();
+            let stop = stop.clone();
+            std::thread::spawn(move || {
+                let mut reads = 0u64;
+                while !stop.load(Ordering::Relaxed) {
+                    let (raw, version) = pos.read_raw();
+                    assert_eq!(version % 2, 0);
+                    assert_eq!(raw.entry_price, raw.quantity as u64 * 10);
+                    assert_eq!(raw.realized_pnl, -raw.quantity);
+                    reads += 1;
+                }
+                reads
+            })
+        };
+        for writer in writers {
+            writer.join().unwrap();
+        }
+        stop.store(true, Ordering::Relaxed);
+        assert!(reader.join().unwrap() > 0);
+
+        // 写者互斥，没有丢失更新
+        let (raw, version) = pos.read_raw();
+        assert_eq!(raw.quantity, 40_000);
+        assert_eq!(version, 80_000);
+    }
 }
 
+
+/// loom 模型检查：`RUSTFLAGS="--cfg loom" cargo test --release loom`
+#[cfg(all(test, loom))]
+mod loom_tests {
+    use super::*;
+    use loom::sync::Arc;
+    use loom::thread;
+
+    #[test]
+    fn loom_reader_never_sees_torn_update() {
+        loom::model(|| {
+            let pos = Arc::new(LockFreePosition::new());
+            let writer = {
+                let pos = pos.clone();
+                thread::spawn(move || {
+                    for _ in 0..2 {
+                        pos.update(|raw| {
+                            raw.quantity += 1;
+                            raw.entry_price = raw.quantity as u64 * 10;
+                        });
+                    }
+                })
+            };
+
+            let (raw, version) = pos.read_raw();
+            assert_eq!(version % 2, 0);
+            assert_eq!(raw.entry_price, raw.quantity as u64 * 10);
+            assert_eq!(raw.quantity as u64, version / 2);
+
+            writer.join().unwrap();
+        });
+    }
+
+    #[test]
+    fn loom_writers_are_serialized() {
+        loom::model(|| {
+            let pos = Arc::new(LockFreePosition::new());
+            let handles: Vec<_> = (0..2)
+                .map(|_| {
+                    let pos = pos.clone();
+                    thread::spawn(move || pos.update(|raw| raw.quantity += 1))
+                })
+                .collect();
+            for handle in handles {
+                handle.join().unwrap();
+            }
+
+            let (raw, version) = pos.read_raw();
+            assert_eq!(raw.quantity, 2);
+            assert_eq!(version, 4);
+        });
+    }
+}
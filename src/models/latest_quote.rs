@@ -0,0 +1,304 @@
+use std::hint;
+use std::sync::Arc;
+use std::sync::atomic::{AtomicU64, Ordering, fence};
+
+use dashmap::DashMap;
+use tokio::sync::Notify;
+
+use crate::common::enums::Exchange;
+use crate::dto::aster::websocket::AsterBookTickerData;
+use crate::dto::binance::websocket::{BinancePartialDepth, BookTickerData};
+use crate::models::TradingSymbol;
+
+/// 最优买卖价快照
+#[derive(Debug, Clone, Copy, PartialEq, Default)]
+pub struct TopOfBook {
+    pub bid_price: f64,
+    pub bid_qty: f64,
+    pub ask_price: f64,
+    pub ask_qty: f64,
+    pub update_id: u64,
+    /// 交易所事件时间（毫秒），没有时为 0
+    pub event_time: i64,
+}
+
+impl TopOfBook {
+    pub fn from_binance_book_ticker(data: &BookTickerData) -> Self {
+        Self {
+            bid_price: data.best_bid_price,
+            bid_qty: data.best_bid_qty,
+            ask_price: data.best_ask_price,
+            ask_qty: data.best_ask_qty,
+            update_id: data.order_book_update_id,
+            event_time: data.event_time.unwrap_or(0),
+        }
+    }
+
+    pub fn from_aster_book_ticker(data: &AsterBookTickerData) -> Self {
+        Self {
+            bid_price: data.best_bid_price,
+            bid_qty: data.best_bid_qty,
+            ask_price: data.best_ask_price,
+            ask_qty: data.best_ask_qty,
+            update_id: data.order_book_update_id,
+            event_time: data.event_time,
+        }
+    }
+
+    /// 取 Partial Depth 的第一档，任一侧为空时返回 None
+    pub fn from_partial_depth(data: &BinancePartialDepth) -> Option<Self> {
+        let [bid_price, bid_qty] = *data.bids.first()?;
+        let [ask_price, ask_qty] = *data.asks.first()?;
+        Some(Self {
+            bid_price,
+            bid_qty,
+            ask_price,
+            ask_qty,
+            update_id: data.last_update_id as u64,
+            event_time: 0,
+        })
+    }
+
+    pub fn mid_price(&self) -> f64 {
+        (self.bid_price + self.ask_price) / 2.0
+    }
+}
+
+/// 最新值槽位（seqlock）
+///
+/// 生产者直接覆盖，消费者按需读取最新值和版本号，跳过中间的过期数据。
+/// 序号为奇数表示写入中；所有字段都以原子 u64 存储，读写都不会产生数据竞争。
+/// 多个生产者时写入方先用 CAS 抢占序号，同一时刻只有一个写入者。
+#[derive(Debug, Default)]
+pub struct LatestQuote {
+    seq: AtomicU64,
+    bid_price: AtomicU64,
+    bid_qty: AtomicU64,
+    ask_price: AtomicU64,
+    ask_qty: AtomicU64,
+    update_id: AtomicU64,
+    event_time: AtomicU64,
+    notify: Notify,
+}
+
+impl LatestQuote {
+    pub fn new() -> Self {
+        Self::default()
+    }
+
+    /// 覆盖最新值并唤醒等待中的消费者
+    pub fn store(&self, quote: TopOfBook) {
+        let mut seq = self.seq.load(Ordering::Relaxed);
+        loop {
+            if seq & 1 == 1 {
+                hint::spin_loop();
+                seq = self.seq.load(Ordering::Relaxed);
+                continue;
+            }
+            match self
+                .seq
+                .compare_exchange_weak(seq, seq + 1, Ordering::Acquire, Ordering::Relaxed)
+            {
+                Ok(_) => break,
+                Err(current) => seq = current,
+            }
+        }
+        // 保证读者看到新数据之前一定先看到奇数序号
+        fence(Ordering::Release);
+
+        self.bid_price.store(quote.bid_price.to_bits(), Ordering::Relaxed);
+        self.bid_qty.store(quote.bid_qty.to_bits(), Ordering::Relaxed);
+        self.ask_price.store(quote.ask_price.to_bits(), Ordering::Relaxed);
+        self.ask_qty.store(quote.ask_qty.to_bits(), Ordering::Relaxed);
+        self.update_id.store(quote.update_id, Ordering::Relaxed);
+        self.event_time.store(quote.event_time as u64, Ordering::Relaxed);
+
+        self.seq.store(seq + 2, Ordering::Release);
+        self.notify.notify_waiters();
+    }
+
+    /// 当前版本号，每次写入加 1，从未写入时为 0
+    pub fn version(&self) -> u64 {
+        self.seq.load(Ordering::Acquire) / 2
+    }
+
+    /// 读取最新值和版本号，从未写入时返回 None
+    pub fn load(&self) -> Option<(TopOfBook, u64)> {
+        loop {
+            let before = self.seq.load(Ordering::Acquire);
+            if before & 1 == 1 {
+                hint::spin_loop();
+                continue;
+            }
+            if before == 0 {
+                return None;
+            }
+
+            let quote = TopOfBook {
+                bid_price: f64::from_bits(self.bid_price.load(Ordering::Relaxed)),
+                bid_qty: f64::from_bits(self.bid_qty.load(Ordering::Relaxed)),
+                ask_price: f64::from_bits(self.ask_price.load(Ordering::Relaxed)),
+                ask_qty: f64::from_bits(self.ask_qty.load(Ordering::Relaxed)),
+                update_id: self.update_id.load(Ordering::Relaxed),
+                event_time: self.event_time.load(Ordering::Relaxed) as i64,
+            };
+
+            fence(Ordering::Acquire);
+            if self.seq.load(Ordering::Relaxed) == before {
+                return Some((quote, before / 2));
+            }
+        }
+    }
+
+    /// 版本号比 `last_seen` 新时返回最新值
+    pub fn load_if_newer(&self, last_seen: u64) -> Option<(TopOfBook, u64)> {
+        if self.version() <= last_seen {
+            return None;
+        }
+        self.load()
+    }
+
+    /// 等待版本号超过 `last_seen`，返回最新值和版本号
+    ///
+    /// 等待期间的多次写入只会返回最后一次
+    pub async fn changed(&self, last_seen: u64) -> (TopOfBook, u64) {
+        loop {
+            let notified = self.notify.notified();
+            tokio::pin!(notified);
+            notified.as_mut().enable();
+
+            if let Some(latest) = self.load_if_newer(last_seen) {
+                return latest;
+            }
+            notified.await;
+        }
+    }
+}
+
+/// 行情来源
+#[derive(Debug, Clone, Copy, PartialEq, Eq, Hash)]
+pub enum QuoteSource {
+    BookTicker,
+    PartialDepth,
+}
+
+/// 按 (交易所, 交易对, 来源) 索引的最新值槽位表
+///
+/// 生产者和消费者各自持有槽位的 `Arc`，热路径上不再查表
+#[derive(Debug, Default)]
+pub struct LatestQuoteBook {
+    cells: DashMap<(Exchange, TradingSymbol, QuoteSource), Arc<LatestQuote>>,
+}
+
+impl LatestQuoteBook {
+    pub fn new() -> Self {
+        Self::default()
+    }
+
+    /// 获取槽位，不存在时创建
+    pub fn cell(&self, exchange: Exchange, symbol: TradingSymbol, source: QuoteSource) -> Arc<LatestQuote> {
+        if let Some(cell) = self.cells.get(&(exchange, symbol, source)) {
+            return cell.clone();
+        }
+        self.cells
+            .entry((exchange, symbol, source))
+            .or_insert_with(|| Arc::new(LatestQuote::new()))
+            .clone()
+    }
+
+    pub fn get(&self, exchange: Exchange, symbol: TradingSymbol, source: QuoteSource) -> Option<Arc<LatestQuote>> {
+        self.cells.get(&(exchange, symbol, source)).map(|cell| cell.clone())
+    }
+
+    pub fn store(&self, exchange: Exchange, symbol: TradingSymbol, source: QuoteSource, quote: TopOfBook) {
+        self.cell(exchange, symbol, source).store(quote);
+    }
+
+    pub fn load(&self, exchange: Exchange, symbol: TradingSymbol, source: QuoteSource) -> Option<(TopOfBook, u64)> {
+        self.get(exchange, symbol, source)?.load()
+    }
+
+    pub fn len(&self) -> usize {
+        self.cells.len()
+    }
+
+    pub fn is_empty(&self) -> bool {
+        self.cells.is_empty()
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn quote(bid: f64, update_id: u64) -> TopOfBook {
+        TopOfBook {
+            bid_price: bid,
+            bid_qty: 1.0,
+            ask_price: bid + 0.1,
+            ask_qty: 2.0,
+            update_id,
+            event_time: 1,
+        }
+    }
+
+    #[test]
+    fn test_latest_value_and_version() {
+        let cell = LatestQuote::new();
+        assert!(cell.load().is_none());
+        assert_eq!(cell.version(), 0);
+
+        cell.store(quote(100.0, 1));
+        cell.store(quote(101.0, 2));
+        let (latest, version) = cell.load().unwrap();
+        assert_eq!(latest, quote(101.0, 2));
+        assert_eq!(version, 2);
+
+        // 中间的过期数据被跳过
+        assert!(cell.load_if_newer(2).is_none());
+        assert_eq!(cell.load_if_newer(0).unwrap().1, 2);
+    }
+
+    #[test]
+    fn test_concurrent_reads_are_consistent() {
+        let cell = Arc::new(LatestQuote::new());
+        let writer = {
+            let cell = cell.clone();
+            std::thread::spawn(move || {
+                for i in 1..=20_000u64 {
+                    cell.store(quote(i as f64, i));
+                }
+            })
+        };
+
+        let mut last_version = 0;
+        while last_version < 20_000 {
+            if let Some((q, version)) = cell.load() {
+                // 同一次写入的字段必须一起可见
+                assert_eq!(q.bid_price, q.update_id as f64);
+                assert_eq!(q.update_id, version);
+                assert!(version >= last_version);
+                last_version = version;
+            }
+        }
+        writer.join().unwrap();
+    }
+
+    #[tokio::test]
+    async fn test_changed_wakes_consumer() {
+        let book = Arc::new(LatestQuoteBook::new());
+        let cell = book.cell(Exchange::Binance, TradingSymbol::BTCUSDT, QuoteSource::BookTicker);
+
+        let waiter = {
+            let cell = cell.clone();
+            tokio::spawn(async move { cell.changed(0).await })
+        };
+        tokio::task::yield_now().await;
+
+        book.store(Exchange::Binance, TradingSymbol::BTCUSDT, QuoteSource::BookTicker, quote(50.0, 7));
+        let (latest, version) = waiter.await.unwrap();
+        assert_eq!(latest.update_id, 7);
+        assert_eq!(version, 1);
+        assert_eq!(book.len(), 1);
+    }
+}
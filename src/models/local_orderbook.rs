@@ -0,0 +1,311 @@
+use crate::dto::binance::rest_api::DepthSnapshot;
+use crate::dto::binance::websocket::BinanceDepthUpdate;
+use crate::models::depth_levels::{BookSide, DepthLevels};
+use crate::models::{CommonDepth, Exchange, TradingSymbol};
+use ordered_float::OrderedFloat;
+use std::collections::VecDeque;
+
+type Price = OrderedFloat<f64>;
+type Quantity = f64;
+
+/// 快照到达前最多缓存的增量事件数量
+const DEFAULT_MAX_PENDING: usize = 1000;
+
+/// 增量事件的处理结果
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub enum DepthUpdateResult {
+    /// 快照尚未就绪（事件已缓存），或快照已加载但还没有跨越 lastUpdateId 的事件
+    Buffered,
+    /// 事件早于快照（u < lastUpdateId），已丢弃
+    Stale,
+    /// 事件已应用到本地订单簿
+    Applied,
+    /// updateId 不连续，本地订单簿已重置，需要重新拉取快照
+    Gap { expected: i64, received: i64 },
+}
+
+/// 基于 REST 快照 + depthUpdate 增量维护的本地订单簿
+///
+/// 同步规则（币安期货）：
+/// 1. 快照到达前缓存所有增量事件
+/// 2. 丢弃 u < lastUpdateId 的事件
+/// 3. 第一个应用的事件需满足 U <= lastUpdateId 且 u >= lastUpdateId
+/// 4. 之后每个事件的 pu 必须等于上一个事件的 u，否则重新同步
+#[derive(Debug, Clone)]
+pub struct LocalOrderBook {
+    pub symbol: TradingSymbol,
+    bids: DepthLevels<Price, Quantity>,
+    asks: DepthLevels<Price, Quantity>,
+    last_update_id: i64,
+    timestamp: i64,
+    snapshot_loaded: bool,
+    first_event_applied: bool,
+    pending: VecDeque<BinanceDepthUpdate>,
+    max_pending: usize,
+}
+
+impl LocalOrderBook {
+    pub fn new(symbol: TradingSymbol) -> Self {
+        Self::with_max_pending(symbol, DEFAULT_MAX_PENDING)
+    }
+
+    pub fn with_max_pending(symbol: TradingSymbol, max_pending: usize) -> Self {
+        Self {
+            symbol,
+            bids: DepthLevels::with_capacity(BookSide::Bid, 1024),
+            asks: DepthLevels::with_capacity(BookSide::Ask, 1024),
+            last_update_id: 0,
+            timestamp: 0,
+            snapshot_loaded: false,
+            first_event_applied: false,
+            pending: VecDeque::with_capacity(max_pending.min(DEFAULT_MAX_PENDING)),
+            max_pending,
+        }
+    }
+
+    /// 是否需要（重新）拉取 REST 快照
+    pub fn needs_snapshot(&self) -> bool {
+        !self.snapshot_loaded
+    }
+
+    /// 快照已加载且已与增量流对齐
+    pub fn is_synced(&self) -> bool {
+        self.snapshot_loaded && self.first_event_applied
+    }
+
+    pub fn last_update_id(&self) -> i64 {
+        self.last_update_id
+    }
+
+    pub fn pending_len(&self) -> usize {
+        self.pending.len()
+    }
+
+    /// 加载 REST 快照，并回放快照到达前缓存的增量事件
+    ///
+    /// 回放中出现断档时返回 `Gap`；缓存中有跨越 lastUpdateId 的事件并已应用时返回 `Applied`，
+    /// 否则返回 `Buffered`，订单簿在第一个跨越事件到达前不算同步
+    pub fn apply_snapshot(&mut self, snapshot: DepthSnapshot) -> DepthUpdateResult {
+        self.bids.clear();
+        self.asks.clear();
+        Self::apply_levels(&mut self.bids, &snapshot.bids);
+        Self::apply_levels(&mut self.asks, &snapshot.asks);
+        self.last_update_id = snapshot.last_update_id;
+        self.timestamp = snapshot
+            .transaction_time
+            .or(snapshot.event_time)
+            .unwrap_or(0);
+        self.snapshot_loaded = true;
+        self.first_event_applied = false;
+
+        while let Some(update) = self.pending.pop_front() {
+            if let gap @ DepthUpdateResult::Gap { .. } = self.apply_update(update) {
+                return gap;
+            }
+        }
+        if self.first_event_applied {
+            DepthUpdateResult::Applied
+        } else {
+            DepthUpdateResult::Buffered
+        }
+    }
+
+    /// 处理一条 depthUpdate 事件
+    pub fn push_update(&mut self, update: BinanceDepthUpdate) -> DepthUpdateResult {
+        if !self.snapshot_loaded {
+            if self.pending.len() >= self.max_pending {
+                self.pending.pop_front();
+            }
+            self.pending.push_back(update);
+            return DepthUpdateResult::Buffered;
+        }
+        self.apply_update(update)
+    }
+
+    fn apply_update(&mut self, update: BinanceDepthUpdate) -> DepthUpdateResult {
+        if !self.first_event_applied {
+            if update.final_update_id < self.last_update_id {
+                return DepthUpdateResult::Stale;
+            }
+            if update.first_update_id > self.last_update_id {
+                let expected = self.last_update_id;
+                let received = update.first_update_id;
+                self.reset_with(update);
+                return DepthUpdateResult::Gap { expected, received };
+            }
+        } else {
+            // 期货流带 pu，现货流没有 pu 时退化为 U == 上一个 u + 1
+            let in_sequence = match update.prev_final_update_id {
+                Some(pu) => pu == self.last_update_id,
+                None => update.first_update_id == self.last_update_id + 1,
+            };
+            if !in_sequence {
+                let expected = self.last_update_id;
+                let received = update.prev_final_update_id.unwrap_or(update.first_update_id);
+                self.reset_with(update);
+                return DepthUpdateResult::Gap { expected, received };
+            }
+        }
+
+        Self::apply_levels(&mut self.bids, &update.bids);
+        Self::apply_levels(&mut self.asks, &update.asks);
+        self.last_update_id = update.final_update_id;
+        self.timestamp = update.transaction_time.unwrap_or(update.event_time);
+        self.first_event_applied = true;
+        DepthUpdateResult::Applied
+    }
+
+    /// 丢弃本地状态，等待新的快照；触发断档的事件保留在缓存中
+    fn reset_with(&mut self, update: BinanceDepthUpdate) {
+        self.bids.clear();
+        self.asks.clear();
+        self.pending.clear();
+        self.snapshot_loaded = false;
+        self.first_event_applied = false;
+        self.pending.push_back(update);
+    }
+
+    fn apply_levels(side: &mut DepthLevels<Price, Quantity>, levels: &[[f64; 2]]) {
+        for level in levels {
+            let price = OrderedFloat(level[0]);
+            let quantity = level[1];
+            if quantity == 0.0 {
+                side.remove(price);
+            } else {
+                side.upsert(price, quantity);
+            }
+        }
+    }
+
+    /// 最优买价和数量
+    pub fn best_bid(&self) -> Option<(f64, f64)> {
+        self.bids.best().map(|(p, q)| (p.0, q))
+    }
+
+    /// 最优卖价和数量
+    pub fn best_ask(&self) -> Option<(f64, f64)> {
+        self.asks.best().map(|(p, q)| (p.0, q))
+    }
+
+    pub fn bid_depth(&self) -> usize {
+        self.bids.len()
+    }
+
+    pub fn ask_depth(&self) -> usize {
+        self.asks.len()
+    }
+
+    /// 截取买卖各 `levels` 档生成 CommonDepth
+    pub fn to_common_depth(&self, levels: usize) -> CommonDepth {
+        CommonDepth {
+            bid_list: DepthLevels::from_levels(BookSide::Bid, self.bids.top(levels).iter().copied()),
+            ask_list: DepthLevels::from_levels(BookSide::Ask, self.asks.top(levels).iter().copied()),
+            symbol: self.symbol,
+            timestamp: self.timestamp,
+            exchange: Exchange::Binance,
+        }
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn update(first: i64, last: i64, prev: i64, bids: Vec<[f64; 2]>, asks: Vec<[f64; 2]>) -> BinanceDepthUpdate {
+        BinanceDepthUpdate {
+            event_type: "depthUpdate".to_string(),
+            event_time: 1000,
+            transaction_time: Some(999),
+            symbol: TradingSymbol::BTCUSDT,
+            first_update_id: first,
+            final_update_id: last,
+            prev_final_update_id: Some(prev),
+            bids,
+            asks,
+        }
+    }
+
+    fn snapshot(last_update_id: i64) -> DepthSnapshot {
+        DepthSnapshot {
+            last_update_id,
+            event_time: Some(900),
+            transaction_time: Some(899),
+            bids: vec![[100.0, 1.0], [99.0, 2.0]],
+            asks: vec![[101.0, 1.0], [102.0, 2.0]],
+        }
+    }
+
+    #[test]
+    fn test_buffer_then_snapshot_replay() {
+        let mut book = LocalOrderBook::new(TradingSymbol::BTCUSDT);
+        assert!(book.needs_snapshot());
+
+        // 早于快照的事件被丢弃，跨越快照的事件被应用
+        assert_eq!(book.push_update(update(1, 5, 0, vec![[98.0, 1.0]], vec![])), DepthUpdateResult::Buffered);
+        assert_eq!(book.push_update(update(6, 12, 5, vec![[100.0, 0.0]], vec![[101.0, 3.0]])), DepthUpdateResult::Buffered);
+        assert_eq!(book.pending_len(), 2);
+
+        assert_eq!(book.apply_snapshot(snapshot(10)), DepthUpdateResult::Applied);
+        assert!(book.is_synced());
+        assert_eq!(book.last_update_id(), 12);
+        assert_eq!(book.best_bid(), Some((99.0, 2.0)));
+        assert_eq!(book.best_ask(), Some((101.0, 3.0)));
+
+        assert_eq!(book.push_update(update(13, 15, 12, vec![[99.5, 4.0]], vec![])), DepthUpdateResult::Applied);
+        assert_eq!(book.best_bid(), Some((99.5, 4.0)));
+    }
+
+    #[test]
+    fn test_gap_triggers_resync() {
+        let mut book = LocalOrderBook::new(TradingSymbol::BTCUSDT);
+        assert_eq!(book.apply_snapshot(snapshot(10)), DepthUpdateResult::Buffered);
+        assert!(!book.is_synced());
+        assert_eq!(book.push_update(update(8, 12, 7, vec![], vec![])), DepthUpdateResult::Applied);
+        assert!(book.is_synced());
+
+        let result = book.push_update(update(20, 25, 18, vec![], vec![]));
+        assert_eq!(result, DepthUpdateResult::Gap { expected: 12, received: 18 });
+        assert!(book.needs_snapshot());
+        assert_eq!(book.pending_len(), 1);
+        assert_eq!(book.best_bid(), None);
+
+        // 新快照到达后从缓存的事件继续
+        assert_eq!(book.apply_snapshot(snapshot(22)), DepthUpdateResult::Applied);
+        assert!(book.is_synced());
+        assert_eq!(book.last_update_id(), 25);
+    }
+
+    #[test]
+    fn test_first_event_after_snapshot_must_cover_last_update_id() {
+        let mut book = LocalOrderBook::new(TradingSymbol::BTCUSDT);
+        book.apply_snapshot(snapshot(10));
+        let result = book.push_update(update(11, 14, 10, vec![], vec![]));
+        assert_eq!(result, DepthUpdateResult::Gap { expected: 10, received: 11 });
+    }
+
+    #[test]
+    fn test_snapshot_without_bridging_event_is_not_synced() {
+        let mut book = LocalOrderBook::new(TradingSymbol::BTCUSDT);
+        // 缓存中只有早于快照的事件
+        book.push_update(update(1, 5, 0, vec![], vec![]));
+        assert_eq!(book.apply_snapshot(snapshot(10)), DepthUpdateResult::Buffered);
+        assert!(!book.needs_snapshot());
+        assert!(!book.is_synced());
+
+        assert_eq!(book.push_update(update(3, 9, 2, vec![], vec![])), DepthUpdateResult::Stale);
+        assert_eq!(book.push_update(update(9, 11, 8, vec![], vec![])), DepthUpdateResult::Applied);
+        assert!(book.is_synced());
+    }
+
+    #[test]
+    fn test_to_common_depth_truncates_levels() {
+        let mut book = LocalOrderBook::new(TradingSymbol::ETHUSDT);
+        book.apply_snapshot(snapshot(10));
+        let depth = book.to_common_depth(1);
+        assert_eq!(depth.symbol, TradingSymbol::ETHUSDT);
+        assert_eq!(depth.bid_list.len(), 1);
+        assert_eq!(depth.ask_list.len(), 1);
+        assert_eq!(depth.best_bid(), Some((100.0, 1.0)));
+        assert_eq!(depth.best_ask(), Some((101.0, 1.0)));
+    }
+}
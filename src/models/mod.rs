@@ -1,5 +1,8 @@
+pub mod depth_levels;
 pub mod hft_position;
 pub mod key;
+pub mod latest_quote;
+pub mod local_orderbook;
 pub mod order;
 pub mod order_tick;
 pub mod order_tick_u64;
@@ -10,21 +13,33 @@ pub mod risk;
 pub mod signal;
 pub mod strategy;
 pub mod symbol;
+pub mod symbol_filters;
+pub mod symbol_table;
+pub mod tick_ring;
 pub mod trade_tick;
 pub mod trade_tick_u64;
 pub mod enums;
 pub use crate::common::enums::Exchange;
 pub use key::CommonKey;
+pub use latest_quote::{LatestQuote, LatestQuoteBook, QuoteSource, TopOfBook};
 pub use order::{Order, OrderStatus, OrderManager, OrderType};
 pub use order_tick::{OrderTick, OrderTickBuffer};
+pub use depth_levels::{BookSide, DepthLevels};
 pub use orderbook::CommonDepth;
+pub use local_orderbook::{DepthUpdateResult, LocalOrderBook};
 pub use hft_position::{
-    HftPositionKey, HftPositionManager, LockFreePosition, PositionSnapshot,
+    FillEvent, HftPositionKey, HftPositionManager, LockFreePosition, PositionReader, PositionRef, PositionSnapshot,
 };
 pub use position::{
-    Position, PositionKey, PositionManager, StrategyPosition,
+    Position, PositionKey, StrategyPosition,
 };
 pub use signal::{LimitSignal, MarketSignal, PositionSide, Side, Signal, TradingSignal};
 pub use strategy::{StrategyContext, StrategySetting, StrategyType};
-pub use symbol::TradingSymbol;
+pub use symbol::{SymbolPrecision, TradingSymbol};
+pub use symbol_table::{SymbolEntry, SymbolId};
+pub use symbol_filters::{install_symbol_filters, symbol_filters, SymbolFilterCache, SymbolFilters};
+pub use tick_ring::TickRing;
 pub use trade_tick::{TradeTick, TradeTickBuffer};
+pub use order_tick_u64::{OrderTickBufferU64, OrderTickU64};
+pub use orderbook_u64::CommonDepthU64;
+pub use trade_tick_u64::{TradeTickBufferU64, TradeTickU64};
@@ -1,8 +1,10 @@
 use crate::dto::mexc::PushDataV3ApiWrapper;
+use crate::dto::binance::borrowed::BookTickerRef;
 use crate::dto::binance::websocket::BookTickerData;
+use crate::models::tick_ring::TickRing;
 use crate::models::{TradingSymbol, Exchange};
 use crate::common::ts::TransactionTime;
-use std::num::ParseFloatError;
+use crate::common::decimal::{parse_f64, ParseDecimalError};
 use ta::{OrderTickerf64,BatchOrderTickerf64,Timestamp};
 /// 订单tick的基础数据
 #[derive(Debug, Clone, Copy)]
@@ -42,12 +44,12 @@ impl OrderTickerf64 for OrderTick {
 }
 
 impl OrderTick {
-    pub fn new_from_mexc(data: PushDataV3ApiWrapper) -> Result<Self, ParseFloatError> {
+    pub fn new_from_mexc(data: PushDataV3ApiWrapper) -> Result<Self, ParseDecimalError> {
         if let Some(order_tick) = data.extract_book_ticker_data() {
-            let best_bid_price = order_tick.bid_price.parse::<f64>()?;
-            let best_ask_price = order_tick.ask_price.parse::<f64>()?;
-            let best_bid_quantity = order_tick.bid_quantity.parse::<f64>()?;
-            let best_ask_quantity = order_tick.ask_quantity.parse::<f64>()?;
+            let best_bid_price = parse_f64(&order_tick.bid_price)?;
+            let best_ask_price = parse_f64(&order_tick.ask_price)?;
+            let best_bid_quantity = parse_f64(&order_tick.bid_quantity)?;
+            let best_ask_quantity = parse_f64(&order_tick.ask_quantity)?;
             
             Ok(Self {
                 data: OrderTickData {
@@ -61,7 +63,8 @@ impl OrderTick {
                 timestamp: data.create_time.unwrap_or(0) as u64,
             })
         } else {
-            Err("No book ticker data available".parse::<f64>().unwrap_err())
+            // 没有 Book Ticker 数据
+            Err(ParseDecimalError::Empty)
         }
     }
 
@@ -79,6 +82,36 @@ impl OrderTick {
         }
     }
 
+    /// 从借用的 Book Ticker 推送构建，不经过 `BookTickerData`
+    pub fn new_from_binance_ref(data: &BookTickerRef<'_>) -> Self {
+        Self {
+            data: OrderTickData {
+                best_bid_price: data.best_bid_price,
+                best_ask_price: data.best_ask_price,
+                best_bid_quantity: data.best_bid_qty,
+                best_ask_quantity: data.best_ask_qty,
+            },
+            exchange: Exchange::Binance,
+            symbol: data.symbol,
+            timestamp: data.transaction_time() as u64,
+        }
+    }
+
+    /// 价格和数量全为 0 的占位 tick
+    pub fn empty(exchange: Exchange, symbol: TradingSymbol) -> Self {
+        Self {
+            data: OrderTickData {
+                best_bid_price: 0.0,
+                best_ask_price: 0.0,
+                best_bid_quantity: 0.0,
+                best_ask_quantity: 0.0,
+            },
+            exchange,
+            symbol,
+            timestamp: 0,
+        }
+    }
+
     /// 计算买卖价差
     pub fn spread(&self) -> f64 {
         if self.data.best_ask_price > self.data.best_bid_price {
@@ -100,55 +133,43 @@ impl OrderTick {
 }
 
 /// OrderTick 缓冲区
-/// 使用 Vec 存储，支持高效的数据操作
+/// 固定容量的环形缓冲区，写满后覆盖最旧的 tick，所有视图均为零拷贝切片
 #[derive(Clone)]
 pub struct OrderTickBuffer {
-    ticks: Vec<OrderTick>,
-    max_size: usize,
+    ticks: TickRing<OrderTick>,
 }
 
 impl OrderTickBuffer {
     /// 创建新的 OrderTick 缓冲区
     pub fn new(max_size: usize) -> Self {
         Self {
-            ticks: Vec::with_capacity(max_size),
-            max_size,
+            ticks: TickRing::new(max_size),
         }
     }
 
-    /// 添加新的 OrderTick
+    /// 添加新的 OrderTick（缓冲区已满时覆盖最旧的 tick）
     pub fn push_tick(&mut self, tick: OrderTick) {
-        // 如果缓冲区已满，移除最旧的 tick
-        if self.ticks.len() < self.max_size {
-            self.ticks.push(tick);
-        }
-
+        self.ticks.push(tick);
     }
 
     /// 获取最新的 N 个 OrderTick（返回引用切片，零拷贝，推荐使用）
     pub fn get_recent_ticks(&self, count: usize) -> &[OrderTick] {
-        let start = self.ticks.len().saturating_sub(count);
-        &self.ticks[start..]
+        self.ticks.recent(count)
     }
 
     /// 获取最新的 N 个 OrderTick（如果必须需要拥有数据）
     pub fn get_recent_ticks_owned(&self, count: usize) -> Vec<OrderTick> {
-        let start = self.ticks.len().saturating_sub(count);
-        self.ticks[start..].iter().copied().collect()
+        self.ticks.recent(count).to_vec()
     }
 
     /// 获取最新的 OrderTick
     pub fn get_latest_tick(&self) -> Option<OrderTick> {
-        self.ticks.last().copied()
+        self.ticks.latest().copied()
     }
 
-    /// 获取指定时间范围内的 OrderTick
-    pub fn get_ticks_in_range(&self, start_time: u64, end_time: u64) -> Vec<OrderTick> {
-        self.ticks
-            .iter()
-            .filter(|tick| tick.timestamp >= start_time && tick.timestamp <= end_time)
-            .cloned()
-            .collect()
+    /// 获取指定时间范围内的 OrderTick（二分查找，要求时间戳单调递增）
+    pub fn get_ticks_in_range(&self, start_time: u64, end_time: u64) -> &[OrderTick] {
+        self.ticks.range_by_key(start_time, end_time, |tick| tick.timestamp)
     }
 
     /// 获取缓冲区大小
@@ -161,39 +182,51 @@ impl OrderTickBuffer {
         self.ticks.is_empty()
     }
 
+    /// 缓冲区容量
+    pub fn capacity(&self) -> usize {
+        self.ticks.capacity()
+    }
+
     /// 清空缓冲区
     pub fn clear(&mut self) {
         self.ticks.clear();
     }
 
+    /// 获取所有 OrderTick（按时间顺序，零拷贝）
+    pub fn as_slice(&self) -> &[OrderTick] {
+        self.ticks.as_slice()
+    }
+
     /// 获取所有 OrderTick（按时间顺序）
     pub fn get_all_ticks(&self) -> Vec<OrderTick> {
-        self.ticks.iter().copied().collect()
+        self.ticks.as_slice().to_vec()
     }
 
     /// 计算平均价差
     pub fn average_spread(&self) -> f64 {
-        if self.ticks.is_empty() {
+        let ticks = self.ticks.as_slice();
+        if ticks.is_empty() {
             return 0.0;
         }
 
-        let total_spread: f64 = self.ticks.iter().map(|tick| tick.spread()).sum();
-        total_spread / self.ticks.len() as f64
+        let total_spread: f64 = ticks.iter().map(|tick| tick.spread()).sum();
+        total_spread / ticks.len() as f64
     }
 
     /// 计算平均中间价
     pub fn average_mid_price(&self) -> f64 {
-        if self.ticks.is_empty() {
+        let ticks = self.ticks.as_slice();
+        if ticks.is_empty() {
             return 0.0;
         }
 
-        let total_mid_price: f64 = self.ticks.iter().map(|tick| tick.mid_price()).sum();
-        total_mid_price / self.ticks.len() as f64
+        let total_mid_price: f64 = ticks.iter().map(|tick| tick.mid_price()).sum();
+        total_mid_price / ticks.len() as f64
     }
 }
 impl BatchOrderTickerf64<OrderTick> for OrderTickBuffer {
     fn get_batch_order_ticker(&self) -> Option<&[OrderTick]> {
-        Some(&self.ticks)
+        Some(self.ticks.as_slice())
     }
 }
 #[cfg(test)]
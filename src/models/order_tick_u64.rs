@@ -1,11 +1,15 @@
 use crate::dto::mexc::PushDataV3ApiWrapper;
+use crate::dto::binance::borrowed::BookTickerStrRef;
 use crate::dto::binance::websocket::BookTickerData;
+use crate::models::symbol::SymbolPrecision;
+use crate::models::tick_ring::TickRing;
 use crate::models::{TradingSymbol, Exchange};
 use crate::common::ts::TransactionTime;
-use crate::common::utils::{f2u, s2u};
-use std::num::ParseFloatError;
+use crate::common::decimal::ParseDecimalError;
 
 /// 订单tick的基础数据 (u64版本)
+///
+/// 价格以交易对价格精度的整数 tick 表示，数量以数量精度的整数 lot 表示（见 `SymbolPrecision`）
 #[derive(Debug, Clone, Copy)]
 pub struct OrderTickDataU64 {
     pub best_bid_price: u64,
@@ -24,43 +28,87 @@ pub struct OrderTickU64 {
 }
 
 impl OrderTickU64 {
-    pub fn new_from_mexc(data: PushDataV3ApiWrapper) -> Result<Self, ParseFloatError> {
+    /// 从 MEXC 推送的价格/数量字符串直接解析为 tick / lot，不经过 f64
+    pub fn new_from_mexc(data: PushDataV3ApiWrapper) -> Result<Self, ParseDecimalError> {
         if let Some(order_tick) = data.extract_book_ticker_data() {
-            let best_bid_price = s2u(&order_tick.bid_price)?;
-            let best_ask_price = s2u(&order_tick.ask_price)?;
-            let best_bid_quantity = s2u(&order_tick.bid_quantity)?;
-            let best_ask_quantity = s2u(&order_tick.ask_quantity)?;
-            
+            let symbol = data
+                .symbol
+                .as_deref()
+                .map(TradingSymbol::from_symbol)
+                .unwrap_or(TradingSymbol::BTCUSDT);
+            let precision = symbol.get_precision();
+
             Ok(Self {
                 data: OrderTickDataU64 {
-                    best_bid_price,
-                    best_ask_price,
-                    best_bid_quantity,
-                    best_ask_quantity,
+                    best_bid_price: precision.parse_price(&order_tick.bid_price)?,
+                    best_ask_price: precision.parse_price(&order_tick.ask_price)?,
+                    best_bid_quantity: precision.parse_quantity(&order_tick.bid_quantity)?,
+                    best_ask_quantity: precision.parse_quantity(&order_tick.ask_quantity)?,
                 },
                 exchange: Exchange::Mexc,
-                symbol: data.symbol.unwrap_or(TradingSymbol::BTCUSDT.to_string()).parse().unwrap_or(TradingSymbol::BTCUSDT),
+                symbol,
                 timestamp: data.create_time.unwrap_or(0) as u64,
             })
         } else {
-            Err("No book ticker data available".parse::<f64>().unwrap_err())
+            // 没有 Book Ticker 数据
+            Err(ParseDecimalError::Empty)
         }
     }
 
+    /// 从已解析为 f64 的 Book Ticker 推送换算（按精度四舍五入）
+    ///
+    /// 热路径应使用 `new_from_binance_ref`，直接解析推送中的原始字符串。
     pub fn new_from_binance(data: BookTickerData) -> Self {
+        let precision = data.symbol.get_precision();
         Self {
             data: OrderTickDataU64 {
-                best_bid_price: f2u(data.best_bid_price),
-                best_ask_price: f2u(data.best_ask_price),
-                best_bid_quantity: f2u(data.best_bid_qty),
-                best_ask_quantity: f2u(data.best_ask_qty),
+                best_bid_price: precision.price_to_ticks(data.best_bid_price),
+                best_ask_price: precision.price_to_ticks(data.best_ask_price),
+                best_bid_quantity: precision.quantity_to_lots(data.best_bid_qty),
+                best_ask_quantity: precision.quantity_to_lots(data.best_ask_qty),
+            },
+            exchange: Exchange::Binance,
+            symbol: data.symbol,
+            timestamp: data.transaction_time() as u64,
+        }
+    }
+
+    /// 从借用的 Book Ticker 推送的价格/数量字符串直接解析为 tick / lot，不经过 f64
+    pub fn new_from_binance_ref(data: &BookTickerStrRef<'_>) -> Result<Self, ParseDecimalError> {
+        let precision = data.symbol.get_precision();
+        Ok(Self {
+            data: OrderTickDataU64 {
+                best_bid_price: precision.parse_price(data.best_bid_price)?,
+                best_ask_price: precision.parse_price(data.best_ask_price)?,
+                best_bid_quantity: precision.parse_quantity(data.best_bid_qty)?,
+                best_ask_quantity: precision.parse_quantity(data.best_ask_qty)?,
             },
             exchange: Exchange::Binance,
             symbol: data.symbol,
             timestamp: data.transaction_time() as u64,
+        })
+    }
+
+    /// 价格和数量全为 0 的占位 tick
+    pub fn empty(exchange: Exchange, symbol: TradingSymbol) -> Self {
+        Self {
+            data: OrderTickDataU64 {
+                best_bid_price: 0,
+                best_ask_price: 0,
+                best_bid_quantity: 0,
+                best_ask_quantity: 0,
+            },
+            exchange,
+            symbol,
+            timestamp: 0,
         }
     }
 
+    /// 该交易对的价格/数量精度
+    pub fn precision(&self) -> SymbolPrecision {
+        self.symbol.get_precision()
+    }
+
     /// 计算买卖价差
     pub fn spread(&self) -> u64 {
         if self.data.best_ask_price > self.data.best_bid_price {
@@ -79,57 +127,51 @@ impl OrderTickU64 {
     pub fn is_valid(&self) -> bool {
         self.data.best_bid_price > 0 && self.data.best_ask_price > 0
     }
+
+    /// 买一卖一挂单量之和（lot）
+    pub fn top_quantity(&self) -> u64 {
+        self.data.best_bid_quantity + self.data.best_ask_quantity
+    }
 }
 
 /// OrderTick 缓冲区 (u64版本)
-/// 使用 Vec 存储，支持高效的数据操作
+/// 固定容量的环形缓冲区，写满后覆盖最旧的 tick，所有视图均为零拷贝切片
 #[derive(Clone)]
 pub struct OrderTickBufferU64 {
-    ticks: Vec<OrderTickU64>,
-    max_size: usize,
+    ticks: TickRing<OrderTickU64>,
 }
 
 impl OrderTickBufferU64 {
     /// 创建新的 OrderTick 缓冲区
     pub fn new(max_size: usize) -> Self {
         Self {
-            ticks: Vec::with_capacity(max_size),
-            max_size,
+            ticks: TickRing::new(max_size),
         }
     }
 
-    /// 添加新的 OrderTick
+    /// 添加新的 OrderTick（缓冲区已满时覆盖最旧的 tick）
     pub fn push_tick(&mut self, tick: OrderTickU64) {
-        // 如果缓冲区已满，移除最旧的 tick
-        if self.ticks.len() < self.max_size {
-            self.ticks.push(tick);
-        }
+        self.ticks.push(tick);
     }
 
     /// 获取最新的 N 个 OrderTick（返回引用切片，零拷贝，推荐使用）
     pub fn get_recent_ticks(&self, count: usize) -> &[OrderTickU64] {
-        let start = self.ticks.len().saturating_sub(count);
-        &self.ticks[start..]
+        self.ticks.recent(count)
     }
 
     /// 获取最新的 N 个 OrderTick（如果必须需要拥有数据）
     pub fn get_recent_ticks_owned(&self, count: usize) -> Vec<OrderTickU64> {
-        let start = self.ticks.len().saturating_sub(count);
-        self.ticks[start..].iter().copied().collect()
+        self.ticks.recent(count).to_vec()
     }
 
     /// 获取最新的 OrderTick
     pub fn get_latest_tick(&self) -> Option<OrderTickU64> {
-        self.ticks.last().copied()
+        self.ticks.latest().copied()
     }
 
-    /// 获取指定时间范围内的 OrderTick
-    pub fn get_ticks_in_range(&self, start_time: u64, end_time: u64) -> Vec<OrderTickU64> {
-        self.ticks
-            .iter()
-            .filter(|tick| tick.timestamp >= start_time && tick.timestamp <= end_time)
-            .cloned()
-            .collect()
+    /// 获取指定时间范围内的 OrderTick（二分查找，要求时间戳单调递增）
+    pub fn get_ticks_in_range(&self, start_time: u64, end_time: u64) -> &[OrderTickU64] {
+        self.ticks.range_by_key(start_time, end_time, |tick| tick.timestamp)
     }
 
     /// 获取缓冲区大小
@@ -142,34 +184,46 @@ impl OrderTickBufferU64 {
         self.ticks.is_empty()
     }
 
+    /// 缓冲区容量
+    pub fn capacity(&self) -> usize {
+        self.ticks.capacity()
+    }
+
     /// 清空缓冲区
     pub fn clear(&mut self) {
         self.ticks.clear();
     }
 
+    /// 获取所有 OrderTick（按时间顺序，零拷贝）
+    pub fn as_slice(&self) -> &[OrderTickU64] {
+        self.ticks.as_slice()
+    }
+
     /// 获取所有 OrderTick（按时间顺序）
     pub fn get_all_ticks(&self) -> Vec<OrderTickU64> {
-        self.ticks.iter().copied().collect()
+        self.ticks.as_slice().to_vec()
     }
 
     /// 计算平均价差
     pub fn average_spread(&self) -> f64 {
-        if self.ticks.is_empty() {
+        let ticks = self.ticks.as_slice();
+        if ticks.is_empty() {
             return 0.0;
         }
 
-        let total_spread: u64 = self.ticks.iter().map(|tick| tick.spread()).sum();
-        total_spread as f64 / self.ticks.len() as f64
+        let total_spread: u64 = ticks.iter().map(|tick| tick.spread()).sum();
+        total_spread as f64 / ticks.len() as f64
     }
 
     /// 计算平均中间价
     pub fn average_mid_price(&self) -> f64 {
-        if self.ticks.is_empty() {
+        let ticks = self.ticks.as_slice();
+        if ticks.is_empty() {
             return 0.0;
         }
 
-        let total_mid_price: u64 = self.ticks.iter().map(|tick| tick.mid_price()).sum();
-        total_mid_price as f64 / self.ticks.len() as f64
+        let total_mid_price: u64 = ticks.iter().map(|tick| tick.mid_price()).sum();
+        total_mid_price as f64 / ticks.len() as f64
     }
 }
 
@@ -227,5 +281,22 @@ mod tests {
         assert_eq!(tick.mid_price(), 25005 * 100_000_000);
         assert!(tick.is_valid());
     }
+
+    #[test]
+    fn test_binance_ticks_use_symbol_precision() {
+        let text = r#"{"e":"bookTicker","u":1,"E":2,"T":3,"s":"BTCUSDT","b":"118234.50","B":"7.312","a":"118234.60","A":"2.045"}"#;
+        let tick = OrderTickU64::new_from_binance(serde_json::from_str(text).unwrap());
+        assert_eq!(tick.data.best_bid_price, 11_823_450);
+        assert_eq!(tick.data.best_ask_quantity, 2_045);
+        assert_eq!(tick.spread(), 10);
+
+        let borrowed = OrderTickU64::new_from_binance_ref(&serde_json::from_str(text).unwrap()).unwrap();
+        assert_eq!(borrowed.data.best_ask_price, tick.data.best_ask_price);
+        assert_eq!(borrowed.data.best_bid_quantity, 7_312);
+
+        let malformed = text.replace(r#""a":"118234.60""#, r#""a":"1x""#);
+        assert!(OrderTickU64::new_from_binance_ref(&serde_json::from_str(&malformed).unwrap()).is_err());
+        assert_eq!(tick.precision().format_price(tick.data.best_ask_price), "118234.60");
+    }
 }
 
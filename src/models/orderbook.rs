@@ -1,5 +1,7 @@
+use crate::dto::binance::borrowed::PartialDepthRef;
 use crate::dto::binance::websocket::BinancePartialDepth;
 use crate::dto::mexc::PushDataV3ApiWrapper;
+use crate::models::depth_levels::{BookSide, DepthLevels};
 use crate::models::{Exchange, TradingSymbol};
 use std::collections::BTreeMap;
 use ordered_float::OrderedFloat;
@@ -9,8 +11,8 @@ type Price = OrderedFloat<f64>;
 type Quantity = f64;
 #[derive(Debug, Clone)]
 pub struct CommonDepth {
-    pub bid_list: BTreeMap<Price, Quantity>,
-    pub ask_list: BTreeMap<Price, Quantity>,
+    pub bid_list: DepthLevels<Price, Quantity>,
+    pub ask_list: DepthLevels<Price, Quantity>,
     pub symbol: TradingSymbol,
     pub timestamp: i64,
     pub exchange: Exchange,
@@ -20,24 +22,24 @@ pub struct CommonDepth {
 impl CommonDepth {
     pub fn new_from_mexc(data: PushDataV3ApiWrapper) -> Option<Self> {
         if let Some(partial_depth) = data.extract_limit_depth_data() {
-            // 辅助函数：将深度数据转换为 BTreeMap
-            let depth_to_map = |items: &[crate::dto::mexc::PublicLimitDepthV3ApiItem]| {
-                items
-                    .iter()
-                    .filter_map(|item| {
+            // 辅助函数：将深度数据转换为连续存储的档位
+            let depth_to_levels = |side: BookSide, items: &[crate::dto::mexc::PublicLimitDepthV3ApiItem]| {
+                DepthLevels::from_levels(
+                    side,
+                    items.iter().filter_map(|item| {
                         item.price.parse::<f64>().ok().and_then(|price| {
                             item.quantity
                                 .parse::<f64>()
                                 .ok()
                                 .map(|quantity| (OrderedFloat(price), quantity))
                         })
-                    })
-                    .collect::<BTreeMap<Price, Quantity>>()
+                    }),
+                )
             };
 
             Some(CommonDepth {
-                bid_list: depth_to_map(&partial_depth.bids),
-                ask_list: depth_to_map(&partial_depth.asks),
+                bid_list: depth_to_levels(BookSide::Bid, &partial_depth.bids),
+                ask_list: depth_to_levels(BookSide::Ask, &partial_depth.asks),
                 symbol: data
                     .symbol
                     .map(TradingSymbol::from)
@@ -52,12 +54,13 @@ impl CommonDepth {
         }
     }
 
-    pub fn new_from_binance(data: BinancePartialDepth) -> Self {
-        // 辅助函数：将 Binance 深度数据转换为 BTreeMap
-        let depth_to_map = |items: &[[f64; 2]]| {
-            items
-                .iter()
-                .filter_map(|item| {
+    /// Partial Depth 数据本身不带 symbol，由调用方（订阅时或按 stream 名称路由）指定
+    pub fn new_from_binance(data: BinancePartialDepth, symbol: TradingSymbol) -> Self {
+        // 辅助函数：将 Binance 深度数据转换为连续存储的档位
+        let depth_to_levels = |side: BookSide, items: &[[f64; 2]]| {
+            DepthLevels::from_levels(
+                side,
+                items.iter().filter_map(|item| {
                     let price = item[0];
                     let quantity = item[1];
                     // 过滤掉价格为0或数量为0的无效数据
@@ -66,14 +69,14 @@ impl CommonDepth {
                     } else {
                         None
                     }
-                })
-                .collect::<BTreeMap<Price, Quantity>>()
+                }),
+            )
         };
 
         CommonDepth {
-            bid_list: depth_to_map(&data.bids),
-            ask_list: depth_to_map(&data.asks),
-            symbol: TradingSymbol::BTCUSDT, // Partial Depth 没有 symbol，使用默认值
+            bid_list: depth_to_levels(BookSide::Bid, &data.bids),
+            ask_list: depth_to_levels(BookSide::Ask, &data.asks),
+            symbol,
             timestamp: std::time::SystemTime::now()
                 .duration_since(std::time::UNIX_EPOCH)
                 .unwrap()
@@ -81,13 +84,104 @@ impl CommonDepth {
             exchange: Exchange::Binance,
         }
     }
+
+    /// 从直接解析出档位的 Partial Depth 构建，档位 Vec 原样接管，不再复制
+    pub fn new_from_binance_ref(data: PartialDepthRef, symbol: TradingSymbol) -> Self {
+        CommonDepth {
+            bid_list: DepthLevels::from_vec(BookSide::Bid, data.bids.0),
+            ask_list: DepthLevels::from_vec(BookSide::Ask, data.asks.0),
+            symbol,
+            timestamp: std::time::SystemTime::now()
+                .duration_since(std::time::UNIX_EPOCH)
+                .unwrap()
+                .as_millis() as i64,
+            exchange: Exchange::Binance,
+        }
+    }
+
+    /// 最优买价和数量，O(1)
+    pub fn best_bid(&self) -> Option<(f64, f64)> {
+        self.bid_list.best().map(|(p, q)| (p.0, q))
+    }
+
+    /// 最优卖价和数量，O(1)
+    pub fn best_ask(&self) -> Option<(f64, f64)> {
+        self.ask_list.best().map(|(p, q)| (p.0, q))
+    }
+
+    /// 中间价
+    pub fn mid_price(&self) -> Option<f64> {
+        match (self.bid_list.best_price(), self.ask_list.best_price()) {
+            (Some(bid), Some(ask)) => Some((bid.0 + ask.0) / 2.0),
+            _ => None,
+        }
+    }
+
+    /// 前 `levels` 档的挂单量不平衡度：(买量 - 卖量) / (买量 + 卖量)，范围 [-1, 1]
+    pub fn volume_imbalance(&self, levels: usize) -> f64 {
+        let bid_volume = self.bid_list.quantity_sum(levels);
+        let ask_volume = self.ask_list.quantity_sum(levels);
+        let total = bid_volume + ask_volume;
+        if total > 0.0 {
+            (bid_volume - ask_volume) / total
+        } else {
+            0.0
+        }
+    }
 }
 // 实现 Orderbookf64 trait 以支持 ta 库的功能
 impl Orderbookf64 for CommonDepth {
     fn get_bids_btm(&self) -> &BTreeMap<Price, Quantity> {
-        &self.bid_list
+        self.bid_list.as_btree_map()
     }
     fn get_asks_btm(&self) -> &BTreeMap<Price, Quantity> {
-        &self.ask_list
+        self.ask_list.as_btree_map()
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_new_from_binance_orders_levels() {
+        let data = BinancePartialDepth {
+            last_update_id: 1,
+            bids: vec![[99.0, 1.0], [100.0, 3.0], [98.0, 0.0]],
+            asks: vec![[102.0, 2.0], [101.0, 1.0]],
+        };
+        let depth = CommonDepth::new_from_binance(data, TradingSymbol::BTCUSDT);
+
+        assert_eq!(depth.best_bid(), Some((100.0, 3.0)));
+        assert_eq!(depth.best_ask(), Some((101.0, 1.0)));
+        assert_eq!(depth.bid_list.len(), 2);
+        assert_eq!(depth.mid_price(), Some(100.5));
+        // (4 - 3) / 7
+        assert!((depth.volume_imbalance(5) - 1.0 / 7.0).abs() < 1e-12);
+        assert!((depth.volume_imbalance(1) - 0.5).abs() < 1e-12);
+
+        // ta 兼容视图
+        assert_eq!(depth.get_bids_btm().len(), 2);
+        assert_eq!(depth.get_asks_btm().keys().next().unwrap().0, 101.0);
+    }
+
+    #[test]
+    fn test_slice_imbalance_agrees_with_btree_view() {
+        let data = BinancePartialDepth {
+            last_update_id: 1,
+            bids: vec![[99.0, 1.5], [100.0, 3.0], [97.0, 2.25]],
+            asks: vec![[102.0, 2.0], [101.0, 1.0], [103.0, 0.5]],
+        };
+        let mut depth = CommonDepth::new_from_binance(data, TradingSymbol::BTCUSDT);
+        assert_eq!(depth.get_bids_btm().len(), 3);
+        depth.bid_list.upsert(OrderedFloat(98.0), 4.0);
+        depth.ask_list.remove(OrderedFloat(103.0));
+
+        // ta 的 VolumeImbalanceF64 基于 BTreeMap 视图的全部档位计算
+        let bid_volume: f64 = depth.get_bids_btm().values().sum();
+        let ask_volume: f64 = depth.get_asks_btm().values().sum();
+        let expected = (bid_volume - ask_volume) / (bid_volume + ask_volume);
+
+        assert!((depth.volume_imbalance(depth.bid_list.len().max(depth.ask_list.len())) - expected).abs() < 1e-12);
     }
 }
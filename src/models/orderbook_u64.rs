@@ -1,47 +1,53 @@
-use crate::common::utils::f2u;
+use crate::dto::binance::borrowed::PartialDepthStrRef;
 use crate::dto::binance::websocket::BinancePartialDepth;
 use crate::dto::mexc::PushDataV3ApiWrapper;
-use crate::models::{Exchange, TradingSymbol};
+use crate::models::depth_levels::{BookSide, DepthLevels};
+use crate::models::{Exchange, SymbolPrecision, TradingSymbol};
 use std::collections::BTreeMap;
 use ta::{ OrderbookU64};
 
 type Price = u64;
 type Quantity = u64;
 
+/// 深度快照 (u64版本)
+///
+/// 价格为交易对价格精度的整数 tick，数量为数量精度的整数 lot（见 `SymbolPrecision`）
 #[derive(Debug, Clone)]
 pub struct CommonDepthU64 {
-    pub bid_list: BTreeMap<Price, Quantity>,
-    pub ask_list: BTreeMap<Price, Quantity>,
+    pub bid_list: DepthLevels<Price, Quantity>,
+    pub ask_list: DepthLevels<Price, Quantity>,
     pub symbol: TradingSymbol,
     pub timestamp: i64,
     pub exchange: Exchange,
 }
 
 impl CommonDepthU64 {
+    /// 从 MEXC 推送的价格/数量字符串直接解析为 tick / lot，不经过 f64
     pub fn new_from_mexc(data: PushDataV3ApiWrapper) -> Option<Self> {
         if let Some(partial_depth) = data.extract_limit_depth_data() {
-            // 辅助函数：将深度数据转换为 BTreeMap
-            let depth_to_map = |items: &[crate::dto::mexc::PublicLimitDepthV3ApiItem]| {
-                items
-                    .iter()
-                    .filter_map(|item| {
-                        item.price.parse::<f64>().ok().and_then(|price| {
-                            item.quantity
-                                .parse::<f64>()
-                                .ok()
-                                .map(|quantity| (f2u(price), f2u(quantity)))
-                        })
-                    })
-                    .collect::<BTreeMap<Price, Quantity>>()
+            let symbol = data
+                .symbol
+                .as_deref()
+                .map(TradingSymbol::from_symbol)
+                .unwrap_or(TradingSymbol::BTCUSDT);
+            let precision = symbol.get_precision();
+
+            // 辅助函数：将深度数据转换为连续存储的档位
+            let depth_to_levels = |side: BookSide, items: &[crate::dto::mexc::PublicLimitDepthV3ApiItem]| {
+                DepthLevels::from_levels(
+                    side,
+                    items.iter().filter_map(|item| {
+                        let price = precision.parse_price(&item.price).ok()?;
+                        let quantity = precision.parse_quantity(&item.quantity).ok()?;
+                        Some((price, quantity))
+                    }),
+                )
             };
 
             Some(CommonDepthU64 {
-                bid_list: depth_to_map(&partial_depth.bids),
-                ask_list: depth_to_map(&partial_depth.asks),
-                symbol: data
-                    .symbol
-                    .map(TradingSymbol::from)
-                    .unwrap_or(TradingSymbol::BTCUSDT),
+                bid_list: depth_to_levels(BookSide::Bid, &partial_depth.bids),
+                ask_list: depth_to_levels(BookSide::Ask, &partial_depth.asks),
+                symbol,
                 timestamp: data
                     .create_time
                     .unwrap_or_else(|| data.send_time.unwrap_or(0)),
@@ -52,28 +58,33 @@ impl CommonDepthU64 {
         }
     }
 
-    pub fn new_from_binance(data: BinancePartialDepth) -> Self {
-        // 辅助函数：将 Binance 深度数据转换为 BTreeMap
-        let depth_to_map = |items: &[[f64; 2]]| {
-            items
-                .iter()
-                .filter_map(|item| {
-                    let price = item[0];
-                    let quantity = item[1];
-                    // 过滤掉价格为0或数量为0的无效数据
-                    if price > 0.0 && quantity > 0.0 {
-                        Some((f2u(price), f2u(quantity)))
+    /// Partial Depth 数据本身不带 symbol，由调用方传入订阅时已知的交易对，
+    /// 已解析为 f64 的价格/数量按该交易对的精度四舍五入换算
+    ///
+    /// 热路径应使用 `new_from_binance_ref`，直接解析推送中的原始字符串。
+    pub fn new_from_binance(data: BinancePartialDepth, symbol: TradingSymbol) -> Self {
+        let precision = symbol.get_precision();
+        // 辅助函数：将 Binance 深度数据转换为连续存储的档位
+        let depth_to_levels = |side: BookSide, items: &[[f64; 2]]| {
+            DepthLevels::from_levels(
+                side,
+                items.iter().filter_map(|item| {
+                    let price = precision.price_to_ticks(item[0]);
+                    let quantity = precision.quantity_to_lots(item[1]);
+                    // 过滤掉价格为0或数量为0的无效数据（包括换算后不足一个 tick/lot 的档位）
+                    if price > 0 && quantity > 0 {
+                        Some((price, quantity))
                     } else {
                         None
                     }
-                })
-                .collect::<BTreeMap<Price, Quantity>>()
+                }),
+            )
         };
 
         CommonDepthU64 {
-            bid_list: depth_to_map(&data.bids),
-            ask_list: depth_to_map(&data.asks),
-            symbol: TradingSymbol::BTCUSDT, // Partial Depth 没有 symbol，使用默认值
+            bid_list: depth_to_levels(BookSide::Bid, &data.bids),
+            ask_list: depth_to_levels(BookSide::Ask, &data.asks),
+            symbol,
             timestamp: std::time::SystemTime::now()
                 .duration_since(std::time::UNIX_EPOCH)
                 .unwrap()
@@ -81,14 +92,88 @@ impl CommonDepthU64 {
             exchange: Exchange::Binance,
         }
     }
+
+    /// 从借用的 Partial Depth 推送的价格/数量字符串直接解析为 tick / lot，不经过 f64
+    ///
+    /// 无法解析、价格为 0 或数量为 0 的档位被过滤掉
+    pub fn new_from_binance_ref(data: &PartialDepthStrRef<'_>, symbol: TradingSymbol) -> Self {
+        let precision = symbol.get_precision();
+        let depth_to_levels = |side: BookSide, items: &[(&str, &str)]| {
+            DepthLevels::from_levels(
+                side,
+                items.iter().filter_map(|&(price, quantity)| {
+                    let price = precision.parse_price(price).ok()?;
+                    let quantity = precision.parse_quantity(quantity).ok()?;
+                    (price > 0 && quantity > 0).then_some((price, quantity))
+                }),
+            )
+        };
+
+        CommonDepthU64 {
+            bid_list: depth_to_levels(BookSide::Bid, &data.bids),
+            ask_list: depth_to_levels(BookSide::Ask, &data.asks),
+            symbol,
+            timestamp: data.event_time.unwrap_or_else(|| {
+                std::time::SystemTime::now()
+                    .duration_since(std::time::UNIX_EPOCH)
+                    .unwrap()
+                    .as_millis() as i64
+            }),
+            exchange: Exchange::Binance,
+        }
+    }
+
+    /// 该交易对的价格/数量精度
+    pub fn precision(&self) -> SymbolPrecision {
+        self.symbol.get_precision()
+    }
+
+    /// 最优买价和数量，O(1)
+    pub fn best_bid(&self) -> Option<(Price, Quantity)> {
+        self.bid_list.best()
+    }
+
+    /// 最优卖价和数量，O(1)
+    pub fn best_ask(&self) -> Option<(Price, Quantity)> {
+        self.ask_list.best()
+    }
+
+    /// 前 `levels` 档的挂单量不平衡度：(买量 - 卖量) / (买量 + 卖量)，范围 [-1, 1]
+    pub fn volume_imbalance(&self, levels: usize) -> f64 {
+        let bid_volume = self.bid_list.quantity_sum(levels) as f64;
+        let ask_volume = self.ask_list.quantity_sum(levels) as f64;
+        let total = bid_volume + ask_volume;
+        if total > 0.0 {
+            (bid_volume - ask_volume) / total
+        } else {
+            0.0
+        }
+    }
 }
 
 impl OrderbookU64 for CommonDepthU64 {
     fn get_bids_btm(&self) -> &BTreeMap<Price, Quantity> {
-        &self.bid_list
+        self.bid_list.as_btree_map()
     }
     fn get_asks_btm(&self) -> &BTreeMap<Price, Quantity> {
-        &self.ask_list
+        self.ask_list.as_btree_map()
     }
 }
 
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_new_from_binance_ref_parses_raw_levels() {
+        let text = r#"{"e":"depthUpdate","E":5,"T":4,"s":"ETHUSDT","U":1,"u":2,"pu":0,"b":[["3512.33","0.500"],["3512.34","1.500"],["3512.30","0"]],"a":[["3512.35","2.000"],["bad","1"]]}"#;
+        let data: PartialDepthStrRef = serde_json::from_str(text).unwrap();
+        let depth = CommonDepthU64::new_from_binance_ref(&data, TradingSymbol::ETHUSDT);
+
+        assert_eq!(depth.best_bid(), Some((351_234, 1_500)));
+        assert_eq!(depth.best_ask(), Some((351_235, 2_000)));
+        assert_eq!(depth.bid_list.len(), 2);
+        assert_eq!(depth.ask_list.len(), 1);
+        assert_eq!(depth.timestamp, 5);
+    }
+}
@@ -1,6 +1,7 @@
 use crate::common::enums::{Exchange, StrategyName};
 use crate::common::ts::SignalTs;
 use crate::common::utils::get_timestamp_ms;
+use crate::models::SymbolId;
 
 #[derive(Debug, Clone, Copy, PartialEq)]
 #[repr(u8)]
@@ -40,7 +41,7 @@ pub enum Signal {
 #[derive(Debug, Clone, PartialEq)]
 pub struct TradingSignal {
     pub id: u32,
-    pub symbol: String,
+    pub symbol: SymbolId,
     pub strategy: StrategyName,
     pub quantity: f64,
     pub signal: Signal,
@@ -54,7 +55,7 @@ pub struct TradingSignal {
 impl TradingSignal {
     pub fn new_market_signal(
         id: u32,
-        symbol: String,
+        symbol: impl Into<SymbolId>,
         side: Side,
         strategy: StrategyName,
         quantity: f64,
@@ -67,7 +68,7 @@ impl TradingSignal {
         Self {
             id,
             quantity,
-            symbol,
+            symbol: symbol.into(),
             side,
             signal: Signal::Market(MarketSignal::new(side, stop_price, profit_price)),
             latest_price,
@@ -80,7 +81,7 @@ impl TradingSignal {
 
     pub fn new_close_signal(
         id: u32,
-        symbol: String,
+        symbol: impl Into<SymbolId>,
         current_position: u8, // 0: 无仓位, 1: 多头, 2: 空头
         strategy: StrategyName,
         quantity: f64,
@@ -98,7 +99,7 @@ impl TradingSignal {
 
         Self {
             id,
-            symbol,
+            symbol: symbol.into(),
             strategy,
             quantity,
             side: close_side,
@@ -124,7 +125,7 @@ impl TradingSignal {
     /// 用于通知风控层止损已触发，需要重置仓位状态
     pub fn new_stop_loss_triggered_signal(
         id: u32,
-        symbol: String,
+        symbol: impl Into<SymbolId>,
         strategy: StrategyName,
         exchange: Exchange,
         latest_price: f64,
@@ -134,7 +135,7 @@ impl TradingSignal {
         
         Self {
             id,
-            symbol,
+            symbol: symbol.into(),
             strategy,
             quantity: 0.0, // 止损触发信号不需要数量
             side: Side::Buy, // 不重要
@@ -7,6 +7,7 @@ pub enum StrategyType {
     Bollinger,
     Macd,
     Q1,
+    OrderBook,
 }
 
 /// 策略设置
@@ -1,3 +1,5 @@
+use crate::common::decimal::{format_fixed, parse_fixed_u64, ParseDecimalError};
+use serde::de::{self, Visitor};
 use serde::{Deserialize, Deserializer, Serialize, Serializer};
 use std::fmt::{self, Display};
 use std::str::FromStr;
@@ -18,8 +20,59 @@ impl SymbolPrecision {
             quantity_precision,
         }
     }
+
+    /// 价格缩放倍数 10^price_precision，整数价格 tick = 价格 * price_scale
+    pub const fn price_scale(&self) -> u64 {
+        10u64.pow(self.price_precision as u32)
+    }
+
+    /// 数量缩放倍数 10^quantity_precision，整数数量 lot = 数量 * quantity_scale
+    pub const fn quantity_scale(&self) -> u64 {
+        10u64.pow(self.quantity_precision as u32)
+    }
+
+    /// 价格字符串直接解析为 tick，超出精度的部分四舍五入
+    pub fn parse_price(&self, price: &str) -> Result<u64, ParseDecimalError> {
+        parse_fixed_u64(price, self.price_precision as u32)
+    }
+
+    /// 数量字符串直接解析为 lot，超出精度的部分四舍五入
+    pub fn parse_quantity(&self, quantity: &str) -> Result<u64, ParseDecimalError> {
+        parse_fixed_u64(quantity, self.quantity_precision as u32)
+    }
+
+    /// f64 价格转换为 tick，负数按 0 处理
+    pub fn price_to_ticks(&self, price: f64) -> u64 {
+        (price * self.price_scale() as f64).round() as u64
+    }
+
+    /// f64 数量转换为 lot，负数按 0 处理
+    pub fn quantity_to_lots(&self, quantity: f64) -> u64 {
+        (quantity * self.quantity_scale() as f64).round() as u64
+    }
+
+    pub fn ticks_to_price(&self, ticks: u64) -> f64 {
+        ticks as f64 / self.price_scale() as f64
+    }
+
+    pub fn lots_to_quantity(&self, lots: u64) -> f64 {
+        lots as f64 / self.quantity_scale() as f64
+    }
+
+    /// tick 格式化为下单用的价格字符串（固定 price_precision 位小数）
+    pub fn format_price(&self, ticks: u64) -> String {
+        format_fixed(ticks, self.price_precision as u32)
+    }
+
+    /// lot 格式化为下单用的数量字符串（固定 quantity_precision 位小数）
+    pub fn format_quantity(&self, lots: u64) -> String {
+        format_fixed(lots, self.quantity_precision as u32)
+    }
 }
 
+/// 自定义符号缓冲区的字节数
+pub const MAX_CUSTOM_SYMBOL_LEN: usize = 15;
+
 /// 高效的交易对符号类型
 /// 对于常用交易对使用预定义枚举（零成本），对于其他交易对使用固定大小数组
 #[derive(Debug, Clone, PartialEq, Eq, Hash, Copy)]
@@ -48,8 +101,8 @@ pub enum TradingSymbol {
     GIGGLEUSDT,
     AIAUSDT,
 
-    // 自定义符号 - 使用固定大小数组 [u8; 20]，完全栈分配，支持 Copy
-    Custom([u8; 15]),
+    // 自定义符号 - 使用固定大小数组 [u8; 15]，完全栈分配，支持 Copy
+    Custom([u8; MAX_CUSTOM_SYMBOL_LEN]),
 }
 
 impl TradingSymbol {
@@ -140,7 +193,20 @@ impl TradingSymbol {
 
     /// 从字符串创建符号，自动选择最佳表示方式
     pub fn from_string(s: String) -> Self {
-        match s.as_str() {
+        Self::from_symbol(&s)
+    }
+
+    /// 从字符串切片创建符号，不分配内存
+    ///
+    /// 超过 `MAX_CUSTOM_SYMBOL_LEN` 字节的自定义符号会 panic，来自外部的符号应使用 `try_from_symbol`。
+    pub fn from_symbol(s: &str) -> Self {
+        Self::try_from_symbol(s)
+            .unwrap_or_else(|| panic!("Symbol '{}' is too long (max {} bytes)", s, MAX_CUSTOM_SYMBOL_LEN))
+    }
+
+    /// 从字符串切片创建符号，自定义符号超过 `MAX_CUSTOM_SYMBOL_LEN` 字节时返回 None
+    pub fn try_from_symbol(s: &str) -> Option<Self> {
+        let symbol = match s {
             "BTCUSDT" => TradingSymbol::BTCUSDT,
             "ETHUSDT" => TradingSymbol::ETHUSDT,
             "SOLUSDT" => TradingSymbol::SOLUSDT,
@@ -164,17 +230,18 @@ impl TradingSymbol {
             "GIGGLEUSDT" => TradingSymbol::GIGGLEUSDT,
             "AIAUSDT" => TradingSymbol::AIAUSDT,
             _ => {
-                // 检查字符串长度
-                if s.len() > 20 {
-                    panic!("Symbol '{}' is too long (max 20 bytes)", s);
+                // 检查字符串长度（按字节计算，UTF-8 符号可能远超字符数）
+                if s.len() > MAX_CUSTOM_SYMBOL_LEN {
+                    return None;
                 }
-                
+
                 // 创建固定大小数组
-                let mut bytes = [0u8; 15];
+                let mut bytes = [0u8; MAX_CUSTOM_SYMBOL_LEN];
                 bytes[..s.len()].copy_from_slice(s.as_bytes());
                 TradingSymbol::Custom(bytes)
             }
-        }
+        };
+        Some(symbol)
     }
 }
 
@@ -182,7 +249,7 @@ impl FromStr for TradingSymbol {
     type Err = ();
 
     fn from_str(s: &str) -> Result<Self, Self::Err> {
-        Ok(Self::from_string(s.to_string()))
+        Self::try_from_symbol(s).ok_or(())
     }
 }
 
@@ -194,7 +261,7 @@ impl Display for TradingSymbol {
 
 impl From<&str> for TradingSymbol {
     fn from(s: &str) -> Self {
-        Self::from_string(s.to_string())
+        Self::from_symbol(s)
     }
 }
 
@@ -227,14 +294,29 @@ impl Serialize for TradingSymbol {
     }
 }
 
-// 自定义反序列化：从字符串反序列化，自动选择最优表示
+struct TradingSymbolVisitor;
+
+impl<'de> Visitor<'de> for TradingSymbolVisitor {
+    type Value = TradingSymbol;
+
+    fn expecting(&self, formatter: &mut fmt::Formatter) -> fmt::Result {
+        formatter.write_str("a trading symbol string")
+    }
+
+    fn visit_str<E: de::Error>(self, value: &str) -> Result<TradingSymbol, E> {
+        TradingSymbol::try_from_symbol(value).ok_or_else(|| {
+            E::custom(format_args!("symbol '{}' is too long (max {} bytes)", value, MAX_CUSTOM_SYMBOL_LEN))
+        })
+    }
+}
+
+// 自定义反序列化：从字符串反序列化，自动选择最优表示（直接使用输入缓冲区，不分配 String）
 impl<'de> Deserialize<'de> for TradingSymbol {
     fn deserialize<D>(deserializer: D) -> Result<Self, D::Error>
     where
         D: Deserializer<'de>,
     {
-        let s = String::deserialize(deserializer)?;
-        Ok(TradingSymbol::from_string(s))
+        deserializer.deserialize_str(TradingSymbolVisitor)
     }
 }
 
@@ -270,6 +352,23 @@ mod tests {
         assert_eq!(custom, expected);
     }
 
+    #[test]
+    fn test_precision_scaling() {
+        let precision = TradingSymbol::BTCUSDT.get_precision();
+        assert_eq!(precision.price_scale(), 100);
+        assert_eq!(precision.parse_price("118234.50"), Ok(11_823_450));
+        assert_eq!(precision.parse_quantity("0.0045"), Ok(5));
+        assert_eq!(precision.price_to_ticks(118234.5), 11_823_450);
+        assert_eq!(precision.format_price(11_823_450), "118234.50");
+        assert_eq!(precision.format_quantity(5), "0.005");
+        assert_eq!(precision.ticks_to_price(11_823_450), 118234.5);
+
+        let precision = TradingSymbol::DOGEUSDT.get_precision();
+        assert_eq!(precision.quantity_scale(), 1);
+        assert_eq!(precision.format_quantity(150), "150");
+        assert_eq!(precision.format_price(precision.price_to_ticks(0.1 + 0.2)), "0.30000");
+    }
+
     #[test]
     fn test_serialization() {
         let btc = TradingSymbol::BTCUSDT;
@@ -321,7 +420,7 @@ mod tests {
         let long_symbol = TradingSymbol::from_string("1000PEPEUSDT".to_string());
         assert_eq!(long_symbol.as_str(), "1000PEPEUSDT");
         
-        // 测试边界情况 - 正好20字节
+        // 测试边界情况 - 正好15字节
         let max_symbol = TradingSymbol::from_string("123456789012345".to_string());
         assert_eq!(max_symbol.as_str(), "123456789012345");
         
@@ -334,10 +433,23 @@ mod tests {
     #[test]
     #[should_panic(expected = "Symbol 'VERY_LONG_SYMBOL_NAME_THAT_EXCEEDS_TWENTY_BYTES' is too long")]
     fn test_symbol_too_long() {
-        // 测试超过20字节的符号应该panic
+        // 测试超过15字节的符号应该panic
         TradingSymbol::from_string("VERY_LONG_SYMBOL_NAME_THAT_EXCEEDS_TWENTY_BYTES".to_string());
     }
 
+    #[test]
+    fn test_symbol_longer_than_buffer() {
+        // 16 字节的 UTF-8 符号放不进自定义符号的缓冲区
+        let symbol = "币安人生USDT";
+        assert_eq!(symbol.len(), 16);
+        assert_eq!(TradingSymbol::try_from_symbol(symbol), None);
+        assert!(symbol.parse::<TradingSymbol>().is_err());
+        assert!(serde_json::from_str::<TradingSymbol>(r#""币安人生USDT""#).is_err());
+
+        let fits = TradingSymbol::try_from_symbol("币安人生USD").unwrap();
+        assert_eq!(fits.as_str(), "币安人生USD");
+    }
+
     #[test]
     fn test_symbol_precision() {
         // 测试BTC精度
@@ -0,0 +1,320 @@
+use crate::common::decimal::{parse_fixed_u64, ParseDecimalError};
+use crate::dto::binance::rest_api::{ExchangeInfo, ExchangeSymbolFilter, ExchangeSymbolInfo};
+use crate::models::symbol::{SymbolPrecision, TradingSymbol};
+use crate::error_log;
+use std::collections::HashMap;
+use std::sync::{Arc, RwLock};
+
+/// 交易对下单过滤器
+///
+/// 由 exchangeInfo 的 PRICE_FILTER / LOT_SIZE / MIN_NOTIONAL 换算为 `precision` 下的整数，
+/// 启动时解析一次，之后的价格/数量取整和最小名义价值检查都是整数运算，不再做字符串推断。
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub struct SymbolFilters {
+    pub symbol: TradingSymbol,
+    /// 价格以 price_precision 位小数的 tick 表示，数量以 quantity_precision 位小数的 lot 表示
+    pub precision: SymbolPrecision,
+    /// 最小价格变动（tick 数），至少为 1
+    pub tick_size: u64,
+    /// 最小数量变动（lot 数），至少为 1
+    pub step_size: u64,
+    /// 最小下单数量（lot 数）
+    pub min_qty: u64,
+    /// 最小名义价值，单位为 tick * lot（即 10^-(price_precision + quantity_precision)）
+    pub min_notional: u64,
+}
+
+impl SymbolFilters {
+    /// 没有 exchangeInfo 时的兜底：使用 `TradingSymbol::get_precision()`，步长为 1，不限制最小值
+    pub fn fallback(symbol: TradingSymbol) -> Self {
+        Self {
+            symbol,
+            precision: symbol.get_precision(),
+            tick_size: 1,
+            step_size: 1,
+            min_qty: 0,
+            min_notional: 0,
+        }
+    }
+
+    /// 从 exchangeInfo 的单个交易对解析过滤器，`symbol` 为 `info.symbol` 转换后的交易对
+    ///
+    /// 精度取交易所声明精度和 tickSize/stepSize 小数位数中的较大者，保证步长可以用整数表示。
+    pub fn from_exchange_info(symbol: TradingSymbol, info: &ExchangeSymbolInfo) -> Result<Self, ParseDecimalError> {
+        let mut tick_size = None;
+        let mut lot_size = None;
+        let mut notional = None;
+        for filter in &info.filters {
+            match filter {
+                ExchangeSymbolFilter::PriceFilter { tick_size: tick, .. } => tick_size = Some(tick.as_str()),
+                ExchangeSymbolFilter::LotSize { step_size, min_qty, .. } => {
+                    lot_size = Some((step_size.as_str(), min_qty.as_str()))
+                }
+                ExchangeSymbolFilter::MinNotional { notional: value } => notional = Some(value.as_str()),
+                _ => {}
+            }
+        }
+
+        let price_precision = tick_size
+            .map(decimal_places)
+            .unwrap_or(0)
+            .max(info.price_precision);
+        let quantity_precision = lot_size
+            .map(|(step, min_qty)| decimal_places(step).max(decimal_places(min_qty)))
+            .unwrap_or(0)
+            .max(info.quantity_precision);
+        let precision = SymbolPrecision::new(price_precision, quantity_precision);
+
+        let tick_size = match tick_size {
+            Some(tick) => precision.parse_price(tick)?.max(1),
+            None => 1,
+        };
+        let (step_size, min_qty) = match lot_size {
+            Some((step, min_qty)) => (precision.parse_quantity(step)?.max(1), precision.parse_quantity(min_qty)?),
+            None => (1, 0),
+        };
+        let min_notional = match notional {
+            Some(value) => parse_fixed_u64(value, price_precision as u32 + quantity_precision as u32)?,
+            None => 0,
+        };
+
+        Ok(Self {
+            symbol,
+            precision,
+            tick_size,
+            step_size,
+            min_qty,
+            min_notional,
+        })
+    }
+
+    /// tick 取整到最近的 tickSize 倍数
+    #[inline]
+    pub fn round_price_ticks(&self, ticks: u64) -> u64 {
+        (ticks + self.tick_size / 2) / self.tick_size * self.tick_size
+    }
+
+    /// tick 向下取整到 tickSize 倍数
+    #[inline]
+    pub fn floor_price_ticks(&self, ticks: u64) -> u64 {
+        ticks - ticks % self.tick_size
+    }
+
+    /// tick 向上取整到 tickSize 倍数
+    #[inline]
+    pub fn ceil_price_ticks(&self, ticks: u64) -> u64 {
+        self.floor_price_ticks(ticks + self.tick_size - 1)
+    }
+
+    /// f64 价格换算为合法 tick（最近的 tickSize 倍数）
+    #[inline]
+    pub fn price_ticks(&self, price: f64) -> u64 {
+        self.round_price_ticks(self.precision.price_to_ticks(price))
+    }
+
+    /// lot 向下取整到 stepSize 倍数，下单数量不会超过请求数量
+    #[inline]
+    pub fn floor_quantity_lots(&self, lots: u64) -> u64 {
+        lots - lots % self.step_size
+    }
+
+    /// f64 数量换算为合法 lot（先按精度四舍五入消除浮点误差，再向下取整到 stepSize）
+    #[inline]
+    pub fn quantity_lots(&self, quantity: f64) -> u64 {
+        self.floor_quantity_lots(self.precision.quantity_to_lots(quantity))
+    }
+
+    /// 数量是否满足 LOT_SIZE 的最小下单量
+    #[inline]
+    pub fn meets_min_qty(&self, lots: u64) -> bool {
+        lots >= self.min_qty
+    }
+
+    /// 价格 * 数量是否满足 MIN_NOTIONAL
+    #[inline]
+    pub fn meets_min_notional(&self, price_ticks: u64, lots: u64) -> bool {
+        price_ticks as u128 * lots as u128 >= self.min_notional as u128
+    }
+
+    /// tick 格式化为下单价格字符串
+    pub fn format_price(&self, ticks: u64) -> String {
+        self.precision.format_price(ticks)
+    }
+
+    /// lot 格式化为下单数量字符串
+    pub fn format_quantity(&self, lots: u64) -> String {
+        self.precision.format_quantity(lots)
+    }
+
+    /// f64 价格取整到 tickSize 后格式化
+    pub fn format_price_f64(&self, price: f64) -> String {
+        self.format_price(self.price_ticks(price))
+    }
+
+    /// f64 数量向下取整到 stepSize 后格式化
+    pub fn format_quantity_f64(&self, quantity: f64) -> String {
+        self.format_quantity(self.quantity_lots(quantity))
+    }
+}
+
+/// 十进制字符串去掉尾随 0 后的小数位数，只在加载 exchangeInfo 时使用
+fn decimal_places(value: &str) -> u8 {
+    match value.split_once('.') {
+        Some((_, fraction)) => fraction.trim_end_matches('0').len() as u8,
+        None => 0,
+    }
+}
+
+/// 交易对过滤器缓存
+#[derive(Debug, Clone, Default)]
+pub struct SymbolFilterCache {
+    filters: HashMap<TradingSymbol, SymbolFilters>,
+}
+
+impl SymbolFilterCache {
+    pub fn new() -> Self {
+        Self::default()
+    }
+
+    /// 从 exchangeInfo 构建，解析失败的交易对退回 `SymbolFilters::fallback`
+    ///
+    /// `TradingSymbol` 无法表示的符号（如超长的 UTF-8 符号）跳过，不影响其他交易对。
+    pub fn from_exchange_info(info: &ExchangeInfo) -> Self {
+        let mut cache = Self::new();
+        for symbol_info in &info.symbols {
+            let Some(symbol) = TradingSymbol::try_from_symbol(&symbol_info.symbol) else {
+                error_log!(warn, "⚠️ 交易对符号无法表示，跳过: {}", symbol_info.symbol);
+                continue;
+            };
+            let filters = SymbolFilters::from_exchange_info(symbol, symbol_info)
+                .unwrap_or_else(|_| SymbolFilters::fallback(symbol));
+            cache.insert(filters);
+        }
+        cache
+    }
+
+    /// 从 exchangeInfo 的 JSON 文本构建
+    pub fn from_json(text: &str) -> serde_json::Result<Self> {
+        let info: ExchangeInfo = serde_json::from_str(text)?;
+        Ok(Self::from_exchange_info(&info))
+    }
+
+    /// 从本地 exchangeInfo 文件构建（离线环境或 REST 不可用时使用）
+    pub fn load_from_file(path: &str) -> anyhow::Result<Self> {
+        let text = std::fs::read_to_string(path)?;
+        Ok(Self::from_json(&text)?)
+    }
+
+    pub fn insert(&mut self, filters: SymbolFilters) {
+        self.filters.insert(filters.symbol, filters);
+    }
+
+    pub fn get(&self, symbol: TradingSymbol) -> Option<SymbolFilters> {
+        self.filters.get(&symbol).copied()
+    }
+
+    /// 查询过滤器，缓存中没有时退回交易对的默认精度
+    pub fn get_or_fallback(&self, symbol: TradingSymbol) -> SymbolFilters {
+        self.get(symbol).unwrap_or_else(|| SymbolFilters::fallback(symbol))
+    }
+
+    pub fn len(&self) -> usize {
+        self.filters.len()
+    }
+
+    pub fn is_empty(&self) -> bool {
+        self.filters.is_empty()
+    }
+}
+
+/// 进程内共享的过滤器缓存，启动时加载一次
+static SYMBOL_FILTERS: RwLock<Option<Arc<SymbolFilterCache>>> = RwLock::new(None);
+
+/// 安装全局过滤器缓存（替换已有的缓存）
+pub fn install_symbol_filters(cache: SymbolFilterCache) {
+    *SYMBOL_FILTERS.write().unwrap_or_else(|e| e.into_inner()) = Some(Arc::new(cache));
+}
+
+/// 查询全局过滤器缓存，未加载或缺少该交易对时退回默认精度
+///
+/// `SymbolFilters` 是 Copy 的，策略在构造时取一次保存即可，热路径上不需要再查表。
+pub fn symbol_filters(symbol: TradingSymbol) -> SymbolFilters {
+    SYMBOL_FILTERS
+        .read()
+        .unwrap_or_else(|e| e.into_inner())
+        .as_ref()
+        .map(|cache| cache.get_or_fallback(symbol))
+        .unwrap_or_else(|| SymbolFilters::fallback(symbol))
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    const EXCHANGE_INFO: &str = include_str!("../../exchange_info.json");
+
+    #[test]
+    fn test_load_exchange_info_fixture() {
+        let cache = SymbolFilterCache::from_json(EXCHANGE_INFO).unwrap();
+        assert!(!cache.is_empty());
+
+        let btc = cache.get(TradingSymbol::BTCUSDT).unwrap();
+        assert_eq!(btc.precision, SymbolPrecision::new(2, 3));
+        assert_eq!(btc.tick_size, 10);
+        assert_eq!(btc.step_size, 1);
+        assert_eq!(btc.min_notional, 100 * 100_000);
+
+        // 1000PEPEUSDT 映射到 PEPEUSDT
+        let pepe = cache.get(TradingSymbol::PEPEUSDT).unwrap();
+        assert_eq!(pepe.precision.price_precision, 7);
+    }
+
+    #[test]
+    fn test_rounding_and_min_notional() {
+        let btc = SymbolFilterCache::from_json(EXCHANGE_INFO)
+            .unwrap()
+            .get_or_fallback(TradingSymbol::BTCUSDT);
+
+        assert_eq!(btc.format_price_f64(118234.56), "118234.60");
+        assert_eq!(btc.floor_price_ticks(11_823_456), 11_823_450);
+        assert_eq!(btc.ceil_price_ticks(11_823_451), 11_823_460);
+        assert_eq!(btc.ceil_price_ticks(11_823_450), 11_823_450);
+
+        // 0.1 + 0.2 不会因为浮点误差被截断成 0.299
+        assert_eq!(btc.format_quantity_f64(0.1 + 0.2), "0.300");
+        let coarse = SymbolFilters { step_size: 5, ..btc };
+        assert_eq!(coarse.format_quantity_f64(0.0079), "0.005");
+
+        // MIN_NOTIONAL = 100 USDT
+        let price = btc.price_ticks(50_000.0);
+        assert!(!btc.meets_min_notional(price, btc.quantity_lots(0.001)));
+        assert!(btc.meets_min_notional(price, btc.quantity_lots(0.002)));
+        assert!(btc.meets_min_qty(1));
+        assert!(!btc.meets_min_qty(0));
+    }
+
+    #[test]
+    fn test_skips_unrepresentable_symbols() {
+        let text = r#"{"symbols":[
+            {"symbol":"币安人生USDT","pricePrecision":4,"quantityPrecision":0,"filters":[]},
+            {"symbol":"ASTERUSDT","pricePrecision":4,"quantityPrecision":2,"filters":[
+                {"filterType":"PRICE_FILTER","minPrice":"0.0001","maxPrice":"1000","tickSize":"0.0001"},
+                {"filterType":"MIN_NOTIONAL","notional":"5"}
+            ]}
+        ]}"#;
+        let cache = SymbolFilterCache::from_json(text).unwrap();
+        assert_eq!(cache.len(), 1);
+        let aster = cache.get(TradingSymbol::ASTERUSDT).unwrap();
+        assert_eq!(aster.tick_size, 1);
+        assert_eq!(aster.min_notional, 5 * 1_000_000);
+    }
+
+    #[test]
+    fn test_fallback_uses_symbol_precision() {
+        let cache = SymbolFilterCache::new();
+        let filters = cache.get_or_fallback(TradingSymbol::DOGEUSDT);
+        assert_eq!(filters.precision, TradingSymbol::DOGEUSDT.get_precision());
+        assert_eq!(filters.format_price_f64(0.123456), "0.12346");
+        assert!(filters.meets_min_notional(0, 0));
+    }
+}
@@ -0,0 +1,381 @@
+use crate::common::enums::Exchange;
+use crate::models::symbol::{SymbolPrecision, TradingSymbol};
+use serde::de::{self, Visitor};
+use serde::{Deserialize, Deserializer, Serialize, Serializer};
+use std::collections::HashMap;
+use std::fmt::{self, Display};
+use std::sync::{OnceLock, RwLock};
+
+/// 进程内最多可登记的交易对数量（预定义 + 自定义）
+pub const MAX_SYMBOLS: usize = 1024;
+
+/// 预定义交易对按枚举顺序占用固定 id，不需要查表
+const PREDEFINED: [TradingSymbol; 22] = [
+    TradingSymbol::BTCUSDT,
+    TradingSymbol::ETHUSDT,
+    TradingSymbol::SOLUSDT,
+    TradingSymbol::ADAUSDT,
+    TradingSymbol::XRPUSDT,
+    TradingSymbol::DOGEUSDT,
+    TradingSymbol::TURBOUSDT,
+    TradingSymbol::BNBUSDT,
+    TradingSymbol::AVAXUSDT,
+    TradingSymbol::MATICUSDT,
+    TradingSymbol::DOTUSDT,
+    TradingSymbol::LINKUSDT,
+    TradingSymbol::LTCUSDT,
+    TradingSymbol::UNIUSDT,
+    TradingSymbol::PEPEUSDT,
+    TradingSymbol::NEIROUSDT,
+    TradingSymbol::ONDOUSDT,
+    TradingSymbol::AAVEUSDT,
+    TradingSymbol::ASTERUSDT,
+    TradingSymbol::TAOUSDT,
+    TradingSymbol::GIGGLEUSDT,
+    TradingSymbol::AIAUSDT,
+];
+
+/// 交易对的稠密 id
+///
+/// 由进程内的符号表分配，预定义交易对的 id 固定为枚举顺序，自定义交易对在首次出现时依次分配。
+/// id 到各交易所名称、精度的查询是数组下标访问；按 id 建索引的表可以直接用 `index()` 做数组下标。
+#[derive(Debug, Clone, Copy, PartialEq, Eq, Hash, PartialOrd, Ord)]
+pub struct SymbolId(u16);
+
+/// 符号表中的一项，名称在登记时生成一次，之后只读
+#[derive(Debug)]
+pub struct SymbolEntry {
+    pub symbol: TradingSymbol,
+    pub precision: SymbolPrecision,
+    binance: &'static str,
+    binance_stream: &'static str,
+    mexc: &'static str,
+    aster: &'static str,
+    aster_stream: &'static str,
+}
+
+impl SymbolEntry {
+    fn new(symbol: TradingSymbol) -> Self {
+        let binance = symbol.as_str();
+        // MEXC 现货不使用 1000 倍合约前缀（1000PEPEUSDT -> PEPEUSDT）
+        let mexc = binance.strip_prefix("1000").unwrap_or(binance);
+        Self {
+            symbol,
+            precision: symbol.get_precision(),
+            binance: leak(binance.to_string()),
+            binance_stream: leak(binance.to_ascii_lowercase()),
+            mexc: leak(mexc.to_string()),
+            aster: leak(binance.to_string()),
+            aster_stream: leak(binance.to_ascii_lowercase()),
+        }
+    }
+}
+
+/// 符号表只增不减，名称与进程同生命周期，泄漏换取 `&'static str`
+fn leak(name: String) -> &'static str {
+    Box::leak(name.into_boxed_str())
+}
+
+static ENTRIES: [OnceLock<SymbolEntry>; MAX_SYMBOLS] = [const { OnceLock::new() }; MAX_SYMBOLS];
+
+/// 反查表按交易所分开：币安(含 OKX)、MEXC、Aster
+const NAME_TABLES: usize = 3;
+
+fn name_table(exchange: Exchange) -> usize {
+    match exchange {
+        Exchange::Binance | Exchange::Okex => 0,
+        Exchange::Mexc => 1,
+        Exchange::Aster => 2,
+    }
+}
+
+/// 名称 -> id 的反查表，只在解析外部输入时使用
+struct Interner {
+    ids: HashMap<TradingSymbol, SymbolId>,
+    by_name: [HashMap<&'static str, SymbolId>; NAME_TABLES],
+    next: u16,
+}
+
+impl Interner {
+    fn new() -> Self {
+        let mut interner = Self {
+            ids: HashMap::with_capacity(PREDEFINED.len()),
+            by_name: std::array::from_fn(|_| HashMap::with_capacity(PREDEFINED.len())),
+            next: PREDEFINED.len() as u16,
+        };
+        for (index, &symbol) in PREDEFINED.iter().enumerate() {
+            interner.register(SymbolId(index as u16), symbol);
+        }
+        interner
+    }
+
+    fn register(&mut self, id: SymbolId, symbol: TradingSymbol) {
+        let entry = ENTRIES[id.index()].get_or_init(|| SymbolEntry::new(symbol));
+        self.ids.insert(symbol, id);
+        for exchange in [Exchange::Binance, Exchange::Mexc, Exchange::Aster] {
+            self.by_name[name_table(exchange)].insert(id_name(entry, exchange), id);
+        }
+    }
+
+    fn intern(&mut self, symbol: TradingSymbol) -> SymbolId {
+        if let Some(&id) = self.ids.get(&symbol) {
+            return id;
+        }
+        if self.next as usize >= MAX_SYMBOLS {
+            panic!("Symbol table is full ({} symbols), cannot intern '{}'", MAX_SYMBOLS, symbol);
+        }
+        let id = SymbolId(self.next);
+        self.next += 1;
+        self.register(id, symbol);
+        id
+    }
+}
+
+/// 预定义交易对的固定 id（与 `PREDEFINED` 顺序一致）
+#[inline]
+fn predefined_index(symbol: TradingSymbol) -> Option<u16> {
+    let index = match symbol {
+        TradingSymbol::BTCUSDT => 0,
+        TradingSymbol::ETHUSDT => 1,
+        TradingSymbol::SOLUSDT => 2,
+        TradingSymbol::ADAUSDT => 3,
+        TradingSymbol::XRPUSDT => 4,
+        TradingSymbol::DOGEUSDT => 5,
+        TradingSymbol::TURBOUSDT => 6,
+        TradingSymbol::BNBUSDT => 7,
+        TradingSymbol::AVAXUSDT => 8,
+        TradingSymbol::MATICUSDT => 9,
+        TradingSymbol::DOTUSDT => 10,
+        TradingSymbol::LINKUSDT => 11,
+        TradingSymbol::LTCUSDT => 12,
+        TradingSymbol::UNIUSDT => 13,
+        TradingSymbol::PEPEUSDT => 14,
+        TradingSymbol::NEIROUSDT => 15,
+        TradingSymbol::ONDOUSDT => 16,
+        TradingSymbol::AAVEUSDT => 17,
+        TradingSymbol::ASTERUSDT => 18,
+        TradingSymbol::TAOUSDT => 19,
+        TradingSymbol::GIGGLEUSDT => 20,
+        TradingSymbol::AIAUSDT => 21,
+        TradingSymbol::Custom(_) => return None,
+    };
+    Some(index)
+}
+
+fn id_name(entry: &'static SymbolEntry, exchange: Exchange) -> &'static str {
+    match exchange {
+        Exchange::Binance | Exchange::Okex => entry.binance,
+        Exchange::Mexc => entry.mexc,
+        Exchange::Aster => entry.aster,
+    }
+}
+
+fn interner() -> &'static RwLock<Interner> {
+    static INTERNER: OnceLock<RwLock<Interner>> = OnceLock::new();
+    INTERNER.get_or_init(|| RwLock::new(Interner::new()))
+}
+
+impl SymbolId {
+    /// 登记交易对并返回 id，已登记的直接返回
+    pub fn intern(symbol: TradingSymbol) -> Self {
+        if let Some(index) = predefined_index(symbol) {
+            return SymbolId(index);
+        }
+        if let Some(&id) = interner().read().unwrap_or_else(|e| e.into_inner()).ids.get(&symbol) {
+            return id;
+        }
+        interner().write().unwrap_or_else(|e| e.into_inner()).intern(symbol)
+    }
+
+    /// 按交易所的交易对名称查询 id（如 MEXC 的 PEPEUSDT 与币安的 1000PEPEUSDT 是同一个 id），
+    /// 未登记的名称按币安命名登记
+    pub fn from_exchange_name(exchange: Exchange, name: &str) -> Self {
+        let id = interner().read().unwrap_or_else(|e| e.into_inner()).by_name[name_table(exchange)]
+            .get(name)
+            .copied();
+        if let Some(id) = id {
+            return id;
+        }
+        Self::intern(TradingSymbol::from_symbol(name))
+    }
+
+    /// 数组下标
+    #[inline]
+    pub const fn index(self) -> usize {
+        self.0 as usize
+    }
+
+    #[inline]
+    pub const fn as_u16(self) -> u16 {
+        self.0
+    }
+
+    /// id 对应的符号表项；预定义交易对在首次访问时生成
+    #[inline]
+    pub fn entry(self) -> &'static SymbolEntry {
+        let slot = &ENTRIES[self.index()];
+        match slot.get() {
+            Some(entry) => entry,
+            None => slot.get_or_init(|| SymbolEntry::new(PREDEFINED[self.index()])),
+        }
+    }
+
+    #[inline]
+    pub fn symbol(self) -> TradingSymbol {
+        self.entry().symbol
+    }
+
+    #[inline]
+    pub fn precision(self) -> SymbolPrecision {
+        self.entry().precision
+    }
+
+    /// 币安期货的交易对名称（REST / 下单使用）
+    #[inline]
+    pub fn as_str(self) -> &'static str {
+        self.entry().binance
+    }
+
+    /// 指定交易所的交易对名称
+    #[inline]
+    pub fn exchange_name(self, exchange: Exchange) -> &'static str {
+        id_name(self.entry(), exchange)
+    }
+
+    /// 指定交易所的 websocket stream 名称前缀（小写），不需要每次 `to_lowercase()`
+    #[inline]
+    pub fn stream_name(self, exchange: Exchange) -> &'static str {
+        let entry = self.entry();
+        match exchange {
+            Exchange::Aster => entry.aster_stream,
+            Exchange::Mexc => entry.mexc,
+            Exchange::Binance | Exchange::Okex => entry.binance_stream,
+        }
+    }
+}
+
+impl TradingSymbol {
+    /// 交易对在进程符号表中的 id
+    #[inline]
+    pub fn id(&self) -> SymbolId {
+        SymbolId::intern(*self)
+    }
+}
+
+impl From<TradingSymbol> for SymbolId {
+    fn from(symbol: TradingSymbol) -> Self {
+        SymbolId::intern(symbol)
+    }
+}
+
+impl From<&str> for SymbolId {
+    fn from(name: &str) -> Self {
+        SymbolId::intern(TradingSymbol::from_symbol(name))
+    }
+}
+
+impl From<String> for SymbolId {
+    fn from(name: String) -> Self {
+        SymbolId::from(name.as_str())
+    }
+}
+
+impl From<SymbolId> for TradingSymbol {
+    fn from(id: SymbolId) -> Self {
+        id.symbol()
+    }
+}
+
+impl Default for SymbolId {
+    fn default() -> Self {
+        TradingSymbol::default().id()
+    }
+}
+
+impl Display for SymbolId {
+    fn fmt(&self, f: &mut fmt::Formatter<'_>) -> fmt::Result {
+        f.write_str(self.as_str())
+    }
+}
+
+impl PartialEq<&str> for SymbolId {
+    fn eq(&self, other: &&str) -> bool {
+        self.as_str() == *other
+    }
+}
+
+impl PartialEq<TradingSymbol> for SymbolId {
+    fn eq(&self, other: &TradingSymbol) -> bool {
+        self.symbol() == *other
+    }
+}
+
+// 与 TradingSymbol 一致：序列化为交易对名称
+impl Serialize for SymbolId {
+    fn serialize<S>(&self, serializer: S) -> Result<S::Ok, S::Error>
+    where
+        S: Serializer,
+    {
+        serializer.serialize_str(self.as_str())
+    }
+}
+
+struct SymbolIdVisitor;
+
+impl<'de> Visitor<'de> for SymbolIdVisitor {
+    type Value = SymbolId;
+
+    fn expecting(&self, formatter: &mut fmt::Formatter) -> fmt::Result {
+        formatter.write_str("a trading symbol string")
+    }
+
+    fn visit_str<E: de::Error>(self, value: &str) -> Result<SymbolId, E> {
+        Ok(SymbolId::from(value))
+    }
+}
+
+impl<'de> Deserialize<'de> for SymbolId {
+    fn deserialize<D>(deserializer: D) -> Result<Self, D::Error>
+    where
+        D: Deserializer<'de>,
+    {
+        deserializer.deserialize_str(SymbolIdVisitor)
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_predefined_ids_are_fixed() {
+        assert_eq!(TradingSymbol::BTCUSDT.id().index(), 0);
+        assert_eq!(TradingSymbol::AIAUSDT.id().index(), PREDEFINED.len() - 1);
+        assert_eq!(TradingSymbol::PEPEUSDT.id().symbol(), TradingSymbol::PEPEUSDT);
+        assert_eq!(TradingSymbol::ETHUSDT.id().precision(), TradingSymbol::ETHUSDT.get_precision());
+    }
+
+    #[test]
+    fn test_exchange_names() {
+        let pepe = TradingSymbol::PEPEUSDT.id();
+        assert_eq!(pepe.as_str(), "1000PEPEUSDT");
+        assert_eq!(pepe.exchange_name(Exchange::Mexc), "PEPEUSDT");
+        assert_eq!(pepe.stream_name(Exchange::Binance), "1000pepeusdt");
+        assert_eq!(SymbolId::from_exchange_name(Exchange::Mexc, "PEPEUSDT"), pepe);
+        assert_eq!(SymbolId::from_exchange_name(Exchange::Binance, "1000PEPEUSDT"), pepe);
+    }
+
+    #[test]
+    fn test_custom_symbols_are_interned_once() {
+        let id = SymbolId::from("INTERNTESTUSDT");
+        assert!(id.index() >= PREDEFINED.len());
+        assert_eq!(SymbolId::from("INTERNTESTUSDT".to_string()), id);
+        assert_eq!(id.symbol(), TradingSymbol::from_symbol("INTERNTESTUSDT"));
+        assert_eq!(id, "INTERNTESTUSDT");
+        assert_eq!(id.to_string(), "INTERNTESTUSDT");
+        assert_eq!(SymbolId::from_exchange_name(Exchange::Aster, "INTERNTESTUSDT"), id);
+
+        let json = serde_json::to_string(&id).unwrap();
+        assert_eq!(serde_json::from_str::<SymbolId>(&json).unwrap(), id);
+    }
+}
@@ -0,0 +1,157 @@
+/// 固定容量的环形缓冲区（镜像存储）
+///
+/// 写满后覆盖最旧的元素。底层存储长度为 `2 * capacity`，每个元素同时写入
+/// `slot` 和 `slot + capacity` 两个位置，因此任意时刻按时间顺序排列的全部数据
+/// 都是底层 Vec 中的一段连续内存：
+/// - `as_slice` / `recent` / `range_by_key` 均返回零拷贝切片，不需要拼接两段
+/// - ta 库中以单个切片为输入的 `BatchTradeTickerf64` / `BatchOrderTickerf64` 可直接使用
+///
+/// 代价是每次写入两次 Copy，以及两倍的内存占用。
+#[derive(Debug, Clone)]
+pub struct TickRing<T> {
+    buf: Vec<T>,
+    capacity: usize,
+    /// 写满后下一次写入的位置，同时也是最旧元素所在位置
+    head: usize,
+}
+
+impl<T: Copy> TickRing<T> {
+    pub fn new(capacity: usize) -> Self {
+        Self {
+            buf: Vec::with_capacity(capacity * 2),
+            capacity,
+            head: 0,
+        }
+    }
+
+    /// 追加一个元素，写满后覆盖最旧的元素
+    #[inline]
+    pub fn push(&mut self, item: T) {
+        let cap = self.capacity;
+        if cap == 0 {
+            return;
+        }
+        if self.buf.len() < cap {
+            self.buf.push(item);
+            if self.buf.len() == cap {
+                // 首次写满时补齐镜像区，之后只做原地覆盖
+                self.buf.extend_from_within(..cap);
+            }
+        } else {
+            let head = self.head;
+            self.buf[head] = item;
+            self.buf[head + cap] = item;
+            self.head = if head + 1 == cap { 0 } else { head + 1 };
+        }
+    }
+
+    /// 按时间顺序（旧 -> 新）的全部数据
+    #[inline]
+    pub fn as_slice(&self) -> &[T] {
+        if self.buf.len() < self.capacity {
+            &self.buf
+        } else {
+            &self.buf[self.head..self.head + self.capacity]
+        }
+    }
+
+    /// 最新的 `count` 个元素
+    #[inline]
+    pub fn recent(&self, count: usize) -> &[T] {
+        let all = self.as_slice();
+        &all[all.len().saturating_sub(count)..]
+    }
+
+    #[inline]
+    pub fn latest(&self) -> Option<&T> {
+        self.as_slice().last()
+    }
+
+    /// `key` 落在 `[start, end]` 内的元素
+    ///
+    /// 要求 `key` 随写入顺序单调不减（如交易所时间戳），使用二分查找定位边界
+    pub fn range_by_key<F>(&self, start: u64, end: u64, key: F) -> &[T]
+    where
+        F: Fn(&T) -> u64,
+    {
+        let all = self.as_slice();
+        let lo = all.partition_point(|item| key(item) < start);
+        let hi = all.partition_point(|item| key(item) <= end);
+        if lo >= hi { &[] } else { &all[lo..hi] }
+    }
+
+    pub fn len(&self) -> usize {
+        self.buf.len().min(self.capacity)
+    }
+
+    pub fn is_empty(&self) -> bool {
+        self.buf.is_empty()
+    }
+
+    pub fn is_full(&self) -> bool {
+        self.capacity > 0 && self.buf.len() >= self.capacity
+    }
+
+    pub fn capacity(&self) -> usize {
+        self.capacity
+    }
+
+    /// 清空数据，保留已分配的内存
+    pub fn clear(&mut self) {
+        self.buf.clear();
+        self.head = 0;
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_overwrites_oldest_when_full() {
+        let mut ring = TickRing::new(3);
+        for i in 1..=2u64 {
+            ring.push(i);
+        }
+        assert_eq!(ring.as_slice(), &[1, 2]);
+        assert!(!ring.is_full());
+
+        for i in 3..=7u64 {
+            ring.push(i);
+        }
+        assert_eq!(ring.len(), 3);
+        assert_eq!(ring.as_slice(), &[5, 6, 7]);
+        assert_eq!(ring.recent(2), &[6, 7]);
+        assert_eq!(ring.recent(10), &[5, 6, 7]);
+        assert_eq!(ring.latest(), Some(&7));
+    }
+
+    #[test]
+    fn test_range_by_key_after_wraparound() {
+        let mut ring = TickRing::new(4);
+        for ts in [10u64, 20, 20, 30, 40, 50] {
+            ring.push(ts);
+        }
+        // 当前数据: [20, 30, 40, 50]
+        assert_eq!(ring.range_by_key(20, 40, |t| *t), &[20, 30, 40]);
+        assert_eq!(ring.range_by_key(25, 45, |t| *t), &[30, 40]);
+        assert!(ring.range_by_key(60, 70, |t| *t).is_empty());
+        assert!(ring.range_by_key(40, 30, |t| *t).is_empty());
+    }
+
+    #[test]
+    fn test_clear_and_zero_capacity() {
+        let mut ring = TickRing::new(2);
+        ring.push(1u64);
+        ring.push(2);
+        ring.push(3);
+        ring.clear();
+        assert!(ring.is_empty());
+        ring.push(4);
+        assert_eq!(ring.as_slice(), &[4]);
+
+        let mut empty = TickRing::new(0);
+        empty.push(1u64);
+        assert!(empty.is_empty());
+    }
+}
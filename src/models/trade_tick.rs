@@ -1,4 +1,6 @@
+use crate::dto::binance::borrowed::TradeRef;
 use crate::dto::binance::websocket::BinanceTradeData;
+use crate::models::tick_ring::TickRing;
 use crate::models::{Exchange, Side, TradingSymbol};
 use ta::{TradeTickerf64, Timestamp, BatchTradeTickerf64};
 /// 逐笔交易数据结构
@@ -31,54 +33,48 @@ impl Timestamp for TradeTick {
     }
 }
 /// 逐笔交易缓冲区
-/// 使用 VecDeque 存储，支持高效的双端操作
+/// 固定容量的环形缓冲区，写满后覆盖最旧的交易，所有视图均为零拷贝切片
 #[derive(Clone)]
 pub struct TradeTickBuffer {
-    trades: Vec<TradeTick>,
-    max_size: usize,
+    trades: TickRing<TradeTick>,
 }
 
 impl TradeTickBuffer {
     /// 创建新的交易缓冲区
     pub fn new(max_size: usize) -> Self {
         Self {
-            trades: Vec::with_capacity(max_size),
-            max_size,
+            trades: TickRing::new(max_size),
         }
     }
 
-    /// 添加新的交易（简单追加，不删除旧数据）
+    /// 添加新的交易（缓冲区已满时覆盖最旧的交易）
     pub fn push_trade(&mut self, trade: TradeTick) {
-        if self.trades.len() < self.max_size {
-            self.trades.push(trade);
-        }
+        self.trades.push(trade);
     }
 
     /// 获取最新的 N 笔交易（返回引用切片，零拷贝，推荐使用）
     pub fn get_recent_trades(&self, count: usize) -> &[TradeTick] {
-        let start = self.trades.len().saturating_sub(count);
-        &self.trades[start..]
+        self.trades.recent(count)
     }
 
     /// 获取最新的 N 笔交易（如果必须需要拥有数据）
     pub fn get_recent_trades_owned(&self, count: usize) -> Vec<TradeTick> {
-        let start = self.trades.len().saturating_sub(count);
-        self.trades[start..].iter().copied().collect()
+        self.trades.recent(count).to_vec()
     }
 
     /// 获取最新的 N 笔交易（返回迭代器，延迟求值）
     pub fn recent_trades_iter(&self, count: usize) -> impl Iterator<Item = &TradeTick> {
-        let start = self.trades.len().saturating_sub(count);
-        self.trades[start..].iter()
+        self.trades.recent(count).iter()
+    }
+
+    /// 获取最新的一笔交易
+    pub fn get_latest_trade(&self) -> Option<TradeTick> {
+        self.trades.latest().copied()
     }
 
-    /// 获取指定时间范围内的交易
-    pub fn get_trades_in_range(&self, start_time: u64, end_time: u64) -> Vec<TradeTick> {
-        self.trades
-            .iter()
-            .filter(|trade| trade.timestamp >= start_time && trade.timestamp <= end_time)
-            .cloned()
-            .collect()
+    /// 获取指定时间范围内的交易（二分查找，要求成交时间单调递增）
+    pub fn get_trades_in_range(&self, start_time: u64, end_time: u64) -> &[TradeTick] {
+        self.trades.range_by_key(start_time, end_time, |trade| trade.timestamp)
     }
 
     /// 获取缓冲区大小
@@ -91,27 +87,34 @@ impl TradeTickBuffer {
         self.trades.is_empty()
     }
 
+    /// 缓冲区容量
+    pub fn capacity(&self) -> usize {
+        self.trades.capacity()
+    }
+
     /// 清空缓冲区
     pub fn clear(&mut self) {
         self.trades.clear();
     }
 
+    /// 获取所有交易（按时间顺序，零拷贝）
+    pub fn as_slice(&self) -> &[TradeTick] {
+        self.trades.as_slice()
+    }
+
     /// 获取所有交易（按时间顺序）
     pub fn get_all_trades(&self) -> Vec<TradeTick> {
-        self.trades.iter().cloned().collect()
+        self.trades.as_slice().to_vec()
     }
 
     /// 克隆整个缓冲区（用于快照）
     pub fn clone_buffer(&self) -> TradeTickBuffer {
-        TradeTickBuffer {
-            trades: self.trades.clone(),
-            max_size: self.max_size,
-        }
+        self.clone()
     }
 }
 impl BatchTradeTickerf64<TradeTick> for TradeTickBuffer {
     fn get_batch_trade_ticker(&self) -> Option<&[TradeTick]> {
-        Some(&self.trades)
+        Some(self.trades.as_slice())
     }
 }
 /// 为 TradeTick 实现一些便利方法
@@ -130,6 +133,20 @@ impl TradeTick {
         }
     }
 
+    /// 从借用的成交推送构建，不经过 `BinanceTradeData`
+    pub fn new_from_binance_ref(data: &TradeRef<'_>) -> Self {
+        Self {
+            trade_id: data.trade_id,
+            symbol: data.symbol,
+            price: data.price,
+            quantity: data.quantity,
+            side: if data.is_buy() { Side::Buy } else { Side::Sell },
+            timestamp: data.trade_time as u64,
+            exchange: Exchange::Binance,
+            is_mm_buyer: data.is_buyer_maker,
+        }
+    }
+
     /// 计算交易金额
     pub fn amount(&self) -> f64 {
         self.price * self.quantity
@@ -176,4 +193,30 @@ mod tests {
         assert_eq!(recent.len(), 1);
         assert_eq!(recent[0].trade_id, 1);
     }
+
+    #[test]
+    fn test_trade_tick_buffer_overwrites_oldest() {
+        let mut buffer = TradeTickBuffer::new(3);
+        for i in 1..=5u64 {
+            buffer.push_trade(TradeTick {
+                trade_id: i,
+                symbol: TradingSymbol::BTCUSDT,
+                price: 50000.0,
+                quantity: 0.1,
+                side: Side::Buy,
+                timestamp: i * 1000,
+                exchange: Exchange::Binance,
+                is_mm_buyer: false,
+            });
+        }
+
+        assert_eq!(buffer.len(), 3);
+        assert_eq!(buffer.get_latest_trade().map(|t| t.trade_id), Some(5));
+        let ids: Vec<u64> = buffer.get_batch_trade_ticker().unwrap().iter().map(|t| t.trade_id).collect();
+        assert_eq!(ids, vec![3, 4, 5]);
+
+        let in_range = buffer.get_trades_in_range(3500, 5000);
+        assert_eq!(in_range.len(), 2);
+        assert_eq!(in_range[0].trade_id, 4);
+    }
 }
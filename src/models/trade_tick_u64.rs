@@ -1,9 +1,14 @@
+use crate::common::decimal::ParseDecimalError;
+use crate::dto::binance::borrowed::TradeStrRef;
 use crate::dto::binance::websocket::BinanceTradeData;
+use crate::models::symbol::SymbolPrecision;
+use crate::models::tick_ring::TickRing;
 use crate::models::{Exchange, Side, TradingSymbol};
-use crate::common::utils::f2u;
 
 
 /// 逐笔交易数据结构 (u64版本)
+///
+/// `price` 为交易对价格精度的整数 tick，`quantity` 为数量精度的整数 lot（见 `SymbolPrecision`）
 #[derive(Debug, Clone, Copy)]
 pub struct TradeTickU64 {
     pub trade_id: u64,
@@ -17,54 +22,48 @@ pub struct TradeTickU64 {
 
 
 /// 逐笔交易缓冲区 (u64版本)
-/// 使用 VecDeque 存储，支持高效的双端操作
+/// 固定容量的环形缓冲区，写满后覆盖最旧的交易，所有视图均为零拷贝切片
 #[derive(Clone)]
 pub struct TradeTickBufferU64 {
-    trades: Vec<TradeTickU64>,
-    max_size: usize,
+    trades: TickRing<TradeTickU64>,
 }
 
 impl TradeTickBufferU64 {
     /// 创建新的交易缓冲区
     pub fn new(max_size: usize) -> Self {
         Self {
-            trades: Vec::with_capacity(max_size),
-            max_size,
+            trades: TickRing::new(max_size),
         }
     }
 
-    /// 添加新的交易（简单追加，不删除旧数据）
+    /// 添加新的交易（缓冲区已满时覆盖最旧的交易）
     pub fn push_trade(&mut self, trade: TradeTickU64) {
-        if self.trades.len() < self.max_size {
-            self.trades.push(trade);
-        }
+        self.trades.push(trade);
     }
 
     /// 获取最新的 N 笔交易（返回引用切片，零拷贝，推荐使用）
     pub fn get_recent_trades(&self, count: usize) -> &[TradeTickU64] {
-        let start = self.trades.len().saturating_sub(count);
-        &self.trades[start..]
+        self.trades.recent(count)
     }
 
     /// 获取最新的 N 笔交易（如果必须需要拥有数据）
     pub fn get_recent_trades_owned(&self, count: usize) -> Vec<TradeTickU64> {
-        let start = self.trades.len().saturating_sub(count);
-        self.trades[start..].iter().copied().collect()
+        self.trades.recent(count).to_vec()
     }
 
     /// 获取最新的 N 笔交易（返回迭代器，延迟求值）
     pub fn recent_trades_iter(&self, count: usize) -> impl Iterator<Item = &TradeTickU64> {
-        let start = self.trades.len().saturating_sub(count);
-        self.trades[start..].iter()
+        self.trades.recent(count).iter()
+    }
+
+    /// 获取最新的一笔交易
+    pub fn get_latest_trade(&self) -> Option<TradeTickU64> {
+        self.trades.latest().copied()
     }
 
-    /// 获取指定时间范围内的交易
-    pub fn get_trades_in_range(&self, start_time: u64, end_time: u64) -> Vec<TradeTickU64> {
-        self.trades
-            .iter()
-            .filter(|trade| trade.timestamp >= start_time && trade.timestamp <= end_time)
-            .cloned()
-            .collect()
+    /// 获取指定时间范围内的交易（二分查找，要求成交时间单调递增）
+    pub fn get_trades_in_range(&self, start_time: u64, end_time: u64) -> &[TradeTickU64] {
+        self.trades.range_by_key(start_time, end_time, |trade| trade.timestamp)
     }
 
     /// 获取缓冲区大小
@@ -77,46 +76,85 @@ impl TradeTickBufferU64 {
         self.trades.is_empty()
     }
 
+    /// 缓冲区容量
+    pub fn capacity(&self) -> usize {
+        self.trades.capacity()
+    }
+
     /// 清空缓冲区
     pub fn clear(&mut self) {
         self.trades.clear();
     }
 
+    /// 获取所有交易（按时间顺序，零拷贝）
+    pub fn as_slice(&self) -> &[TradeTickU64] {
+        self.trades.as_slice()
+    }
+
     /// 获取所有交易（按时间顺序）
     pub fn get_all_trades(&self) -> Vec<TradeTickU64> {
-        self.trades.iter().cloned().collect()
+        self.trades.as_slice().to_vec()
     }
 
     /// 克隆整个缓冲区（用于快照）
     pub fn clone_buffer(&self) -> TradeTickBufferU64 {
-        TradeTickBufferU64 {
-            trades: self.trades.clone(),
-            max_size: self.max_size,
+        self.clone()
+    }
+
+    /// 主动买入成交量占比，整数累加，最后做一次除法；没有成交时返回 0.5
+    pub fn taker_buy_ratio(&self) -> f64 {
+        let (buy, total) = self.trades.as_slice().iter().fold((0u128, 0u128), |(buy, total), trade| {
+            let quantity = trade.quantity as u128;
+            (if trade.is_buy() { buy + quantity } else { buy }, total + quantity)
+        });
+        if total == 0 {
+            0.5
+        } else {
+            buy as f64 / total as f64
         }
     }
 }
 
 /// 为 TradeTickU64 实现一些便利方法
 impl TradeTickU64 {
-    /// 从 BinanceTradeData 创建 TradeTickU64
+    /// 从已解析为 f64 的 BinanceTradeData 换算（按精度四舍五入）
+    ///
+    /// 热路径应使用 `new_from_binance_ref`，直接解析推送中的原始字符串。
     pub fn new_from_binance(data: BinanceTradeData) -> Self {
+        let precision = data.symbol.get_precision();
         Self {
             trade_id: data.trade_id,
             symbol: data.symbol,
-            price: f2u(data.price),
-            quantity: f2u(data.quantity),
+            price: precision.price_to_ticks(data.price),
+            quantity: precision.quantity_to_lots(data.quantity),
             side: if data.is_buy() { Side::Buy } else { Side::Sell },
             timestamp: data.trade_time as u64,
             exchange: Exchange::Binance,
         }
     }
 
-    /// 计算交易金额
+    /// 从借用的成交推送的价格/数量字符串直接解析为 tick / lot，不经过 f64
+    pub fn new_from_binance_ref(data: &TradeStrRef<'_>) -> Result<Self, ParseDecimalError> {
+        let precision = data.symbol.get_precision();
+        Ok(Self {
+            trade_id: data.trade_id,
+            symbol: data.symbol,
+            price: precision.parse_price(data.price)?,
+            quantity: precision.parse_quantity(data.quantity)?,
+            side: if data.is_buy() { Side::Buy } else { Side::Sell },
+            timestamp: data.trade_time as u64,
+            exchange: Exchange::Binance,
+        })
+    }
+
+    /// 该交易对的价格/数量精度
+    pub fn precision(&self) -> SymbolPrecision {
+        self.symbol.get_precision()
+    }
+
+    /// 计算交易金额（以价格 tick 为单位）
     pub fn amount(&self) -> u64 {
-        // 注意：这里需要先除以 PARSE_DECIMAL 再相乘，避免溢出
-        // 或者使用更大的整数类型
-        // 简化版本：直接相乘，但需要注意精度
-        (self.price as u128 * self.quantity as u128 / 100_000_000) as u64
+        (self.price as u128 * self.quantity as u128 / self.precision().quantity_scale() as u128) as u64
     }
 
     /// 检查是否为买单
@@ -159,5 +197,23 @@ mod tests {
         assert_eq!(recent.len(), 1);
         assert_eq!(recent[0].trade_id, 1);
     }
+
+    #[test]
+    fn test_binance_trade_ticks() {
+        let text = r#"{"e":"trade","E":1,"T":2,"s":"BTCUSDT","t":7,"p":"118234.60","q":"0.004","X":"MARKET","m":false}"#;
+        let trade = TradeTickU64::new_from_binance(serde_json::from_str(text).unwrap());
+        assert_eq!(trade.price, 11_823_460);
+        assert_eq!(trade.quantity, 4);
+        // 118234.60 * 0.004 = 472.9384 -> 47293 tick（向下取整）
+        assert_eq!(trade.amount(), 47_293);
+
+        let mut buffer = TradeTickBufferU64::new(4);
+        assert_eq!(buffer.taker_buy_ratio(), 0.5);
+        buffer.push_trade(trade);
+        buffer.push_trade(TradeTickU64::new_from_binance_ref(
+            &serde_json::from_str(&text.replace(r#""m":false"#, r#""m":true"#).replace(r#""0.004""#, r#""0.012""#)).unwrap(),
+        ).unwrap());
+        assert_eq!(buffer.taker_buy_ratio(), 0.25);
+    }
 }
 
@@ -1,54 +1,89 @@
-use crate::common::enums::{Exchange, StrategyName};
+use crate::common::consts::DEFAULT_MAX_CONCURRENT_SIGNALS;
+use crate::common::enums::{Exchange, PositionSide, StrategyName};
+use crate::common::latency::LatencyStats;
+use crate::dto::binance::rest_api::OrderResponse;
 use crate::exchange_api::binance::api::BinanceFuturesApi;
-use crate::models::{Signal, TradingSignal, TradingSymbol};
+use crate::models::{FillEvent, HftPositionKey, HftPositionManager, PositionReader, Side, Signal, SymbolId, TradingSignal};
 use anyhow::Result;
 use std::collections::HashMap;
-use std::str::FromStr;
-use tokio::sync::mpsc;
+use std::sync::{Arc, RwLock};
+use std::time::Instant;
+use tokio::sync::mpsc::error::TrySendError;
+use tokio::sync::{mpsc, Semaphore};
+use tokio::task::JoinSet;
 // 导入日志宏
 use crate::{signal_log, order_log, error_log};
 
 #[derive(Debug, Clone, PartialEq, Eq, Hash, Copy)]
 pub struct PositionKey {
     exchange: Exchange,
-    symbol: TradingSymbol,
+    symbol: SymbolId,
     strategy: StrategyName,
 }
 impl PositionKey {
-    pub fn new(exchange: Exchange, symbol: TradingSymbol, strategy: StrategyName) -> Self {
+    pub fn new(exchange: Exchange, symbol: impl Into<SymbolId>, strategy: StrategyName) -> Self {
         PositionKey {
             exchange,
-            symbol,
+            symbol: symbol.into(),
             strategy,
         }
     }
 }
-#[derive(Debug, Clone, Copy)]
-pub struct Position {
-    entry_price: f64,
-    amount: f64,
-    unrealized_pnl: f64,
-    realized_pnl: Option<f64>,
-    last_updated_time: u64,
-    created_time: u64,
+
+/// 信号是否为平仓信号
+fn is_closing_signal(signal: &TradingSignal) -> bool {
+    matches!(&signal.signal, Signal::Market(market_signal) if market_signal.is_closed)
+}
+
+/// 信号作用的仓位键：开仓买入/平仓卖出对应多头，开仓卖出/平仓买入对应空头
+pub fn position_key_by_signal(signal: &TradingSignal) -> HftPositionKey {
+    let side = match (signal.side, is_closing_signal(signal)) {
+        (Side::Buy, false) | (Side::Sell, true) => PositionSide::Long,
+        (Side::Sell, false) | (Side::Buy, true) => PositionSide::Short,
+    };
+    HftPositionKey::new(signal.exchange(), signal.symbol, signal.strategy, side)
 }
-#[derive(Debug)]
+
+/// 由信号构造成交事件（平仓信号的成交为减仓）
+pub fn fill_from_signal(signal: &TradingSignal, quantity: f64, price: f64) -> FillEvent {
+    FillEvent {
+        key: position_key_by_signal(signal),
+        quantity,
+        price,
+        reduce_only: is_closing_signal(signal),
+    }
+}
+
+/// 信号层的仓位视图
+///
+/// 仓位本身存放在共享的 `HftPositionManager` 中，只由成交回报更新；
+/// 这里只保存开仓资金配置，所有查询都是 `&self` 的无锁读取。
+#[derive(Clone)]
 pub struct PositionManager {
-    positions: HashMap<PositionKey, Position>,
-    all_pnl: f64,
+    positions: Arc<HftPositionManager>,
     balance: f64,
-    open_amount_ratio:HashMap<PositionKey, f64>,
+    open_amount_ratio: HashMap<PositionKey, f64>,
 }
 
 impl PositionManager {
     pub fn new(balance: f64) -> Self {
+        Self::with_positions(balance, Arc::new(HftPositionManager::new()))
+    }
+
+    /// 使用已有的仓位引擎（多个组件共享同一份仓位）
+    pub fn with_positions(balance: f64, positions: Arc<HftPositionManager>) -> Self {
         Self {
-            positions: HashMap::new(),
-            all_pnl: 0.0,
+            positions,
             balance,
             open_amount_ratio: HashMap::new(),
         }
     }
+
+    /// 策略使用的只读仓位句柄
+    pub fn reader(&self) -> PositionReader {
+        self.positions.reader()
+    }
+
     pub fn set_open_amount_ratio(&mut self, k: PositionKey, v: f64) {
         self.open_amount_ratio.insert(k, v);
     }
@@ -60,73 +95,102 @@ impl PositionManager {
     }
 
     pub fn get_position_key_by_signal(&self, signal: &TradingSignal) -> Result<PositionKey> {
-        let symbol = TradingSymbol::from_str(&signal.symbol)
-        .map_err(|_| anyhow::anyhow!("Invalid symbol: {}", signal.symbol))?;
-        let key = PositionKey::new(signal.exchange(), symbol, signal.strategy);
+        let key = PositionKey::new(signal.exchange(), signal.symbol, signal.strategy);
         Ok(key)
     }
-    pub fn set_position(&mut self, k: PositionKey, v: Position) {
-        self.positions.insert(k, v);
+
+    /// 成交回报更新仓位
+    pub fn apply_fill(&self, fill: &FillEvent) -> Result<f64, String> {
+        self.positions.apply_fill(fill)
     }
-    
-    pub fn remove_position(&mut self, k: PositionKey) {
-        self.positions.remove(&k);
+
+    /// 清除 (exchange, symbol, strategy) 下的多空仓位
+    pub fn remove_position(&self, k: PositionKey) {
+        self.positions.clear_strategy_positions(k.exchange, k.symbol, k.strategy);
     }
-    
-    pub fn update_position(&mut self, k: PositionKey, quantity: f64) {
-        if let Some(position) = self.positions.get_mut(&k) {
-            position.amount = quantity;
-        }
+
+    /// (exchange, symbol, strategy) 下的持仓数量（多空之和）
+    pub fn get_position_quantity(&self, k: PositionKey) -> f64 {
+        self.positions.strategy_quantity(k.exchange, k.symbol, k.strategy)
     }
-    
-    pub fn get_position(&self, k: PositionKey) -> Option<Position> {
-        self.positions.get(&k).cloned()
+
+    pub fn remove_position_by_signal(&self, signal: &TradingSignal) {
+        let key = PositionKey::new(signal.exchange(), signal.symbol, signal.strategy);
+        self.remove_position(key);
     }
     
-    pub fn get_position_quantity(&self, k: PositionKey) -> f64 {
-        self.positions
-            .get(&k)
-            .map(|position| position.amount)
-            .unwrap_or(0.0)
+    pub fn get_position_quantity_by_signal(&self, signal: &TradingSignal) -> f64 {
+        let key = PositionKey::new(signal.exchange(), signal.symbol, signal.strategy);
+        self.get_position_quantity(key)
     }
-    
-    pub fn get_position_by_key(&self, key: PositionKey) -> Option<Position> {
-        self.positions.get(&key).cloned()
+
+    /// 信号可平仓的数量（只看信号对应方向的仓位）
+    pub fn get_closable_quantity_by_signal(&self, signal: &TradingSignal) -> f64 {
+        self.positions.get_closable_quantity(&position_key_by_signal(signal))
     }
-    
-    pub fn set_position_by_signal(&mut self, signal: &TradingSignal, quantity: f64) {
-        // 从 TradingSignal 中提取信息创建 PositionKey
-        let symbol = TradingSymbol::from_str(&signal.symbol).unwrap_or(TradingSymbol::BTCUSDT);
-        let key = PositionKey::new(signal.exchange(), symbol, signal.strategy);
-        
-        let position = Position {
-            entry_price: signal.latest_price,
-            amount: quantity,
-            unrealized_pnl: 0.0,
-            realized_pnl: None,
-            last_updated_time: signal.timestamp(),
-            created_time: signal.timestamp(),
-        };
-        
-        self.positions.insert(key, position);
+}
+/// 单个通道默认排队的信号上限，满了新信号被拒绝，分发循环不等待该通道
+const LANE_CAPACITY: usize = 64;
+
+/// 各信号通道的排队耗时（从分发到开始执行，含等待并发名额的时间）和被拒绝的信号数
+///
+/// 句柄可以克隆，在启动 `process_signals` 前取得即可在运行期间读取；
+/// 只有新通道出现或信号被拒绝时才写锁，记录耗时本身是原子操作。
+#[derive(Debug, Clone, Default)]
+pub struct LaneWaitStats {
+    lanes: Arc<RwLock<HashMap<PositionKey, Arc<LatencyStats>>>>,
+    rejected: Arc<RwLock<HashMap<PositionKey, u64>>>,
+}
+
+impl LaneWaitStats {
+    /// 通道的统计，不存在时创建
+    fn lane(&self, key: PositionKey) -> Arc<LatencyStats> {
+        if let Some(stats) = self.get(&key) {
+            return stats;
+        }
+        let mut lanes = self.lanes.write().unwrap_or_else(|e| e.into_inner());
+        Arc::clone(lanes.entry(key).or_default())
     }
-    
-    pub fn remove_position_by_signal(&mut self, signal: &TradingSignal) {
-        let symbol = TradingSymbol::from_str(&signal.symbol).unwrap_or(TradingSymbol::BTCUSDT);
-        let key = PositionKey::new(signal.exchange(), symbol, signal.strategy);
-        self.positions.remove(&key);
+
+    pub fn get(&self, key: &PositionKey) -> Option<Arc<LatencyStats>> {
+        self.lanes.read().unwrap_or_else(|e| e.into_inner()).get(key).cloned()
     }
-    
-    pub fn get_position_quantity_by_signal(&self, signal: &TradingSignal) -> f64 {
-        let symbol = TradingSymbol::from_str(&signal.symbol).unwrap_or(TradingSymbol::BTCUSDT);
-        let key = PositionKey::new(signal.exchange(), symbol, signal.strategy);
-        self.get_position_quantity(key)
+
+    /// 通道已满时被拒绝的信号数
+    pub fn rejected(&self, key: &PositionKey) -> u64 {
+        self.rejected.read().unwrap_or_else(|e| e.into_inner()).get(key).copied().unwrap_or(0)
+    }
+
+    fn record_rejected(&self, key: PositionKey) -> u64 {
+        let mut rejected = self.rejected.write().unwrap_or_else(|e| e.into_inner());
+        let count = rejected.entry(key).or_default();
+        *count += 1;
+        *count
+    }
+
+    /// 全部通道的统计
+    pub fn snapshot(&self) -> Vec<(PositionKey, Arc<LatencyStats>)> {
+        self.lanes
+            .read()
+            .unwrap_or_else(|e| e.into_inner())
+            .iter()
+            .map(|(key, stats)| (*key, Arc::clone(stats)))
+            .collect()
     }
 }
+
+/// 信号管理器
+///
+/// 信号按 (交易所, 交易对, 策略) 分到各自的通道：同一通道内按到达顺序串行执行，
+/// 仓位检查、下单和成交记账对同一个键不会交错；不同通道并发执行，
+/// 同时在下单的通道数不超过 `max_concurrent`，一个交易对的慢订单不会拖住其他交易对的平仓。
 pub struct SignalManager {
     pub position_manager: PositionManager,
     pub signal_receiver: mpsc::Receiver<TradingSignal>,
     binance_client: BinanceFuturesApi,
+    max_concurrent: usize,
+    lane_capacity: usize,
+    lane_wait: LaneWaitStats,
 }
 
 impl SignalManager {
@@ -140,6 +204,9 @@ impl SignalManager {
             position_manager,
             signal_receiver,
             binance_client,
+            max_concurrent: DEFAULT_MAX_CONCURRENT_SIGNALS,
+            lane_capacity: LANE_CAPACITY,
+            lane_wait: LaneWaitStats::default(),
         }
     }
 
@@ -152,14 +219,37 @@ impl SignalManager {
     ) -> Self {
         let binance_client = BinanceFuturesApi::new(api_key, secret_key);
         let position_manager = PositionManager::new(balance);
-        Self {
-            position_manager,
-            signal_receiver,
-            binance_client,
-        }
+        Self::new_with_client(signal_receiver, position_manager, binance_client)
+    }
+
+    /// 设置最多同时执行的通道数（至少为 1）
+    pub fn with_max_concurrent(mut self, max_concurrent: usize) -> Self {
+        self.max_concurrent = max_concurrent.max(1);
+        self
+    }
+
+    /// 设置单个通道排队的信号上限（至少为 1）
+    pub fn with_lane_capacity(mut self, lane_capacity: usize) -> Self {
+        self.lane_capacity = lane_capacity.max(1);
+        self
     }
 
+    /// 各通道排队耗时的句柄
+    pub fn lane_wait_stats(&self) -> LaneWaitStats {
+        self.lane_wait.clone()
+    }
+
+    /// 分发信号直到信号通道关闭，然后等待所有通道执行完已排队的信号
+    ///
+    /// 分发不等待任何通道：某个通道积压满时新信号被拒绝并计数，其他键的信号照常分发。
     pub async fn process_signals(&mut self) -> Result<()> {
+        let executor = Arc::new(SignalExecutor {
+            position_manager: self.position_manager.clone(),
+            binance_client: self.binance_client.clone(),
+        });
+        let permits = Arc::new(Semaphore::new(self.max_concurrent));
+        let mut lanes: HashMap<PositionKey, mpsc::Sender<(TradingSignal, Instant)>> = HashMap::new();
+        let mut lane_tasks = JoinSet::new();
 
         while let Some(signal) = self.signal_receiver.recv().await {
             signal_log!(info, "📥 接收到信号: 策略={:?}, 交易对={}, 方向={:?}",
@@ -168,34 +258,84 @@ impl SignalManager {
                 signal.side
             );
 
-            // 直接处理信号，使用借用的 client
-            let strategy = signal.strategy;
-            let result = self.process_single_signal(signal).await;
-            match &result {
-                Ok(_) => signal_log!(info, "✅ 信号处理成功: 策略={:?}", strategy),
-                Err(e) => error_log!(error, "❌ 信号处理失败: 策略={:?}, 错误: {}", strategy, e),
+            let key = PositionKey::new(signal.exchange(), signal.symbol, signal.strategy);
+            let lane = lanes.entry(key).or_insert_with(|| {
+                let (lane_tx, lane_rx) = mpsc::channel(self.lane_capacity);
+                lane_tasks.spawn(run_lane(
+                    key,
+                    lane_rx,
+                    Arc::clone(&executor),
+                    Arc::clone(&permits),
+                    self.lane_wait.lane(key),
+                ));
+                lane_tx
+            });
+            match lane.try_send((signal, Instant::now())) {
+                Ok(()) => {}
+                Err(TrySendError::Full((signal, _))) => {
+                    let rejected = self.lane_wait.record_rejected(key);
+                    error_log!(error, "❌ 信号通道 {:?} 已满，拒绝信号 id={} (累计拒绝 {} 条)",
+                        key, signal.id, rejected);
+                }
+                Err(TrySendError::Closed(_)) => {
+                    error_log!(error, "❌ 信号通道 {:?} 已退出，信号被丢弃", key);
+                }
             }
+        }
 
-            // 如果处理失败，可以选择是否继续处理下一个信号
-            if result.is_err() {
-                tracing::warn!("⚠️ 信号处理失败，继续处理下一个信号");
+        // 关闭所有通道，等待已排队的信号执行完
+        drop(lanes);
+        while let Some(joined) = lane_tasks.join_next().await {
+            if let Err(e) = joined {
+                error_log!(error, "❌ 信号通道任务异常退出: {}", e);
             }
         }
 
+        for (key, wait) in self.lane_wait.snapshot() {
+            signal_log!(info, "⏱️ 通道 {:?} 排队耗时: {} 次, 平均 {:?}, 最大 {:?}, 拒绝 {} 条",
+                key, wait.count(), wait.mean(), wait.max(), self.lane_wait.rejected(&key));
+        }
         tracing::info!("🎉 所有信号处理完成");
         Ok(())
     }
+}
+
+/// 单个通道的执行循环：按顺序取信号，拿到并发名额后执行
+async fn run_lane(
+    key: PositionKey,
+    mut signals: mpsc::Receiver<(TradingSignal, Instant)>,
+    executor: Arc<SignalExecutor>,
+    permits: Arc<Semaphore>,
+    wait: Arc<LatencyStats>,
+) {
+    while let Some((signal, queued_at)) = signals.recv().await {
+        let _permit = permits.acquire().await.expect("信号并发名额不会被关闭");
+        let waited = queued_at.elapsed();
+        wait.record(waited);
+        signal_log!(debug, "⏱️ 通道 {:?} 信号排队 {:?}", key, waited);
+
+        let strategy = signal.strategy;
+        match executor.process_single_signal(signal).await {
+            Ok(_) => signal_log!(info, "✅ 信号处理成功: 策略={:?}", strategy),
+            // 处理失败只影响这一条信号，通道继续处理下一个
+            Err(e) => error_log!(error, "❌ 信号处理失败: 策略={:?}, 错误: {}", strategy, e),
+        }
+    }
+}
 
-    async fn process_single_signal(&mut self, signal: TradingSignal) -> Result<()> {
+/// 通道共享的执行上下文
+struct SignalExecutor {
+    position_manager: PositionManager,
+    binance_client: BinanceFuturesApi,
+}
+
+impl SignalExecutor {
+    async fn process_single_signal(&self, signal: TradingSignal) -> Result<()> {
         let mut signal = signal; // may adjust quantity for close signals
         let strategy = signal.strategy;
 
         // 1. 检查信号类型并处理仓位
-        let is_closing_signal = if let Signal::Market(market_signal) = &signal.signal {
-            market_signal.is_closed
-        } else {
-            false
-        };
+        let is_closing_signal = is_closing_signal(&signal);
 
         // 检查是否为止损触发信号
         let is_stop_loss_triggered = if let Signal::Market(market_signal) = &signal.signal {
@@ -205,7 +345,7 @@ impl SignalManager {
         };
 
         if is_stop_loss_triggered {
-            // 止损触发：重置仓位状态，但不执行实际交易
+            // 止损触发：交易所的止损单已经成交，重置仓位状态，但不执行实际交易
             self.position_manager.remove_position_by_signal(&signal);
             tracing::info!(
                 "🛑 止损触发信号处理: 策略 {:?}, 交易对: {}, 重置仓位状态",
@@ -215,9 +355,9 @@ impl SignalManager {
             return Ok(()); // 直接返回，不执行订单
         }
 
-        let original_position = if is_closing_signal {
-            // 平仓信号：先保存原始仓位，然后清零
-            let current_position = self.position_manager.get_position_quantity_by_signal(&signal);
+        if is_closing_signal {
+            // 平仓信号：平掉信号对应方向的全部仓位
+            let current_position = self.position_manager.get_closable_quantity_by_signal(&signal);
             
             if current_position <= 0.0 {
                 tracing::warn!(
@@ -231,17 +371,12 @@ impl SignalManager {
 
             // 在发送到交易所前，将平仓信号数量设置为当前持仓数量
             signal.quantity = current_position;
-
-            // 清零内存仓位
-            self.position_manager.set_position_by_signal(&signal, 0.0);
             tracing::info!(
-                "📤 处理平仓信号: 策略 {:?}, 交易对: {}, 原始仓位: {}, 清零仓位",
+                "📤 处理平仓信号: 策略 {:?}, 交易对: {}, 当前仓位: {}",
                 strategy,
                 signal.symbol,
                 current_position
             );
-            
-            current_position // 保存原始仓位用于回滚
         } else {
             // 开仓信号：先检查是否已有仓位
             let current_position = self.position_manager.get_position_quantity_by_signal(&signal);
@@ -257,61 +392,166 @@ impl SignalManager {
                 return Ok(()); // 直接返回，不执行订单
             }
 
-            // 没有仓位，可以开仓
             tracing::info!(
-                "📤 处理开仓信号: 策略 {:?}, 交易对: {}, 设置仓位为 {}",
+                "📤 处理开仓信号: 策略 {:?}, 交易对: {}, 数量 {}",
                 strategy,
                 signal.symbol,
                 signal.quantity
             );
-            
-            // 先设置仓位
-            self.position_manager.set_position_by_signal(&signal, signal.quantity);
-            0.0 // 开仓信号没有原始仓位
-        };
+        }
 
-        // 2. 执行订单 - 使用借用的 client
-        match self.binance_client.signal_to_order(&signal).await {
-            Ok(order_ids) => {
+        // 2. 执行订单 - 仓位只在成交后更新，下单失败不需要回滚
+        match self.binance_client.signal_to_order_responses(&signal).await {
+            Ok(responses) => {
+                for fill in market_fills(&signal, &responses) {
+                    if let Err(e) = self.position_manager.apply_fill(&fill) {
+                        error_log!(error, "❌ 成交更新仓位失败: 策略 {:?}, 交易对: {}, 错误: {}", strategy, signal.symbol, e);
+                    }
+                }
                 order_log!(info, "✅ 订单执行成功: 策略 {:?}, 交易对: {}, 方向: {:?}, 数量: {}, 订单ID: {:?}",
                     strategy,
                     signal.symbol,
                     signal.side,
                     signal.quantity,
-                    order_ids
+                    responses.iter().map(|order| order.order_id).collect::<Vec<_>>()
                 );
                 Ok(())
             }
             Err(e) => {
-                // 订单执行失败，回滚仓位
-                if is_closing_signal {
-                    // 平仓失败：回滚到原始仓位
-                    self.position_manager.set_position_by_signal(&signal, original_position);
-                    tracing::error!(
-                        "❌ 平仓订单执行失败，回滚仓位: 策略 {:?}, 交易对: {}, 回滚到: {}",
-                        strategy,
-                        signal.symbol,
-                        original_position
-                    );
-                } else {
-                    // 开仓失败：移除仓位
-                    self.position_manager.remove_position_by_signal(&signal);
-                    tracing::error!("❌ 开仓订单执行失败，移除仓位: 策略 {:?}, 交易对: {}", strategy, signal.symbol);
-                }
-
-                tracing::error!("❌ 订单执行失败: {}", e);
+                tracing::error!("❌ 订单执行失败: 策略 {:?}, 交易对: {}, 仓位保持不变: {}", strategy, signal.symbol, e);
                 Err(anyhow::anyhow!("Failed to place orders: {}", e))
             }
         }
     }
 }
 
+/// 从下单回报中提取主市价单的成交
+///
+/// 止损/止盈条件单下单时不会成交，只取 MARKET 类型的回报。只有状态为 FILLED /
+/// PARTIALLY_FILLED 且带成交数量和均价的回报才记账，按交易所报告的数量和价格；
+/// ACK / NEW / EXPIRED 等没有成交的回报只记录日志，不推测成交。
+fn market_fills(signal: &TradingSignal, responses: &[OrderResponse]) -> Vec<FillEvent> {
+    responses
+        .iter()
+        .filter(|order| order.order_type == "MARKET")
+        .filter_map(|order| {
+            let executed = order.executed_qty.parse::<f64>().unwrap_or(0.0);
+            let avg_price = order.avg_price.parse::<f64>().unwrap_or(0.0);
+            let filled = matches!(order.status.as_str(), "FILLED" | "PARTIALLY_FILLED");
+            if filled && executed > 0.0 && avg_price > 0.0 {
+                Some(fill_from_signal(signal, executed, avg_price))
+            } else {
+                order_log!(warn, "⚠️ 订单 {} 回报没有成交: 状态={}, 成交数量={}, 均价={}，仓位不更新",
+                    order.order_id, order.status, order.executed_qty, order.avg_price);
+                None
+            }
+        })
+        .collect()
+}
+
 #[cfg(test)]
 mod tests {
     use super::*;
     use crate::common::config::user_config::load_binance_user_config;
     use crate::models::Side;
 
+    fn order_response(order_id: i64, order_type: &str, status: &str, executed_qty: &str, avg_price: &str) -> OrderResponse {
+        serde_json::from_value(serde_json::json!({
+            "cumQty": executed_qty, "cumQuote": "0", "executedQty": executed_qty, "orderId": order_id,
+            "avgPrice": avg_price, "origQty": "1", "price": "0", "reduceOnly": false, "side": "BUY",
+            "positionSide": "BOTH", "status": status, "stopPrice": "0", "closePosition": false,
+            "symbol": "ETHUSDT", "timeInForce": "GTC", "type": order_type, "origType": order_type,
+            "updateTime": 0, "workingType": "CONTRACT_PRICE", "priceProtect": false, "priceMatch": "NONE",
+            "selfTradePreventionMode": "NONE"
+        }))
+        .unwrap()
+    }
+
+    #[test]
+    fn test_fills_drive_positions() {
+        let position_manager = PositionManager::new(10000.0);
+        let reader = position_manager.reader();
+        let open = TradingSignal::new_market_signal(
+            1, "ETHUSDT", Side::Sell, StrategyName::MACD, 0.5, Exchange::Binance, 0, Some(3100.0), None, 3000.0,
+        );
+
+        // 止损单不产生成交；主市价单按回报的成交数量和均价记账，空头仓位
+        let responses = [
+            order_response(1, "MARKET", "PARTIALLY_FILLED", "0.4", "3001.5"),
+            order_response(2, "STOP_MARKET", "NEW", "0", "0"),
+        ];
+        let fills = market_fills(&open, &responses);
+        assert_eq!(fills.len(), 1);
+        assert_eq!(fills[0].key.side, PositionSide::Short);
+        assert!(!fills[0].reduce_only);
+        position_manager.apply_fill(&fills[0]).unwrap();
+        assert_eq!(position_manager.get_position_quantity_by_signal(&open), 0.4);
+        let snapshot = reader.get_position_snapshot(&fills[0].key).unwrap();
+        assert_eq!(snapshot.entry_price, 3001.5);
+
+        // 平仓买入对应空头仓位；没有成交的回报（ACK / NEW / EXPIRED）不记账
+        let close = TradingSignal::new_close_signal(2, "ETHUSDT", 2, StrategyName::MACD, 0.4, Exchange::Binance, 2990.0);
+        assert_eq!(position_manager.get_closable_quantity_by_signal(&close), 0.4);
+        assert!(market_fills(&close, &[order_response(3, "MARKET", "NEW", "0", "0")]).is_empty());
+        assert!(market_fills(&close, &[order_response(3, "MARKET", "EXPIRED", "0", "0")]).is_empty());
+        assert_eq!(position_manager.get_closable_quantity_by_signal(&close), 0.4);
+
+        let fills = market_fills(&close, &[order_response(4, "MARKET", "FILLED", "0.4", "2990.5")]);
+        assert!(fills[0].reduce_only);
+        assert_eq!(position_manager.apply_fill(&fills[0]), Ok(0.4));
+        assert_eq!(reader.strategy_quantity(Exchange::Binance, open.symbol, StrategyName::MACD), 0.0);
+    }
+
+    #[tokio::test]
+    async fn test_signals_dispatched_to_lanes() {
+        let (signal_tx, signal_rx) = mpsc::channel(16);
+        let client = BinanceFuturesApi::new("key".to_string(), "secret".to_string());
+        let mut manager = SignalManager::new_with_client(signal_rx, PositionManager::new(10000.0), client)
+            .with_max_concurrent(2);
+        let lane_wait = manager.lane_wait_stats();
+
+        // 无持仓的平仓信号不会下单，只经过通道调度
+        for (id, symbol) in [(1, "BTCUSDT"), (2, "ETHUSDT"), (3, "BTCUSDT")] {
+            let signal = TradingSignal::new_close_signal(id, symbol, 1, StrategyName::MACD, 1.0, Exchange::Binance, 1.0);
+            signal_tx.send(signal).await.unwrap();
+        }
+        drop(signal_tx);
+        manager.process_signals().await.unwrap();
+
+        // process_signals 返回前所有通道已执行完
+        let btc = PositionKey::new(Exchange::Binance, "BTCUSDT", StrategyName::MACD);
+        let eth = PositionKey::new(Exchange::Binance, "ETHUSDT", StrategyName::MACD);
+        assert_eq!(lane_wait.snapshot().len(), 2);
+        assert_eq!(lane_wait.get(&btc).unwrap().count(), 2);
+        assert_eq!(lane_wait.get(&eth).unwrap().count(), 1);
+        assert_eq!(lane_wait.rejected(&btc), 0);
+    }
+
+    #[tokio::test]
+    async fn test_full_lane_rejects_without_blocking_other_keys() {
+        let (signal_tx, signal_rx) = mpsc::channel(16);
+        let client = BinanceFuturesApi::new("key".to_string(), "secret".to_string());
+        let mut manager = SignalManager::new_with_client(signal_rx, PositionManager::new(10000.0), client)
+            .with_lane_capacity(1);
+        let lane_wait = manager.lane_wait_stats();
+
+        // 分发循环在单线程运行时中连续取出已排队的信号，通道任务还没有机会消费，
+        // BTC 通道第一条之后的信号被拒绝，ETH 信号照常进入自己的通道
+        for (id, symbol) in [(1, "BTCUSDT"), (2, "BTCUSDT"), (3, "BTCUSDT"), (4, "ETHUSDT")] {
+            let signal = TradingSignal::new_close_signal(id, symbol, 1, StrategyName::MACD, 1.0, Exchange::Binance, 1.0);
+            signal_tx.send(signal).await.unwrap();
+        }
+        drop(signal_tx);
+        manager.process_signals().await.unwrap();
+
+        let btc = PositionKey::new(Exchange::Binance, "BTCUSDT", StrategyName::MACD);
+        let eth = PositionKey::new(Exchange::Binance, "ETHUSDT", StrategyName::MACD);
+        assert_eq!(lane_wait.rejected(&btc), 2);
+        assert_eq!(lane_wait.get(&btc).unwrap().count(), 1);
+        assert_eq!(lane_wait.rejected(&eth), 0);
+        assert_eq!(lane_wait.get(&eth).unwrap().count(), 1);
+    }
+
     #[tokio::test]
     async fn test_sequential_signal_processing() {
         // 加载用户配置
@@ -559,7 +799,10 @@ mod tests {
             None,
             0.5,
         );
-        manager.position_manager.set_position_by_signal(&initial_signal, 5000.0);
+        manager
+            .position_manager
+            .apply_fill(&fill_from_signal(&initial_signal, 5000.0, initial_signal.latest_price))
+            .unwrap();
 
         // 创建测试信号：尝试重复开仓
         let duplicate_signal = TradingSignal::new_market_signal(
@@ -653,7 +896,10 @@ mod tests {
             None,
             0.5,
         );
-        manager.position_manager.set_position_by_signal(&initial_signal, 10000.0);
+        manager
+            .position_manager
+            .apply_fill(&fill_from_signal(&initial_signal, 10000.0, initial_signal.latest_price))
+            .unwrap();
         println!(
             "📊 初始仓位设置: 策略 {:?}, 交易对: {}, 数量: 10000.0",
             StrategyName::BOLLINGER,
@@ -716,7 +962,7 @@ mod tests {
             assert_eq!(position, 0.0, "平仓成功后仓位应该为 0");
             println!("🎉 测试通过！成功处理平仓信号并将仓位设置为 0");
         } else {
-            // 平仓失败：仓位应该回滚到原始值
+            // 平仓失败：仓位应该保持原始值
             let error = result.unwrap_err();
             println!("✅ process_signals 平仓失败回滚测试成功！");
             println!(
@@ -725,7 +971,7 @@ mod tests {
                 check_signal.symbol,
                 position
             );
-            assert_eq!(position, 10000.0, "平仓失败后仓位应该回滚到原始值");
+            assert_eq!(position, 10000.0, "平仓失败后仓位应该保持不变");
             println!("🎉 测试通过！平仓失败后成功回滚仓位到原始值");
         }
     }
@@ -836,7 +1082,10 @@ mod tests {
             None,
             0.5,
         );
-        manager.position_manager.set_position_by_signal(&initial_signal, 10000.0);
+        manager
+            .position_manager
+            .apply_fill(&fill_from_signal(&initial_signal, 10000.0, initial_signal.latest_price))
+            .unwrap();
         println!(
             "📊 初始仓位设置: 策略 {:?}, 交易对: {}, 数量: 10000.0",
             StrategyName::BOLLINGER,
@@ -880,7 +1129,7 @@ mod tests {
             // 等待一段时间让异步任务完成
             tokio::time::sleep(tokio::time::Duration::from_millis(100)).await;
 
-            // 验证仓位是否被正确回滚到原始值
+            // 仓位只由成交更新，平仓失败后应保持原始值
             let check_signal = TradingSignal::new_close_signal(
                 1,
                 "TURBOUSDT".to_string(),
@@ -897,7 +1146,7 @@ mod tests {
                 check_signal.symbol,
                 position
             );
-            assert_eq!(position, 10000.0, "平仓失败后仓位应该回滚到原始值");
+            assert_eq!(position, 10000.0, "平仓失败后仓位应该保持不变");
 
             println!("🎉 测试通过！成功处理平仓失败并回滚仓位");
         } else {
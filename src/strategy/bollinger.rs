@@ -64,7 +64,7 @@ impl BollingerStrategy {
                 // 创建平仓信号并标记为平仓操作
                 let signal = TradingSignal::new_close_signal(
                     1,
-                    self.symbol.clone().into(), // 使用 Into trait，对预定义枚举更高效
+                    self.symbol.id(),
                     position_to_close,  // 使用保存的位置
                     StrategyName::BOLLINGER,
                     quantity,
@@ -91,7 +91,7 @@ impl BollingerStrategy {
                 
                 return Some(TradingSignal::new_market_signal(
                     1,
-                    self.symbol.clone().into(), // 使用 Into trait，对预定义枚举更高效
+                    self.symbol.id(),
                     Side::Sell,
                     StrategyName::BOLLINGER,
                     quantity,
@@ -115,7 +115,7 @@ impl BollingerStrategy {
                 
                 return Some(TradingSignal::new_market_signal(
                     1,
-                    self.symbol.clone().into(), // 使用 Into trait，对预定义枚举更高效
+                    self.symbol.id(),
                     Side::Buy,
                     StrategyName::BOLLINGER,
                     quantity,
@@ -1,17 +1,55 @@
 use crate::dto::binance::websocket::BookTickerData as BinanceBookTickerData;
 use crate::dto::aster::websocket::AsterBookTickerData;
+use crate::dto::aster::rest_api::BatchOrderResult;
 use crate::exchange_api::aster::AsterFuturesApi;
-use crate::dto::aster::rest_api::{OrderRequest, OrderSide, OrderType};
+use crate::models::{symbol_filters, LatestQuote, SymbolFilters, TopOfBook, TradingSymbol};
+use crate::strategy::order_book_taker::lead_lag_gateway::{
+    LeadLagTemplates, OrderEvent, OrderGateway, OrderIntent, TradeDirection,
+};
 use tokio::sync::mpsc;
 use std::sync::Arc;
 use crate::{order_log, error_log};
 
-/// 交易方向
+/// 持仓与在途订单状态
+///
+/// 订单由 `OrderGateway` 异步执行，状态机保证同一时间最多一个在途指令；
+/// 在途期间行情照常处理，回报到达后按最新价格继续推进。
+#[derive(Debug, Clone, Copy, PartialEq)]
+enum OrderState {
+    /// 无持仓、无在途订单
+    Flat,
+    /// 开仓指令在途；`exit` 记录等待回报期间已经触发的止损/止盈
+    Opening {
+        direction: TradeDirection,
+        entry_price: f64,
+        stop_loss_ticks: u64,
+        exit: Option<ExitSignal>,
+    },
+    /// 持仓中（开仓价使用订单簿价格：做多用 ask，做空用 bid）
+    Open { direction: TradeDirection, entry_price: f64 },
+    /// 平仓指令在途
+    Closing {
+        direction: TradeDirection,
+        entry_price: f64,
+        exit_price: f64,
+        reason: CloseReason,
+    },
+}
+
+/// 持仓退出信号
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+enum ExitSignal {
+    StopLoss,
+    TakeProfit,
+}
+
+/// 平仓原因
 #[derive(Debug, Clone, Copy, PartialEq, Eq)]
-enum TradeDirection {
-    Long,   // 做多
-    Short,  // 做空
-    None,   // 无持仓
+enum CloseReason {
+    /// 止盈：先撤销止损单再平仓
+    TakeProfit,
+    /// 开仓部分失败且收到 -2021（订单会立即触发），按已有仓位紧急平仓
+    Emergency,
 }
 
 /// Lead-Lag 策略
@@ -20,10 +58,14 @@ pub struct LeadLagStrategy {
     binance_ticker_rx: mpsc::Receiver<BinanceBookTickerData>,
     aster_ticker_rx: mpsc::Receiver<AsterBookTickerData>,
     
-    // ASTER API 客户端（用于实盘交易）
-    aster_api: Arc<AsterFuturesApi>,
+    // 订单网关（用于实盘交易）：启动前持有，`run` 时移入独立任务
+    gateway: Option<OrderGateway>,
+    intents: mpsc::Sender<OrderIntent>,
+    order_events: mpsc::Receiver<OrderEvent>,
     symbol: String,      // 交易对，如 "ASTERUSDT"
-    quantity: String,    // 交易数量
+    quantity: String,    // 交易数量（已按 stepSize 取整）
+    quantity_lots: u64,  // 交易数量的整数 lot，用于最小名义价值检查
+    filters: SymbolFilters, // 交易对过滤器，止损价在整数 tick 上计算并取整到 tickSize
     
     // 最新的 fair price（用于开仓判断）
     latest_binance_fair_price: Option<f64>,
@@ -33,14 +75,10 @@ pub struct LeadLagStrategy {
     latest_aster_bid_price: Option<f64>,
     latest_aster_ask_price: Option<f64>,
     
-    // 当前持仓状态
-    current_position: TradeDirection,
-    entry_price: Option<f64>, // 开仓价格（使用订单簿价格：做多用ask，做空用bid）
+    // 当前持仓与在途订单状态
+    state: OrderState,
     open_order_ids: Vec<i64>, // 开仓时的订单ID列表（用于管理订单）
     entry_count: u64, // 开仓计数器
-    // 简单的在途标记，防止并发重复下单
-    is_opening: bool,   // 开仓请求进行中
-    is_closing: bool,   // 平仓（止盈/紧急）进行中
     
     // 策略参数
     entry_threshold: f64,  // 入场阈值 0.0003
@@ -51,6 +89,9 @@ pub struct LeadLagStrategy {
 
 impl LeadLagStrategy {
     /// 创建新的 Lead-Lag 策略实例
+    ///
+    /// 过滤器取自全局缓存，应先安装 ASTER 的 exchangeInfo（见 `AsterFuturesApi::load_symbol_filters`）；
+    /// 缓存中没有该交易对时退回默认精度，此时不做最小名义价值检查。
     pub fn new(
         binance_ticker_rx: mpsc::Receiver<BinanceBookTickerData>,
         aster_ticker_rx: mpsc::Receiver<AsterBookTickerData>,
@@ -58,26 +99,53 @@ impl LeadLagStrategy {
         symbol: String,
         quantity: String,
     ) -> Self {
+        let filters = symbol_filters(TradingSymbol::from_symbol(&symbol));
+        // 数量在启动时按 stepSize 取整一次，之后每次下单直接复用
+        let quantity_lots = filters
+            .precision
+            .parse_quantity(&quantity)
+            .map(|lots| filters.floor_quantity_lots(lots))
+            .unwrap_or(0);
+        let quantity = if quantity_lots > 0 { filters.format_quantity(quantity_lots) } else { quantity };
+        let templates = LeadLagTemplates::new(&aster_api, &symbol, &quantity, filters.precision.price_precision as u32)
+            .expect("Lead-Lag 模板固定为 1~2 个订单");
+        let (gateway, intents, order_events) = OrderGateway::new(aster_api, symbol.clone(), templates);
         Self {
             binance_ticker_rx,
             aster_ticker_rx,
-            aster_api,
+            gateway: Some(gateway),
+            intents,
+            order_events,
             symbol,
             quantity,
+            quantity_lots,
+            filters,
             latest_binance_fair_price: None,
             latest_aster_fair_price: None,
             latest_aster_bid_price: None,
             latest_aster_ask_price: None,
-            current_position: TradeDirection::None,
-            entry_price: None,
+            state: OrderState::Flat,
             open_order_ids: Vec::new(),
             entry_threshold: 0.0005,
             stop_loss: 0.0005,
             take_profit: 0.0005,
             max_spread: 0.0001,
             entry_count: 0,
-            is_opening: false,
-            is_closing: false,
+        }
+    }
+
+    /// 创建最新值模式的策略实例，行情由生产者写入 `LatestQuote` 槽位，只能通过 `run_on_latest` 运行
+    pub fn new_on_latest(aster_api: Arc<AsterFuturesApi>, symbol: String, quantity: String) -> Self {
+        // 最新值模式不经过 mpsc 通道，发送端直接丢弃
+        let (_, binance_ticker_rx) = mpsc::channel(1);
+        let (_, aster_ticker_rx) = mpsc::channel(1);
+        Self::new(binance_ticker_rx, aster_ticker_rx, aster_api, symbol, quantity)
+    }
+
+    /// 启动订单网关任务（只在第一次调用时启动）
+    fn start_gateway(&mut self) {
+        if let Some(gateway) = self.gateway.take() {
+            tokio::spawn(gateway.run());
         }
     }
 
@@ -112,465 +180,382 @@ impl LeadLagStrategy {
         }
     }
 
-    /// 检查是否有套利机会并执行交易逻辑
-    async fn check_and_execute_trade(&mut self) {
+    /// 按最新价格推进状态机：只提交指令，不等待订单往返
+    fn evaluate(&mut self) {
+        match self.state {
+            OrderState::Flat => self.check_entry(),
+            OrderState::Opening { direction, entry_price, stop_loss_ticks, exit: None } => {
+                // 市价开仓单大概率已成交，等待回报期间照常检查止损止盈，回报到达后处理
+                if let Some((exit, _)) = self.exit_signal(direction, entry_price) {
+                    order_log!(info, "⏳ Lead-Lag 开仓回报未到已触发 {:?}，回报到达后处理", exit);
+                    self.state = OrderState::Opening { direction, entry_price, stop_loss_ticks, exit: Some(exit) };
+                }
+            }
+            OrderState::Opening { .. } | OrderState::Closing { .. } => {}
+            OrderState::Open { direction, entry_price } => match self.exit_signal(direction, entry_price) {
+                Some((ExitSignal::StopLoss, current_price)) => self.on_stop_loss(direction, entry_price, current_price),
+                Some((ExitSignal::TakeProfit, current_price)) => {
+                    self.submit_close(direction, entry_price, current_price, CloseReason::TakeProfit)
+                }
+                None => {}
+            },
+        }
+    }
+
+    /// 无持仓时检查开仓机会
+    fn check_entry(&mut self) {
         let binance_price = match self.latest_binance_fair_price {
             Some(p) => p,
             None => return,
         };
         
         // 不再使用 ASTER 的 fair price 做入场判断
+        // 需要同时有 ASTER 的订单簿价格才能开仓
+        let (aster_bid, aster_ask) = match (self.latest_aster_bid_price, self.latest_aster_ask_price) {
+            (Some(bid), Some(ask)) => (bid, ask),
+            _ => return, // 没有 ASTER 订单簿数据，无法开仓
+        };
+        
+        // 流动性保护：检查 ASTER 的价差
+        let aster_spread = aster_ask - aster_bid;
+        if aster_spread > self.max_spread {
+            // 价差太大，流动性不足，不开仓
+            return;
+        }
 
-        // 检查当前持仓状态
-        match self.current_position {
-            TradeDirection::None => {
-                // 在途保护：若正在开仓/平仓，跳过本次检查
-                if self.is_opening || self.is_closing { return; }
-                // 无持仓，检查开仓机会
-                // 需要同时有 ASTER 的订单簿价格才能开仓
-                let aster_ask = match self.latest_aster_ask_price {
-                    Some(p) => p,
-                    None => return, // 没有 ASTER 订单簿数据，无法开仓
-                };
-                
-                let aster_bid = match self.latest_aster_bid_price {
-                    Some(p) => p,
-                    None => return,
-                };
-                
-                // 流动性保护：检查 ASTER 的价差
-                let aster_spread = aster_ask - aster_bid;
-                if aster_spread > self.max_spread {
-                    // 价差太大，流动性不足，不开仓
-                    return;
+        // Binance fair price > ASTER ask + 阈值 -> 在 ASTER 做多（用 ask 价格开仓）
+        // 名义价值按实际开仓价计算，低于 MIN_NOTIONAL 的开仓单必然被拒绝，不发送
+        let long_diff = binance_price - aster_ask;
+        if long_diff > self.entry_threshold
+            && self.filters.meets_min_notional(self.filters.price_ticks(aster_ask), self.quantity_lots)
+        {
+            // 多头止损向下取整到 tickSize，止损距离不小于 stop_loss
+            let stop_loss_ticks = self.filters.floor_price_ticks(
+                self.filters.price_ticks(aster_bid).saturating_sub(self.filters.precision.price_to_ticks(self.stop_loss)),
+            );
+            order_log!(info, "📤 Lead-Lag 提交开仓 - 做多 {} Ask: {:.5}, Binance Fair: {:.5}, 价差: {:.5} (阈值 {:.5}), ASTER 价差: {:.5}",
+                self.symbol, aster_ask, binance_price, long_diff, self.entry_threshold, aster_spread);
+            self.submit_open(TradeDirection::Long, aster_ask, stop_loss_ticks);
+            return;
+        }
+
+        // ASTER bid > Binance fair price + 阈值 -> 在 ASTER 做空（用 bid 价格开仓）
+        let short_diff = aster_bid - binance_price;
+        if short_diff > self.entry_threshold
+            && self.filters.meets_min_notional(self.filters.price_ticks(aster_bid), self.quantity_lots)
+        {
+            // 空头止损向上取整到 tickSize
+            let stop_loss_ticks = self.filters.ceil_price_ticks(
+                self.filters.price_ticks(aster_ask) + self.filters.precision.price_to_ticks(self.stop_loss),
+            );
+            order_log!(info, "📤 Lead-Lag 提交开仓 - 做空 {} Bid: {:.5}, Binance Fair: {:.5}, 价差: {:.5} (阈值 {:.5}), ASTER 价差: {:.5}",
+                self.symbol, aster_bid, binance_price, short_diff, self.entry_threshold, aster_spread);
+            self.submit_open(TradeDirection::Short, aster_bid, stop_loss_ticks);
+        }
+    }
+
+    /// 持仓的止损/止盈信号和当前判断价格
+    ///
+    /// 做多用 ASTER ask 判断（entry - stop_loss 止损，上涨 take_profit 止盈），
+    /// 做空用 ASTER bid 判断（entry + stop_loss 止损，下跌 take_profit 止盈）。
+    fn exit_signal(&self, direction: TradeDirection, entry_price: f64) -> Option<(ExitSignal, f64)> {
+        match direction {
+            TradeDirection::Long => {
+                let current_ask = self.latest_aster_ask_price?;
+                if current_ask <= entry_price - self.stop_loss {
+                    Some((ExitSignal::StopLoss, current_ask))
+                } else if current_ask - entry_price >= self.take_profit {
+                    Some((ExitSignal::TakeProfit, current_ask))
+                } else {
+                    None
                 }
-                
-                // Binance fair price > ASTER ask + 阈值 -> 在 ASTER 做多（用 ask 价格开仓）
-                let long_diff = binance_price - aster_ask;
-                if long_diff > self.entry_threshold {
-                    let stop_loss_price = format!("{:.5}", aster_bid - self.stop_loss);
-                    
-                    // 构建批量订单：市价买单 + 止损单
-                    let orders = vec![
-                        // 市价买单
-                        OrderRequest {
-                            symbol: self.symbol.clone(),
-                            side: OrderSide::Buy,
-                            order_type: OrderType::Market,
-                            quantity: Some(self.quantity.clone()),
-                            ..Default::default()
-                        },
-                        // 止损单（市价卖出，触发价为 stop_loss_price）
-                        OrderRequest {
-                            symbol: self.symbol.clone(),
-                            side: OrderSide::Sell,
-                            order_type: OrderType::StopMarket,
-                            quantity: Some(self.quantity.clone()),
-                            stop_price: Some(stop_loss_price.clone()),
-                            reduce_only: Some("true".to_string()),
-                            ..Default::default()
-                        },
-                    ];
-                    
-                    // 执行批量下单
-                    self.is_opening = true;
-                    let res = self.aster_api.batch_orders(orders, None).await;
-                    match res {
-                        Ok(result) => {
-                            if result.is_all_success() {
-                                // 保存订单ID
-                                self.open_order_ids = result.successful_orders.iter()
-                                    .map(|o| o.order_id)
-                                    .collect();
-                                
-                                self.current_position = TradeDirection::Long;
-                                self.entry_price = Some(aster_ask);
-                                self.entry_count += 1;
-                                
-                                println!("🟢 【开仓】在 ASTER 做多 - 实盘下单成功");
-                                println!("   开仓价格 (Ask): {:.5}", aster_ask);
-                                println!("   Binance Fair Price: {:.5}", binance_price);
-                                println!("   ASTER 价差: {:.5} (Bid: {:.5}, Ask: {:.5})", aster_spread, aster_bid, aster_ask);
-                                println!("   价差: {:.5} (Binance Fair - ASTER Ask, 超过阈值 {:.5})", long_diff, self.entry_threshold);
-                                println!("   数量: {}", self.quantity);
-                                println!("   止损价格: {}", stop_loss_price);
-                                println!("   止盈价格: {:.5} (Ask价格上涨 {:.5})", aster_ask + self.take_profit, self.take_profit);
-                                println!("   订单ID: {:?}", self.open_order_ids);
-                                println!("   当前为第 {} 次开仓", self.entry_count);
-                                println!("   ────────────────────────────────────────────────────────");
-                                println!();
-                                
-                                order_log!(info, "✅ Lead-Lag 策略开仓成功 - 做多 {} 数量: {}, 订单ID: {:?}", 
-                                    self.symbol, self.quantity, self.open_order_ids);
-                                order_log!(info, "📈 本次为第 {} 次开仓", self.entry_count);
-                                self.is_opening = false;
-                            } else {
-                                error_log!(error, "❌ Lead-Lag 策略开仓失败 - 部分订单失败: 成功{}/{}, 失败{}/{}",
-                                    result.successful_orders.len(), result.total_requested,
-                                    result.failed_orders.len(), result.total_requested);
-                                
-                                // 检查是否有 -2021 错误（订单会立即触发），需要平仓
-                                let mut need_close_position = false;
-                                for (_, error) in &result.failed_orders {
-                                    error_log!(error, "   订单失败: code={}, msg={}", error.code, error.msg);
-                                    if error.code == -2021 {
-                                        // 订单会立即触发，说明可能已经有仓位，需要平仓
-                                        need_close_position = true;
-                                    }
-                                }
-                                
-                                // 如果检测到 -2021 错误，发出平仓请求
-                                if need_close_position {
-                                    error_log!(warn, "⚠️ 检测到 -2021 错误（订单会立即触发），执行紧急平仓");
-                                    
-                                    // 发出平仓单（做多时平仓用卖出）
-                                    let close_order = OrderRequest {
-                                        symbol: self.symbol.clone(),
-                                        side: OrderSide::Sell,
-                                        order_type: OrderType::Market,
-                                        quantity: Some(self.quantity.clone()),
-                                        reduce_only: Some("true".to_string()),
-                                        ..Default::default()
-                                    };
-                                    
-                                    match self.aster_api.batch_orders(vec![close_order], None).await {
-                                        Ok(close_result) => {
-                                            if close_result.is_all_success() {
-                                                order_log!(info, "✅ 紧急平仓成功 - 订单ID: {:?}", 
-                                                    close_result.successful_orders.iter().map(|o| o.order_id).collect::<Vec<_>>());
-                                            } else {
-                                                for (_, error) in &close_result.failed_orders {
-                                                    error_log!(error, "   紧急平仓失败: code={}, msg={}", error.code, error.msg);
-                                                }
-                                            }
-                                        }
-                                        Err(e) => {
-                                            error_log!(error, "❌ 紧急平仓下单失败: {}", e);
-                                        }
-                                    }
-                                self.is_opening = false;
-                                }
-                                if !need_close_position { self.is_opening = false; }
-                            }
-                        }
-                        Err(e) => {
-                            error_log!(error, "❌ Lead-Lag 策略开仓下单失败: {}", e);
-                            self.is_opening = false;
-                        }
-                    }
+            }
+            TradeDirection::Short => {
+                let current_bid = self.latest_aster_bid_price?;
+                if current_bid >= entry_price + self.stop_loss {
+                    Some((ExitSignal::StopLoss, current_bid))
+                } else if entry_price - current_bid >= self.take_profit {
+                    Some((ExitSignal::TakeProfit, current_bid))
+                } else {
+                    None
                 }
-                // ASTER bid > Binance fair price + 阈值 -> 在 ASTER 做空（用 bid 价格开仓）
-                else {
-                    let short_diff = aster_bid - binance_price;
-                    if short_diff > self.entry_threshold {
-                    let stop_loss_price = format!("{:.5}", aster_ask + self.stop_loss);
-                    
-                    // 构建批量订单：市价卖单 + 止损单
-                    let orders = vec![
-                        // 市价卖单
-                        OrderRequest {
-                            symbol: self.symbol.clone(),
-                            side: OrderSide::Sell,
-                            order_type: OrderType::Market,
-                            quantity: Some(self.quantity.clone()),
-                            ..Default::default()
-                        },
-                        // 止损单（市价买入，触发价为 stop_loss_price）
-                        OrderRequest {
-                            symbol: self.symbol.clone(),
-                            side: OrderSide::Buy,
-                            order_type: OrderType::StopMarket,
-                            quantity: Some(self.quantity.clone()),
-                            stop_price: Some(stop_loss_price.clone()),
-                            reduce_only: Some("true".to_string()),
-                            ..Default::default()
-                        },
-                    ];
-                    
-                    // 执行批量下单
-                    self.is_opening = true;
-                    let res = self.aster_api.batch_orders(orders, None).await;
-                    match res {
-                        Ok(result) => {
-                            if result.is_all_success() {
-                                // 保存订单ID
-                                self.open_order_ids = result.successful_orders.iter()
-                                    .map(|o| o.order_id)
-                                    .collect();
-                                
-                                self.current_position = TradeDirection::Short;
-                                self.entry_price = Some(aster_bid);
-                                self.entry_count += 1;
-                                
-                                println!("🔴 【开仓】在 ASTER 做空 - 实盘下单成功");
-                                println!("   开仓价格 (Bid): {:.5}", aster_bid);
-                                println!("   Binance Fair Price: {:.5}", binance_price);
-                                println!("   ASTER 价差: {:.5} (Bid: {:.5}, Ask: {:.5})", aster_spread, aster_bid, aster_ask);
-                                println!("   价差: {:.5} (ASTER Bid - Binance Fair, 超过阈值 {:.5})", short_diff, self.entry_threshold);
-                                println!("   数量: {}", self.quantity);
-                                println!("   止损价格: {}", stop_loss_price);
-                                println!("   止盈价格: {:.5} (Bid价格下跌 {:.5})", aster_bid - self.take_profit, self.take_profit);
-                                println!("   订单ID: {:?}", self.open_order_ids);
-                                println!("   当前为第 {} 次开仓", self.entry_count);
-                                println!("   ────────────────────────────────────────────────────────");
-                                println!();
-                                
-                                order_log!(info, "✅ Lead-Lag 策略开仓成功 - 做空 {} 数量: {}, 订单ID: {:?}", 
-                                    self.symbol, self.quantity, self.open_order_ids);
-                                order_log!(info, "📈 本次为第 {} 次开仓", self.entry_count);
-                                self.is_opening = false;
-                            } else {
-                                error_log!(error, "❌ Lead-Lag 策略开仓失败 - 部分订单失败: 成功{}/{}, 失败{}/{}",
-                                    result.successful_orders.len(), result.total_requested,
-                                    result.failed_orders.len(), result.total_requested);
-                                
-                                // 检查是否有 -2021 错误（订单会立即触发），需要平仓
-                                let mut need_close_position = false;
-                                for (_, error) in &result.failed_orders {
-                                    error_log!(error, "   订单失败: code={}, msg={}", error.code, error.msg);
-                                    if error.code == -2021 {
-                                        // 订单会立即触发，说明可能已经有仓位，需要平仓
-                                        need_close_position = true;
-                                    }
-                                }
-                                
-                                // 如果检测到 -2021 错误，发出平仓请求
-                                if need_close_position {
-                                    error_log!(warn, "⚠️ 检测到 -2021 错误（订单会立即触发），执行紧急平仓");
-                                    
-                                    // 发出平仓单（做空时平仓用买入）
-                                    let close_order = OrderRequest {
-                                        symbol: self.symbol.clone(),
-                                        side: OrderSide::Buy,
-                                        order_type: OrderType::Market,
-                                        quantity: Some(self.quantity.clone()),
-                                        reduce_only: Some("true".to_string()),
-                                        ..Default::default()
-                                    };
-                                    
-                                    match self.aster_api.batch_orders(vec![close_order], None).await {
-                                        Ok(close_result) => {
-                                            if close_result.is_all_success() {
-                                                order_log!(info, "✅ 紧急平仓成功 - 订单ID: {:?}", 
-                                                    close_result.successful_orders.iter().map(|o| o.order_id).collect::<Vec<_>>());
-                                            } else {
-                                                for (_, error) in &close_result.failed_orders {
-                                                    error_log!(error, "   紧急平仓失败: code={}, msg={}", error.code, error.msg);
-                                                }
-                                            }
-                                        }
-                                        Err(e) => {
-                                            error_log!(error, "❌ 紧急平仓下单失败: {}", e);
-                                        }
-                                    }
-                                self.is_opening = false;
-                                }
-                                if !need_close_position { self.is_opening = false; }
-                            }
-                        }
-                        Err(e) => {
-                            error_log!(error, "❌ Lead-Lag 策略开仓下单失败: {}", e);
-                            self.is_opening = false;
-                        }
-                    }
+            }
+        }
+    }
+
+    /// 非阻塞地提交指令；网关通道满或已关闭时放弃本次指令
+    fn submit(&mut self, intent: OrderIntent) -> bool {
+        match self.intents.try_send(intent) {
+            Ok(()) => true,
+            Err(e) => {
+                error_log!(error, "❌ Lead-Lag 订单网关不可用，指令未提交: {:?}, {}", intent, e);
+                false
+            }
+        }
+    }
+
+    fn submit_open(&mut self, direction: TradeDirection, entry_price: f64, stop_loss_ticks: u64) {
+        if self.submit(OrderIntent::Open { direction, stop_loss_ticks }) {
+            self.state = OrderState::Opening { direction, entry_price, stop_loss_ticks, exit: None };
+        }
+    }
+
+    fn submit_close(&mut self, direction: TradeDirection, entry_price: f64, exit_price: f64, reason: CloseReason) {
+        let cancel_open_orders = reason == CloseReason::TakeProfit;
+        if self.submit(OrderIntent::Close { direction, cancel_open_orders }) {
+            self.state = OrderState::Closing { direction, entry_price, exit_price, reason };
+        } else if reason == CloseReason::Emergency {
+            self.state = OrderState::Flat;
+        }
+    }
+
+    /// 止损：交易所的止损单负责平仓，本地只清理状态
+    fn on_stop_loss(&mut self, direction: TradeDirection, entry_price: f64, current_price: f64) {
+        let (label, quote) = direction_labels(direction);
+        let (stop_loss_price, loss) = match direction {
+            TradeDirection::Long => (entry_price - self.stop_loss, entry_price - current_price),
+            TradeDirection::Short => (entry_price + self.stop_loss, current_price - entry_price),
+        };
+        println!("⛔ 【止损平仓】{}仓位止损", label);
+        println!("   开仓价格 ({}): {:.5}", quote, entry_price);
+        println!("   当前价格 ({}): {:.5}", quote, current_price);
+        println!("   止损价格: {:.5}", stop_loss_price);
+        println!("   价格变化: {:.5}", current_price - entry_price);
+        println!("   亏损: {:.5}", loss);
+        println!("   ────────────────────────────────────────────────────────");
+        println!();
+
+        self.state = OrderState::Flat;
+        self.open_order_ids.clear();
+    }
+
+    /// 处理订单网关回报
+    fn on_order_event(&mut self, event: OrderEvent) {
+        match (self.state, event.intent) {
+            (OrderState::Opening { direction, entry_price, stop_loss_ticks, exit }, OrderIntent::Open { .. }) => {
+                self.on_open_result(direction, entry_price, stop_loss_ticks, exit, event.result)
+            }
+            (OrderState::Closing { direction, entry_price, exit_price, reason }, OrderIntent::Close { .. }) => {
+                self.on_close_result(direction, entry_price, exit_price, reason, event.result)
+            }
+            (state, intent) => {
+                error_log!(warn, "⚠️ Lead-Lag 收到与当前状态不匹配的回报: state={:?}, intent={:?}", state, intent);
+            }
+        }
+    }
+
+    fn on_open_result(
+        &mut self,
+        direction: TradeDirection,
+        entry_price: f64,
+        stop_loss_ticks: u64,
+        exit: Option<ExitSignal>,
+        result: anyhow::Result<BatchOrderResult>,
+    ) {
+        let result = match result {
+            Ok(result) => result,
+            Err(e) => {
+                error_log!(error, "❌ Lead-Lag 策略开仓下单失败: {}", e);
+                self.state = OrderState::Flat;
+                return;
+            }
+        };
+
+        if !result.is_all_success() {
+            error_log!(error, "❌ Lead-Lag 策略开仓失败 - 部分订单失败: 成功{}/{}, 失败{}/{}",
+                result.successful_orders.len(), result.total_requested,
+                result.failed_orders.len(), result.total_requested);
+
+            // 检查是否有 -2021 错误（订单会立即触发），说明可能已经有仓位，需要平仓
+            let mut need_close_position = false;
+            for (_, error) in &result.failed_orders {
+                error_log!(error, "   订单失败: code={}, msg={}", error.code, error.msg);
+                if error.code == -2021 {
+                    need_close_position = true;
                 }
-            }},
-            
-            TradeDirection::Long => {
-                // 持有多头仓位，检查止损和止盈
-                // 做多时，使用 ASTER 的 ask 价格来判断（买入时用卖价）
-                let current_ask = match self.latest_aster_ask_price {
-                    Some(p) => p,
-                    None => return, // 没有订单簿数据，无法判断
+            }
+
+            self.state = OrderState::Flat;
+            if need_close_position {
+                error_log!(warn, "⚠️ 检测到 -2021 错误（订单会立即触发），执行紧急平仓");
+                self.submit_close(direction, entry_price, entry_price, CloseReason::Emergency);
+            }
+            return;
+        }
+
+        // 保存订单ID
+        self.open_order_ids = result.successful_orders.iter().map(|o| o.order_id).collect();
+        self.entry_count += 1;
+
+        let (label, quote) = direction_labels(direction);
+        let take_profit_price = match direction {
+            TradeDirection::Long => entry_price + self.take_profit,
+            TradeDirection::Short => entry_price - self.take_profit,
+        };
+        match direction {
+            TradeDirection::Long => println!("🟢 【开仓】在 ASTER 做多 - 实盘下单成功"),
+            TradeDirection::Short => println!("🔴 【开仓】在 ASTER 做空 - 实盘下单成功"),
+        }
+        println!("   开仓价格 ({}): {:.5}", quote, entry_price);
+        println!("   数量: {}", self.quantity);
+        println!("   止损价格: {}", self.filters.format_price(stop_loss_ticks));
+        println!("   止盈价格: {:.5} ({}价格变动 {:.5})", take_profit_price, quote, self.take_profit);
+        println!("   订单ID: {:?}", self.open_order_ids);
+        println!("   当前为第 {} 次开仓", self.entry_count);
+        println!("   ────────────────────────────────────────────────────────");
+        println!();
+
+        order_log!(info, "✅ Lead-Lag 策略开仓成功 - {} {} 数量: {}, 订单ID: {:?}",
+            label, self.symbol, self.quantity, self.open_order_ids);
+        order_log!(info, "📈 本次为第 {} 次开仓", self.entry_count);
+
+        self.state = OrderState::Open { direction, entry_price };
+        match exit {
+            // 等待回报期间已触及止损：交易所止损单已经触发
+            Some(ExitSignal::StopLoss) => {
+                let current_price = match direction {
+                    TradeDirection::Long => self.latest_aster_ask_price,
+                    TradeDirection::Short => self.latest_aster_bid_price,
                 };
-                
-                if let Some(entry) = self.entry_price {
-                    // 计算止损价格（做多：entry_price - stop_loss）
-                    let stop_loss_price = entry - self.stop_loss;
-                    
-                    // 止损判断：当前 ask1 价格低于止损价格
-                    if current_ask <= stop_loss_price {
-                        println!("⛔ 【止损平仓】多头仓位止损");
-                        println!("   开仓价格 (Ask): {:.5}", entry);
-                        println!("   当前价格 (Ask): {:.5}", current_ask);
-                        println!("   止损价格: {:.5}", stop_loss_price);
-                        println!("   价格变化: {:.5}", current_ask - entry);
-                        println!("   亏损: {:.5}", entry - current_ask);
-                        println!("   ────────────────────────────────────────────────────────");
-                        println!();
-                        
-                        self.current_position = TradeDirection::None;
-                        self.entry_price = None;
-                        self.open_order_ids.clear();
-                    }
-                    // 止盈：ask 价格上涨超过 0.0003 - 主动发出止盈单并取消所有订单
-                    else {
-                        let price_change = current_ask - entry;
-                        if price_change >= self.take_profit {
-                            if self.is_closing { return; }
-                            self.is_closing = true;
-                            // 1. 先取消所有开放订单（包括止损单）
-                            match self.aster_api.cancel_all_open_orders(&self.symbol, None).await {
-                                Ok(_) => {
-                                    order_log!(info, "✅ 止盈操作：成功取消所有开放订单");
-                                }
-                                Err(e) => {
-                                    error_log!(warn, "⚠️ 止盈操作：取消订单失败: {}，继续执行止盈", e);
-                                }
-                            }
-                            
-                            // 2. 发出止盈单（市价卖出）
-                            let take_profit_order = OrderRequest {
-                            symbol: self.symbol.clone(),
-                            side: OrderSide::Sell,
-                            order_type: OrderType::Market,
-                            quantity: Some(self.quantity.clone()),
-                            reduce_only: Some("true".to_string()),
-                            ..Default::default()
-                        };
-                        
-                            match self.aster_api.batch_orders(vec![take_profit_order], None).await {
-                                Ok(result) => {
-                                    if result.is_all_success() {
-                                        println!("✅ 【止盈平仓】多头仓位止盈 - 实盘下单成功");
-                                        println!("   开仓价格 (Ask): {:.5}", entry);
-                                        println!("   平仓价格 (Ask): {:.5}", current_ask);
-                                        println!("   价格变化: {:.5}", price_change);
-                                        println!("   盈利: {:.5}", price_change);
-                                        println!("   订单ID: {:?}", result.successful_orders.iter().map(|o| o.order_id).collect::<Vec<_>>());
-                                        println!("   ────────────────────────────────────────────────────────");
-                                        println!();
-                                        
-                                        order_log!(info, "✅ Lead-Lag 策略止盈成功 - 多头平仓, 盈利: {:.5}", price_change);
-                                        
-                                        self.current_position = TradeDirection::None;
-                                        self.entry_price = None;
-                                        self.open_order_ids.clear();
-                                        self.is_closing = false;
-                                    } else {
-                                        error_log!(error, "❌ 止盈下单失败 - 部分订单失败");
-                                        for (_, error) in &result.failed_orders {
-                                            error_log!(error, "   订单失败: code={}, msg={}", error.code, error.msg);
-                                        }
-                                    // 若为 -2022（ReduceOnly 被拒绝），当作当前已无持仓，直接清理状态，避免重复重试
-                                    if result.failed_orders.iter().any(|(_, e)| e.code == -2022) {
-                                        order_log!(info, "ℹ️ 收到 -2022（ReduceOnly 被拒绝），视作无仓位，清理状态（多头）");
-                                        self.current_position = TradeDirection::None;
-                                        self.entry_price = None;
-                                        self.open_order_ids.clear();
-                                            self.is_closing = false;
-                                        } else {
-                                            self.is_closing = false;
-                                    }
-                                    }
-                                }
-                                Err(e) => {
-                                    error_log!(error, "❌ 止盈下单失败: {}", e);
-                                    self.is_closing = false;
-                                }
-                            }
-                        }
-                    }
+                self.on_stop_loss(direction, entry_price, current_price.unwrap_or(entry_price));
+            }
+            // 止盈按最新价格重新判断，价格回落则继续持仓
+            Some(ExitSignal::TakeProfit) => self.evaluate(),
+            None => {}
+        }
+    }
+
+    fn on_close_result(
+        &mut self,
+        direction: TradeDirection,
+        entry_price: f64,
+        exit_price: f64,
+        reason: CloseReason,
+        result: anyhow::Result<BatchOrderResult>,
+    ) {
+        if reason == CloseReason::Emergency {
+            match result {
+                Ok(result) if result.is_all_success() => {
+                    order_log!(info, "✅ 紧急平仓成功 - 订单ID: {:?}",
+                        result.successful_orders.iter().map(|o| o.order_id).collect::<Vec<_>>());
                 }
-            },
-            
-            TradeDirection::Short => {
-                // 持有空头仓位，检查止损和止盈
-                // 做空时，使用 ASTER 的 bid 价格来判断（卖出时用买价）
-                let current_bid = match self.latest_aster_bid_price {
-                    Some(p) => p,
-                    None => return, // 没有订单簿数据，无法判断
-                };
-                
-                if let Some(entry) = self.entry_price {
-                    // 计算止损价格（做空：entry_price + stop_loss）
-                    let stop_loss_price = entry + self.stop_loss;
-                    
-                    // 止损判断：当前 bid1 价格高于止损价格
-                    if current_bid >= stop_loss_price {
-                        println!("⛔ 【止损平仓】空头仓位止损");
-                        println!("   开仓价格 (Bid): {:.5}", entry);
-                        println!("   当前价格 (Bid): {:.5}", current_bid);
-                        println!("   止损价格: {:.5}", stop_loss_price);
-                        println!("   价格变化: {:.5}", current_bid - entry);
-                        println!("   亏损: {:.5}", current_bid - entry);
-                        println!("   ────────────────────────────────────────────────────────");
-                        println!();
-                        
-                        self.current_position = TradeDirection::None;
-                        self.entry_price = None;
-                        self.open_order_ids.clear();
-                    }
-                    // 止盈：bid 价格下跌超过 0.0003（对空头有利）- 主动发出止盈单并取消所有订单
-                    else {
-                        let price_change = entry - current_bid; // 做空：价格下跌为盈利
-                        if price_change >= self.take_profit {
-                            if self.is_closing { return; }
-                            self.is_closing = true;
-                            // 1. 先取消所有开放订单（包括止损单）
-                            match self.aster_api.cancel_all_open_orders(&self.symbol, None).await {
-                                Ok(_) => {
-                                    order_log!(info, "✅ 止盈操作：成功取消所有开放订单");
-                                }
-                                Err(e) => {
-                                    error_log!(warn, "⚠️ 止盈操作：取消订单失败: {}，继续执行止盈", e);
-                                }
-                            }
-                            
-                            // 2. 发出止盈单（市价买入）
-                            let take_profit_order = OrderRequest {
-                                symbol: self.symbol.clone(),
-                                side: OrderSide::Buy,
-                                order_type: OrderType::Market,
-                                quantity: Some(self.quantity.clone()),
-                                reduce_only: Some("true".to_string()),
-                                ..Default::default()
-                            };
-                            
-                            match self.aster_api.batch_orders(vec![take_profit_order], None).await {
-                                Ok(result) => {
-                                    if result.is_all_success() {
-                                        println!("✅ 【止盈平仓】空头仓位止盈 - 实盘下单成功");
-                                        println!("   开仓价格 (Bid): {:.5}", entry);
-                                        println!("   平仓价格 (Bid): {:.5}", current_bid);
-                                        println!("   价格变化: {:.5}", price_change);
-                                        println!("   盈利: {:.5}", price_change);
-                                        println!("   订单ID: {:?}", result.successful_orders.iter().map(|o| o.order_id).collect::<Vec<_>>());
-                                        println!("   ────────────────────────────────────────────────────────");
-                                        println!();
-                                        
-                                        order_log!(info, "✅ Lead-Lag 策略止盈成功 - 空头平仓, 盈利: {:.5}", price_change);
-                                        
-                                        self.current_position = TradeDirection::None;
-                                        self.entry_price = None;
-                                        self.open_order_ids.clear();
-                                        self.is_closing = false;
-                                    } else {
-                                        error_log!(error, "❌ 止盈下单失败 - 部分订单失败");
-                                        for (_, error) in &result.failed_orders {
-                                            error_log!(error, "   订单失败: code={}, msg={}", error.code, error.msg);
-                                        }
-                                        // 若为 -2022（ReduceOnly 被拒绝），当作当前已无持仓，直接清理状态，避免重复重试
-                                        if result.failed_orders.iter().any(|(_, e)| e.code == -2022) {
-                                            order_log!(info, "ℹ️ 收到 -2022（ReduceOnly 被拒绝），视作无仓位，清理状态（空头）");
-                                            self.current_position = TradeDirection::None;
-                                            self.entry_price = None;
-                                            self.open_order_ids.clear();
-                                            self.is_closing = false;
-                                        } else {
-                                            self.is_closing = false;
-                                        }
-                                    }
-                                }
-                                Err(e) => {
-                                    error_log!(error, "❌ 止盈下单失败: {}", e);
-                                    self.is_closing = false;
-                                }
-                            }
-                        }
+                Ok(result) => {
+                    for (_, error) in &result.failed_orders {
+                        error_log!(error, "   紧急平仓失败: code={}, msg={}", error.code, error.msg);
                     }
                 }
-            },
+                Err(e) => error_log!(error, "❌ 紧急平仓下单失败: {}", e),
+            }
+            self.state = OrderState::Flat;
+            return;
+        }
+
+        let (label, quote) = direction_labels(direction);
+        let price_change = match direction {
+            TradeDirection::Long => exit_price - entry_price,
+            TradeDirection::Short => entry_price - exit_price,
+        };
+        match result {
+            Ok(result) if result.is_all_success() => {
+                println!("✅ 【止盈平仓】{}仓位止盈 - 实盘下单成功", label);
+                println!("   开仓价格 ({}): {:.5}", quote, entry_price);
+                println!("   平仓价格 ({}): {:.5}", quote, exit_price);
+                println!("   价格变化: {:.5}", price_change);
+                println!("   盈利: {:.5}", price_change);
+                println!("   订单ID: {:?}", result.successful_orders.iter().map(|o| o.order_id).collect::<Vec<_>>());
+                println!("   ────────────────────────────────────────────────────────");
+                println!();
+
+                order_log!(info, "✅ Lead-Lag 策略止盈成功 - {}平仓, 盈利: {:.5}", label, price_change);
+                self.state = OrderState::Flat;
+                self.open_order_ids.clear();
+            }
+            Ok(result) => {
+                error_log!(error, "❌ 止盈下单失败 - 部分订单失败");
+                for (_, error) in &result.failed_orders {
+                    error_log!(error, "   订单失败: code={}, msg={}", error.code, error.msg);
+                }
+                // 若为 -2022（ReduceOnly 被拒绝），当作当前已无持仓，直接清理状态，避免重复重试
+                if result.failed_orders.iter().any(|(_, e)| e.code == -2022) {
+                    order_log!(info, "ℹ️ 收到 -2022（ReduceOnly 被拒绝），视作无仓位，清理状态（{}）", label);
+                    self.state = OrderState::Flat;
+                    self.open_order_ids.clear();
+                } else {
+                    // 仍持仓，下一个 tick 重新判断止盈
+                    self.state = OrderState::Open { direction, entry_price };
+                }
+            }
+            Err(e) => {
+                error_log!(error, "❌ 止盈下单失败: {}", e);
+                self.state = OrderState::Open { direction, entry_price };
+            }
+        }
+    }
+
+    /// 处理 Binance 最新盘口
+    fn on_binance_quote(&mut self, quote: TopOfBook) {
+        // 计算公平价格
+        let fair_price = Self::calculate_fair_price(
+            quote.bid_price,
+            quote.bid_qty,
+            quote.ask_price,
+            quote.ask_qty,
+        );
+
+        // 更新最新的 Binance fair price
+        self.latest_binance_fair_price = Some(fair_price);
+
+        // 检查交易机会（开仓需要基于 fair price，但需要订单簿价格才能开仓）
+        self.evaluate();
+    }
+
+    /// 处理 ASTER 最新盘口
+    fn on_aster_quote(&mut self, quote: TopOfBook) {
+        // 计算公平价格
+        let fair_price = Self::calculate_fair_price(
+            quote.bid_price,
+            quote.bid_qty,
+            quote.ask_price,
+            quote.ask_qty,
+        );
+
+        // 更新最新的 ASTER fair price 和订单簿价格
+        self.latest_aster_fair_price = Some(fair_price);
+        self.latest_aster_bid_price = Some(quote.bid_price);
+        self.latest_aster_ask_price = Some(quote.ask_price);
+
+        // 检查交易机会（开仓和止损止盈都需要检查）
+        self.evaluate();
+    }
+
+    /// 基于最新值槽位运行策略主循环
+    ///
+    /// 生产者直接覆盖槽位，策略每次只读取最新的盘口；处理期间到达的中间数据
+    /// 全部跳过，突发行情下 tick 到决策的延迟不会随积压增长。任务被取消时退出。
+    pub async fn run_on_latest(
+        &mut self,
+        binance_quote: Arc<LatestQuote>,
+        aster_quote: Arc<LatestQuote>,
+    ) -> anyhow::Result<()> {
+        println!("🚀 Lead-Lag 策略启动（最新值模式）");
+        self.start_gateway();
+        let mut binance_version = 0;
+        let mut aster_version = 0;
+
+        loop {
+            tokio::select! {
+                Some(event) = self.order_events.recv() => {
+                    self.on_order_event(event);
+                }
+                (quote, version) = binance_quote.changed(binance_version) => {
+                    binance_version = version;
+                    self.on_binance_quote(quote);
+                }
+                (quote, version) = aster_quote.changed(aster_version) => {
+                    aster_version = version;
+                    self.on_aster_quote(quote);
+                }
+            }
         }
     }
 
@@ -584,27 +569,24 @@ impl LeadLagStrategy {
         println!("   止盈: {:.5}", self.take_profit);
         println!("   最大允许价差（流动性保护）: {:.5}", self.max_spread);
         println!("{}", "=".repeat(80));
-
+        self.start_gateway();
 
         loop {
             tokio::select! {
+                // 处理订单网关回报（下单期间行情照常处理）
+                Some(event) = self.order_events.recv() => {
+                    self.on_order_event(event);
+                }
+
                 // 处理 Binance bookTicker 数据
                 binance_ticker = self.binance_ticker_rx.recv() => {
                     match binance_ticker {
-                        Some(ticker) => {
-                            // 计算公平价格
-                            let fair_price = Self::calculate_fair_price(
-                                ticker.best_bid_price,
-                                ticker.best_bid_qty,
-                                ticker.best_ask_price,
-                                ticker.best_ask_qty,
-                            );
-
-                            // 更新最新的 Binance fair price
-                            self.latest_binance_fair_price = Some(fair_price);
-
-                            // 检查交易机会（开仓需要基于 fair price，但需要订单簿价格才能开仓）
-                            self.check_and_execute_trade().await;
+                        Some(mut ticker) => {
+                            // 只关心最新的盘口，跳过通道中积压的过期数据
+                            while let Ok(newer) = self.binance_ticker_rx.try_recv() {
+                                ticker = newer;
+                            }
+                            self.on_binance_quote(TopOfBook::from_binance_book_ticker(&ticker));
                         }
                         None => {
                             println!("⚠️  Binance bookTicker 通道已关闭");
@@ -616,22 +598,11 @@ impl LeadLagStrategy {
                 // 处理 ASTER bookTicker 数据
                 aster_ticker = self.aster_ticker_rx.recv() => {
                     match aster_ticker {
-                        Some(ticker) => {
-                            // 计算公平价格
-                            let fair_price = Self::calculate_fair_price(
-                                ticker.best_bid_price,
-                                ticker.best_bid_qty,
-                                ticker.best_ask_price,
-                                ticker.best_ask_qty,
-                            );
-
-                            // 更新最新的 ASTER fair price 和订单簿价格
-                            self.latest_aster_fair_price = Some(fair_price);
-                            self.latest_aster_bid_price = Some(ticker.best_bid_price);
-                            self.latest_aster_ask_price = Some(ticker.best_ask_price);
-
-                            // 检查交易机会（开仓和止损止盈都需要检查）
-                            self.check_and_execute_trade().await;
+                        Some(mut ticker) => {
+                            while let Ok(newer) = self.aster_ticker_rx.try_recv() {
+                                ticker = newer;
+                            }
+                            self.on_aster_quote(TopOfBook::from_aster_book_ticker(&ticker));
                         }
                         None => {
                             println!("⚠️  ASTER bookTicker 通道已关闭");
@@ -647,3 +618,94 @@ impl LeadLagStrategy {
     }
 }
 
+
+/// 仓位名称和判断价格所用的盘口一侧
+fn direction_labels(direction: TradeDirection) -> (&'static str, &'static str) {
+    match direction {
+        TradeDirection::Long => ("多头", "Ask"),
+        TradeDirection::Short => ("空头", "Bid"),
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use crate::dto::aster::rest_api::{AsterErrorResponse, OrderResponse};
+
+    fn strategy() -> (LeadLagStrategy, mpsc::Receiver<OrderIntent>) {
+        let (_binance_tx, binance_rx) = mpsc::channel(1);
+        let (_aster_tx, aster_rx) = mpsc::channel(1);
+        let aster_api = Arc::new(AsterFuturesApi::new("key".to_string(), "secret".to_string()));
+        let mut strategy = LeadLagStrategy::new(binance_rx, aster_rx, aster_api, "ASTERUSDT".to_string(), "10".to_string());
+        // 不启动网关，直接观察策略提交的指令
+        let (tx, rx) = mpsc::channel(16);
+        strategy.intents = tx;
+        (strategy, rx)
+    }
+
+    fn quote(bid_price: f64, ask_price: f64) -> TopOfBook {
+        TopOfBook { bid_price, bid_qty: 1.0, ask_price, ask_qty: 1.0, ..Default::default() }
+    }
+
+    fn filled(order_ids: &[i64]) -> anyhow::Result<BatchOrderResult> {
+        let mut result = BatchOrderResult::new(order_ids.len());
+        for &order_id in order_ids {
+            result.successful_orders.push(serde_json::from_value::<OrderResponse>(serde_json::json!({
+                "orderId": order_id, "symbol": "ASTERUSDT", "status": "FILLED", "side": "BUY",
+                "positionSide": "BOTH", "type": "MARKET", "origType": "MARKET", "timeInForce": "GTC",
+                "cumQty": "10", "cumQuote": "10", "executedQty": "10", "origQty": "10",
+                "avgPrice": "1.0001", "price": "0", "reduceOnly": false, "updateTime": 0,
+                "workingType": "CONTRACT_PRICE", "priceProtect": false,
+            })).unwrap());
+        }
+        Ok(result)
+    }
+
+    #[test]
+    fn test_orders_do_not_block_quote_processing() {
+        let (mut strategy, mut intents) = strategy();
+        strategy.on_aster_quote(quote(1.0, 1.0001));
+        strategy.on_binance_quote(quote(1.002, 1.002));
+
+        let open = intents.try_recv().unwrap();
+        assert!(matches!(open, OrderIntent::Open { direction: TradeDirection::Long, .. }));
+        assert!(matches!(strategy.state, OrderState::Opening { exit: None, .. }));
+
+        // 开仓在途：继续处理行情但不重复下单，期间触发的止盈留到回报时处理
+        strategy.on_binance_quote(quote(1.003, 1.003));
+        strategy.on_aster_quote(quote(1.0010, 1.0011));
+        assert!(intents.try_recv().is_err());
+        assert!(matches!(strategy.state, OrderState::Opening { exit: Some(ExitSignal::TakeProfit), .. }));
+
+        strategy.on_order_event(OrderEvent { intent: open, result: filled(&[1, 2]) });
+        assert_eq!(strategy.open_order_ids, vec![1, 2]);
+        assert_eq!(strategy.entry_count, 1);
+        let close = intents.try_recv().unwrap();
+        assert_eq!(close, OrderIntent::Close { direction: TradeDirection::Long, cancel_open_orders: true });
+        assert!(matches!(strategy.state, OrderState::Closing { reason: CloseReason::TakeProfit, .. }));
+
+        // -2022：ReduceOnly 被拒绝，视作已无仓位
+        let mut rejected = BatchOrderResult::new(1);
+        rejected.failed_orders.push((0, AsterErrorResponse { code: -2022, msg: "ReduceOnly Order is rejected.".to_string() }));
+        strategy.on_order_event(OrderEvent { intent: close, result: Ok(rejected) });
+        assert_eq!(strategy.state, OrderState::Flat);
+        assert!(strategy.open_order_ids.is_empty());
+    }
+
+    #[test]
+    fn test_min_notional_uses_entry_side_price() {
+        // 最小名义价值恰好等于 ask 价开仓：做多满足，按 bid 做空不满足
+        let (mut long, mut long_intents) = strategy();
+        long.filters.min_notional = long.filters.price_ticks(1.0001) * long.quantity_lots;
+        long.on_aster_quote(quote(1.0, 1.0001));
+        long.on_binance_quote(quote(1.002, 1.002));
+        assert!(matches!(long_intents.try_recv().unwrap(), OrderIntent::Open { direction: TradeDirection::Long, .. }));
+
+        let (mut short, mut short_intents) = strategy();
+        short.filters.min_notional = short.filters.price_ticks(1.0001) * short.quantity_lots;
+        short.on_aster_quote(quote(1.0, 1.0001));
+        short.on_binance_quote(quote(0.998, 0.998));
+        assert!(short_intents.try_recv().is_err());
+        assert_eq!(short.state, OrderState::Flat);
+    }
+}
@@ -0,0 +1,142 @@
+use crate::dto::aster::rest_api::{BatchOrderResult, OrderRequest, OrderSide, OrderType};
+use crate::exchange_api::aster::{AsterFuturesApi, BatchOrderTemplate, OrderTemplate, PriceSlot};
+use crate::{error_log, order_log};
+use std::sync::Arc;
+use tokio::sync::mpsc;
+
+/// 指令和回报通道容量（策略同一时间最多一个在途指令，留出余量）
+const CHANNEL_CAPACITY: usize = 16;
+
+/// 交易方向
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub enum TradeDirection {
+    Long,  // 做多
+    Short, // 做空
+}
+
+/// 策略提交给订单网关的指令
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub enum OrderIntent {
+    /// 开仓：市价单 + 止损单，`stop_loss_ticks` 为止损触发价的整数 tick
+    Open { direction: TradeDirection, stop_loss_ticks: u64 },
+    /// 平仓：reduceOnly 市价单；`cancel_open_orders` 为 true 时先撤销全部挂单（止盈时撤掉止损单）
+    Close { direction: TradeDirection, cancel_open_orders: bool },
+}
+
+/// 订单网关回报：原指令和交易所结果
+#[derive(Debug)]
+pub struct OrderEvent {
+    pub intent: OrderIntent,
+    pub result: anyhow::Result<BatchOrderResult>,
+}
+
+/// Lead-Lag 策略用到的全部下单模板
+///
+/// symbol、方向、类型、数量和 reduceOnly 在启动时固定，开仓模板只留止损价一个槽位。
+pub struct LeadLagTemplates {
+    open_long: BatchOrderTemplate,   // 市价买 + 止损卖（stopPrice 槽位）
+    open_short: BatchOrderTemplate,  // 市价卖 + 止损买（stopPrice 槽位）
+    close_long: BatchOrderTemplate,  // reduceOnly 市价卖
+    close_short: BatchOrderTemplate, // reduceOnly 市价买
+}
+
+impl LeadLagTemplates {
+    pub fn new(aster_api: &AsterFuturesApi, symbol: &str, quantity: &str, price_scale: u32) -> anyhow::Result<Self> {
+        let order = |side: OrderSide, order_type: OrderType, reduce_only: bool| {
+            OrderTemplate::new(OrderRequest {
+                symbol: symbol.to_string(),
+                side,
+                order_type,
+                quantity: Some(quantity.to_string()),
+                reduce_only: reduce_only.then(|| "true".to_string()),
+                ..Default::default()
+            })
+        };
+        let open = |side: OrderSide, stop_side: OrderSide| {
+            aster_api.batch_order_template(
+                &[
+                    order(side, OrderType::Market, false),
+                    order(stop_side, OrderType::StopMarket, true).with_slot(PriceSlot::StopPrice),
+                ],
+                price_scale,
+            )
+        };
+        let close = |side: OrderSide| aster_api.batch_order_template(&[order(side, OrderType::Market, true)], price_scale);
+        Ok(Self {
+            open_long: open(OrderSide::Buy, OrderSide::Sell)?,
+            open_short: open(OrderSide::Sell, OrderSide::Buy)?,
+            close_long: close(OrderSide::Sell)?,
+            close_short: close(OrderSide::Buy)?,
+        })
+    }
+}
+
+/// Lead-Lag 订单网关
+///
+/// 独立任务串行执行策略提交的指令，结果以 `OrderEvent` 回传。策略只做非阻塞的 `try_send`，
+/// 订单往返期间继续消费两边的 bookTicker，下一次决策不会基于过期价格。
+pub struct OrderGateway {
+    aster_api: Arc<AsterFuturesApi>,
+    symbol: String,
+    templates: LeadLagTemplates,
+    intents: mpsc::Receiver<OrderIntent>,
+    events: mpsc::Sender<OrderEvent>,
+}
+
+impl OrderGateway {
+    /// 创建网关，返回 (网关, 指令发送端, 回报接收端)；网关需要 `run` 起来才会执行指令
+    pub fn new(
+        aster_api: Arc<AsterFuturesApi>,
+        symbol: String,
+        templates: LeadLagTemplates,
+    ) -> (Self, mpsc::Sender<OrderIntent>, mpsc::Receiver<OrderEvent>) {
+        let (intent_tx, intent_rx) = mpsc::channel(CHANNEL_CAPACITY);
+        let (event_tx, event_rx) = mpsc::channel(CHANNEL_CAPACITY);
+        let gateway = Self {
+            aster_api,
+            symbol,
+            templates,
+            intents: intent_rx,
+            events: event_tx,
+        };
+        (gateway, intent_tx, event_rx)
+    }
+
+    /// 网关主循环：指令发送端或回报接收端关闭后退出
+    pub async fn run(mut self) {
+        while let Some(intent) = self.intents.recv().await {
+            let result = self.execute(intent).await;
+            if self.events.send(OrderEvent { intent, result }).await.is_err() {
+                break;
+            }
+        }
+        order_log!(info, "🔚 Lead-Lag 订单网关退出");
+    }
+
+    async fn execute(&mut self, intent: OrderIntent) -> anyhow::Result<BatchOrderResult> {
+        match intent {
+            OrderIntent::Open { direction, stop_loss_ticks } => {
+                let template = match direction {
+                    TradeDirection::Long => &mut self.templates.open_long,
+                    TradeDirection::Short => &mut self.templates.open_short,
+                };
+                self.aster_api
+                    .batch_orders_from_template(template, &[stop_loss_ticks], None)
+                    .await
+            }
+            OrderIntent::Close { direction, cancel_open_orders } => {
+                if cancel_open_orders {
+                    match self.aster_api.cancel_all_open_orders(&self.symbol, None).await {
+                        Ok(_) => order_log!(info, "✅ 止盈操作：成功取消所有开放订单"),
+                        Err(e) => error_log!(warn, "⚠️ 止盈操作：取消订单失败: {}，继续执行止盈", e),
+                    }
+                }
+                let template = match direction {
+                    TradeDirection::Long => &mut self.templates.close_long,
+                    TradeDirection::Short => &mut self.templates.close_short,
+                };
+                self.aster_api.batch_orders_from_template(template, &[], None).await
+            }
+        }
+    }
+}
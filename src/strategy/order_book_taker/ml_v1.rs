@@ -1,4 +1,4 @@
-use crate::models::{Position, PositionManager, StrategyContext, StrategyPosition};
+use crate::models::{Position, PositionReader, StrategyContext, StrategyPosition};
 use hmac::digest::typenum::Max;
 use ta::indicators::{Maximum, Minimum, SimpleMovingAverage, StandardDeviation,ZScore};
 use ta::{Close, High, Open};
@@ -6,14 +6,14 @@ use trusty::GradientBoostedDecisionTrees;
 pub struct MLV1Strategy {
     pub cxt: StrategyContext,
     pub model: GradientBoostedDecisionTrees,
-    pub position_manager:PositionManager
+    pub positions:PositionReader
 }
 impl MLV1Strategy{
-    pub fn new(cxt:StrategyContext,model:GradientBoostedDecisionTrees,position_manager:PositionManager) -> Self{
+    pub fn new(cxt:StrategyContext,model:GradientBoostedDecisionTrees,positions:PositionReader) -> Self{
         Self{
             cxt,
             model,
-            position_manager
+            positions
         }
     }
 }
\ No newline at end of file
@@ -1,3 +1,4 @@
 pub mod lead_lag;
+pub mod lead_lag_gateway;
 pub mod ml_v1;
 pub mod test_strategy;
\ No newline at end of file
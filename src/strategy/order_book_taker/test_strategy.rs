@@ -5,6 +5,7 @@ use ta::Next; // 需要导入 Next trait 才能使用 next() 方法
 use crate::common::ts::OrderBookStrategy;
 use crate::models::{strategy::StrategyContext, TradingSignal};
 use crate::middle_processor::snapshot_creator::SnapShot;
+use crate::middle_processor::snapshot_creator_u64::SnapShotU64;
 
 pub struct TestStrategy {
     pub cxt: StrategyContext,
@@ -32,3 +33,29 @@ impl OrderBookStrategy<&SnapShot> for TestStrategy {
         self.cxt.clone()
     }
 }
+
+/// 整数 tick 快照上的测试策略，指标由整数累加得到，只在最后一步转换为比例
+pub struct TestStrategyU64 {
+    pub cxt: StrategyContext,
+    /// 计算挂单量不平衡度使用的档位数
+    pub depth_levels: usize,
+}
+
+impl OrderBookStrategy<&SnapShotU64> for TestStrategyU64 {
+    fn on_orderbook_update(&mut self, input: &SnapShotU64) -> Option<TradingSignal> {
+        let order_tick_qty = input.order_tick.get_latest_tick().map(|tick| tick.top_quantity()).unwrap_or(0);
+        let volume_imb = input.binance_depth.volume_imbalance(self.depth_levels);
+        let taker_buy_ratio = input.trade_tick.taker_buy_ratio();
+
+        // 打印技术指标值
+        println!("📊 技术指标 (u64):");
+        println!("  - OrderTick Quantity: {}", input.precision().format_quantity(order_tick_qty));
+        println!("  - Volume Imbalance: {:.6}", volume_imb);
+        println!("  - Taker Buy Ratio: {:.6}", taker_buy_ratio);
+        None
+    }
+
+    fn strategy_cxt(&self) -> StrategyContext {
+        self.cxt.clone()
+    }
+}
@@ -112,7 +112,7 @@ impl Q1Strategy {
                     // 发送止损触发信号给风控层
                     let stop_loss_signal = TradingSignal::new_stop_loss_triggered_signal(
                         0, // 使用默认ID，因为Q1Strategy没有signal_id字段
-                        self.symbol.to_string(), // 将TradingSymbol转换为String
+                        self.symbol.id(),
                         StrategyName::TURTLE, // 使用TURTLE，因为Q1策略在其他地方也使用这个
                         Exchange::Binance,
                         close_price,
@@ -167,7 +167,7 @@ impl Q1Strategy {
                 
                 return Some(TradingSignal::new_close_signal(
                     1,
-                    self.symbol.clone().into(),
+                    self.symbol.id(),
                     position_to_close,
                     StrategyName::TURTLE,
                     quantity,
@@ -205,7 +205,7 @@ impl Q1Strategy {
                 
                 return Some(TradingSignal::new_market_signal(
                     1,
-                    self.symbol.clone().into(),
+                    self.symbol.id(),
                     Side::Buy,
                     StrategyName::TURTLE,
                     quantity,
@@ -242,7 +242,7 @@ impl Q1Strategy {
                 
                 return Some(TradingSignal::new_market_signal(
                     1,
-                    self.symbol.clone().into(),
+                    self.symbol.id(),
                     Side::Sell,
                     StrategyName::TURTLE,
                     quantity,